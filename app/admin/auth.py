@@ -10,6 +10,7 @@ from sqladmin.authentication import AuthenticationBackend
 
 from app.config.settings import get_settings
 from app.database.db import async_session
+from app.database.hashing import run_in_hash_pool
 from app.database.helpers import (
     get_user_by_email_,
     get_user_by_id_,
@@ -73,7 +74,7 @@ class AdminAuth(AuthenticationBackend):
         async with async_session() as db:
             user = await get_user_by_email_(email, db)
 
-            if not user or not self._validate_user(password, user):
+            if not user or not await self._validate_user(password, user):
                 logger.error(
                     "Failed admin site login attempt by %s",
                     email,
@@ -86,7 +87,7 @@ class AdminAuth(AuthenticationBackend):
 
             return True
 
-    def _validate_user(self, password: str, user: User | None) -> bool:
+    async def _validate_user(self, password: str, user: User | None) -> bool:
         """Validate if the user can access admin interface.
 
         Args:
@@ -98,7 +99,9 @@ class AdminAuth(AuthenticationBackend):
         """
         return not (
             not user
-            or not verify_password(password, user.password)
+            or not await run_in_hash_pool(
+                verify_password, password, user.password
+            )
             or user.role != RoleType.admin
             or user.banned
         )
@@ -6,6 +6,7 @@ from fastapi import Request
 from sqladmin import ModelView
 from sqlalchemy.orm import InstrumentedAttribute
 
+from app.database.hashing import run_in_hash_pool
 from app.database.helpers import hash_password
 from app.models.user import User
 
@@ -64,4 +65,6 @@ class UserAdmin(ModelView, model=User):
         """Customize the password hash before saving into DB."""
         if is_created:
             # Hash the password before saving into DB !
-            data["password"] = hash_password(data["password"])
+            data["password"] = await run_in_hash_pool(
+                hash_password, data["password"]
+            )
@@ -5,20 +5,28 @@ Provides cache decorators, key builders, and invalidation utilities.
 
 from app.cache.decorators import cached
 from app.cache.invalidation import (
+    invalidate_household_cache,
+    invalidate_household_cache_on_commit,
     invalidate_namespace,
     invalidate_user_cache,
     invalidate_user_related_caches,
 )
 from app.cache.key_builders import (
+    household_key_builder,
     paginated_key_builder,
     user_scoped_key_builder,
+    versioned_key_builder,
 )
 
 __all__ = [
     "cached",
+    "household_key_builder",
+    "invalidate_household_cache",
+    "invalidate_household_cache_on_commit",
     "invalidate_namespace",
     "invalidate_user_cache",
     "invalidate_user_related_caches",
     "paginated_key_builder",
     "user_scoped_key_builder",
+    "versioned_key_builder",
 ]
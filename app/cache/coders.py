@@ -0,0 +1,88 @@
+"""Cache coders that store responses as the JSON of their response model.
+
+``PickleCoder`` stores whatever the route returned, which for routes that
+return ORM objects means pickling the SQLAlchemy instance and its state:
+slow to encode and decode, large in Redis, and unreadable once the model
+class changes in a deploy. ``ModelCoder`` instead validates the value into
+the route's response model and stores that model's JSON, using pydantic's
+compiled serializer, and a cache hit only has to parse the JSON back.
+Entries of at least ``CACHE_COMPRESS_MIN_SIZE`` bytes are zlib-compressed.
+
+Each stored entry starts with a one-byte marker: ``j`` for plain JSON and
+``z`` for compressed JSON.
+"""
+
+from __future__ import annotations
+
+import functools
+import zlib
+from typing import Any, ClassVar, TypeVar
+
+from fastapi_cache.coder import Coder
+from pydantic import TypeAdapter
+from pydantic_core import from_json
+
+from app.config.settings import get_settings
+
+PLAIN = b"j"
+COMPRESSED = b"z"
+# zlib level trading a little ratio for much faster compression.
+COMPRESSION_LEVEL = 1
+
+_T = TypeVar("_T", bound=type)
+
+
+class ModelCoder(Coder):
+    """Encode cached values as the JSON of a response model.
+
+    Create subclasses for a response model with ``model_coder``.
+    """
+
+    adapter: ClassVar[TypeAdapter[Any]]
+    # Appended to cache keys, so workers still using another coder during a
+    # rolling deploy never read these entries, nor these workers theirs.
+    key_suffix: ClassVar[str] = "json"
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:  # noqa: ANN401
+        """Validate the value into the response model and dump its JSON."""
+        model = cls.adapter.validate_python(value, from_attributes=True)
+        data = cls.adapter.dump_json(model, by_alias=True)
+        min_size = get_settings().cache_compress_min_size
+        if min_size and len(data) >= min_size:
+            return COMPRESSED + zlib.compress(data, COMPRESSION_LEVEL)
+        return PLAIN + data
+
+    @classmethod
+    def decode(cls, value: bytes) -> Any:  # noqa: ANN401
+        """Load a stored entry as plain JSON data.
+
+        The data is not validated here: FastAPI validates it against the
+        response model when sending it, as it does the route's own results,
+        so validating it twice would only slow down cache hits.
+        """
+        data = value[1:]
+        if value[:1] == COMPRESSED:
+            data = zlib.decompress(data)
+        return from_json(data)
+
+    @classmethod
+    def decode_as_type(cls, value: bytes, *, type_: _T | None) -> Any:  # noqa: ANN401, ARG003
+        """Decode the entry, whatever the route's return annotation."""
+        return cls.decode(value)
+
+
+@functools.cache
+def model_coder(response_model: Any) -> type[ModelCoder]:  # noqa: ANN401
+    """Return the coder for a response model, e.g. ``list[RoomResponse]``.
+
+    Raises:
+        PydanticSchemaGenerationError: If the type is not one pydantic can
+            validate, such as an ORM class.
+    """
+    name = getattr(response_model, "__name__", "Model")
+    return type(
+        f"{name}Coder",
+        (ModelCoder,),
+        {"adapter": TypeAdapter(response_model)},
+    )
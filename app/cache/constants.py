@@ -25,8 +25,17 @@ class CacheNamespaces:
     # User-related namespaces
     USER_ME = "user"  # Current user data (/users/me)
     USERS_SINGLE = "users"  # Base namespace for /users/ endpoint
+    # Task, room and floor reads of a household
+    HOUSEHOLD = "household"
 
     # Format templates for dynamic namespaces
     # Use f-strings with these templates for user-scoped caches
     USER_ME_FORMAT = "user:{user_id}"  # User-scoped cache
     USERS_SINGLE_FORMAT = "users:{user_id}"  # Single user cache
+    # Household-scoped cache, invalidated by generation (see
+    # app.cache.generation)
+    HOUSEHOLD_FORMAT = "household:{household_id}"
+    # Household the user belongs to (see app.database.membership)
+    HOUSEHOLD_MEMBER_FORMAT = "household-member:{user_id}"
+    # Role and status of an authenticated user (see app.database.principal)
+    PRINCIPAL_FORMAT = "principal:{user_id}"
@@ -1,34 +1,65 @@
 """Cache decorator utilities with project-specific defaults."""
 
-from collections.abc import Callable
+import functools
+import inspect
+from collections.abc import Awaitable, Callable
 from typing import Any
 
+from fastapi.dependencies.utils import get_typed_return_annotation
 from fastapi_cache.coder import Coder, PickleCoder
-from fastapi_cache.decorator import cache as _cache
+from pydantic.errors import PydanticSchemaGenerationError
 
+from app.cache.coders import ModelCoder, model_coder
+from app.cache.key_builders import versioned_key_builder
+from app.cache.route import cache_route
 from app.config.settings import get_settings
 
 
-def cached(
+def cached(  # noqa: PLR0913
     expire: int | None = None,
     namespace: str = "",
-    key_builder: Callable[..., str] | None = None,
+    key_builder: Callable[..., str | Awaitable[str]] | None = None,
     coder: type[Coder] | None = None,
+    *,
+    response_model: Any = None,  # noqa: ANN401
+    stale_ttl: int | None = None,
+    revalidate: bool = False,
 ) -> Callable[..., Any]:
     """Project-specific cache decorator with defaults.
 
-    Wraps fastapi-cache's cache decorator with sensible defaults from
-    settings. When caching is disabled (CACHE_ENABLED=false), acts as
-    a no-op decorator that returns the function unchanged.
+    Serves the route from fastapi-cache's backend with sensible defaults
+    from settings, protected against cache stampedes (see
+    ``app.cache.route``). When caching is disabled (CACHE_ENABLED=false),
+    acts as a no-op decorator that returns the function unchanged.
+
+    Cached routes read with ``get_database``, not ``get_read_database``:
+    an entry built from a lagging replica would keep serving the old data
+    for its whole TTL, after the invalidation for the change has passed.
 
     Args:
-        expire: Cache TTL in seconds. Uses CACHE_DEFAULT_TTL if None.
+        expire: Seconds the cached response is fresh (its soft TTL).
+            Uses CACHE_DEFAULT_TTL if None.
         namespace: Cache key namespace for organization.
         key_builder: Custom function to build cache keys. Uses
-            default if None.
-        coder: Custom coder for serialization. Defaults to
-            PickleCoder for SQLAlchemy ORM models. Use JsonCoder if
-            caching Pydantic models.
+            ``versioned_key_builder`` if None. Keys must include the
+            namespace generation (see ``app.cache.generation``) or
+            invalidation will not reach them.
+        coder: Custom coder for serialization. Defaults to a
+            ``ModelCoder`` storing the JSON of ``response_model`` (see
+            ``app.cache.coders``), or PickleCoder if there is no model.
+        response_model: The route's response model, when its return
+            annotation is not one (e.g. a route returning an ORM object
+            with ``response_model=`` on the router decorator). Defaults to
+            the return annotation.
+        stale_ttl: Seconds a response is kept after ``expire`` (so its
+            hard TTL is ``expire + stale_ttl``), served stale while one
+            request refreshes it. Uses CACHE_STALE_TTL if None.
+        revalidate: Tell clients to check back on every use
+            (``Cache-Control: private, no-cache``) instead of reusing the
+            response for the whole TTL. Use this for caches invalidated on
+            writes, so clients do not keep showing data they just changed;
+            unchanged responses are still answered with 304 through their
+            ETag.
 
     Returns:
         Decorated function with caching enabled, or the original
@@ -38,9 +69,10 @@ def cached(
         ```python
         from app.cache import cached, user_scoped_key_builder
 
-        @router.get("/users/me")
+        @router.get("/users/me", response_model=MyUserResponse)
         @cached(expire=300, namespace="user",
-                key_builder=user_scoped_key_builder)
+                key_builder=user_scoped_key_builder,
+                response_model=MyUserResponse)
         async def get_my_user(
             request: Request,
             response: Response,
@@ -61,9 +93,54 @@ def cached(
     if expire is None:
         expire = get_settings().cache_default_ttl
 
-    if coder is None:
-        coder = PickleCoder
+    if stale_ttl is None:
+        stale_ttl = get_settings().cache_stale_ttl
+
+    if key_builder is None:
+        key_builder = versioned_key_builder
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        func_coder = coder or _default_coder(func, response_model)
+        func_key_builder = key_builder
+        if issubclass(func_coder, ModelCoder):
+            func_key_builder = _suffixed(key_builder, func_coder.key_suffix)
+        return cache_route(
+            namespace=namespace,
+            expire=expire,
+            stale_ttl=stale_ttl,
+            key_builder=func_key_builder,
+            coder=func_coder,
+            revalidate=revalidate,
+        )(func)
+
+    return decorator
+
+
+def _default_coder(
+    func: Callable[..., Any],
+    response_model: Any,  # noqa: ANN401
+) -> type[Coder]:
+    """Return the model coder for the route's response model, if any."""
+    if response_model is None:
+        response_model = get_typed_return_annotation(func)
+    if response_model in {None, Any}:
+        return PickleCoder
+    try:
+        return model_coder(response_model)
+    except PydanticSchemaGenerationError:
+        return PickleCoder
+
+
+def _suffixed(
+    key_builder: Callable[..., Any], suffix: str
+) -> Callable[..., Any]:
+    """Append a segment to the keys a key builder builds."""
+
+    @functools.wraps(key_builder)
+    async def build(*args: Any, **kwargs: Any) -> str:  # noqa: ANN401
+        key = key_builder(*args, **kwargs)
+        if inspect.isawaitable(key):
+            key = await key
+        return f"{key}:{suffix}"
 
-    return _cache(
-        expire=expire, namespace=namespace, key_builder=key_builder, coder=coder
-    )
+    return build
@@ -0,0 +1,117 @@
+"""Generation counters for O(1) cache namespace invalidation.
+
+Clearing a namespace with ``FastAPICache.clear`` scans the keyspace for
+matching keys, which gets slower as the cache grows and blocks Redis while
+it runs. Instead, each namespace has a generation number that key builders
+embed in every key they build. Invalidating the namespace just increments
+the generation: later requests build keys that do not exist yet, and the
+entries under the old generation are never read again and expire by their
+TTL.
+
+Namespaces nest like the key prefixes they replace: a key in ``user:123``
+carries the generations of both ``user`` and ``user:123`` (its
+``generation_tag``), so invalidating ``user`` still invalidates every
+user's entries.
+
+With the Redis backend the counters live in Redis (one ``MGET`` per cached
+request and one ``INCR`` per invalidation), so every worker sees the same
+generation. They have no expiry, since a counter that disappeared would
+restart at a generation that may still have live entries. Otherwise the
+counters are kept in process, like the in-memory backend's entries.
+
+With the tiered backend (see ``app.cache.tiered``) each worker also keeps
+the generations it read in its local tier. A bump publishes the namespace's
+counter key so every worker evicts it, which keeps cache hits free of Redis
+round trips without serving a stale generation.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from fastapi_cache import FastAPICache
+
+from app.cache.snapshot import redis_backend, redis_client
+from app.cache.tiered import TieredBackend
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fastapi_cache.backends.redis import RedisBackend
+
+_local_generations: dict[str, int] = {}
+
+
+def _generation_key(namespace: str) -> str:
+    return f"{FastAPICache.get_prefix()}:generation:{namespace}"
+
+
+async def bump_generation(namespace: str) -> int:
+    """Move a namespace to a new generation and return it.
+
+    Raises:
+        RedisError: If the Redis backend cannot be written.
+    """
+    backend = redis_backend()
+    if backend is None:
+        generation = _local_generations.get(namespace, 0) + 1
+        _local_generations[namespace] = generation
+        return generation
+    key = _generation_key(namespace)
+    client = redis_client(backend)
+    tiered = TieredBackend.current()
+    if tiered is None:
+        return int(await client.incr(key))
+    async with client.pipeline(transaction=True) as pipe:
+        generation, _ = (
+            await pipe.incr(key).publish(tiered.channel(), key).execute()
+        )
+    tiered.evict(key)
+    return int(generation)
+
+
+def _lineage(namespace: str) -> list[str]:
+    """Return the namespace and its parents, outermost first."""
+    parts = namespace.split(":")
+    return [":".join(parts[: i + 1]) for i in range(len(parts))]
+
+
+async def generation_tag(namespace: str) -> str:
+    """Return the generations of a namespace and its parents, as a string.
+
+    For ``household:42`` with ``household`` at generation 0 and
+    ``household:42`` at generation 3, the tag is ``"0.3"``. Bumping either
+    namespace changes the tag.
+
+    Raises:
+        RedisError: If the Redis backend cannot be read.
+    """
+    lineage = _lineage(namespace)
+    backend = redis_backend()
+    if backend is None:
+        generations = [_local_generations.get(ns, 0) for ns in lineage]
+    else:
+        generations = await _remote_generations(backend, lineage)
+    return ".".join(map(str, generations))
+
+
+async def _remote_generations(
+    backend: RedisBackend, lineage: list[str]
+) -> list[int]:
+    """Read generations from Redis, or the tiered backend's local tier."""
+    keys = [_generation_key(ns) for ns in lineage]
+    tiered = TieredBackend.current()
+    if tiered is not None:
+        local = [tiered.get_local(key) for key in keys]
+        hits = [value for value in local if value is not None]
+        if len(hits) == len(keys):
+            return [int(value) for value in hits]
+        epoch = tiered.epoch
+    values = await redis_client(backend).mget(keys)
+    if tiered is not None:
+        for key, value in zip(keys, values, strict=True):
+            tiered.set_local(key, value or b"0", epoch=epoch)
+    return [int(value) if value else 0 for value in values]
+
+
+def clear_local_generations() -> None:
+    """Forget the in-process generations of this worker."""
+    _local_generations.clear()
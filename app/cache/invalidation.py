@@ -1,7 +1,9 @@
 """Cache invalidation utilities.
 
 Provides helper functions to clear cached data when underlying data
-changes.
+changes. Each one moves a namespace to a new generation (see
+``app.cache.generation``) instead of deleting its keys, so invalidation
+costs one counter increment however many entries are cached.
 
 All invalidation functions handle errors gracefully - cache failures
 are logged but don't prevent the operation from succeeding. This ensures
@@ -9,12 +11,24 @@ the app continues functioning (with stale cache) if the cache backend
 fails.
 """
 
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
 from fastapi_cache import FastAPICache
 from redis.exceptions import RedisError
 
 from app.cache.constants import CacheNamespaces
+from app.cache.generation import bump_generation
+from app.database.db import call_after_commit
 from app.logs import LogCategory, category_logger
 
+if TYPE_CHECKING:  # pragma: no cover
+    import uuid
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 
 def _cache_initialized() -> bool:
     """Return True if FastAPICache has been initialized."""
@@ -47,26 +61,28 @@ async def invalidate_user_cache(user_id: int) -> None:
     try:
         # Clear /users/me style cache (namespace: "user:{user_id}")
         namespace = CacheNamespaces.USER_ME_FORMAT.format(user_id=user_id)
-        await FastAPICache.clear(namespace=namespace)
+        await bump_generation(namespace)
 
         # Clear single user lookup cache (namespace: "users:{user_id}")
         users_namespace = CacheNamespaces.USERS_SINGLE_FORMAT.format(
             user_id=user_id
         )
-        await FastAPICache.clear(namespace=users_namespace)
+        await bump_generation(users_namespace)
 
         category_logger.info(
-            f"Cleared cache for user {user_id}", LogCategory.CACHE
+            "Cleared cache for user {}",
+            LogCategory.CACHE,
+            user_id,
         )
     except (RedisError, OSError, RuntimeError) as e:
         category_logger.error(
-            f"Failed to invalidate cache for user {user_id}: {e}",
+            "Failed to invalidate cache for user {}: {}",
             LogCategory.CACHE,
+            user_id,
+            e,
         )
 
 
-
-
 async def invalidate_user_related_caches(user_id: int) -> None:
     """Invalidate all user-related caches in parallel for better performance.
 
@@ -95,9 +111,10 @@ async def invalidate_user_related_caches(user_id: int) -> None:
 async def invalidate_namespace(namespace: str) -> None:
     """Invalidate all cache keys under a namespace.
 
-    Clears all cache entries stored under the given namespace prefix.
-    Useful for custom endpoint groups without dedicated invalidation
-    helpers.
+    Clears all cache entries stored under the given namespace, including
+    nested namespaces (clearing ``products`` also clears
+    ``products:123``). Useful for custom endpoint groups without dedicated
+    invalidation helpers.
 
     Args:
         namespace: Cache namespace prefix to clear (e.g., "products:123").
@@ -115,13 +132,66 @@ async def invalidate_namespace(namespace: str) -> None:
     if not _cache_initialized():
         return
     try:
-        await FastAPICache.clear(namespace=namespace)
+        await bump_generation(namespace)
+        category_logger.info(
+            "Cleared cache namespace: {}",
+            LogCategory.CACHE,
+            namespace,
+        )
+    except (RedisError, OSError, RuntimeError) as e:
+        category_logger.error(
+            "Failed to invalidate cache namespace {}: {}",
+            LogCategory.CACHE,
+            namespace,
+            e,
+        )
+
+
+async def invalidate_household_cache(household_id: uuid.UUID) -> None:
+    """Invalidate all cached task, room and floor reads of a household.
+
+    Args:
+        household_id: The household whose caches should be cleared.
+
+    Note:
+        Cache failures are logged but don't raise exceptions. The app
+        continues with stale cache until TTL expires.
+    """
+    if not _cache_initialized():
+        return
+    namespace = CacheNamespaces.HOUSEHOLD_FORMAT.format(
+        household_id=household_id
+    )
+    try:
+        generation = await bump_generation(namespace)
         category_logger.info(
-            f"Cleared cache namespace: {namespace}",
+            "Cleared cache for household {} (generation {})",
             LogCategory.CACHE,
+            household_id,
+            generation,
         )
     except (RedisError, OSError, RuntimeError) as e:
         category_logger.error(
-            f"Failed to invalidate cache namespace {namespace}: {e}",
+            "Failed to invalidate cache for household {}: {}",
             LogCategory.CACHE,
+            household_id,
+            e,
         )
+
+
+def invalidate_household_cache_on_commit(
+    db: AsyncSession, household_id: uuid.UUID
+) -> None:
+    """Invalidate the household's cached reads once ``db`` commits.
+
+    Used by the routes that change tasks, rooms or floors. Invalidating
+    before the commit would let a concurrent read cache the old data under
+    the new generation.
+
+    Args:
+        db: The request's database session.
+        household_id: The household whose caches should be cleared.
+    """
+    call_after_commit(
+        db, functools.partial(invalidate_household_cache, household_id)
+    )
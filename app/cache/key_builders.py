@@ -1,16 +1,86 @@
-"""Custom cache key builders for different caching strategies."""
+"""Custom cache key builders for different caching strategies.
 
+Every key embeds the generation tag of the namespace it is invalidated
+through (see ``app.cache.generation``), so invalidation never has to find
+and delete keys.
+"""
+
+import uuid
 from collections.abc import Callable
+from enum import Enum
 from typing import Any
 
 from fastapi import Request, Response
+from fastapi_cache import FastAPICache
+from fastapi_cache.key_builder import default_key_builder
+from redis.exceptions import RedisError
 
+from app.cache.constants import CacheNamespaces
+from app.cache.generation import generation_tag
 from app.logs import LogCategory, category_logger
 
 # ruff: noqa: PLR0913, ARG001
 
 
-def user_scoped_key_builder(
+async def _generation(namespace: str) -> str:
+    """Return the generation tag to put in a key, as ``g<tag>``.
+
+    ``namespace`` is the invalidation namespace, without the cache prefix.
+    If the generation cannot be read, a tag that is never reused is returned
+    instead, so a stale entry cannot be served.
+    """
+    try:
+        return f"g{await generation_tag(namespace)}"
+    except (RedisError, OSError, RuntimeError) as e:
+        category_logger.error(
+            "Failed to read cache generation of {}: {}",
+            LogCategory.CACHE,
+            namespace,
+            e,
+        )
+        return f"g-unknown-{uuid.uuid4()}"
+
+
+def _unprefixed(namespace: str) -> str:
+    """Strip the cache prefix fastapi-cache adds to the namespace."""
+    return namespace.removeprefix(f"{FastAPICache.get_prefix()}:")
+
+
+def _user_id(request: Request) -> int | str:
+    return (
+        request.state.user.id if hasattr(request.state, "user") else "anonymous"
+    )
+
+
+async def versioned_key_builder(
+    func: Callable[..., Any],
+    namespace: str,
+    request: Request,
+    response: Response,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> str:
+    """Build fastapi-cache's default key, versioned by namespace generation.
+
+    Used by ``cached`` when no key builder is given. The key hashes the
+    function and its arguments like fastapi-cache's default key builder.
+
+    Returns:
+        Cache key in format: "namespace:generation:hash"
+    """
+    key = default_key_builder(
+        func,
+        namespace,
+        request=request,
+        response=response,
+        args=args,
+        kwargs=kwargs,
+    )
+    generation = await _generation(_unprefixed(namespace))
+    return f"{namespace}:{generation}:{key.removeprefix(f'{namespace}:')}"
+
+
+async def user_scoped_key_builder(
     func: Callable[..., Any],
     namespace: str,
     request: Request,
@@ -21,8 +91,8 @@ def user_scoped_key_builder(
     """Build cache key that includes user ID in namespace.
 
     Used for user-specific cached endpoints like /users/me or
-    /users/keys. Places user_id in the namespace for easier
-    invalidation.
+    /users/keys. Carries the generation of the user's namespace, so
+    ``invalidate_user_cache`` makes all of the user's entries misses.
 
     Args:
         func: The cached function.
@@ -33,24 +103,24 @@ def user_scoped_key_builder(
         kwargs: Keyword arguments to the function (unused).
 
     Returns:
-        Cache key in format: "namespace:user_id:func_name"
+        Cache key in format: "namespace:user_id:generation:func_name"
 
     Example:
-        Cache key: "user:123:get_my_user"
+        Cache key: "user:123:g0.2:get_my_user"
     """
-    user_id = (
-        request.state.user.id if hasattr(request.state, "user") else "anonymous"
-    )
-    cache_key = f"{namespace}:{user_id}:{func.__name__}"
+    user_id = _user_id(request)
+    generation = await _generation(f"{_unprefixed(namespace)}:{user_id}")
+    cache_key = f"{namespace}:{user_id}:{generation}:{func.__name__}"
     category_logger.debug(
-        f"Key builder received namespace='{namespace}', "
-        f"returning='{cache_key}'",
+        "Key builder received namespace='{}', returning='{}'",
         LogCategory.CACHE,
+        namespace,
+        cache_key,
     )
     return cache_key
 
 
-def paginated_key_builder(
+async def paginated_key_builder(
     func: Callable[..., Any],
     namespace: str,
     request: Request,
@@ -71,18 +141,19 @@ def paginated_key_builder(
         kwargs: Keyword arguments to the function (unused).
 
     Returns:
-        Cache key in format: "namespace:func_name:page:N:size:M"
+        Cache key in format:
+        "namespace:generation:func_name:page:N:size:M"
 
     Example:
-        Cache key: "users:get_users:page:1:size:50"
+        Cache key: "users:g0:get_users:page:1:size:50"
     """
+    generation = await _generation(_unprefixed(namespace))
     page = request.query_params.get("page", "1")
     size = request.query_params.get("size", "50")
-    return f"{namespace}:{func.__name__}:page:{page}:size:{size}"
+    return f"{namespace}:{generation}:{func.__name__}:page:{page}:size:{size}"
 
 
-
-def user_paginated_key_builder(
+async def user_paginated_key_builder(
     func: Callable[..., Any],
     namespace: str,
     request: Request,
@@ -105,15 +176,92 @@ def user_paginated_key_builder(
 
     Returns:
         Cache key in format:
-        "namespace:user_id:func_name:page:N:size:M"
+        "namespace:user_id:generation:func_name:page:N:size:M"
 
     Example:
-        Cache key: "data:123:get_paginated_data:page:1:size:50"
+        Cache key: "data:123:g0.1:get_paginated_data:page:1:size:50"
     """
-    user_id = (
-        request.state.user.id if hasattr(request.state, "user") else "anonymous"
-    )
+    user_id = _user_id(request)
+    generation = await _generation(f"{_unprefixed(namespace)}:{user_id}")
     page = request.query_params.get("page", "1")
     size = request.query_params.get("size", "50")
-    return f"{namespace}:{user_id}:{func.__name__}:page:{page}:size:{size}"
+    return (
+        f"{namespace}:{user_id}:{generation}:{func.__name__}:"
+        f"page:{page}:size:{size}"
+    )
 
+
+def _key_value(value: Any) -> str | None:  # noqa: ANN401
+    """Return a route argument as a key fragment, or None to leave it out.
+
+    Only plain values (query and path parameters) are part of the key;
+    injected objects such as the database session are skipped.
+    """
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, str | int | float | uuid.UUID):
+        return str(value)
+    if isinstance(value, list | tuple | set):
+        items = [_key_value(item) for item in value]
+        if None in items:
+            return None
+        return ",".join(sorted(item for item in items if item is not None))
+    return None
+
+
+def normalized_params(kwargs: dict[str, Any]) -> str:
+    """Return the route's plain arguments as a canonical query string.
+
+    Arguments are sorted by name, list values are sorted (filters such as
+    ``room_ids`` are sets), and arguments that are None are left out, so
+    requests that mean the same thing get the same key however their
+    query string was written.
+    """
+    parts = []
+    for name, value in sorted(kwargs.items()):
+        if name == "household_id" or value is None:
+            continue
+        fragment = _key_value(value)
+        if fragment is not None:
+            parts.append(f"{name}={fragment}")
+    return "&".join(parts)
+
+
+async def household_key_builder(
+    func: Callable[..., Any],
+    namespace: str,
+    request: Request,
+    response: Response,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> str:
+    """Build cache key scoped to the caller's household and its generation.
+
+    Used for the task, room and floor reads of a household. The route must
+    take a ``household_id`` argument. ``invalidate_household_cache`` makes
+    every cached read of the household a miss.
+
+    Args:
+        func: The cached function.
+        namespace: Cache namespace base.
+        request: FastAPI Request object (unused).
+        response: FastAPI Response object (unused).
+        args: Positional arguments to the function (unused).
+        kwargs: Keyword arguments to the function, used for the household
+            and the filter, sort and page parameters.
+
+    Returns:
+        Cache key in format:
+        "namespace:household_id:generation:func_name:params"
+
+    Example:
+        Cache key: "household:3f2b...:g0.4:get_tasks:order=asc&page=1"
+    """
+    household_id = kwargs.get("household_id")
+    generation = await _generation(
+        CacheNamespaces.HOUSEHOLD_FORMAT.format(household_id=household_id)
+    )
+    return (
+        f"{namespace}:{household_id}:{generation}:{func.__name__}:"
+        f"{normalized_params(kwargs)}"
+    )
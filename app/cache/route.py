@@ -0,0 +1,303 @@
+"""Serve routes from the response cache, protected against stampedes.
+
+This replaces fastapi-cache's ``cache`` decorator, keeping its backend,
+key builders, coders and response headers, and adds two protections for
+the moment a popular entry expires or is invalidated:
+
+- Single-flight: of the requests that miss on the same key, one computes
+  the entry and the others wait for it (see ``app.cache.single_flight``).
+- Stale-while-revalidate: an entry is fresh for ``expire`` seconds (its
+  soft TTL) but kept for ``stale_ttl`` seconds longer (its hard TTL).
+  Once it is stale, one request recomputes it while the others are still
+  served the stale copy, marked ``X-FastAPI-Cache: STALE``.
+
+The refresh runs in the request that wins the lease rather than a detached
+task, since route dependencies such as the database session only live as
+long as their request.
+
+Entries are stored as ``E``, the ``time.time()`` they are fresh until as a
+big-endian double, then the coder's payload.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import math
+import struct
+import time
+from dataclasses import dataclass
+from inspect import Parameter, Signature
+from typing import TYPE_CHECKING, Any
+
+from fastapi import Request, Response
+from fastapi.dependencies.utils import (
+    get_typed_return_annotation,
+    get_typed_signature,
+)
+from fastapi_cache import FastAPICache
+from redis.exceptions import RedisError
+from starlette.concurrency import run_in_threadpool
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from app.cache import single_flight
+from app.logs import LogCategory, category_logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+
+    from fastapi_cache.coder import Coder
+
+ENTRY_MARKER = b"E"
+_FRESH_UNTIL = struct.Struct("!d")
+
+# Names of the parameters added to routes that do not take the request or
+# response themselves.
+INJECTED_REQUEST = "__cache_request"
+INJECTED_RESPONSE = "__cache_response"
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A cached payload and the time.time() it is fresh until."""
+
+    payload: bytes
+    fresh_until: float
+
+    @classmethod
+    def unpack(cls, value: bytes, ttl: int) -> CacheEntry:
+        """Read a stored entry; ``ttl`` is its remaining hard TTL.
+
+        Entries stored without a header stay fresh until they expire.
+        """
+        if value[:1] != ENTRY_MARKER:
+            return cls(value, time.time() + max(ttl, 0))
+        (fresh_until,) = _FRESH_UNTIL.unpack_from(value, 1)
+        return cls(value[1 + _FRESH_UNTIL.size :], fresh_until)
+
+    def pack(self) -> bytes:
+        """Return the entry as stored."""
+        return ENTRY_MARKER + _FRESH_UNTIL.pack(self.fresh_until) + self.payload
+
+    @property
+    def fresh(self) -> bool:
+        """Return True until the soft TTL has passed."""
+        return time.time() < self.fresh_until
+
+    @property
+    def max_age(self) -> int:
+        """Return the seconds the entry stays fresh, rounded up."""
+        return max(math.ceil(self.fresh_until - time.time()), 0)
+
+    @property
+    def etag(self) -> str:
+        """Return a weak ETag that is the same on every worker."""
+        digest = hashlib.blake2b(self.payload, digest_size=8).hexdigest()
+        return f'W/"{digest}"'
+
+
+def _uncacheable(request: Request) -> bool:
+    """Return True for requests that must run the route."""
+    return (
+        not FastAPICache.get_enable()
+        or request.method != "GET"
+        or request.headers.get("Cache-Control") == "no-store"
+    )
+
+
+def _parameter(
+    signature: Signature,
+    annotation: type,
+    name: str,
+    injected: list[Parameter],
+) -> str:
+    """Return the route's parameter of a type, injecting one if needed."""
+    for param in signature.parameters.values():
+        if param.annotation is annotation:
+            return param.name
+    injected.append(
+        Parameter(name, Parameter.KEYWORD_ONLY, annotation=annotation)
+    )
+    return name
+
+
+class CachedRoute:
+    """A route function served from the response cache."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        func: Callable[..., Any],
+        *,
+        namespace: str,
+        expire: int,
+        stale_ttl: int,
+        key_builder: Callable[..., Any],
+        coder: type[Coder],
+        revalidate: bool,
+    ) -> None:
+        """Wrap ``func``; see ``app.cache.decorators.cached``."""
+        self.func = func
+        self.namespace = namespace
+        self.expire = expire
+        self.stale_ttl = stale_ttl
+        self.key_builder = key_builder
+        self.coder = coder
+        self.revalidate = revalidate
+        self.return_type = get_typed_return_annotation(func)
+
+        signature = get_typed_signature(func)
+        injected: list[Parameter] = []
+        self.request_param = _parameter(
+            signature, Request, INJECTED_REQUEST, injected
+        )
+        self.response_param = _parameter(
+            signature, Response, INJECTED_RESPONSE, injected
+        )
+        self.injected = {param.name for param in injected}
+        params = list(signature.parameters.values())
+        variadic = [p for p in params if p.kind is Parameter.VAR_KEYWORD]
+        self.signature = signature.replace(
+            parameters=[
+                *(p for p in params if p.kind is not Parameter.VAR_KEYWORD),
+                *injected,
+                *variadic,
+            ]
+        )
+
+    async def serve(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:  # noqa: ANN401
+        """Answer a call from the cache, computing the entry if needed."""
+        request = kwargs.get(self.request_param)
+        response = kwargs.get(self.response_param)
+        call_kwargs = {
+            name: value
+            for name, value in kwargs.items()
+            if name not in self.injected
+        }
+        if request is None or _uncacheable(request):
+            return await self._call(args, call_kwargs)
+
+        key = self.key_builder(
+            self.func,
+            f"{FastAPICache.get_prefix()}:{self.namespace}",
+            request=request,
+            response=response,
+            args=args,
+            kwargs={
+                name: value
+                for name, value in kwargs.items()
+                if name not in {self.request_param, self.response_param}
+            },
+        )
+        if inspect.isawaitable(key):
+            key = await key
+
+        if request.headers.get("Cache-Control") == "no-cache":
+            return await self._compute(key, args, call_kwargs, response)
+        entry = await self._read(key)
+        if entry is None or not entry.fresh:
+            token = await single_flight.try_lead(key)
+            if token is not None:
+                try:
+                    return await self._compute(key, args, call_kwargs, response)
+                finally:
+                    await single_flight.finish(key, token)
+            if entry is None:
+                await single_flight.wait_for_leader(key)
+                entry = await self._read(key)
+                if entry is None:
+                    return await self._compute(key, args, call_kwargs, response)
+        return self._hit(entry, request, response)
+
+    async def _call(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:  # noqa: ANN401
+        """Run the route, in the thread pool if it is synchronous."""
+        if inspect.iscoroutinefunction(self.func):
+            return await self.func(*args, **kwargs)
+        return await run_in_threadpool(self.func, *args, **kwargs)
+
+    async def _read(self, key: str) -> CacheEntry | None:
+        """Return the stored entry, or None on a miss or backend error."""
+        try:
+            ttl, value = await FastAPICache.get_backend().get_with_ttl(key)
+        except (RedisError, OSError, RuntimeError) as e:
+            category_logger.error(
+                "Failed to read cached response: {}",
+                LogCategory.CACHE,
+                e,
+            )
+            return None
+        return None if value is None else CacheEntry.unpack(value, ttl)
+
+    async def _compute(
+        self,
+        key: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        response: Response | None,
+    ) -> Any:  # noqa: ANN401
+        """Run the route and store its result."""
+        result = await self._call(args, kwargs)
+        entry = CacheEntry(self.coder.encode(result), time.time() + self.expire)
+        try:
+            await FastAPICache.get_backend().set(
+                key, entry.pack(), self.expire + self.stale_ttl
+            )
+        except (RedisError, OSError, RuntimeError) as e:
+            category_logger.error(
+                "Failed to store cached response: {}",
+                LogCategory.CACHE,
+                e,
+            )
+        self._set_headers(response, entry, "MISS")
+        return result
+
+    def _hit(
+        self,
+        entry: CacheEntry,
+        request: Request,
+        response: Response | None,
+    ) -> Any:  # noqa: ANN401
+        """Answer from a stored entry, with a 304 if the client has it."""
+        self._set_headers(response, entry, "HIT" if entry.fresh else "STALE")
+        if response is not None and (
+            request.headers.get("If-None-Match") == entry.etag
+        ):
+            response.status_code = HTTP_304_NOT_MODIFIED
+            return response
+        return self.coder.decode_as_type(entry.payload, type_=self.return_type)
+
+    def _set_headers(
+        self, response: Response | None, entry: CacheEntry, status: str
+    ) -> None:
+        """Set the caching headers on the route's response."""
+        if response is None:
+            return
+        response.headers.update(
+            {
+                "Cache-Control": (
+                    "private, no-cache"
+                    if self.revalidate
+                    else f"max-age={entry.max_age}"
+                ),
+                "ETag": entry.etag,
+                FastAPICache.get_cache_status_header(): status,
+            }
+        )
+
+
+def cache_route(
+    **options: Any,  # noqa: ANN401
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Return a decorator serving a route through ``CachedRoute``."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        route = CachedRoute(func, **options)
+
+        @functools.wraps(func)
+        async def inner(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            return await route.serve(args, kwargs)
+
+        inner.__signature__ = route.signature  # type: ignore[attr-defined]
+        return inner
+
+    return decorator
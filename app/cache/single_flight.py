@@ -0,0 +1,131 @@
+"""Single-flight leases for computing cache entries.
+
+When a popular cache entry expires or is invalidated, every request that
+arrives before it is cached again would otherwise run the route and hit
+the database at once. ``try_lead`` elects one *leader* per cache key: the
+leader computes the entry and calls ``finish``, while the other requests
+``wait_for_leader`` and read the entry it stored.
+
+Within a worker the leader is tracked with an ``asyncio.Event`` per key.
+With the Redis backend the leader also takes a lease, a ``SET NX`` key
+next to the entry that expires after ``CACHE_LEASE_TTL`` seconds, so only
+one worker computes each entry. Waiters give up after the same time and
+compute the entry themselves, so a leader that crashed or hangs delays
+requests by at most one lease. Redis errors never block requests: without
+a lease, the caller simply leads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+import uuid
+
+from redis.exceptions import RedisError
+
+from app.cache.snapshot import redis_backend, redis_client
+from app.config.settings import get_settings
+from app.logs import LogCategory, category_logger
+
+# Seconds between checks of another worker's lease.
+POLL_INTERVAL = 0.05
+# Token of leaders that hold no Redis lease.
+LOCAL_TOKEN = "local"  # noqa: S105
+
+# Delete the lease only if it is still ours, not one taken after it expired.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_inflight: dict[str, asyncio.Event] = {}
+
+
+def _lease_key(key: str) -> str:
+    return f"{key}:lease"
+
+
+async def try_lead(key: str) -> str | None:
+    """Become the leader for a key, returning a token, or return None.
+
+    A leader must call ``finish`` with the token once the entry is stored,
+    or it failed to compute it.
+    """
+    if key in _inflight:
+        return None
+    token = LOCAL_TOKEN
+    backend = redis_backend()
+    if backend is not None:
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_client(backend).set(
+                _lease_key(key),
+                token,
+                nx=True,
+                ex=get_settings().cache_lease_ttl,
+            )
+        except (RedisError, OSError) as e:
+            category_logger.error(
+                "Failed to take cache lease, computing anyway: {}",
+                LogCategory.CACHE,
+                e,
+            )
+            acquired, token = True, LOCAL_TOKEN
+        if not acquired:
+            return None
+    _inflight[key] = asyncio.Event()
+    return token
+
+
+async def finish(key: str, token: str) -> None:
+    """Give up the leadership of a key, waking the waiters."""
+    event = _inflight.pop(key, None)
+    if event is not None:
+        event.set()
+    backend = redis_backend()
+    if backend is None or token == LOCAL_TOKEN:
+        return
+    try:
+        await redis_client(backend).eval(  # type: ignore[no-untyped-call]
+            _RELEASE_SCRIPT, 1, _lease_key(key), token
+        )
+    except (RedisError, OSError) as e:
+        category_logger.error(
+            "Failed to release cache lease, it expires by itself: {}",
+            LogCategory.CACHE,
+            e,
+        )
+
+
+async def wait_for_leader(key: str) -> None:
+    """Wait until the key's leader finishes, or for one lease at most."""
+    timeout = get_settings().cache_lease_ttl
+    event = _inflight.get(key)
+    if event is not None:
+        # asyncio.TimeoutError is only an alias of TimeoutError from 3.11.
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(event.wait(), timeout)
+        return
+    backend = redis_backend()
+    if backend is None:
+        return
+    deadline = time.monotonic() + timeout
+    try:
+        while time.monotonic() < deadline:
+            if not await redis_client(backend).exists(_lease_key(key)):
+                return
+            await asyncio.sleep(POLL_INTERVAL)
+    except (RedisError, OSError) as e:
+        category_logger.error(
+            "Failed to check cache lease: {}",
+            LogCategory.CACHE,
+            e,
+        )
+
+
+def clear_inflight() -> None:
+    """Forget the leaders of this worker."""
+    _inflight.clear()
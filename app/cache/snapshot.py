@@ -0,0 +1,200 @@
+"""Short-lived caches of small per-user values.
+
+The authentication hot path needs a few facts about the caller (their
+household, role and status) on every request. ``UserSnapshotCache`` keeps
+such values, encoded as short strings, in a bounded in-process LRU and, when
+the Redis cache backend is active, in Redis so every worker shares them.
+Callers invalidate entries explicitly when the underlying rows change; the
+TTL bounds any staleness that invalidation cannot reach (e.g. the LRU of
+another worker process).
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Generic, TypeVar, cast
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis.exceptions import RedisError
+
+from app.logs import LogCategory, category_logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+
+    from redis.asyncio import Redis
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """A small TTL-bounded LRU mapping, e.g. of user id to cached value."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Create an empty cache holding at most ``maxsize`` entries."""
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Return the unexpired value for the key, or None."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: float) -> None:
+        """Store the value, evicting the least recently used entries."""
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """Drop the value for the key, if any."""
+        self._data.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[K], bool]) -> None:
+        """Drop the values whose keys match the predicate."""
+        for key in [key for key in self._data if predicate(key)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        """Drop all values."""
+        self._data.clear()
+
+
+def redis_backend() -> RedisBackend | None:
+    """Return the shared Redis cache backend, if one is initialized.
+
+    With the tiered backend this is its Redis tier, so callers bypass the
+    in-process tier (see ``app.cache.tiered``).
+    """
+    backend = getattr(FastAPICache, "_backend", None)
+    backend = getattr(backend, "remote", backend)
+    return backend if isinstance(backend, RedisBackend) else None
+
+
+def redis_client(backend: RedisBackend) -> Redis[bytes]:
+    """Return the backend's Redis client.
+
+    ``RedisBackend`` also accepts a cluster client, but ``app.main`` only
+    ever gives it a plain ``redis.asyncio.Redis``.
+    """
+    return cast("Redis[bytes]", backend.redis)
+
+
+class UserSnapshotCache:
+    """Cache of one string value per user, in-process and in Redis.
+
+    Without Redis the LRU is the only tier and entries live for the full
+    TTL. With Redis, Redis is the source of truth; the LRU is only consulted
+    when ``local_ttl`` is set, and then holds entries for at most that many
+    seconds, since invalidations cannot reach other workers' LRUs.
+    """
+
+    def __init__(
+        self,
+        namespace_format: str,
+        label: str,
+        *,
+        maxsize: int = 4096,
+        local_ttl: int | None = None,
+    ) -> None:
+        """Create a cache.
+
+        Args:
+            namespace_format: A ``CacheNamespaces`` format with a
+                ``{user_id}`` placeholder, used to build the Redis keys.
+            label: What is cached, for log messages.
+            maxsize: The maximum number of entries in the in-process LRU.
+            local_ttl: Seconds to keep Redis-backed entries in the LRU as
+                well, or None to always read them from Redis.
+        """
+        self.namespace_format = namespace_format
+        self.label = label
+        self.local_ttl = local_ttl
+        self._local: LRUCache[int, str] = LRUCache(maxsize=maxsize)
+
+    def _redis_key(self, user_id: int) -> str:
+        namespace = self.namespace_format.format(user_id=user_id)
+        return f"{FastAPICache.get_prefix()}:{namespace}"
+
+    async def get(self, user_id: int) -> str | None:
+        """Return the cached value for the user, or None on a miss."""
+        backend = redis_backend()
+        if backend is None or self.local_ttl:
+            value = self._local.get(user_id)
+            if value is not None or backend is None:
+                return value
+        try:
+            cached = await backend.get(self._redis_key(user_id))
+        except (RedisError, OSError, RuntimeError) as e:
+            category_logger.error(
+                "Failed to read {} cache: {}",
+                LogCategory.CACHE,
+                self.label,
+                e,
+            )
+            return None
+        if not cached:
+            return None
+        value = cached.decode()
+        if self.local_ttl:
+            self._local.set(user_id, value, self.local_ttl)
+        return value
+
+    async def set(self, user_id: int, value: str, ttl: int) -> None:
+        """Cache the value for the user for ``ttl`` seconds."""
+        backend = redis_backend()
+        if backend is None:
+            self._local.set(user_id, value, ttl)
+            return
+        if self.local_ttl:
+            self._local.set(user_id, value, min(ttl, self.local_ttl))
+        try:
+            await backend.set(
+                self._redis_key(user_id), value.encode(), expire=ttl
+            )
+        except (RedisError, OSError, RuntimeError) as e:
+            category_logger.error(
+                "Failed to write {} cache: {}",
+                LogCategory.CACHE,
+                self.label,
+                e,
+            )
+
+    async def invalidate(self, *user_ids: int) -> None:
+        """Drop the cached values of the given users.
+
+        Note:
+            Cache failures are logged but don't raise exceptions. Stale
+            entries then expire after their TTL.
+        """
+        for user_id in user_ids:
+            self._local.pop(user_id)
+        backend = redis_backend()
+        if backend is None or not user_ids:
+            return
+        try:
+            await redis_client(backend).delete(
+                *(self._redis_key(uid) for uid in user_ids)
+            )
+        except (RedisError, OSError, RuntimeError) as e:
+            category_logger.error(
+                "Failed to invalidate {} cache: {}",
+                LogCategory.CACHE,
+                self.label,
+                e,
+            )
+
+    def clear_local(self) -> None:
+        """Empty the in-process tier of this worker."""
+        self._local.clear()
@@ -0,0 +1,208 @@
+"""Two-tier response cache: an in-process LRU in front of Redis.
+
+Every cached response read from Redis costs a network round trip, even for
+the few hot keys that make up most hits. ``TieredBackend`` keeps recently
+read entries in a small per-worker LRU (L1) for ``CACHE_LOCAL_TTL`` seconds
+and only asks Redis (L2) on a local miss. The generation tags from
+``app.cache.generation`` are held in the same LRU, so a local hit needs no
+Redis call at all.
+
+An L1 entry must not outlive an invalidation, so invalidations are
+published on the ``{prefix}:invalidate`` channel and every worker evicts
+the matching local entries when the message arrives. While a worker is not
+subscribed (at startup, or after losing its Redis connection) it cannot
+hear invalidations, so it bypasses the local tier until it subscribes
+again.
+
+The backend wraps a ``RedisBackend`` rather than extending it:
+``redis_backend()`` returns the wrapped ``remote``, so the user snapshot
+caches and generation counters keep talking to Redis directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from typing import TYPE_CHECKING
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.types import Backend
+from redis.exceptions import RedisError
+
+from app.cache.snapshot import LRUCache, redis_client
+from app.logs import LogCategory, category_logger
+from app.metrics import increment_cache_lookup
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fastapi_cache.backends.redis import RedisBackend
+
+# Seconds to wait before resubscribing after the listener lost Redis.
+RESUBSCRIBE_DELAY = 1.0
+
+
+class TieredBackend(Backend):
+    """Serve cache reads from an in-process LRU, falling back to Redis."""
+
+    def __init__(
+        self, remote: RedisBackend, *, local_ttl: float, maxsize: int
+    ) -> None:
+        """Wrap a Redis backend with a local tier of the given size."""
+        self.remote = remote
+        self.local_ttl = local_ttl
+        # Values with the time.monotonic() their Redis copy expires, if any.
+        self._local: LRUCache[str, tuple[bytes, float | None]] = LRUCache(
+            maxsize=maxsize
+        )
+        # Incremented on every eviction, so a value read from Redis before
+        # an invalidation is not stored locally after it.
+        self.epoch = 0
+        self.subscribed = False
+        self._listener: asyncio.Task[None] | None = None
+
+    @classmethod
+    def current(cls) -> TieredBackend | None:
+        """Return the shared cache backend if it is a tiered one."""
+        backend = getattr(FastAPICache, "_backend", None)
+        return backend if isinstance(backend, cls) else None
+
+    @staticmethod
+    def channel() -> str:
+        """Return the pub/sub channel invalidations are published on."""
+        return f"{FastAPICache.get_prefix()}:invalidate"
+
+    # Local tier
+
+    def get_local(self, key: str) -> bytes | None:
+        """Return the local value for a key, if the local tier is usable."""
+        if not self.subscribed:
+            return None
+        entry = self._local.get(key)
+        return entry[0] if entry else None
+
+    def set_local(
+        self, key: str, value: bytes, *, epoch: int, ttl: int = -1
+    ) -> None:
+        """Store a value read from Redis at ``epoch`` in the local tier.
+
+        The value is dropped if anything was evicted since ``epoch`` (it may
+        predate that invalidation) or the local tier is unusable. ``ttl`` is
+        the Redis TTL, which caps the local one; -1 means no expiry.
+        """
+        if not self.subscribed or epoch != self.epoch:
+            return
+        local_ttl = min(self.local_ttl, ttl) if ttl > 0 else self.local_ttl
+        expires_at = time.monotonic() + ttl if ttl > 0 else None
+        self._local.set(key, (value, expires_at), local_ttl)
+
+    def evict(self, prefix: str) -> None:
+        """Drop local entries for a key and every key nested under it."""
+        self.epoch += 1
+        nested = f"{prefix}:"
+        self._local.pop_where(
+            lambda key: key == prefix or key.startswith(nested)
+        )
+
+    def clear_local(self) -> None:
+        """Drop every local entry."""
+        self.epoch += 1
+        self._local.clear()
+
+    async def publish_eviction(self, prefix: str) -> None:
+        """Evict a prefix here and on every other worker.
+
+        Raises:
+            RedisError: If the message cannot be published.
+        """
+        self.evict(prefix)
+        await redis_client(self.remote).publish(self.channel(), prefix)
+
+    # Backend interface
+
+    async def get_with_ttl(self, key: str) -> tuple[int, bytes | None]:
+        """Return the remaining TTL and value, trying the local tier first."""
+        entry = self._local.get(key) if self.subscribed else None
+        increment_cache_lookup("local", hit=entry is not None)
+        if entry is not None:
+            local_value, expires_at = entry
+            if expires_at is None:
+                return -1, local_value
+            remaining = max(int(expires_at - time.monotonic()), 0)
+            return remaining, local_value
+
+        epoch = self.epoch
+        ttl, value = await self.remote.get_with_ttl(key)
+        increment_cache_lookup("redis", hit=value is not None)
+        if value is not None:
+            self.set_local(key, value, epoch=epoch, ttl=ttl)
+        return ttl, value
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the value, trying the local tier first."""
+        _, value = await self.get_with_ttl(key)
+        return value
+
+    async def set(
+        self, key: str, value: bytes, expire: int | None = None
+    ) -> None:
+        """Store the value in Redis and the local tier."""
+        epoch = self.epoch
+        await self.remote.set(key, value, expire)
+        self.set_local(key, value, epoch=epoch, ttl=expire or -1)
+
+    async def clear(
+        self, namespace: str | None = None, key: str | None = None
+    ) -> int:
+        """Clear a namespace or key in Redis and on every worker."""
+        cleared = await self.remote.clear(namespace, key)
+        prefix = namespace or key
+        if prefix:
+            await self.publish_eviction(prefix)
+        return cleared
+
+    # Invalidation listener
+
+    async def start(self) -> None:
+        """Start listening for invalidations from other workers."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop listening and stop using the local tier."""
+        self.subscribed = False
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        self.clear_local()
+
+    async def _listen(self) -> None:
+        """Evict local entries named by invalidation messages, forever."""
+        while True:
+            pubsub = redis_client(self.remote).pubsub()
+            try:
+                await pubsub.subscribe(self.channel())
+                # Entries stored before the subscription may have missed an
+                # invalidation, so start from an empty tier.
+                self.clear_local()
+                self.subscribed = True
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        data = message["data"]
+                        self.evict(
+                            data.decode() if isinstance(data, bytes) else data
+                        )
+            except (RedisError, OSError) as e:
+                category_logger.error(
+                    "Cache invalidation listener lost Redis, bypassing the "
+                    "local cache tier until it reconnects: {}",
+                    LogCategory.CACHE,
+                    e,
+                )
+            finally:
+                self.subscribed = False
+                with contextlib.suppress(RedisError, OSError):
+                    await pubsub.reset()
+            self.clear_local()
+            await asyncio.sleep(RESUBSCRIBE_DELAY)
@@ -0,0 +1,936 @@
+"""CLI commands to benchmark hot paths against a development database."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+import uuid
+from asyncio import run as aiorun
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+import httpx
+import typer
+from fastapi import FastAPI
+from fastapi_cache.coder import PickleCoder
+from fastapi_mail import ConnectionConfig
+from loguru import logger
+from pydantic import NameEmail, SecretStr
+from rich import print as rprint
+from rich.table import Table
+from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIASGIMiddleware, SlowAPIMiddleware
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.cache.coders import model_coder
+from app.config.log_config import (
+    TEXT_FORMAT,
+    LogCategory,
+    close_log_writer,
+    format_json,
+    get_log_config,
+    log_config,
+)
+from app.config.log_context import (
+    annotate_request,
+    bind_request,
+    reset_request,
+)
+from app.config.log_writer import add_batched_file_sink, is_not_batch
+from app.config.settings import get_settings
+from app.database.db import async_session
+from app.mail import outbox, templates
+from app.managers.email import get_mail_config
+from app.managers.security import get_current_household
+from app.middleware.observability import ObservabilityMiddleware
+from app.models.enums import RoleType
+from app.models.task import Task, TaskStatus, task_dependencies, task_rooms
+from app.models.user import User
+from app.rate_limit import limiter
+from app.rate_limit.handlers import rate_limit_handler
+from app.resources.routes import api_router
+from app.schemas.email import EmailTemplateSchema
+from app.schemas.response.room import RoomResponse
+from app.schemas.response.task import PaginatedTasksResponse, TaskResponse
+from app.schemas.response.user import MyUserResponse
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Awaitable, Callable
+
+    from fastapi_cache.coder import Coder
+    from sqlalchemy import Table as SQLTable
+    from starlette.requests import Request
+    from starlette.responses import Response
+    from starlette.types import Scope
+
+app = typer.Typer(no_args_is_help=True, rich_markup_mode="rich")
+
+# The indexes added for the task query paths, as declared on the models.
+TASK_INDEXES = sorted(
+    index.name
+    for table in (
+        cast("SQLTable", Task.__table__),
+        task_dependencies,
+        task_rooms,
+    )
+    for index in table.indexes
+    if index.name
+)
+
+# Query shapes issued by the task and room routes, keyed by a short label.
+TASK_QUERIES = {
+    "dashboard counts": (
+        "SELECT status, count(*) FROM tasks "
+        "WHERE household_id = :household_id GROUP BY status"
+    ),
+    "filter by status": (
+        "SELECT * FROM tasks WHERE household_id = :household_id "
+        "AND status = 'blocked' ORDER BY created_at, id LIMIT 21"
+    ),
+    "filter by assignee": (
+        "SELECT * FROM tasks WHERE household_id = :household_id "
+        "AND assigned_user_id = 3 ORDER BY created_at, id LIMIT 21"
+    ),
+    "sort by priority": (
+        "SELECT * FROM tasks WHERE household_id = :household_id "
+        "ORDER BY priority DESC, id DESC LIMIT 21"
+    ),
+    "sort by created_at": (
+        "SELECT * FROM tasks WHERE household_id = :household_id "
+        "ORDER BY created_at, id LIMIT 21"
+    ),
+    "suggestions": (
+        "SELECT * FROM tasks WHERE household_id = :household_id "
+        "AND status <> 'done' ORDER BY priority DESC, created_at LIMIT 3"
+    ),
+    "dependents": (
+        "SELECT task_id FROM task_dependencies "
+        "WHERE depends_on_task_id = :task_id"
+    ),
+}
+
+SEED_HOUSEHOLDS = """
+    INSERT INTO households (id, name, owner_id)
+    SELECT gen_random_uuid(), 'benchmark ' || g, 0
+    FROM generate_series(1, :households) AS g
+    RETURNING id
+"""
+
+# Tasks are dealt round-robin to the households. Within a household, five
+# in eight tasks are done, one in ten has an assignee, and every task
+# depends on the previous task of its household.
+SEED_TASKS = """
+    INSERT INTO tasks (
+        id, household_id, title, priority, difficulty, status,
+        assigned_user_id, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        (CAST(:household_ids AS uuid[]))[1 + g % :households],
+        'benchmark task ' || g,
+        1 + n % 5,
+        1 + n % 3,
+        CAST((ARRAY[
+            'done', 'done', 'done', 'done', 'done',
+            'not_started', 'in_progress', 'blocked'
+        ])[1 + n % 8] AS taskstatus),
+        CASE WHEN n % 10 = 0 THEN n % 7 END,
+        now() - g * interval '1 second',
+        now()
+    FROM generate_series(0, :tasks - 1) AS g,
+        LATERAL (SELECT g / :households AS n) AS seq
+"""
+
+SEED_DEPENDENCIES = """
+    INSERT INTO task_dependencies (task_id, depends_on_task_id)
+    SELECT id, previous_id FROM (
+        SELECT id, lag(id) OVER (
+            PARTITION BY household_id ORDER BY created_at
+        ) AS previous_id
+        FROM tasks
+        WHERE household_id = ANY(CAST(:household_ids AS uuid[]))
+    ) AS chain
+    WHERE previous_id IS NOT NULL
+"""
+
+
+# Routes timed by ``bench middleware``: one without and one with a database
+# round trip.
+MIDDLEWARE_PATHS = ("/heartbeat", "/tasks")
+
+
+class _RequestLoggingLayer(BaseHTTPMiddleware):
+    """Request logging as a ``BaseHTTPMiddleware`` layer, for comparison."""
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        """Log the request like ``ObservabilityMiddleware`` does."""
+        if not log_config.is_enabled(LogCategory.REQUESTS):
+            return await call_next(request)
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        ObservabilityMiddleware._log_request(  # noqa: SLF001
+            request.scope,
+            response.status_code,
+            time.perf_counter() - start_time,
+        )
+        return response
+
+
+class _CacheLoggingLayer(BaseHTTPMiddleware):
+    """Cache logging as a ``BaseHTTPMiddleware`` layer, for comparison."""
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        """Log cache activity like ``ObservabilityMiddleware`` does."""
+        if not log_config.is_enabled(LogCategory.CACHE):
+            return await call_next(request)
+        ObservabilityMiddleware._log_cache_control(request.scope)  # noqa: SLF001
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        cache_status = response.headers.get("X-FastAPI-Cache")
+        if cache_status:
+            ObservabilityMiddleware._log_cache_status(  # noqa: SLF001
+                request.scope, cache_status, time.perf_counter() - start_time
+            )
+        return response
+
+
+def build_middleware_app(*, pure_asgi: bool) -> FastAPI:
+    """Build an app with the API routes and one of the middleware stacks.
+
+    ``pure_asgi`` selects the current stack (``ObservabilityMiddleware`` and
+    ``SlowAPIASGIMiddleware``); otherwise the same logging runs in two
+    ``BaseHTTPMiddleware`` layers under ``SlowAPIMiddleware``, as it used
+    to. Authentication is replaced by a scratch household with no tasks.
+    """
+    app = FastAPI()
+    app.include_router(api_router)
+    app.state.limiter = limiter
+    app.add_exception_handler(
+        RateLimitExceeded, cast("Any", rate_limit_handler)
+    )
+    if pure_asgi:
+        app.add_middleware(ObservabilityMiddleware)
+        app.add_middleware(SlowAPIASGIMiddleware)
+    else:
+        app.add_middleware(_RequestLoggingLayer)
+        app.add_middleware(_CacheLoggingLayer)
+        app.add_middleware(SlowAPIMiddleware)
+    household_id = uuid.uuid4()
+    app.dependency_overrides[get_current_household] = lambda: household_id
+    return app
+
+
+def latency_summary(
+    latencies: list[float], elapsed: float
+) -> tuple[float, float, float]:
+    """Return p50 and p99 latency in ms and throughput in requests/s."""
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return (
+        percentiles[49] * 1000,
+        percentiles[98] * 1000,
+        len(latencies) / elapsed,
+    )
+
+
+async def _time_requests(
+    app: FastAPI, path: str, requests: int, concurrency: int
+) -> tuple[float, float, float]:
+    """Send ``requests`` GETs from ``concurrency`` clients and time them."""
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        response = await client.get(path)
+        if response.status_code != httpx.codes.OK:
+            rprint(
+                f"\n[red]-> ERROR: GET {path} returned "
+                f"{response.status_code}: {response.text}\n"
+            )
+            raise typer.Exit(1)
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                start_time = time.perf_counter()
+                await client.get(path)
+                latencies.append(time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        await asyncio.gather(
+            *(worker(requests // concurrency) for _ in range(concurrency))
+        )
+        elapsed = time.perf_counter() - start_time
+    return latency_summary(latencies, elapsed)
+
+
+async def _bench_middleware(requests: int, concurrency: int) -> None:
+    """Time the API routes under the old and the new middleware stack."""
+    stacks = {
+        "BaseHTTPMiddleware": build_middleware_app(pure_asgi=False),
+        "pure ASGI": build_middleware_app(pure_asgi=True),
+    }
+    root = get_settings().api_root
+    table = Table(
+        title=f"Middleware overhead ({requests} requests, "
+        f"{concurrency} concurrent)"
+    )
+    for column in ("Path", "Stack", "p50 ms", "p99 ms", "req/s"):
+        table.add_column(
+            column, justify="left" if column in {"Path", "Stack"} else "right"
+        )
+    for path in MIDDLEWARE_PATHS:
+        for name, app in stacks.items():
+            p50, p99, throughput = await _time_requests(
+                app, f"{root}{path}", requests, concurrency
+            )
+            table.add_row(
+                path, name, f"{p50:.3f}", f"{p99:.3f}", f"{throughput:.0f}"
+            )
+    rprint(table)
+
+
+# An authenticated GET of a cached route, as ObservabilityMiddleware sees it.
+LOGGED_REQUEST: Scope = {
+    "type": "http",
+    "method": "GET",
+    "path": "/api/users/me",
+    "query_string": b"",
+    "headers": [(b"cache-control", b"max-age=0")],
+    "client": ("127.0.0.1", 50000),
+}
+
+
+def log_request_eagerly(scope: Scope, duration: float) -> None:
+    """Log a request as ``ObservabilityMiddleware`` used to.
+
+    Each message was built with an f-string before loguru checked its
+    level, so the cache messages were built even at LOG_LEVEL=INFO.
+    """
+    method, path = scope["method"], scope["path"]
+    if log_config.is_enabled(LogCategory.CACHE):
+        for name, value in scope["headers"]:
+            if name == b"cache-control":
+                logger.debug(
+                    f"Request has Cache-Control: {value.decode('latin-1')}"
+                )
+        logger.debug(f"CACHE HIT: {method} {path} ({duration * 1000:.2f}ms)")
+    if log_config.is_enabled(LogCategory.REQUESTS):
+        logger.info(
+            f'{scope["client"][0]} - "{method} {path}" 200 ({duration:.3f}s)'
+        )
+
+
+def log_request_lazily(scope: Scope, duration: float) -> None:
+    """Log a request as ``ObservabilityMiddleware`` does now."""
+    if log_config.is_enabled(LogCategory.CACHE):
+        ObservabilityMiddleware._log_cache_control(scope)  # noqa: SLF001
+        ObservabilityMiddleware._log_cache_status(  # noqa: SLF001
+            scope, "HIT", duration
+        )
+    if log_config.is_enabled(LogCategory.REQUESTS):
+        ObservabilityMiddleware._log_request(scope, 200, duration)  # noqa: SLF001
+
+
+def log_request_structured(scope: Scope, duration: float) -> None:
+    """Log a request as ``ObservabilityMiddleware`` does for JSON logs.
+
+    The request's log context is bound, and its user recorded, first.
+    """
+    context_token = bind_request(scope)
+    try:
+        annotate_request(user_id=1)
+        log_request_lazily(scope, duration)
+    finally:
+        reset_request(context_token)
+
+
+def add_log_file(sink: str, path: Path) -> Callable[[], None]:
+    """Log to ``path`` through a sink; return a function to remove it.
+
+    ``sink`` is ``inline`` (the request writes the file), ``enqueue``
+    (loguru's multiprocessing queue), ``batched`` (the batched writer) or
+    ``json`` (the batched writer, formatting records as JSON). Removing the
+    sink waits for its queued messages to be written.
+    """
+    config = get_log_config()
+    if sink in {"batched", "json"}:
+        writer = add_batched_file_sink(
+            str(path),
+            level=config.log_level,
+            log_format=format_json if sink == "json" else TEXT_FORMAT,
+            max_size=config.queue_size,
+            batch_size=config.batch_size,
+            policy=config.queue_policy,
+        )
+
+        def remove() -> None:
+            writer.close()
+            for handler_id in writer.handler_ids:
+                logger.remove(handler_id)
+
+        return remove
+    handler_id = logger.add(
+        str(path),
+        format=TEXT_FORMAT,
+        level=config.log_level,
+        enqueue=sink == "enqueue",
+        filter=is_not_batch,
+    )
+    return lambda: logger.remove(handler_id)
+
+
+def time_request_logging(
+    sink: str,
+    log_request: Callable[[Scope, float], None],
+    requests: int,
+    path: Path,
+) -> tuple[float, float, int]:
+    """Log ``requests`` requests to a file at ``path`` through a sink.
+
+    Returns the µs each request spent logging, the ms taken to write what
+    was still queued afterwards, and the number of lines in the file.
+    """
+    remove = add_log_file(sink, path)
+    start_time = time.perf_counter()
+    for _ in range(requests):
+        log_request(LOGGED_REQUEST, 0.0042)
+    logging_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    remove()
+    drain_time = time.perf_counter() - start_time
+    with path.open() as log_file:
+        lines = sum(1 for _ in log_file)
+    return logging_time / requests * 1_000_000, drain_time * 1000, lines
+
+
+def _bench_logging(requests: int) -> None:
+    """Time request logging through the old and the new log sinks."""
+    config = get_log_config()
+    # Replace the app's own log handlers with the ones being compared.
+    logger.remove()
+    close_log_writer()
+    table = Table(
+        title=f"Logging per authenticated request ({requests} requests, "
+        f"LOG_LEVEL={config.log_level})"
+    )
+    for column in ("Sink", "Formatting", "µs/request", "drain ms", "lines"):
+        table.add_column(
+            column,
+            justify="left" if column in {"Sink", "Formatting"} else "right",
+        )
+    with tempfile.TemporaryDirectory() as directory:
+        for sink, formatting, log_request in (
+            ("inline", "eager", log_request_eagerly),
+            ("enqueue", "eager", log_request_eagerly),
+            ("batched", "lazy", log_request_lazily),
+            ("json", "lazy, with context", log_request_structured),
+        ):
+            per_request, drain_ms, lines = time_request_logging(
+                sink, log_request, requests, Path(directory) / f"{sink}.log"
+            )
+            table.add_row(
+                sink,
+                formatting,
+                f"{per_request:.1f}",
+                f"{drain_ms:.1f}",
+                str(lines),
+            )
+    rprint(table)
+
+
+def coder_payloads(items: int) -> dict[str, tuple[Any, Any]]:
+    """Return cached route results and their response models, by route.
+
+    ``/users/me`` returns a ``User`` ORM object; ``/tasks`` returns a page
+    of ``items`` tasks, each in two rooms.
+    """
+    user = User(
+        id=1,
+        email="bench@example.com",
+        password="$2b$12$" + "x" * 53,
+        first_name="Bench",
+        last_name="Mark",
+        role=RoleType.user,
+        banned=False,
+        verified=True,
+    )
+    rooms = [
+        RoomResponse(id=uuid.uuid4(), name=name, color="#a0c4ff", floor="1")
+        for name in ("Kitchen", "Living room")
+    ]
+    page = PaginatedTasksResponse(
+        items=[
+            TaskResponse(
+                id=uuid.uuid4(),
+                title=f"Benchmark task {i}",
+                description="Unpack the boxes and put everything away.",
+                priority=1 + i % 5,
+                difficulty=1 + i % 3,
+                status=TaskStatus.not_started,
+                rooms=rooms,
+            )
+            for i in range(items)
+        ],
+        page=1,
+        page_size=items,
+        total=items,
+    )
+    return {
+        "/users/me": (user, MyUserResponse),
+        "/tasks": (page, PaginatedTasksResponse),
+    }
+
+
+def time_coder(
+    coder: type[Coder],
+    value: Any,  # noqa: ANN401
+    iterations: int,
+) -> tuple[float, float, int]:
+    """Return the µs to encode and decode a value, and its encoded size."""
+    encoded = coder.encode(value)
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        coder.encode(value)
+    encode_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        coder.decode_as_type(encoded, type_=None)
+    decode_time = time.perf_counter() - start_time
+    return (
+        encode_time / iterations * 1_000_000,
+        decode_time / iterations * 1_000_000,
+        len(encoded),
+    )
+
+
+def email_batch(
+    emails: int, *, static: bool = False
+) -> list[EmailTemplateSchema]:
+    """Return ``emails`` welcome emails, as registration queues them.
+
+    With ``static``, each also carries the settings-derived template values
+    that callers used to pass with every email.
+    """
+    return [
+        EmailTemplateSchema(
+            recipients=[NameEmail(f"Bench {i}", f"bench{i}@example.com")],
+            subject="Welcome!",
+            body={
+                "name": f"Bench {i}",
+                "user": f"bench{i}@example.com",
+                "verification": f"{uuid.uuid4().hex}.{'x' * 120}",
+                **(templates.static_context() if static else {}),
+            },
+            template_name="welcome.html",
+        )
+        for i in range(emails)
+    ]
+
+
+def legacy_mail_config() -> ConnectionConfig:
+    """Build the mail configuration as each ``EmailManager`` used to."""
+    settings = get_settings()
+    return ConnectionConfig(
+        MAIL_USERNAME=settings.mail_username,
+        MAIL_PASSWORD=SecretStr(settings.mail_password),
+        MAIL_FROM=settings.mail_from,
+        MAIL_PORT=settings.mail_port,
+        MAIL_SERVER=settings.mail_server,
+        MAIL_FROM_NAME=settings.mail_from_name,
+        MAIL_STARTTLS=settings.mail_starttls,
+        MAIL_SSL_TLS=settings.mail_ssl_tls,
+        USE_CREDENTIALS=settings.mail_use_credentials,
+        VALIDATE_CERTS=settings.mail_validate_certs,
+        TEMPLATE_FOLDER=templates.TEMPLATE_FOLDER,
+    )
+
+
+def time_email_stages(
+    legacy: list[EmailTemplateSchema], current: list[EmailTemplateSchema]
+) -> dict[str, tuple[float, float]]:
+    """Return the µs per email to configure and render, before and after.
+
+    Before, every ``EmailManager`` built its own configuration and
+    ``FastMail`` rendered every email in a new Jinja environment. Now the
+    configuration is shared and the templates are compiled once.
+    """
+    start_time = time.perf_counter()
+    for _ in legacy:
+        legacy_mail_config()
+    config_before = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for _ in current:
+        get_mail_config()
+    config_after = time.perf_counter() - start_time
+
+    conf = legacy_mail_config()
+    start_time = time.perf_counter()
+    for email in legacy:
+        conf.template_engine().get_template(email.template_name).render(
+            email.body
+        )
+    render_before = time.perf_counter() - start_time
+    templates.load_templates()
+    start_time = time.perf_counter()
+    for email in current:
+        templates.render(email.template_name, email.body)
+    render_after = time.perf_counter() - start_time
+
+    return {
+        stage: (
+            before / len(legacy) * 1_000_000,
+            after / len(current) * 1_000_000,
+        )
+        for stage, before, after in (
+            ("Mail config", config_before, config_after),
+            ("Render", render_before, render_after),
+        )
+    }
+
+
+async def time_enqueue(emails: list[EmailTemplateSchema]) -> float:
+    """Return the µs per email to add ``emails`` to the outbox.
+
+    The emails are flushed to the database and then rolled back, so none
+    is sent.
+    """
+    async with async_session() as session:
+        start_time = time.perf_counter()
+        for email in emails:
+            outbox.enqueue(session, email)
+        await session.flush()
+        elapsed = time.perf_counter() - start_time
+        await session.rollback()
+    return elapsed / len(emails) * 1_000_000
+
+
+async def _bench_emails(emails: int) -> None:
+    """Time configuring, rendering and queueing emails, before and after."""
+    legacy = email_batch(emails, static=True)
+    current = email_batch(emails)
+    stages = time_email_stages(legacy, current)
+    # Connect to the database first, so neither side pays for it.
+    await time_enqueue(current[:1])
+    stages["Enqueue"] = (
+        await time_enqueue(legacy),
+        await time_enqueue(current),
+    )
+    stages["Total"] = (
+        sum(before for before, _ in stages.values()),
+        sum(after for _, after in stages.values()),
+    )
+    table = Table(title=f"Render and enqueue ({emails} emails)")
+    for column in ("Stage", "before µs/email", "after µs/email", "speedup"):
+        table.add_column(
+            column, justify="left" if column == "Stage" else "right"
+        )
+    for stage, (before, after) in stages.items():
+        table.add_row(
+            stage, f"{before:.1f}", f"{after:.1f}", f"{before / after:.1f}x"
+        )
+    rprint(table)
+
+
+def plan_summary(plan: dict[str, Any]) -> str:
+    """Describe the scans in an ``EXPLAIN (FORMAT JSON)`` plan tree."""
+    scans = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop(0)
+        if "Relation Name" in node or "Index Name" in node:
+            scan = node["Node Type"]
+            if "Index Name" in node:
+                scan += f" using {node['Index Name']}"
+            scans.append(scan)
+        nodes.extend(node.get("Plans", []))
+    return ", ".join(scans) or plan["Node Type"]
+
+
+async def _explain(
+    session: Any,  # noqa: ANN401
+    params: dict[str, Any],
+) -> dict[str, tuple[str, float]]:
+    """Run every query under EXPLAIN ANALYZE and summarise the plans."""
+    results = {}
+    for label, sql in TASK_QUERIES.items():
+        rows = await session.execute(
+            text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params
+        )
+        output = rows.scalar_one()
+        if isinstance(output, str):
+            output = json.loads(output)
+        results[label] = (
+            plan_summary(output[0]["Plan"]),
+            output[0]["Execution Time"],
+        )
+    return results
+
+
+async def _bench_indexes(tasks: int, households: int) -> None:
+    """Seed data, compare plans with and without indexes, then roll back."""
+    async with async_session() as session:
+        existing = set(
+            (
+                await session.execute(
+                    text(
+                        "SELECT indexname FROM pg_indexes "
+                        "WHERE indexname = ANY(:names)"
+                    ),
+                    {"names": TASK_INDEXES},
+                )
+            ).scalars()
+        )
+        if existing != set(TASK_INDEXES):
+            rprint(
+                "\n[red]-> ERROR: The task indexes are missing.\n"
+                "[yellow]Please run [bold]'api-admin db upgrade'[/bold] "
+                "first.\n"
+            )
+            raise typer.Exit(1)
+
+        rprint(f"\nSeeding {tasks} tasks in {households} households ... ")
+        household_ids: list[uuid.UUID] = list(
+            (
+                await session.execute(
+                    text(SEED_HOUSEHOLDS), {"households": households}
+                )
+            ).scalars()
+        )
+        seed_params = {
+            "household_ids": household_ids,
+            "households": households,
+            "tasks": tasks,
+        }
+        await session.execute(text(SEED_TASKS), seed_params)
+        await session.execute(text(SEED_DEPENDENCIES), seed_params)
+        await session.execute(text("ANALYZE tasks, task_dependencies"))
+        task_id = (
+            await session.execute(
+                text(
+                    "SELECT id FROM tasks WHERE household_id = :household_id "
+                    "ORDER BY created_at LIMIT 1"
+                ),
+                {"household_id": household_ids[0]},
+            )
+        ).scalar_one()
+        params = {"household_id": household_ids[0], "task_id": task_id}
+
+        rprint("Explaining queries with the task indexes ... ")
+        indexed = await _explain(session, params)
+
+        rprint("Explaining queries without the task indexes ... ")
+        for name in TASK_INDEXES:
+            await session.execute(text(f'DROP INDEX "{name}"'))
+        await session.execute(
+            text("CREATE INDEX ix_tasks_household_id ON tasks (household_id)")
+        )
+        unindexed = await _explain(session, params)
+
+        # Nothing above is kept: the seed data and the dropped indexes are
+        # all part of this transaction.
+        await session.rollback()
+
+    table = Table(title=f"Task query plans ({tasks} tasks)")
+    table.add_column("Query")
+    table.add_column("Without indexes")
+    table.add_column("ms", justify="right")
+    table.add_column("With indexes")
+    table.add_column("ms", justify="right")
+    for label in TASK_QUERIES:
+        before_plan, before_ms = unindexed[label]
+        after_plan, after_ms = indexed[label]
+        table.add_row(
+            label,
+            before_plan,
+            f"{before_ms:.2f}",
+            after_plan,
+            f"{after_ms:.2f}",
+        )
+    rprint(table)
+    rprint(
+        "[yellow]The seeded rows were rolled back; run VACUUM on the task "
+        "tables to reclaim their space."
+    )
+
+
+@app.command()
+def indexes(
+    tasks: int = typer.Option(
+        1_000_000,
+        "--tasks",
+        "-t",
+        help="Number of tasks to seed.",
+    ),
+    households: int = typer.Option(
+        100,
+        "--households",
+        help="Number of households to spread the tasks over.",
+    ),
+) -> None:
+    """Compare task query plans with and without the task indexes.
+
+    Seeds tasks into scratch households, runs the hot task queries under
+    EXPLAIN ANALYZE, drops the task indexes and repeats, then rolls
+    everything back. The task tables stay locked while this runs, so only
+    use it against a development database.
+    """
+    if tasks < 1 or households < 1:
+        rprint("[red]Error: --tasks and --households must be positive")
+        raise typer.Exit(1)
+    try:
+        aiorun(_bench_indexes(tasks, households))
+    except SQLAlchemyError as exc:
+        rprint(f"\n[red]-> Database error: [bold]{exc}\n")
+        raise typer.Exit(1) from exc
+
+
+@app.command()
+def middleware(
+    requests: int = typer.Option(
+        2000,
+        "--requests",
+        "-r",
+        help="Number of timed requests per path and middleware stack.",
+    ),
+    concurrency: int = typer.Option(
+        10,
+        "--concurrency",
+        "-c",
+        help="Number of concurrent clients.",
+    ),
+) -> None:
+    """Compare request latency under the old and new middleware stacks.
+
+    Sends GET requests to /heartbeat and /tasks in-process through the
+    BaseHTTPMiddleware stack the app used to run and through the current
+    pure ASGI stack, and reports p50/p99 latency and throughput for each.
+    /tasks reads from the configured database, so the database must be
+    reachable. Enable the REQUESTS and CACHE log categories to include the
+    cost of logging.
+    """
+    if requests < 1 or concurrency < 1 or requests < concurrency:
+        rprint(
+            "[red]Error: --requests must be at least --concurrency, "
+            "and both positive"
+        )
+        raise typer.Exit(1)
+    try:
+        aiorun(_bench_middleware(requests, concurrency))
+    except SQLAlchemyError as exc:
+        rprint(f"\n[red]-> Database error: [bold]{exc}\n")
+        raise typer.Exit(1) from exc
+
+
+@app.command()
+def coders(
+    iterations: int = typer.Option(
+        10_000,
+        "--iterations",
+        "-n",
+        help="Number of encodes and decodes to time per payload and coder.",
+    ),
+    items: int = typer.Option(
+        20,
+        "--items",
+        help="Number of tasks in the /tasks page payload.",
+    ),
+) -> None:
+    """Compare the response model coder with PickleCoder.
+
+    Encodes and decodes the results of the cached /users/me and /tasks
+    routes with PickleCoder, which the cache used to store them with, and
+    with the JSON coder for their response model. Reports the time per
+    encode and decode and the stored entry size. Entries of at least
+    CACHE_COMPRESS_MIN_SIZE bytes are compressed by the model coder.
+    """
+    if iterations < 1 or items < 1:
+        rprint("[red]Error: --iterations and --items must be positive")
+        raise typer.Exit(1)
+    table = Table(title=f"Cache coders ({iterations} iterations)")
+    for column in ("Route", "Coder", "encode µs", "decode µs", "bytes"):
+        table.add_column(
+            column, justify="left" if column in {"Route", "Coder"} else "right"
+        )
+    for route, (value, response_model) in coder_payloads(items).items():
+        for name, coder in (
+            ("PickleCoder", PickleCoder),
+            ("ModelCoder", model_coder(response_model)),
+        ):
+            encode_us, decode_us, size = time_coder(coder, value, iterations)
+            table.add_row(
+                route,
+                name,
+                f"{encode_us:.1f}",
+                f"{decode_us:.1f}",
+                str(size),
+            )
+    rprint(table)
+
+
+@app.command()
+def emails(
+    emails: int = typer.Option(
+        10_000,
+        "--emails",
+        "-n",
+        help="Number of welcome emails to render and queue.",
+    ),
+) -> None:
+    """Compare the cost of rendering and queueing an email.
+
+    Renders ``emails`` welcome emails and adds them to the outbox, first as
+    the app used to (a mail configuration built per ``EmailManager`` and a
+    new Jinja environment per email) and then with the shared configuration
+    and the precompiled templates, and reports the µs per email of each
+    stage. The emails are flushed to the configured database, which must be
+    reachable, and then rolled back, so none is sent.
+    """
+    if emails < 1:
+        rprint("[red]Error: --emails must be positive")
+        raise typer.Exit(1)
+    try:
+        aiorun(_bench_emails(emails))
+    except SQLAlchemyError as exc:
+        rprint(f"\n[red]-> Database error: [bold]{exc}\n")
+        raise typer.Exit(1) from exc
+
+
+@app.command()
+def logging(
+    requests: int = typer.Option(
+        10_000,
+        "--requests",
+        "-r",
+        help="Number of requests to log per sink.",
+    ),
+) -> None:
+    """Compare the logging overhead of an authenticated request.
+
+    Logs what ObservabilityMiddleware logs for an authenticated, cached GET
+    /users/me, ``requests`` times, to a temporary file through each sink:
+    written by the request itself (the old sink under uvicorn --reload),
+    through loguru's enqueue (the old default), through the batched
+    writer with lazy formatting, and through the batched writer as JSON
+    lines with the request's context (LOG_FORMAT=json). Reports the µs each
+    request spends on logging, the time to write what was still queued
+    afterwards, and the lines written. Uses the configured LOG_LEVEL and
+    LOG_CATEGORIES; enable the REQUESTS and CACHE categories for a
+    meaningful comparison.
+    """
+    if requests < 1:
+        rprint("[red]Error: --requests must be positive")
+        raise typer.Exit(1)
+    _bench_logging(requests)
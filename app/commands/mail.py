@@ -0,0 +1,67 @@
+"""CLI commands to run the mail worker and manage the email outbox."""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+from asyncio import run as aiorun
+
+import typer
+from prometheus_client import start_http_server
+from rich import print as rprint
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config.log_config import get_log_config
+from app.config.settings import get_settings
+from app.database.db import async_session
+from app.mail import outbox
+from app.mail.worker import run_worker
+
+app = typer.Typer(no_args_is_help=True, rich_markup_mode="rich")
+
+
+@app.command()
+def worker(
+    metrics_port: int = typer.Option(
+        9100,
+        "--metrics-port",
+        help="Port to serve Prometheus metrics on, if METRICS_ENABLED.",
+    ),
+) -> None:
+    """Send the emails queued in the outbox until stopped.
+
+    Run one or more workers alongside the API; without one, queued emails
+    are never sent. Stop a worker with Ctrl-C or SIGTERM: it finishes the
+    emails it is sending first.
+    """
+
+    async def _run() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await run_worker(stop)
+
+    get_log_config()
+    if get_settings().metrics_enabled:
+        start_http_server(metrics_port)
+        rprint(f"Serving metrics on port {metrics_port}")
+    rprint("[green]Mail worker started, press Ctrl-C to stop.")
+    aiorun(_run())
+    rprint("[cyan]Mail worker stopped.")
+
+
+@app.command()
+def requeue() -> None:
+    """Retry the dead-lettered emails in the outbox."""
+
+    async def _requeue() -> int:
+        async with async_session() as session, session.begin():
+            return await outbox.requeue_dead(session)
+
+    try:
+        count = aiorun(_requeue())
+    except SQLAlchemyError as exc:
+        rprint(f"\n[red]-> ERROR requeuing emails:\n[b]{exc}")
+        raise typer.Exit(1) from exc
+    rprint(f"[green]Requeued {count} dead-lettered email(s).")
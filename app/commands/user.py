@@ -12,7 +12,7 @@ from rich.console import Console
 from rich.table import Table
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.database.db import async_session
+from app.database.db import async_session, run_after_commit
 from app.database.helpers import is_database_initialized
 from app.managers.user import UserManager
 from app.models.enums import RoleType
@@ -363,6 +363,7 @@ def delete(
                 await check_db_initialized(session)
                 await UserManager.delete_user(user_id, session)
                 await session.commit()
+                await run_after_commit(session)
         except HTTPException as exc:
             rprint(f"\n[RED]-> ERROR deleting that User : [bold]{exc.detail}\n")
             raise typer.Exit(1) from exc
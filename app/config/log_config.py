@@ -2,12 +2,31 @@
 
 from __future__ import annotations
 
-import logging
+import atexit
 import sys
+import traceback
 from enum import Flag, auto
+from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
+from pydantic_core import to_json
+
+from app.config.log_context import current_request
+from app.config.log_writer import (
+    BatchedLogWriter,
+    QueuePolicy,
+    add_batched_file_sink,
+    is_not_batch,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from loguru import Record
+
+TEXT_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {message}"
+# The key a record's JSON line is stored under while it is formatted.
+JSON_KEY = "json_line"
 
 
 class LogCategory(Flag):
@@ -45,6 +64,13 @@ class LogConfig:
         self.log_compression = getattr(settings, "log_compression", "zip")
         self.log_filename = getattr(settings, "log_filename", "api.log")
         self.console_enabled = getattr(settings, "log_console_enabled", False)
+        self.queue_size = getattr(settings, "log_queue_size", 10000)
+        self.batch_size = getattr(settings, "log_batch_size", 256)
+        # Settings validates LOG_QUEUE_POLICY against QueuePolicy.
+        self.queue_policy: QueuePolicy = getattr(
+            settings, "log_queue_policy", "block"
+        )
+        self.log_format = getattr(settings, "log_format", "text")
 
         # Validate filename doesn't contain path separators
         if "/" in self.log_filename or "\\" in self.log_filename:
@@ -76,51 +102,101 @@ class LogConfig:
         """Check if a logging category is enabled."""
         return bool(self.enabled_categories & category)
 
+    @cached_property
+    def level_no(self) -> int:
+        """Return the severity number of LOG_LEVEL."""
+        return logger.level(self.log_level.upper()).no
+
+    def accepts(self, level_no: int) -> bool:
+        """Check if a message of this severity is logged at LOG_LEVEL."""
+        return level_no >= self.level_no
+
 
 def setup_logging() -> LogConfig:
     """Configure loguru with rotation, retention, and formatting."""
+    global _log_writer  # noqa: PLW0603
     config = LogConfig()
 
     # Remove default handler
     logger.remove()
+    close_log_writer()
+
+    structured = config.log_format == "json"
 
     # Add console handler only if enabled
     if config.console_enabled:
         logger.add(
             sys.stderr,
-            format="<level>{level: <8}</level> <level>{message}</level>",
+            format=format_json
+            if structured
+            else "<level>{level: <8}</level> <level>{message}</level>",
             level=config.log_level,
-            colorize=True,
+            colorize=not structured,
+            filter=is_not_batch,
         )
 
     # Add file handler with rotation - more detail for file logs
     log_file = config.log_path / config.log_filename
     config.log_path.mkdir(parents=True, exist_ok=True)
 
-    # Uvicorn reload uses a separate process; disable enqueue to avoid
-    # multiprocessing resource tracker warnings during development.
-    reload_enabled = any(arg.startswith("--reload") for arg in sys.argv)
-    if reload_enabled:
-        logging.getLogger("uvicorn").info(
-            "Loguru enqueue disabled because uvicorn reload is enabled."
-        )
-    enqueue_logs = not reload_enabled
-
-    logger.add(
+    # Requests only queue their messages; a background thread writes them
+    # to the file in batches. It works under uvicorn reload, unlike loguru's
+    # multiprocessing enqueue.
+    _log_writer = add_batched_file_sink(
         str(log_file),
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {message}",
         level=config.log_level,
+        log_format=format_json if structured else TEXT_FORMAT,
+        max_size=config.queue_size,
+        batch_size=config.batch_size,
+        policy=config.queue_policy,
         rotation=config.log_rotation,
         retention=config.log_retention,
         compression=config.log_compression,
-        enqueue=enqueue_logs,
     )
 
     return config
 
 
+def json_record(record: Record) -> dict[str, Any]:
+    """Return the fields of a record's JSON log line.
+
+    Adds the context of the request being handled, if any.
+    """
+    fields: dict[str, Any] = {
+        "time": record["time"],
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+    }
+    request = current_request()
+    if request is not None:
+        fields["request"] = request.as_dict()
+    if record["exception"] is not None:
+        fields["exception"] = "".join(
+            traceback.format_exception(*record["exception"])
+        )
+    return fields
+
+
+def format_json(record: Record) -> str:
+    """Format a record as one line of JSON, for loguru's ``format``."""
+    record["extra"][JSON_KEY] = to_json(json_record(record)).decode()
+    return f"{{extra[{JSON_KEY}]}}\n"
+
+
+def close_log_writer() -> None:
+    """Write any queued log messages and stop the log writer thread."""
+    if _log_writer is not None:
+        _log_writer.close()
+
+
+atexit.register(close_log_writer)
+
 # Global logger instance - lazy initialization to avoid circular imports
 _log_config: LogConfig | None = None
+_log_writer: BatchedLogWriter | None = None
 
 
 def get_log_config() -> LogConfig:
@@ -139,5 +215,14 @@ class _LogConfigProxy:
         """Check if a logging category is enabled."""
         return get_log_config().is_enabled(category)
 
+    def accepts(self, level_no: int) -> bool:
+        """Check if a message of this severity is logged at LOG_LEVEL."""
+        return get_log_config().accepts(level_no)
+
+    @property
+    def structured(self) -> bool:
+        """Check if log records are written as JSON lines."""
+        return get_log_config().log_format == "json"
+
 
 log_config = _LogConfigProxy()
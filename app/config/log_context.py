@@ -0,0 +1,124 @@
+"""Carry the current request's details into every log record.
+
+``ObservabilityMiddleware`` binds one ``RequestContext`` per request, when
+structured logging is enabled, and the authentication dependencies fill in
+the user and household once they know them. The JSON log format reads the
+context of the task that logs a message, so a call site passes nothing and
+a request pays for one context lookup per message, however many are logged.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    import uuid
+
+    from starlette.types import Message, Scope
+
+REQUEST_ID_HEADER = b"x-request-id"
+# A client's own request id is kept if it looks like one, so its logs and
+# ours correlate; anything else gets a fresh id.
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+
+
+@dataclass
+class RequestContext:
+    """The details of a request that its log records carry."""
+
+    request_id: str
+    method: str
+    path: str
+    scope: Scope = field(repr=False)
+    start: float = field(default_factory=time.perf_counter)
+    user_id: int | None = None
+    household_id: uuid.UUID | None = None
+    status_code: int | None = None
+
+    @property
+    def route(self) -> str | None:
+        """Return the matched route template, once routing has run."""
+        route = self.scope.get("route")
+        return getattr(route, "path", None)
+
+    def respond(self, message: Message) -> None:
+        """Record the response status and add the X-Request-ID header."""
+        self.status_code = message["status"]
+        message["headers"] = [
+            *message.get("headers", ()),
+            (REQUEST_ID_HEADER, self.request_id.encode()),
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the context as it is logged, timed up to now."""
+        context = {
+            "id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "user_id": self.user_id,
+            "household_id": self.household_id,
+            "elapsed_ms": round((time.perf_counter() - self.start) * 1000, 3),
+        }
+        if self.status_code is not None:
+            context["status"] = self.status_code
+        return context
+
+
+_request_context: ContextVar[RequestContext | None] = ContextVar(
+    "request_context", default=None
+)
+
+
+def _request_id(scope: Scope) -> str:
+    """Return the request's X-Request-ID if valid, else a new id."""
+    headers: list[tuple[bytes, bytes]] = scope["headers"]
+    for name, value in headers:
+        if name == REQUEST_ID_HEADER:
+            request_id = value.decode("latin-1")
+            if _VALID_REQUEST_ID.fullmatch(request_id):
+                return request_id
+            break
+    # Unique, not secret: getrandbits is much cheaper than uuid4, whose
+    # urandom call can cost more than the rest of a request's logging.
+    return f"{random.getrandbits(128):032x}"
+
+
+def bind_request(scope: Scope) -> Token[RequestContext | None]:
+    """Start a request's context; pass the token to ``reset_request``."""
+    return _request_context.set(
+        RequestContext(
+            request_id=_request_id(scope),
+            method=scope["method"],
+            path=scope["path"],
+            scope=scope,
+        )
+    )
+
+
+def reset_request(token: Token[RequestContext | None]) -> None:
+    """End the context started by ``bind_request``."""
+    _request_context.reset(token)
+
+
+def current_request() -> RequestContext | None:
+    """Return the context of the request being handled, if any."""
+    return _request_context.get()
+
+
+def annotate_request(
+    *, user_id: int | None = None, household_id: uuid.UUID | None = None
+) -> None:
+    """Record who made the current request, if a context is bound."""
+    context = _request_context.get()
+    if context is None:
+        return
+    if user_id is not None:
+        context.user_id = user_id
+    if household_id is not None:
+        context.household_id = household_id
@@ -0,0 +1,178 @@
+"""Write the log file from a background thread, in batches.
+
+Loguru's ``enqueue=True`` hands each message to a multiprocessing queue,
+and is disabled under ``uvicorn --reload``, where every request then wrote
+to the log file itself. ``BatchedLogWriter`` is a sink that only puts each
+formatted message on a bounded in-process queue; a daemon thread takes up
+to ``LOG_BATCH_SIZE`` messages at a time and writes them to the file in one
+call, through loguru's file handler so rotation, retention and compression
+still apply.
+
+When ``LOG_QUEUE_SIZE`` messages are waiting, ``LOG_QUEUE_POLICY`` decides
+what a new message does: ``block`` waits for room, ``drop`` discards it.
+Dropped messages are counted, and the count is written to the file with
+the next batch.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import uuid
+from typing import TYPE_CHECKING, Any, Literal
+
+from loguru import logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+
+    from loguru import Record
+
+QueuePolicy = Literal["block", "drop"]
+
+# Marks the batches a writer thread logs, so only its file handler takes
+# them and that handler takes nothing else.
+BATCH_KEY = "log_batch"
+
+
+def is_not_batch(record: Record) -> bool:
+    """Return True for any record except a writer thread batch."""
+    return BATCH_KEY not in record["extra"]
+
+
+class BatchedLogWriter:
+    """A loguru sink that queues messages for a writer thread."""
+
+    def __init__(
+        self,
+        write: Callable[[str], object],
+        *,
+        max_size: int,
+        batch_size: int,
+        policy: QueuePolicy,
+    ) -> None:
+        """Start the writer thread, which passes batches to ``write``."""
+        self._write = write
+        # SimpleQueue is unbounded, but much cheaper to put to than Queue:
+        # a message only checks for room while the queue looks full.
+        self._queue: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        self._max_size = max(1, max_size)
+        self._room = threading.Event()
+        self._batch_size = max(1, batch_size)
+        self._policy = policy
+        self._lock = threading.Lock()
+        self._unreported = 0
+        self.dropped = 0
+        self.closed = False
+        # The loguru handlers feeding and written by this writer.
+        self.handler_ids: list[int] = []
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, message: str) -> None:
+        """Queue a formatted message, or write it once the writer is closed."""
+        if self.closed:
+            self._write(message)
+            return
+        while self._queue.qsize() >= self._max_size:
+            if self._policy == "drop":
+                with self._lock:
+                    self.dropped += 1
+                    self._unreported += 1
+                return
+            # Clear before checking again, so room made in between is seen.
+            self._room.clear()
+            if self._queue.qsize() >= self._max_size:
+                self._room.wait()
+        self._queue.put(message)
+
+    def _take_batch(self) -> tuple[list[str], bool]:
+        """Wait for a message and take up to a batch of them.
+
+        Also returns whether the writer was asked to stop.
+        """
+        batch: list[str] = []
+        message = self._queue.get()
+        while message is not None:
+            batch.append(message)
+            if len(batch) >= self._batch_size:
+                return batch, False
+            try:
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                return batch, False
+        return batch, True
+
+    def _run(self) -> None:
+        """Write batches of queued messages until closed."""
+        stop = False
+        while not stop:
+            batch, stop = self._take_batch()
+            self._room.set()
+            with self._lock:
+                dropped, self._unreported = self._unreported, 0
+            if dropped:
+                batch.append(
+                    f"{dropped} log message(s) dropped: the log queue was "
+                    "full\n"
+                )
+            if batch:
+                self._write("".join(batch))
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write the queued messages and stop the writer thread.
+
+        Messages logged afterwards are written straight to the file.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        # Anything queued while closing is written here instead.
+        leftover: list[str] = []
+        while not self._queue.empty():
+            message = self._queue.get_nowait()
+            if message is not None:
+                leftover.append(message)
+        if leftover:
+            self._write("".join(leftover))
+
+
+def add_batched_file_sink(  # noqa: PLR0913
+    path: str,
+    *,
+    level: str,
+    log_format: str | Callable[[Record], str],
+    max_size: int,
+    batch_size: int,
+    policy: QueuePolicy,
+    **file_options: Any,  # noqa: ANN401
+) -> BatchedLogWriter:
+    """Log to a file at ``path`` through a ``BatchedLogWriter``.
+
+    Messages are formatted with ``log_format``, a loguru format string or
+    function, by the thread that logs them. ``file_options`` (rotation,
+    retention, compression) are passed to loguru's file handler.
+    """
+    level_no = logger.level(level.upper()).no
+    batch_id = uuid.uuid4().hex
+    batches = logger.bind(**{BATCH_KEY: batch_id}).opt(raw=True)
+    writer = BatchedLogWriter(
+        lambda text: batches.log(level_no, text),
+        max_size=max_size,
+        batch_size=batch_size,
+        policy=policy,
+    )
+    writer.handler_ids = [
+        logger.add(writer, format=log_format, level=level, filter=is_not_batch),
+        logger.add(
+            path,
+            level=level,
+            filter=lambda record: record["extra"].get(BATCH_KEY) == batch_id,
+            **file_options,
+        ),
+    ]
+    return writer
@@ -5,6 +5,7 @@ from __future__ import annotations
 import sys
 from functools import lru_cache
 from pathlib import Path  # noqa: TC003
+from typing import Literal
 from urllib.parse import quote
 
 from cryptography.fernet import Fernet
@@ -63,6 +64,30 @@ class Settings(BaseSettings):
     db_port: str = "5432"
     db_name: str = "api-template"
 
+    # Connection pool, per worker process. Each worker holds up to
+    # db_pool_size + db_pool_max_overflow connections, so keep that times
+    # the number of workers below the server's max_connections.
+    db_pool_size: int = 5
+    db_pool_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # seconds before reconnecting (-1 = never)
+    # Test each connection with a round trip before use. Only needed when
+    # idle connections are dropped by a firewall or proxy.
+    db_pool_pre_ping: bool = False
+    # Prepared statements cached per connection, so repeated queries skip
+    # parsing and planning (0 = disabled).
+    db_statement_cache_size: int = 100
+    # Set when connecting through PgBouncer in transaction pooling mode,
+    # where a prepared statement may not exist on the next server
+    # connection. Disables statement caching and uses unique names.
+    db_pgbouncer: bool = False
+    # Read replicas for GET routes, as comma-separated "host" or "host:port"
+    # entries using the credentials and database name above. Empty = none.
+    db_replica_hosts: str = ""
+    # Seconds a client keeps reading from the primary after a change, so it
+    # does not read stale data back from a lagging replica.
+    db_read_your_writes_seconds: int = 5
+
     test_with_postgres: bool = False
 
     # Setup the TEST Postgresql database.
@@ -101,6 +126,26 @@ class Settings(BaseSettings):
     mail_ssl_tls: bool = False
     mail_use_credentials: bool = True
     mail_validate_certs: bool = True
+    # Mail is sent over MAIL_POOL_SIZE persistent connections, each sending
+    # up to MAIL_BATCH_SIZE queued messages at a time and closed after
+    # MAIL_IDLE_TIMEOUT seconds without mail.
+    mail_pool_size: int = 2
+    mail_batch_size: int = 20
+    mail_idle_timeout: float = 30
+    # The mail worker (`api-admin mail worker`) claims up to
+    # MAIL_OUTBOX_BATCH_SIZE queued emails per poll and sends at most
+    # MAIL_OUTBOX_CONCURRENCY at once. Failed emails are retried after
+    # MAIL_OUTBOX_RETRY_BASE seconds, doubling up to MAIL_OUTBOX_RETRY_MAX,
+    # and dead-lettered after MAIL_OUTBOX_MAX_ATTEMPTS attempts.
+    mail_outbox_batch_size: int = 50
+    mail_outbox_concurrency: int = 4
+    mail_outbox_poll_interval: float = 1
+    mail_outbox_max_attempts: int = 8
+    mail_outbox_retry_base: float = 30
+    mail_outbox_retry_max: float = 3600
+    # Compiled email templates are cached here, or in the system temporary
+    # directory if empty.
+    mail_template_cache_dir: str = ""
 
     # admin pages settings
     admin_pages_enabled: bool = False
@@ -112,6 +157,12 @@ class Settings(BaseSettings):
     )
     admin_pages_timeout: int = 86400
 
+    # Password hashing runs on a worker pool so bcrypt does not block the
+    # event loop: "thread" (bcrypt releases the GIL) or "process". At most
+    # password_hash_workers hashes run at once, the rest wait in a queue.
+    password_hash_executor: Literal["thread", "process"] = "thread"  # noqa: S105
+    password_hash_workers: int = 4
+
     # Logging settings
     log_path: str = "./logs"
     log_level: str = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
@@ -123,6 +174,14 @@ class Settings(BaseSettings):
     )
     log_filename: str = "api.log"
     log_console_enabled: bool = False
+    # The log file is written by a background thread in batches of up to
+    # log_batch_size messages. When log_queue_size messages are waiting,
+    # "block" makes a new message wait for room and "drop" discards it.
+    log_queue_size: int = 10000
+    log_batch_size: int = 256
+    log_queue_policy: Literal["block", "drop"] = "block"
+    # "json" writes each record as a line of JSON with the request's context
+    log_format: Literal["text", "json"] = "text"
 
     # Prometheus metrics settings (opt-in, disabled by default)
     metrics_enabled: bool = False
@@ -137,17 +196,45 @@ class Settings(BaseSettings):
     redis_password: str = ""
     redis_db: int = 0
     cache_default_ttl: int = 300  # 5 minutes
+    # With Redis, also keep cached responses in an in-process tier for this
+    # many seconds (0 = disabled), holding at most cache_local_maxsize
+    # entries per worker. Invalidations reach every worker via pub/sub.
+    cache_local_ttl: int = 5
+    cache_local_maxsize: int = 2048
+    # Compress cached responses of at least this many bytes (0 = never).
+    cache_compress_min_size: int = 1024
+    # Keep cached responses this many seconds past their TTL, serving them
+    # stale while one request refreshes them (0 = disabled).
+    cache_stale_ttl: int = 30
+    # Seconds one request may hold the lease to compute a cache entry,
+    # and the longest other requests wait for it.
+    cache_lease_ttl: int = 5
+    # Seconds to cache each user's household membership (0 = disabled).
+    # Uses Redis when available, otherwise an in-process LRU.
+    household_cache_ttl: int = 30
+    # Seconds to cache each user's role, ban and verification status for
+    # the JWT check (0 = disabled). Uses Redis when available, otherwise an
+    # in-process LRU.
+    principal_cache_ttl: int = 30
 
     # Rate limiting settings (opt-in, disabled by default)
     # Automatically uses Redis when both rate_limit_enabled and
     # redis_enabled are True
     rate_limit_enabled: bool = False
+    # Comma-separated IPs or CIDR ranges of the reverse proxies and load
+    # balancers in front of the API. Requests from them are rate limited
+    # by the client address in X-Forwarded-For instead of their own.
+    trusted_proxies: str = ""
 
     # Resource quotas per household (0 = unlimited)
     max_floors_per_household: int = 10
     max_rooms_per_household: int = 40
     max_tasks_per_household: int = 1000
 
+    # Serve dashboard and room stats from the materialized counter table
+    # instead of aggregating the tasks table on every request
+    task_stats_use_counters: bool = True
+
     # gatekeeper settings!
     # this is to ensure that people read the damn instructions and changelogs
     i_read_the_damn_docs: bool = False
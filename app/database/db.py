@@ -1,7 +1,9 @@
 """Setup the Database and support functions.."""
 
 import os
-from collections.abc import AsyncGenerator
+import time
+import uuid
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from typing import Any
 
 from sqlalchemy import MetaData
@@ -11,8 +13,10 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 from app.config.settings import get_settings
+from app.metrics import observe_db_pool_checkout_wait, track_db_pool_usage
 
 
 def get_database_url(*, use_test_db: bool = False) -> str:
@@ -55,6 +59,52 @@ class Base(DeclarativeBase):
     )
 
 
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """The default async queue pool, timing how long checkouts wait."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            observe_db_pool_checkout_wait(time.perf_counter() - start)
+
+
+def _unique_statement_name() -> str:
+    """Name prepared statements uniquely, as PgBouncer requires."""
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options() -> dict[str, Any]:
+    """Return the pool and driver options for the application engine.
+
+    asyncpg's prepared statement cache is on unless ``DB_PGBOUNCER`` is
+    set: behind PgBouncer in transaction mode consecutive statements may
+    run on different server connections, so statements are not cached and
+    get unique names instead.
+    """
+    settings = get_settings()
+    if settings.db_pgbouncer:
+        connect_args: dict[str, Any] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    else:
+        connect_args = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        }
+    return {
+        "poolclass": MeteredQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_pool_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
 def create_session_maker(
     *,
     use_test_db: bool = False,
@@ -67,8 +117,9 @@ def create_session_maker(
     engine = create_async_engine(
         get_database_url(use_test_db=use_test_db),
         echo=False,
-        connect_args={"prepared_statement_cache_size": 0},
+        **engine_options(),
     )
+    track_db_pool_usage(engine.sync_engine.pool)
     return async_sessionmaker(engine, expire_on_commit=False)
 
 
@@ -77,10 +128,35 @@ async_session = create_session_maker()
 async_engine = async_session.kw["bind"]
 
 
+# Session.info key for the callbacks registered with call_after_commit.
+_AFTER_COMMIT = "after_commit"
+
+
+def call_after_commit(
+    session: AsyncSession, callback: Callable[[], Awaitable[None]]
+) -> None:
+    """Run ``callback`` once the request transaction has committed.
+
+    ``get_database`` commits only after the route has returned (and after
+    the response has started), so work that must not run before the
+    changes are visible, such as cache invalidation, is registered here.
+    Callbacks are dropped if the transaction rolls back.
+    """
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+async def run_after_commit(session: AsyncSession) -> None:
+    """Run and clear the callbacks registered with ``call_after_commit``."""
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        await callback()
+
+
 async def get_database() -> AsyncGenerator[AsyncSession, Any]:
     """Return the database connection as a Generator."""
-    async with async_session() as session, session.begin():
-        yield session
+    async with async_session() as session:
+        async with session.begin():
+            yield session
+        await run_after_commit(session)
 
 
 async def get_database_manual() -> AsyncGenerator[AsyncSession, Any]:
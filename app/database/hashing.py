@@ -0,0 +1,88 @@
+"""Run password hashing off the event loop on a bounded worker pool.
+
+bcrypt is deliberately slow (100-300 ms per hash), so calling
+``hash_password`` or ``verify_password`` directly from a handler stalls
+every other request on the worker. ``run_in_hash_pool`` runs them on a
+thread or process pool of ``PASSWORD_HASH_WORKERS`` workers instead; calls
+beyond that limit wait in the pool's queue, whose depth is exported as the
+``password_hash_queue_depth`` metric.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import TYPE_CHECKING, ParamSpec, TypeVar
+
+from app.config.settings import get_settings
+from app.metrics import set_password_hash_queue_depth
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_executor: Executor | None = None
+_workers = 0
+# Jobs submitted to the pool that have not finished yet.
+_pending = 0
+
+
+def _get_executor() -> Executor:
+    """Return the hashing pool, creating it on first use."""
+    global _executor, _workers  # noqa: PLW0603
+    if _executor is None:
+        settings = get_settings()
+        _workers = max(1, settings.password_hash_workers)
+        if settings.password_hash_executor == "process":  # noqa: S105
+            _executor = ProcessPoolExecutor(max_workers=_workers)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=_workers, thread_name_prefix="password-hash"
+            )
+    return _executor
+
+
+def queue_depth() -> int:
+    """Return the number of hashing jobs waiting for a free worker."""
+    return max(0, _pending - _workers)
+
+
+async def run_in_hash_pool(
+    func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """Run a password hashing function on the hashing pool.
+
+    With the process pool, ``func`` and its arguments must be picklable, so
+    pass module-level functions such as ``hash_password`` and plain values.
+    Exceptions raised by ``func`` propagate to the caller.
+    """
+    global _pending  # noqa: PLW0603
+    executor = _get_executor()
+    _pending += 1
+    set_password_hash_queue_depth(queue_depth())
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, functools.partial(func, *args, **kwargs)
+        )
+    finally:
+        _pending -= 1
+        set_password_hash_queue_depth(queue_depth())
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the hashing pool; it is recreated on next use.
+
+    This blocks until the running jobs finish, so call it from a thread
+    (``asyncio.to_thread``) when on the event loop.
+    """
+    global _executor  # noqa: PLW0603
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -1,5 +1,6 @@
 """Database helper functions."""
 
+import uuid
 from collections.abc import Sequence
 from typing import Any
 
@@ -8,6 +9,7 @@ from sqlalchemy import insert, select, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.household import household_members
 from app.models.user import User
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -84,6 +86,26 @@ async def get_user_by_id_(user_id: int, session: AsyncSession) -> User | None:
     return await session.get(User, user_id)
 
 
+async def get_user_with_household_(
+    user_id: int, session: AsyncSession
+) -> tuple[User | None, uuid.UUID | None]:
+    """Return a user by ID together with their household ID.
+
+    Both are fetched with a single joined query; the household ID is None
+    if the user does not exist or is not a member of any household.
+    """
+    result = await session.execute(
+        select(User, household_members.c.household_id)
+        .outerjoin(household_members, household_members.c.user_id == User.id)
+        .where(User.id == user_id)
+        .limit(1)
+    )
+    row = result.first()
+    if row is None:
+        return None, None
+    return row[0], row[1]
+
+
 async def get_user_by_email_(email: str, session: AsyncSession) -> User | None:
     """Return a user by email."""
     result = await session.execute(select(User).where(User.email == email))
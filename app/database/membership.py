@@ -0,0 +1,89 @@
+"""Cached lookup of the household a user belongs to.
+
+Almost every authenticated request needs the caller's household, so the
+answer is kept in a short-lived ``UserSnapshotCache``: the shared Redis
+cache backend when one is configured, otherwise a bounded in-process LRU.
+The household and invitation routes call
+``invalidate_household_membership_on_commit`` whenever they add or remove
+members; the TTL bounds any staleness that
+invalidation cannot reach (e.g. the LRU of another worker process).
+"""
+
+from __future__ import annotations
+
+import functools
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: TC002
+
+from app.cache.constants import CacheNamespaces
+from app.cache.snapshot import UserSnapshotCache
+from app.config.settings import get_settings
+from app.database.db import call_after_commit
+from app.models.household import household_members
+
+# Cached value for users that do not belong to any household.
+_NO_HOUSEHOLD = "-"
+
+_cache = UserSnapshotCache(
+    CacheNamespaces.HOUSEHOLD_MEMBER_FORMAT, "household membership"
+)
+
+
+async def get_household_id(db: AsyncSession, user_id: int) -> uuid.UUID | None:
+    """Return the household the user belongs to, or None.
+
+    Served from the membership cache when possible, falling back to (and
+    then caching) a query on ``household_members``.
+    """
+    ttl = get_settings().household_cache_ttl
+    if ttl > 0:
+        cached = await _cache.get(user_id)
+        if cached is not None:
+            return None if cached == _NO_HOUSEHOLD else uuid.UUID(cached)
+
+    result = await db.execute(
+        select(household_members.c.household_id).where(
+            household_members.c.user_id == user_id
+        )
+    )
+    household_id = result.scalar_one_or_none()
+    if ttl > 0:
+        await _cache.set(
+            user_id,
+            str(household_id) if household_id else _NO_HOUSEHOLD,
+            ttl,
+        )
+    return household_id
+
+
+async def invalidate_household_membership(*user_ids: int) -> None:
+    """Drop the cached household of the given users.
+
+    Call this whenever users join or leave a household (including when a
+    household is created or deleted).
+
+    Note:
+        Cache failures are logged but don't raise exceptions. Stale entries
+        then expire after ``HOUSEHOLD_CACHE_TTL`` seconds.
+    """
+    await _cache.invalidate(*user_ids)
+
+
+def invalidate_household_membership_on_commit(
+    db: AsyncSession, *user_ids: int
+) -> None:
+    """Drop the cached household of the given users once ``db`` commits.
+
+    Invalidating before the commit would let a concurrent request re-cache
+    the old membership from the not yet committed state.
+    """
+    call_after_commit(
+        db, functools.partial(invalidate_household_membership, *user_ids)
+    )
+
+
+def clear_local_membership_cache() -> None:
+    """Empty the in-process membership cache of this worker."""
+    _cache.clear_local()
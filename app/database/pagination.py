@@ -0,0 +1,178 @@
+"""Keyset pagination and cheap row-count helpers.
+
+Offset pagination makes Postgres walk and discard every row before the
+requested page, and an exact ``COUNT(*)`` scans the whole filtered set on
+each request. Keyset pagination instead resumes after the last row seen,
+encoded in an opaque cursor, so every page costs the same. When the exact
+total is not needed, ``estimate_count`` returns the planner's row estimate
+without executing the query.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from sqlalchemy import tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable, Sequence
+
+    from sqlalchemy import Select, SQLColumnExpression
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.sql.compiler import SQLCompiler
+
+
+_T = TypeVar("_T", bound=tuple[Any, ...])
+_R = TypeVar("_R")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(key: str, value: Any, row_id: Any) -> str:  # noqa: ANN401
+    """Encode the sort key of the last row on a page as an opaque cursor.
+
+    Args:
+        key: Name of the sort column, so a cursor cannot be replayed against
+            a different ordering.
+        value: Value of the sort column for the last row.
+        row_id: Primary key of the last row, used as the tie-breaker.
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"k": key, "v": value, "id": str(row_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str) -> tuple[Any, str]:
+    """Decode a cursor created by ``encode_cursor`` for the same sort key.
+
+    Returns:
+        The ``(value, row_id)`` pair of the last row of the previous page.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for a
+            different sort key.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_key, value, row_id = payload["k"], payload["v"], payload["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        msg = "Malformed cursor"
+        raise InvalidCursorError(msg) from exc
+    if cursor_key != key:
+        msg = "Cursor does not match the requested sort order"
+        raise InvalidCursorError(msg)
+    return value, row_id
+
+
+def keyset_select(  # noqa: PLR0913
+    stmt: Select[_T],
+    key_cols: Sequence[SQLColumnExpression[Any]],
+    *,
+    key: str,
+    parse_value: Callable[[Any], Any],
+    cursor: str | None,
+    descending: bool,
+    page: int,
+    page_size: int,
+) -> Select[_T]:
+    """Order ``stmt`` by ``key_cols`` and select one page of it.
+
+    With a ``cursor`` the page resumes after the row it was issued for,
+    otherwise ``page`` is selected by offset. One row more than
+    ``page_size`` is selected, so ``split_page`` can tell whether another
+    page follows.
+
+    Args:
+        stmt: The filtered select statement.
+        key_cols: The sort column followed by the UUID primary key, which breaks
+            ties so the order is total.
+        key: Identifies the sort order the cursor must have been issued for.
+        parse_value: Converts the cursor's JSON sort value back to the sort
+            column's type.
+        cursor: A cursor from ``split_page``, if any.
+        descending: Whether to sort in descending order.
+        page: The page to select by offset when there is no cursor.
+        page_size: The number of rows on a page.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for a
+            different sort order.
+    """
+    stmt = stmt.order_by(
+        *(col.desc() if descending else col.asc() for col in key_cols)
+    )
+    if cursor is None:
+        stmt = stmt.offset((page - 1) * page_size)
+    else:
+        value, row_id = decode_cursor(cursor, key)
+        try:
+            last_key: list[Any] = [parse_value(value), uuid.UUID(row_id)]
+        except (ValueError, TypeError) as exc:
+            msg = "Malformed cursor"
+            raise InvalidCursorError(msg) from exc
+        keys, last = tuple_(*key_cols), tuple_(*last_key)
+        stmt = stmt.where(keys < last if descending else keys > last)
+    return stmt.limit(page_size + 1)
+
+
+def split_page(
+    rows: Sequence[_R],
+    page_size: int,
+    *,
+    key: str,
+    sort_value: Callable[[_R], Any],
+    row_id: Callable[[_R], Any],
+) -> tuple[Sequence[_R], str | None]:
+    """Trim the extra row selected by ``keyset_select``.
+
+    Returns:
+        The rows of the page and the cursor of the next page, or ``None``
+        if this is the last page.
+    """
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(key, sort_value(last), row_id(last))
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` wrapper around a select statement."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(
+    element: _Explain,
+    compiler: SQLCompiler,
+    **kw: Any,  # noqa: ANN401
+) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_count(db: AsyncSession, stmt: Select[Any]) -> int:
+    """Return the query planner's estimate of the rows ``stmt`` returns.
+
+    Only the plan is computed, so the cost is independent of table size.
+    The value is as accurate as the table statistics gathered by
+    ``ANALYZE`` and should only be shown as an approximation.
+    """
+    plan = (await db.execute(_Explain(stmt))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,121 @@
+"""Cached snapshot of the authenticated user.
+
+Most authenticated routes only need to know who the caller is and whether
+they may act: their id, role and whether they are banned or verified. That
+snapshot (the "principal") is cached per user so the JWT check on those
+routes does not load the user on every request. The in-process LRU keeps
+entries for at most a few seconds when Redis is active, since other
+workers cannot invalidate it; Redis (or, without Redis, the LRU) keeps them
+for ``PRINCIPAL_CACHE_TTL`` seconds.
+
+``UserManager`` and ``AuthManager`` invalidate the principal, once their
+transaction has committed, whenever they ban, verify, delete or change the
+role of a user.
+"""
+
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: TC002
+
+from app.cache.constants import CacheNamespaces
+from app.cache.snapshot import UserSnapshotCache
+from app.config.settings import get_settings
+from app.database.db import call_after_commit
+from app.models.enums import RoleType
+from app.models.user import User
+
+# Seconds a Redis-backed principal is also kept in the in-process LRU. This
+# bounds how long a ban or role change takes to reach other workers.
+_LOCAL_TTL = 5
+
+_cache = UserSnapshotCache(
+    CacheNamespaces.PRINCIPAL_FORMAT, "principal", local_ttl=_LOCAL_TTL
+)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The parts of a User needed to authenticate and authorize them.
+
+    It has the same attribute names as ``User``, so it can stand in for the
+    user in ``request.state.user``.
+    """
+
+    id: int
+    role: RoleType
+    banned: bool
+    verified: bool
+
+    def encode(self) -> str:
+        """Return the compact cache representation of this principal."""
+        return f"{self.role.value}:{int(self.banned)}:{int(self.verified)}"
+
+    @classmethod
+    def decode(cls, user_id: int, value: str) -> Principal:
+        """Build a principal from its cache representation."""
+        role, banned, verified = value.split(":")
+        return cls(
+            id=user_id,
+            role=RoleType(role),
+            banned=banned == "1",
+            verified=verified == "1",
+        )
+
+
+async def get_principal(db: AsyncSession, user_id: int) -> Principal | None:
+    """Return the principal for the user, or None if they do not exist.
+
+    Served from the principal cache when possible, falling back to (and
+    then caching) a query on ``users``.
+    """
+    ttl = get_settings().principal_cache_ttl
+    if ttl > 0:
+        cached = await _cache.get(user_id)
+        if cached is not None:
+            return Principal.decode(user_id, cached)
+
+    row = (
+        await db.execute(
+            select(User.role, User.banned, User.verified).where(
+                User.id == user_id
+            )
+        )
+    ).one_or_none()
+    if row is None:
+        return None
+    principal = Principal(
+        id=user_id,
+        role=row.role,
+        banned=bool(row.banned),
+        verified=bool(row.verified),
+    )
+    if ttl > 0:
+        await _cache.set(user_id, principal.encode(), ttl)
+    return principal
+
+
+async def invalidate_principal(*user_ids: int) -> None:
+    """Drop the cached principal of the given users.
+
+    Call this whenever a user's role, ban or verification status changes,
+    or the user is deleted.
+    """
+    await _cache.invalidate(*user_ids)
+
+
+def invalidate_principal_on_commit(db: AsyncSession, *user_ids: int) -> None:
+    """Drop the cached principal of the given users once ``db`` commits.
+
+    Invalidating before the commit would let a concurrent request re-cache
+    the old role or ban status from the not yet committed state.
+    """
+    call_after_commit(db, functools.partial(invalidate_principal, *user_ids))
+
+
+def clear_local_principal_cache() -> None:
+    """Empty the in-process principal cache of this worker."""
+    _cache.clear_local()
@@ -0,0 +1,225 @@
+"""Propagate task completion to the blocked status of dependent tasks.
+
+Every task stores ``incomplete_dependency_count``, the number of its
+dependencies that are not done yet. A task that is not done is blocked
+exactly while that count is non-zero, so whether a task is blocked is a
+column read rather than a load of all of its dependencies.
+
+A task's count changes when one of its dependencies becomes done or
+not done, is deleted, or when its own dependency edges change. A
+``before_flush`` hook collects those tasks from the ORM unit of work and an
+``after_flush_postexec`` hook recounts all of them with one set-based
+``UPDATE``, which also blocks or unblocks them and adjusts
+``task_status_counts`` to match. Blocking or unblocking a task never
+changes whether it is done, so that single pass reaches every task whose
+status can change. Statements that bypass the ORM unit of work (such as a
+Core ``DELETE`` of an edge) must call ``refresh_tasks`` themselves.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import case, event, func, inspect, or_, select, update
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.database.task_stats import StatusDeltas, apply_status_deltas
+from app.models.task import Task, TaskStatus, task_dependencies, task_rooms
+
+if TYPE_CHECKING:  # pragma: no cover
+    import uuid
+    from collections.abc import Collection, Sequence
+
+    from sqlalchemy import Row
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import UOWTransaction
+
+# Session.info key for the work collected by the before_flush hook.
+_PENDING = "task_propagation"
+
+
+def _is_done(task_status: TaskStatus | None) -> bool:
+    return task_status == TaskStatus.done
+
+
+def _done_changed(task: Task) -> bool:
+    """Return True if a pending status change toggles done-ness."""
+    history = inspect(task).attrs["status"].history
+    if not history.added:
+        return False
+    old = history.deleted[0] if history.deleted else None
+    return _is_done(old) != _is_done(history.added[0])
+
+
+def _status_deltas(session: Session, rows: Sequence[Row[Any]]) -> StatusDeltas:
+    """Turn ``(id, household_id, old_status, status)`` rows into deltas."""
+    deltas: StatusDeltas = Counter()
+    changed = {row.id: row for row in rows if row.old_status != row.status}
+    if not changed:
+        return deltas
+    scopes = {task_id: [row.household_id] for task_id, row in changed.items()}
+    room_rows = session.connection().execute(
+        select(task_rooms.c.task_id, task_rooms.c.room_id).where(
+            task_rooms.c.task_id.in_(changed)
+        )
+    )
+    for task_id, room_id in room_rows:
+        scopes[task_id].append(room_id)
+    for task_id, row in changed.items():
+        for scope_id in scopes[task_id]:
+            deltas[(scope_id, row.household_id, row.old_status)] -= 1
+            deltas[(scope_id, row.household_id, row.status)] += 1
+    return deltas
+
+
+def _recount(
+    session: Session,
+    task_ids: Collection[uuid.UUID],
+    source_ids: Collection[uuid.UUID],
+) -> None:
+    """Recount and re-block ``task_ids`` and the dependents of ``source_ids``.
+
+    Only rows whose count or status actually changes are updated. Loaded
+    instances of those tasks are updated in place, so responses built from
+    them see the new status without a refresh.
+    """
+    if not task_ids and not source_ids:
+        return
+    edges = task_dependencies.c
+    dependency = aliased(Task)
+    counts = (
+        select(
+            Task.id,
+            Task.status.label("old_status"),
+            func.count(dependency.id)
+            .filter(dependency.status != TaskStatus.done)
+            .label("incomplete"),
+        )
+        .outerjoin(task_dependencies, edges.task_id == Task.id)
+        .outerjoin(dependency, dependency.id == edges.depends_on_task_id)
+        .where(
+            or_(
+                Task.id.in_(task_ids),
+                Task.id.in_(
+                    select(edges.task_id).where(
+                        edges.depends_on_task_id.in_(source_ids)
+                    )
+                ),
+            )
+        )
+        .group_by(Task.id)
+        .subquery()
+    )
+    new_status = case(
+        (counts.c.old_status == TaskStatus.done, counts.c.old_status),
+        (counts.c.incomplete > 0, TaskStatus.blocked),
+        (counts.c.old_status == TaskStatus.blocked, TaskStatus.not_started),
+        else_=counts.c.old_status,
+    )
+    tasks = Task.__table__.c
+    rows = (
+        session.connection()
+        .execute(
+            update(Task)
+            .where(
+                tasks.id == counts.c.id,
+                or_(
+                    tasks.incomplete_dependency_count != counts.c.incomplete,
+                    tasks.status != new_status,
+                ),
+            )
+            .values(
+                incomplete_dependency_count=counts.c.incomplete,
+                status=new_status,
+            )
+            .returning(
+                tasks.id,
+                tasks.household_id,
+                counts.c.old_status,
+                tasks.status,
+                tasks.incomplete_dependency_count,
+            )
+        )
+        .all()
+    )
+    apply_status_deltas(session, _status_deltas(session, rows))
+    for row in rows:
+        task = session.identity_map.get(Session.identity_key(Task, row.id))
+        if task is not None:
+            set_committed_value(task, "status", row.status)
+            set_committed_value(
+                task,
+                "incomplete_dependency_count",
+                row.incomplete_dependency_count,
+            )
+
+
+async def refresh_tasks(
+    db: AsyncSession, task_ids: Collection[uuid.UUID]
+) -> None:
+    """Recount tasks whose dependency edges changed outside the ORM."""
+    await db.run_sync(_recount, set(task_ids), set())
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changes(
+    session: Session,
+    flush_context: UOWTransaction,  # noqa: ARG001
+    instances: object,  # noqa: ARG001
+) -> None:
+    """Record the tasks whose counts the pending changes affect."""
+    # Tasks to recount, and tasks whose dependents must be recounted. New
+    # tasks have no id until they are inserted, so instances are kept.
+    targets: set[Task] = set()
+    sources: set[uuid.UUID] = set()
+    for task in session.new | session.dirty | session.deleted:
+        if not isinstance(task, Task):
+            continue
+        attrs = inspect(task).attrs
+        depends_on = attrs["depends_on"].history
+        if depends_on.added or depends_on.deleted:
+            targets.add(task)
+        depended_by = attrs["depended_by"].history
+        targets.update(depended_by.added, depended_by.deleted)
+        if task in session.dirty and _done_changed(task):
+            sources.add(task.id)
+
+    # Deleting an unfinished task unblocks its dependents. Their edges go
+    # away with it, so they have to be found before the flush.
+    deleted = [
+        task.id
+        for task in session.deleted
+        if isinstance(task, Task) and not _is_done(task.status)
+    ]
+    dependent_ids: set[uuid.UUID] = set()
+    if deleted:
+        dependent_ids.update(
+            session.connection()
+            .execute(
+                select(task_dependencies.c.task_id).where(
+                    task_dependencies.c.depends_on_task_id.in_(deleted)
+                )
+            )
+            .scalars()
+        )
+    targets -= set(session.deleted)
+    if targets or sources or dependent_ids:
+        session.info[_PENDING] = (targets, sources, dependent_ids)
+    else:
+        session.info.pop(_PENDING, None)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _propagate(
+    session: Session,
+    flush_context: UOWTransaction,  # noqa: ARG001
+) -> None:
+    """Recount the tasks collected before the flush."""
+    pending = session.info.pop(_PENDING, None)
+    if pending is None:
+        return
+    targets, sources, dependent_ids = pending
+    task_ids = dependent_ids | {task.id for task in targets}
+    _recount(session, task_ids, sources)
@@ -7,8 +7,8 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.settings import get_settings
+from app.database import membership
 from app.models.floor import Floor
-from app.models.household import household_members
 from app.models.room import Room
 from app.models.task import Task
 
@@ -29,12 +29,7 @@ async def get_user_household_id(db: AsyncSession, user_id: int) -> uuid.UUID:
 
     Raises HTTPException 403 if user is not a member of any household.
     """
-    result = await db.execute(
-        select(household_members.c.household_id).where(
-            household_members.c.user_id == user_id
-        )
-    )
-    household_id = result.scalar_one_or_none()
+    household_id = await membership.get_household_id(db, user_id)
 
     if household_id is None:
         raise HTTPException(
@@ -75,10 +70,12 @@ async def check_room_quota(db: AsyncSession, household_id: uuid.UUID) -> None:
         raise QuotaExceeded("rooms", settings.max_rooms_per_household)
 
 
-async def check_task_quota(db: AsyncSession, household_id: uuid.UUID) -> None:
-    """Check if household has reached the task quota."""
+async def check_task_quota(
+    db: AsyncSession, household_id: uuid.UUID, new_tasks: int = 1
+) -> None:
+    """Check if household has room for ``new_tasks`` more tasks."""
     settings = get_settings()
-    if settings.max_tasks_per_household == 0:
+    if settings.max_tasks_per_household == 0 or new_tasks <= 0:
         return
 
     result = await db.execute(
@@ -86,5 +83,5 @@ async def check_task_quota(db: AsyncSession, household_id: uuid.UUID) -> None:
     )
     count = result.scalar() or 0
 
-    if count >= settings.max_tasks_per_household:
+    if count + new_tasks > settings.max_tasks_per_household:
         raise QuotaExceeded("tasks", settings.max_tasks_per_household)
@@ -0,0 +1,128 @@
+"""Database-side reachability queries over the task dependency graph.
+
+Both cycle detection and the "available dependencies" lookup only need to
+know which tasks transitively depend on a given task. These helpers build
+that set with a ``WITH RECURSIVE`` query scoped to one household, so the
+graph walk runs inside Postgres and only the final answer is transferred.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import CTE, exists, select
+from sqlalchemy.orm import selectinload
+
+from app.models.task import Task, task_dependencies
+
+if TYPE_CHECKING:  # pragma: no cover
+    import uuid
+    from collections.abc import Collection, Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dependents_cte(task_id: uuid.UUID, household_id: uuid.UUID) -> CTE:
+    """Return a recursive CTE of every task that depends on ``task_id``.
+
+    Follows ``task_dependencies`` from the dependency side to the dependent
+    side, limited to tasks of the given household. ``UNION`` (rather than
+    ``UNION ALL``) de-duplicates rows, so the walk terminates even if the
+    stored graph already contains a cycle.
+    """
+    edges = task_dependencies.c
+    dependents = (
+        select(edges.task_id.label("id"))
+        .join(Task, Task.id == edges.task_id)
+        .where(
+            edges.depends_on_task_id == task_id,
+            Task.household_id == household_id,
+        )
+        .cte("dependents", recursive=True)
+    )
+    return dependents.union(
+        select(edges.task_id)
+        .join(dependents, edges.depends_on_task_id == dependents.c.id)
+        .join(Task, Task.id == edges.task_id)
+        .where(Task.household_id == household_id)
+    )
+
+
+async def would_create_cycle(
+    db: AsyncSession,
+    household_id: uuid.UUID,
+    task_id: uuid.UUID,
+    depends_on_id: uuid.UUID,
+) -> bool:
+    """Check if adding ``task_id -> depends_on_id`` creates a cycle.
+
+    The new edge closes a loop exactly when ``depends_on_id`` already
+    (transitively) depends on ``task_id``.
+    """
+    if task_id == depends_on_id:
+        return True
+    dependents = dependents_cte(task_id, household_id)
+    stmt = select(
+        exists().where(dependents.c.id == depends_on_id).select_from(dependents)
+    )
+    return bool((await db.execute(stmt)).scalar())
+
+
+async def has_cycle_through(
+    db: AsyncSession, task_ids: Collection[uuid.UUID]
+) -> bool:
+    """Check if any of ``task_ids`` (transitively) depends on itself.
+
+    Walks the stored graph from every given task along its dependencies at
+    once, so a batch of edge changes is checked with a single query after
+    it has been flushed.
+    """
+    if not task_ids:
+        return False
+    edges = task_dependencies.c
+    walk = (
+        select(
+            edges.task_id.label("origin"),
+            edges.depends_on_task_id.label("id"),
+        )
+        .where(edges.task_id.in_(task_ids))
+        .cte("walk", recursive=True)
+    )
+    walk = walk.union(
+        select(walk.c.origin, edges.depends_on_task_id).join(
+            walk, edges.task_id == walk.c.id
+        )
+    )
+    stmt = select(exists().where(walk.c.origin == walk.c.id).select_from(walk))
+    return bool((await db.execute(stmt)).scalar())
+
+
+async def get_available_dependencies(
+    db: AsyncSession,
+    household_id: uuid.UUID,
+    task_id: uuid.UUID,
+    *,
+    limit: int | None = None,
+    offset: int = 0,
+) -> Sequence[Task]:
+    """Return household tasks that ``task_id`` may depend on.
+
+    Excludes the task itself and every task that already depends on it,
+    since either would create a circular dependency. Rooms are eager loaded
+    for the summary response.
+    """
+    dependents = dependents_cte(task_id, household_id)
+    stmt = (
+        select(Task)
+        .where(
+            Task.household_id == household_id,
+            Task.id != task_id,
+            Task.id.not_in(select(dependents.c.id)),
+        )
+        .order_by(Task.created_at, Task.id)
+        .offset(offset)
+        .options(selectinload(Task.rooms))
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return (await db.execute(stmt)).scalars().all()
@@ -0,0 +1,167 @@
+"""Route read-only requests to database replicas.
+
+``get_read_database`` hands GET routes a session on one of the replicas in
+``DB_REPLICA_HOSTS``, chosen round-robin. A replica that fails to connect is
+skipped for ``REPLICA_RETRY_AFTER`` seconds, and when no replica is
+available (or none is configured) reads use the primary session from
+``get_database``.
+
+Replicas lag behind the primary, so a client that has just changed
+something could read the old data back. After a successful mutating
+request, ``ReadYourWritesMiddleware`` therefore gives the client a
+``read_primary_until`` cookie and ``X-Read-Primary-Until`` header; while
+either is sent back and has not expired, reads stay on the primary.
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Annotated, Any
+
+from fastapi import Depends, Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.config.settings import get_settings
+from app.database.db import engine_options, get_database, get_database_url
+from app.logs import LogCategory, category_logger
+from app.metrics import track_db_pool_usage
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import AsyncGenerator
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+# Seconds to skip a replica after it failed to connect.
+REPLICA_RETRY_AFTER = 30
+
+
+@dataclass
+class Replica:
+    """One read replica and its health."""
+
+    name: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker[AsyncSession]
+    # time.monotonic() before which the replica is skipped.
+    down_until: float = field(default=0.0)
+
+
+class ReplicaSet:
+    """Round-robin choice among the replicas that are currently healthy."""
+
+    def __init__(self, replicas: list[Replica]) -> None:
+        """Create a set over the given replicas."""
+        self.replicas = replicas
+        self._turn = itertools.count()
+
+    @classmethod
+    def from_settings(cls) -> ReplicaSet:
+        """Create engines for the hosts in ``DB_REPLICA_HOSTS``.
+
+        Each entry is ``host`` or ``host:port``; the port defaults to
+        ``DB_PORT``, and the credentials and database name are the
+        primary's.
+        """
+        primary = make_url(get_database_url())
+        replicas = []
+        for entry in get_settings().db_replica_hosts.split(","):
+            name = entry.strip()
+            host, _, port = name.partition(":")
+            if not host:
+                continue
+            url = primary.set(host=host, port=int(port) if port else None)
+            engine = create_async_engine(url, echo=False, **engine_options())
+            track_db_pool_usage(engine.sync_engine.pool, engine=name)
+            replicas.append(
+                Replica(
+                    name=name,
+                    engine=engine,
+                    sessionmaker=async_sessionmaker(
+                        engine, expire_on_commit=False
+                    ),
+                )
+            )
+        return cls(replicas)
+
+    def __bool__(self) -> bool:
+        """Return True if any replica is configured."""
+        return bool(self.replicas)
+
+    def choose(self) -> Replica | None:
+        """Return the next healthy replica, or None if all are down."""
+        now = time.monotonic()
+        start = next(self._turn)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.down_until <= now:
+                return replica
+        return None
+
+    async def dispose(self) -> None:
+        """Close every replica's connection pool."""
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    @staticmethod
+    def mark_down(replica: Replica, error: Exception) -> None:
+        """Skip a replica for ``REPLICA_RETRY_AFTER`` seconds."""
+        replica.down_until = time.monotonic() + REPLICA_RETRY_AFTER
+        category_logger.error(
+            "Read replica {} unavailable, using others for {}s: {}",
+            LogCategory.DATABASE,
+            replica.name,
+            REPLICA_RETRY_AFTER,
+            error,
+        )
+
+
+replicas = ReplicaSet.from_settings()
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Return True inside the client's read-your-writes window."""
+    value = request.cookies.get(READ_PRIMARY_COOKIE) or request.headers.get(
+        READ_PRIMARY_HEADER
+    )
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_database(
+    request: Request,
+    primary: Annotated[AsyncSession, Depends(get_database)],
+) -> AsyncGenerator[AsyncSession, Any]:
+    """Return a session for read-only work, on a replica if possible.
+
+    The primary session is the same one ``get_database`` gives the rest of
+    the request, and only connects if it is used.
+    """
+    replica = (
+        replicas.choose()
+        if replicas and not reads_from_primary(request)
+        else None
+    )
+    if replica is None:
+        yield primary
+        return
+    async with replica.sessionmaker() as session:
+        try:
+            await session.connection()
+        except (DBAPIError, OSError) as e:
+            replicas.mark_down(replica, e)
+            yield primary
+            return
+        yield session
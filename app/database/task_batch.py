@@ -0,0 +1,264 @@
+"""Apply a batch of task operations in a single transaction.
+
+``POST /tasks/batch`` lets clients such as plan importers create, update,
+re-status and delete many tasks in one request. Rather than repeating the
+per-task route work for every operation, a batch:
+
+- loads every referenced task and room with one ``IN`` query each,
+- checks the task quota once, for the net number of new tasks,
+- flushes all changes together, so the new tasks are sent as a single
+  batched ``INSERT`` rather than one round trip per task,
+- and checks every changed dependency edge for cycles with one recursive
+  query.
+
+Blocked status is kept current by ``app.database.propagation`` when the
+changes are flushed.
+
+Errors are raised before the route returns, so the request transaction
+rolls back and none of the operations are applied.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.database import reachability
+from app.database.quota import check_task_quota
+from app.models.room import Room
+from app.models.task import Task, TaskStatus
+from app.schemas.request.task import (
+    BatchCreateTaskOperation,
+    BatchDeleteTaskOperation,
+    BatchTaskStatusOperation,
+    BatchUpdateTaskOperation,
+)
+from app.schemas.response.task import TaskBatchResult, TaskResponse
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.schemas.request.task import BatchTaskOperation
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _check_operations(operations: Sequence[BatchTaskOperation]) -> None:
+    """Reject batches that touch a task twice or use unknown refs."""
+    seen: set[uuid.UUID] = set()
+    refs: set[str] = set()
+    for op in operations:
+        if isinstance(op, BatchCreateTaskOperation):
+            if op.ref is not None:
+                if op.ref in refs:
+                    msg = f"Duplicate task reference: {op.ref}"
+                    raise _bad_request(msg)
+                refs.add(op.ref)
+        elif op.id in seen:
+            msg = f"Task {op.id} appears in more than one operation"
+            raise _bad_request(msg)
+        else:
+            seen.add(op.id)
+
+    for op in operations:
+        if isinstance(op, BatchCreateTaskOperation):
+            for ref in op.dependency_refs or []:
+                if ref not in refs:
+                    msg = f"Unknown task reference: {ref}"
+                    raise _bad_request(msg)
+
+
+async def _load_tasks(
+    db: AsyncSession, household_id: uuid.UUID, task_ids: set[uuid.UUID]
+) -> dict[uuid.UUID, Task]:
+    """Load the given household tasks, or raise 404 if any is missing."""
+    if not task_ids:
+        return {}
+    tasks = (
+        (
+            await db.execute(
+                select(Task)
+                .where(Task.id.in_(task_ids), Task.household_id == household_id)
+                .options(
+                    selectinload(Task.rooms),
+                    selectinload(Task.depends_on),
+                    selectinload(Task.depended_by),
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if len(tasks) != len(task_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    return {task.id: task for task in tasks}
+
+
+async def _load_rooms(
+    db: AsyncSession, household_id: uuid.UUID, room_ids: set[uuid.UUID]
+) -> dict[uuid.UUID, Room]:
+    """Load the given household rooms, or raise 404 if any is missing."""
+    if not room_ids:
+        return {}
+    rooms = (
+        (
+            await db.execute(
+                select(Room).where(
+                    Room.id.in_(room_ids), Room.household_id == household_id
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if len(rooms) != len(room_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
+        )
+    return {room.id: room for room in rooms}
+
+
+def _new_task(op: BatchCreateTaskOperation, household_id: uuid.UUID) -> Task:
+    return Task(
+        id=uuid.uuid4(),
+        household_id=household_id,
+        title=op.title,
+        description=op.description,
+        priority=op.priority,
+        difficulty=op.difficulty,
+        status=op.status or TaskStatus.not_started,
+        assigned_user_id=op.assigned_user_id,
+    )
+
+
+def _apply_update(
+    task: Task,
+    op: BatchUpdateTaskOperation,
+    tasks: dict[uuid.UUID, Task],
+    rooms: dict[uuid.UUID, Room],
+) -> None:
+    """Apply the fields set in an update operation, like PUT /tasks/{id}."""
+    if op.title is not None:
+        task.title = op.title
+    if op.description is not None:
+        task.description = op.description
+    if op.priority is not None:
+        task.priority = op.priority
+    if op.difficulty is not None:
+        task.difficulty = op.difficulty
+    if op.status is not None:
+        task.status = op.status
+    if op.assigned_user_id is not None:
+        task.assigned_user_id = op.assigned_user_id
+    if op.room_ids is not None:
+        task.rooms = [rooms[room_id] for room_id in dict.fromkeys(op.room_ids)]
+    if op.dependency_ids is not None:
+        task.depends_on = [
+            tasks[dep_id] for dep_id in dict.fromkeys(op.dependency_ids)
+        ]
+
+
+def _referenced_ids(
+    operations: Sequence[BatchTaskOperation],
+) -> tuple[set[uuid.UUID], set[uuid.UUID], set[uuid.UUID]]:
+    """Return the task, dependency and room ids the operations refer to."""
+    task_ids: set[uuid.UUID] = set()
+    dependency_ids: set[uuid.UUID] = set()
+    room_ids: set[uuid.UUID] = set()
+    for op in operations:
+        if not isinstance(op, BatchCreateTaskOperation):
+            task_ids.add(op.id)
+        if isinstance(op, (BatchCreateTaskOperation, BatchUpdateTaskOperation)):
+            dependency_ids.update(op.dependency_ids or [])
+            room_ids.update(op.room_ids or [])
+    return task_ids, dependency_ids, room_ids
+
+
+async def apply_task_batch(
+    db: AsyncSession,
+    household_id: uuid.UUID,
+    operations: Sequence[BatchTaskOperation],
+) -> list[TaskBatchResult]:
+    """Apply the operations in order and return one result per operation.
+
+    Raises HTTPException 400 for inconsistent batches or circular
+    dependencies, 404 if a task or room does not belong to the household,
+    and 403 if the creates would exceed the task quota.
+    """
+    _check_operations(operations)
+    task_ids, dependency_ids, room_ids = _referenced_ids(operations)
+    deleted_ids = {
+        op.id for op in operations if isinstance(op, BatchDeleteTaskOperation)
+    }
+    if deleted_ids & dependency_ids:
+        msg = "A task deleted in this batch cannot be a dependency"
+        raise _bad_request(msg)
+
+    tasks = await _load_tasks(db, household_id, task_ids | dependency_ids)
+    rooms = await _load_rooms(db, household_id, room_ids)
+    creates = [
+        op for op in operations if isinstance(op, BatchCreateTaskOperation)
+    ]
+    await check_task_quota(db, household_id, len(creates) - len(deleted_ids))
+
+    # Build every new task up front so dependency refs can point forward.
+    new_tasks = {id(op): _new_task(op, household_id) for op in creates}
+    refs = {op.ref: new_tasks[id(op)] for op in creates if op.ref is not None}
+
+    # Tasks with new dependency edges, checked for cycles after the flush.
+    rewired: set[uuid.UUID] = set()
+    applied: list[tuple[BatchTaskOperation, Task]] = []
+    for op in operations:
+        if isinstance(op, BatchCreateTaskOperation):
+            task = new_tasks[id(op)]
+            task.rooms = [
+                rooms[room_id] for room_id in dict.fromkeys(op.room_ids or [])
+            ]
+            task.depends_on = [
+                tasks[dep_id]
+                for dep_id in dict.fromkeys(op.dependency_ids or [])
+            ] + [refs[ref] for ref in dict.fromkeys(op.dependency_refs or [])]
+            db.add(task)
+            rewire = bool(task.depends_on)
+        elif isinstance(op, BatchDeleteTaskOperation):
+            task = tasks[op.id]
+            await db.delete(task)
+            rewire = False
+        else:
+            task = tasks[op.id]
+            if isinstance(op, BatchTaskStatusOperation):
+                task.status = op.status
+                rewire = False
+            else:
+                _apply_update(task, op, tasks, rooms)
+                rewire = op.dependency_ids is not None
+        if rewire:
+            rewired.add(task.id)
+        applied.append((op, task))
+
+    await db.flush()
+    if await reachability.has_cycle_through(db, rewired):
+        msg = "Circular dependency detected"
+        raise _bad_request(msg)
+
+    return [
+        TaskBatchResult(
+            op=op.op,
+            id=task.id,
+            ref=op.ref if isinstance(op, BatchCreateTaskOperation) else None,
+            task=None
+            if isinstance(op, BatchDeleteTaskOperation)
+            else TaskResponse.model_validate(task),
+        )
+        for op, task in applied
+    ]
@@ -0,0 +1,192 @@
+"""Aggregated task status counts for dashboards and room statistics.
+
+Counts are read in a single ``GROUP BY status`` pass over the tasks table,
+or - when ``task_stats_use_counters`` is enabled - from the materialized
+``task_status_counts`` table, which turns dashboard polling into a keyed
+read of at most four rows.
+
+The counter table is kept current by a ``before_flush`` hook that turns
+every ORM-level task insert, status change, room re-assignment and delete
+into per-scope deltas, applied with an atomic upsert in the same
+transaction as the change itself. Statements that bypass the ORM unit of
+work (bulk ``UPDATE``/``DELETE``) must adjust the counters themselves.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+from app.models.room import Room
+from app.models.task import Task, TaskStatus, task_rooms, task_status_counts
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import UOWTransaction
+
+# (scope_id, household_id, status) -> change in task count.
+StatusDeltas = Counter[tuple[uuid.UUID, uuid.UUID, TaskStatus]]
+
+
+def _as_mapping(rows: Any) -> dict[TaskStatus, int]:  # noqa: ANN401
+    """Convert ``(status, count)`` rows to a status mapping."""
+    counts = dict.fromkeys(TaskStatus, 0)
+    for task_status, count in rows:
+        counts[TaskStatus(task_status)] = max(int(count), 0)
+    return counts
+
+
+async def household_status_counts(
+    db: AsyncSession, household_id: uuid.UUID
+) -> dict[TaskStatus, int]:
+    """Return the number of tasks per status for a household."""
+    if get_settings().task_stats_use_counters:
+        return await _counter_status_counts(db, household_id)
+    stmt = (
+        select(Task.status, func.count())
+        .where(Task.household_id == household_id)
+        .group_by(Task.status)
+    )
+    return _as_mapping((await db.execute(stmt)).all())
+
+
+async def room_status_counts(
+    db: AsyncSession, room_id: uuid.UUID
+) -> dict[TaskStatus, int]:
+    """Return the number of tasks per status assigned to a room."""
+    if get_settings().task_stats_use_counters:
+        return await _counter_status_counts(db, room_id)
+    stmt = (
+        select(Task.status, func.count())
+        .join(task_rooms, task_rooms.c.task_id == Task.id)
+        .where(task_rooms.c.room_id == room_id)
+        .group_by(Task.status)
+    )
+    return _as_mapping((await db.execute(stmt)).all())
+
+
+async def _counter_status_counts(
+    db: AsyncSession, scope_id: uuid.UUID
+) -> dict[TaskStatus, int]:
+    """Read the materialized counters for a household or room."""
+    counters = task_status_counts.c
+    stmt = select(counters.status, counters.count).where(
+        counters.scope_id == scope_id
+    )
+    return _as_mapping((await db.execute(stmt)).all())
+
+
+def _scalar_history(task: Task, key: str) -> tuple[Any, Any]:
+    """Return the ``(committed, current)`` values of a scalar attribute."""
+    history = inspect(task).attrs[key].load_history()
+    current = (history.added or history.unchanged or [None])[0]
+    committed = (history.deleted or history.unchanged or [None])[0]
+    return committed, current
+
+
+def _room_history(task: Task) -> tuple[set[uuid.UUID], set[uuid.UUID]]:
+    """Return the ``(committed, current)`` room ids of a task."""
+    history = inspect(task).attrs["rooms"].load_history()
+    unchanged = {room.id for room in history.unchanged}
+    return (
+        unchanged | {room.id for room in history.deleted},
+        unchanged | {room.id for room in history.added},
+    )
+
+
+def _rooms_changed(task: Task) -> bool:
+    """Return whether a task's rooms have pending changes, without loading."""
+    return inspect(task).attrs["rooms"].history.has_changes()
+
+
+def _add_task(
+    deltas: StatusDeltas,
+    household_id: uuid.UUID,
+    task_status: TaskStatus | None,
+    room_ids: set[uuid.UUID],
+    sign: int,
+) -> None:
+    """Count one task in its household scope and every room scope."""
+    task_status = task_status or TaskStatus.not_started
+    for scope_id in (household_id, *room_ids):
+        deltas[(scope_id, household_id, task_status)] += sign
+
+
+def collect_status_deltas(session: Session) -> StatusDeltas:
+    """Compute counter deltas for the pending task changes in a session."""
+    deltas: StatusDeltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, Task):
+            _, task_status = _scalar_history(obj, "status")
+            _, rooms = _room_history(obj)
+            _add_task(deltas, obj.household_id, task_status, rooms, 1)
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            task_status, _ = _scalar_history(obj, "status")
+            rooms, _ = _room_history(obj)
+            _add_task(deltas, obj.household_id, task_status, rooms, -1)
+    for obj in session.dirty:
+        if not isinstance(obj, Task) or not session.is_modified(obj):
+            continue
+        old_status, new_status = _scalar_history(obj, "status")
+        # Most edits touch neither field; checking the pending room history
+        # first saves lazy-loading the rooms of every edited task.
+        if old_status == new_status and not _rooms_changed(obj):
+            continue
+        old_rooms, new_rooms = _room_history(obj)
+        if old_status == new_status and old_rooms == new_rooms:
+            continue
+        _add_task(deltas, obj.household_id, old_status, old_rooms, -1)
+        _add_task(deltas, obj.household_id, new_status, new_rooms, 1)
+    return Counter({key: delta for key, delta in deltas.items() if delta})
+
+
+def apply_status_deltas(session: Session, deltas: StatusDeltas) -> None:
+    """Add ``deltas`` to the counter table with a single upsert."""
+    if not deltas:
+        return
+    rows = [
+        {
+            "scope_id": scope_id,
+            "household_id": household_id,
+            "status": task_status,
+            "count": delta,
+        }
+        # Sorted so concurrent transactions lock counter rows in the same
+        # order and cannot deadlock each other.
+        for (scope_id, household_id, task_status), delta in sorted(
+            deltas.items(), key=lambda item: (str(item[0][0]), item[0][2])
+        )
+    ]
+    stmt = insert(task_status_counts)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            task_status_counts.c.scope_id,
+            task_status_counts.c.status,
+        ],
+        set_={"count": task_status_counts.c.count + stmt.excluded.count},
+    )
+    session.connection().execute(stmt, rows)
+
+
+@event.listens_for(Session, "before_flush")
+def _maintain_status_counts(
+    session: Session,
+    flush_context: UOWTransaction,  # noqa: ARG001
+    instances: object,  # noqa: ARG001
+) -> None:
+    """Keep ``task_status_counts`` in step with the pending task changes."""
+    apply_status_deltas(session, collect_status_deltas(session))
+    room_ids = [obj.id for obj in session.deleted if isinstance(obj, Room)]
+    if room_ids:
+        session.connection().execute(
+            delete(task_status_counts).where(
+                task_status_counts.c.scope_id.in_(room_ids)
+            )
+        )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 from typing import TYPE_CHECKING
 
 from loguru import logger
@@ -12,38 +13,50 @@ if TYPE_CHECKING:
     from loguru import Logger
 
 
+def _should_log(level_no: int, category: LogCategory) -> bool:
+    """Check the level, then the category, before a message is built."""
+    return log_config.accepts(level_no) and log_config.is_enabled(category)
+
+
 class CategoryLogger:
     """Logger wrapper that checks categories before logging.
 
     This eliminates the need for if-statements in calling code, reducing
     cyclomatic complexity.
+
+    Pass the values in a message as ``args`` (``"User {} logged in",
+    LogCategory.AUTH, user.id``) rather than in an f-string: the message is
+    only formatted, ``str.format`` style, if it is logged.
     """
 
     def __init__(self, logger: Logger) -> None:
         """Initialize with a loguru logger instance."""
         self._logger = logger
 
-    def info(self, message: str, category: LogCategory) -> None:
+    def info(self, message: str, category: LogCategory, *args: object) -> None:
         """Log an info message if the category is enabled."""
-        if log_config.is_enabled(category):
-            self._logger.info(message)
+        if _should_log(logging.INFO, category):
+            self._logger.info(message, *args)
 
-    def error(self, message: str, category: LogCategory) -> None:
+    def error(self, message: str, category: LogCategory, *args: object) -> None:
         """Log an error message if the category is enabled."""
-        if log_config.is_enabled(category):
-            self._logger.error(message)
+        if _should_log(logging.ERROR, category):
+            self._logger.error(message, *args)
 
-    def warning(self, message: str, category: LogCategory) -> None:
+    def warning(
+        self, message: str, category: LogCategory, *args: object
+    ) -> None:
         """Log a warning message if the category is enabled."""
-        if log_config.is_enabled(category):
-            self._logger.warning(message)
+        if _should_log(logging.WARNING, category):
+            self._logger.warning(message, *args)
 
-    def debug(self, message: str, category: LogCategory) -> None:
+    def debug(self, message: str, category: LogCategory, *args: object) -> None:
         """Log a debug message if the category is enabled."""
-        if log_config.is_enabled(category):
-            self._logger.debug(message)
+        if _should_log(logging.DEBUG, category):
+            self._logger.debug(message, *args)
 
 
-category_logger = CategoryLogger(logger)
+# Records name the caller of category_logger, not the wrapper method.
+category_logger = CategoryLogger(logger.opt(depth=1))
 
 __all__ = ["LogCategory", "category_logger", "log_config", "logger"]
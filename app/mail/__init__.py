@@ -0,0 +1 @@
+"""Email delivery for the application."""
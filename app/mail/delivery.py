@@ -0,0 +1,262 @@
+"""Deliver email over a small pool of persistent SMTP connections.
+
+``FastMail`` opens, authenticates and closes a new SMTP connection, with
+its TLS handshake, for every message, so a burst of invitations or
+password resets opens dozens of connections. ``PooledMail`` builds
+messages the same way but hands them to ``MAIL_POOL_SIZE`` delivery
+workers instead. Each worker keeps one logged-in connection open, takes up
+to ``MAIL_BATCH_SIZE`` queued messages at a time and sends them back to
+back over it, and closes it after ``MAIL_IDLE_TIMEOUT`` seconds without
+mail.
+
+The mail server is resolved once, without blocking the event loop, and
+again only after a connection to it fails. A message that fails on a
+connection the server has since dropped is retried once on a new one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import socket
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from aiosmtplib import SMTP, SMTPException, SMTPServerDisconnected
+from fastapi_mail import FastMail
+from fastapi_mail.fastmail import email_dispatched
+
+from app.config.settings import get_settings
+from app.logs import LogCategory, category_logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from email.message import EmailMessage, Message
+
+    from fastapi_mail import ConnectionConfig
+
+# The socket family, type, protocol and address to connect to.
+Address = tuple[socket.AddressFamily, socket.SocketKind, int, Any]
+
+
+@dataclass
+class _Delivery:
+    """A queued message and the future its sender waits on."""
+
+    message: EmailMessage | Message
+    done: asyncio.Future[None] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+_queue: asyncio.Queue[_Delivery] | None = None
+_workers: list[asyncio.Task[None]] = []
+_address: Address | None = None
+# Held while looking up the address, so workers share one lookup.
+_lookup_lock: asyncio.Lock | None = None
+
+
+async def _resolve(conf: ConnectionConfig) -> Address:
+    """Return the mail server's address, looking it up on first use."""
+    global _address  # noqa: PLW0603
+    assert _lookup_lock is not None  # noqa: S101
+    async with _lookup_lock:
+        if _address is None:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                conf.MAIL_SERVER, conf.MAIL_PORT, type=socket.SOCK_STREAM
+            )
+            family, kind, proto, _, address = infos[0]
+            _address = (family, kind, proto, address)
+            category_logger.info(
+                "SMTP connection: hostname={}, resolved_ip={}, port={}",
+                LogCategory.EMAIL,
+                conf.MAIL_SERVER,
+                address[0],
+                conf.MAIL_PORT,
+            )
+        return _address
+
+
+async def _connect(conf: ConnectionConfig) -> SMTP:
+    """Open and log in to a new connection to the mail server."""
+    global _address  # noqa: PLW0603
+    family, kind, proto, address = await _resolve(conf)
+    sock = socket.socket(family, kind, proto)
+    sock.setblocking(False)
+    try:
+        await asyncio.wait_for(
+            asyncio.get_running_loop().sock_connect(sock, address),
+            conf.TIMEOUT,
+        )
+    except (OSError, asyncio.TimeoutError):
+        sock.close()
+        # The server may have moved; look it up again next time.
+        _address = None
+        raise
+
+    # Connect to the resolved address, but verify TLS certificates against
+    # the server's name.
+    smtp = SMTP(
+        hostname=conf.MAIL_SERVER,
+        sock=sock,
+        timeout=conf.TIMEOUT,
+        use_tls=conf.MAIL_SSL_TLS,
+        start_tls=conf.MAIL_STARTTLS,
+        validate_certs=conf.VALIDATE_CERTS,
+        local_hostname=conf.LOCAL_HOSTNAME,
+        cert_bundle=conf.CERT_BUNDLE,
+    )
+    try:
+        await smtp.connect()
+        if conf.USE_CREDENTIALS:
+            await smtp.login(
+                conf.MAIL_USERNAME, conf.MAIL_PASSWORD.get_secret_value()
+            )
+    except BaseException:
+        smtp.close()
+        raise
+    return smtp
+
+
+class _Worker:
+    """Sends queued messages over one connection, kept open between them."""
+
+    def __init__(
+        self, conf: ConnectionConfig, queue: asyncio.Queue[_Delivery]
+    ) -> None:
+        self.conf = conf
+        self.queue = queue
+        self.smtp: SMTP | None = None
+
+    async def run(self) -> None:
+        """Send batches of queued messages until cancelled."""
+        try:
+            while True:
+                try:
+                    batch = await self._take_batch(
+                        get_settings().mail_idle_timeout
+                    )
+                except asyncio.TimeoutError:
+                    await self.close()
+                    batch = await self._take_batch(None)
+                for delivery in batch:
+                    await self._deliver(delivery)
+        finally:
+            await self.close()
+
+    async def _take_batch(self, timeout: float | None) -> list[_Delivery]:
+        """Wait for queued messages, returning up to a batch of them."""
+        batch = [await asyncio.wait_for(self.queue.get(), timeout)]
+        limit = get_settings().mail_batch_size
+        while len(batch) < limit and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _deliver(self, delivery: _Delivery) -> None:
+        """Send one message, reporting the outcome to its sender."""
+        try:
+            await self._send(delivery.message)
+        except Exception as exc:  # noqa: BLE001
+            # Report any error to the sender; the worker must not die.
+            if not delivery.done.done():
+                delivery.done.set_exception(exc)
+        else:
+            if not delivery.done.done():
+                delivery.done.set_result(None)
+
+    async def _send(self, message: EmailMessage | Message) -> None:
+        """Send a message, connecting first if there is no connection."""
+        if self.smtp is not None and self.smtp.is_connected:
+            try:
+                await self.smtp.send_message(message)
+            except SMTPServerDisconnected:
+                # The server dropped the connection while it was idle.
+                self.smtp = None
+            else:
+                return
+        self.smtp = await _connect(self.conf)
+        await self.smtp.send_message(message)
+
+    async def close(self) -> None:
+        """Politely close the connection, if it is still open."""
+        smtp, self.smtp = self.smtp, None
+        if smtp is None or not smtp.is_connected:
+            return
+        with contextlib.suppress(SMTPException, OSError, asyncio.TimeoutError):
+            await smtp.quit()
+        smtp.close()
+
+
+def _ensure_pool(conf: ConnectionConfig) -> asyncio.Queue[_Delivery]:
+    """Return the delivery queue, starting the workers on first use."""
+    global _loop, _queue, _workers, _address, _lookup_lock  # noqa: PLW0603
+    loop = asyncio.get_running_loop()
+    if _queue is None or _loop is not loop:
+        # A pool left behind by a closed event loop (e.g. in tests) is gone.
+        _loop, _queue, _address = loop, asyncio.Queue(), None
+        _lookup_lock = asyncio.Lock()
+        _workers = [
+            loop.create_task(
+                _Worker(conf, _queue).run(), name=f"mail-delivery-{index}"
+            )
+            for index in range(max(1, get_settings().mail_pool_size))
+        ]
+    return _queue
+
+
+async def deliver(
+    conf: ConnectionConfig, message: EmailMessage | Message
+) -> None:
+    """Send a message over the connection pool, waiting until it is sent.
+
+    The pool is started with the first caller's configuration. Raises the
+    ``SMTPException`` or ``OSError`` that made sending fail.
+    """
+    delivery = _Delivery(message)
+    _ensure_pool(conf).put_nowait(delivery)
+    await delivery.done
+
+
+async def close_pool() -> None:
+    """Stop the delivery workers, closing their connections.
+
+    Messages still queued fail with ``SMTPServerDisconnected``. The pool is
+    started again on next use.
+    """
+    global _queue, _workers
+    for task in _workers:
+        task.cancel()
+    if _workers and _loop is asyncio.get_running_loop():
+        await asyncio.gather(*_workers, return_exceptions=True)
+    if _queue is not None:
+        while not _queue.empty():
+            delivery = _queue.get_nowait()
+            if not delivery.done.done():
+                delivery.done.set_exception(
+                    SMTPServerDisconnected("Mail delivery stopped")
+                )
+    _queue, _workers = None, []
+
+
+class PooledMail(FastMail):
+    """A ``FastMail`` that sends over the delivery pool.
+
+    Messages are built and templates rendered by ``FastMail``, and the
+    ``email_dispatched`` signal (``record_messages``) still fires, also
+    when ``SUPPRESS_SEND`` is set.
+    """
+
+    # FastMail sends built messages from this name-mangled method, opening
+    # a new connection; override it to send over the pool instead.
+    async def _FastMail__send_prepared_messages(  # noqa: N802
+        self, prepared_messages: list[EmailMessage | Message]
+    ) -> None:
+        if not self.config.SUPPRESS_SEND:
+            await asyncio.gather(
+                *(
+                    deliver(self.config, prepared)
+                    for prepared in prepared_messages
+                )
+            )
+        for prepared in prepared_messages:
+            email_dispatched.send(prepared)
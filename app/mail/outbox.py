@@ -0,0 +1,174 @@
+"""A durable outbox of emails, sent by a separate mail worker.
+
+``enqueue`` adds an email to the ``email_outbox`` table in the caller's
+transaction, so an invitation or registration and its email are committed
+together, and nothing is sent for a change that is rolled back. The API
+process never talks to the mail server for these emails; the mail worker
+(``api-admin mail worker``, see ``app.mail.worker``) sends them.
+
+Workers ``claim`` due emails with ``FOR UPDATE SKIP LOCKED``, so several
+can run at once, and push their next attempt ``CLAIM_LEASE`` into the
+future: an email claimed by a worker that crashed is retried after that.
+A failed email is retried after ``MAIL_OUTBOX_RETRY_BASE`` seconds,
+doubling with each attempt up to ``MAIL_OUTBOX_RETRY_MAX``. After
+``MAIL_OUTBOX_MAX_ATTEMPTS`` attempts it is dead-lettered: kept with the
+``dead`` status and its last error until it is requeued.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, cast
+
+from fastapi_mail import MessageSchema, MessageType
+from pydantic import NameEmail
+from sqlalchemy import func, select, update
+
+from app.config.settings import get_settings
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.schemas.email import EmailSchema, EmailTemplateSchema
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlalchemy import CursorResult
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# How long a claimed email is left to its worker before it is retried.
+CLAIM_LEASE = timedelta(minutes=5)
+# Longest error message kept on a failed email.
+MAX_ERROR_LENGTH = 1000
+
+
+def enqueue(
+    session: AsyncSession, email_data: EmailSchema | EmailTemplateSchema
+) -> EmailOutbox:
+    """Add an email to the outbox, to be sent once the session commits."""
+    email = EmailOutbox(
+        subject=email_data.subject,
+        recipients=[
+            {"name": recipient.name, "email": recipient.email}
+            for recipient in email_data.recipients
+        ],
+    )
+    if isinstance(email_data, EmailTemplateSchema):
+        email.template_name = email_data.template_name
+        email.template_body = email_data.body
+    else:
+        email.body = email_data.body
+    session.add(email)
+    return email
+
+
+def to_message(email: EmailOutbox) -> MessageSchema:
+    """Return the message to send for an outbox email."""
+    return MessageSchema(
+        subject=email.subject,
+        recipients=[
+            NameEmail(recipient["name"], recipient["email"])
+            for recipient in email.recipients
+        ],
+        body=email.body,
+        template_body=email.template_body,
+        subtype=MessageType.html,
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Return how long to wait before retrying an email after a failure."""
+    settings = get_settings()
+    delay = settings.mail_outbox_retry_base * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.mail_outbox_retry_max))
+
+
+async def claim(session: AsyncSession, limit: int) -> list[EmailOutbox]:
+    """Claim up to ``limit`` due emails, oldest first, for this worker.
+
+    Commit the session to release the rows to other workers, which skip
+    them until the claim expires.
+    """
+    now = datetime.now(timezone.utc)
+    emails = list(
+        await session.scalars(
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status == OutboxStatus.pending,
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+    )
+    for email in emails:
+        email.attempts += 1
+        email.next_attempt_at = now + CLAIM_LEASE
+    return emails
+
+
+async def mark_sent(session: AsyncSession, email_id: int) -> None:
+    """Record that an email was sent."""
+    await session.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == email_id)
+        .values(
+            status=OutboxStatus.sent,
+            sent_at=datetime.now(timezone.utc),
+            last_error=None,
+        )
+    )
+
+
+async def mark_failed(
+    session: AsyncSession, email: EmailOutbox, error: str
+) -> OutboxStatus:
+    """Schedule a retry of a failed email, or dead-letter it.
+
+    Returns the email's new status.
+    """
+    status = (
+        OutboxStatus.dead
+        if email.attempts >= get_settings().mail_outbox_max_attempts
+        else OutboxStatus.pending
+    )
+    await session.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == email.id)
+        .values(
+            status=status,
+            next_attempt_at=datetime.now(timezone.utc)
+            + retry_delay(email.attempts),
+            last_error=error[:MAX_ERROR_LENGTH],
+        )
+    )
+    return status
+
+
+async def backlog(session: AsyncSession) -> int:
+    """Return the number of emails waiting to be sent."""
+    return (
+        await session.scalar(
+            select(func.count())
+            .select_from(EmailOutbox)
+            .where(EmailOutbox.status == OutboxStatus.pending)
+        )
+        or 0
+    )
+
+
+async def requeue_dead(session: AsyncSession) -> int:
+    """Give dead-lettered emails a fresh set of attempts, now.
+
+    Returns the number of emails requeued.
+    """
+    result = cast(
+        "CursorResult[Any]",
+        await session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.status == OutboxStatus.dead)
+            .values(
+                status=OutboxStatus.pending,
+                attempts=0,
+                next_attempt_at=datetime.now(timezone.utc),
+            )
+        ),
+    )
+    return result.rowcount
@@ -0,0 +1,133 @@
+"""Render email templates compiled once per process.
+
+``FastMail`` builds a new Jinja ``Environment`` for every message it
+renders from a template, so each send reloads, parses and compiles the
+template again. ``load_templates`` compiles every template in
+``app/templates/email`` once instead, when the mail worker starts, and
+``render`` reuses them.
+
+Values that only depend on the settings (``application``, ``base_url``
+and ``frontend_url``) are pre-rendered: they are folded into the compiled
+template as constant text, so a message only renders its own values and
+callers need not pass the static ones. Compiled templates are kept in a
+Jinja bytecode cache (``MAIL_TEMPLATE_CACHE_DIR``, or the system temporary
+directory), so other processes and restarts skip the compile step too,
+until a template or a static value changes.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from jinja2 import (
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    TemplateNotFound,
+    nodes,
+)
+from jinja2.visitor import NodeTransformer
+
+from app.config.settings import get_settings
+from app.logs import LogCategory, category_logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from jinja2 import Template
+
+TEMPLATE_FOLDER = Path(__file__).parent.parent / "templates" / "email"
+
+_templates: dict[str, Template] = {}
+
+
+def static_context() -> dict[str, str]:
+    """Return the template values that are the same for every message."""
+    settings = get_settings()
+    return {
+        "application": settings.api_title,
+        "base_url": settings.base_url,
+        "frontend_url": settings.frontend_url or settings.base_url,
+    }
+
+
+class _FoldStatic(NodeTransformer):
+    """Replace the static template variables with their values.
+
+    Jinja then compiles the output around them to constant text. Templates
+    must not assign to these names.
+    """
+
+    def __init__(self, context: dict[str, str]) -> None:
+        self.context = context
+
+    def visit_Name(self, node: nodes.Name) -> nodes.Node:  # noqa: N802
+        """Return a constant for a static variable, else the name."""
+        if node.ctx == "load" and node.name in self.context:
+            return nodes.Const(self.context[node.name], lineno=node.lineno)
+        return node
+
+
+def _compile(
+    env: Environment,
+    loader: FileSystemLoader,
+    cache: BytecodeCache,
+    name: str,
+    context: dict[str, str],
+) -> Template:
+    """Compile a template with the static values folded in.
+
+    The bytecode cache is keyed on the template source and the static
+    values, so a change to either compiles the template again.
+    """
+    source, filename, _ = loader.get_source(env, name)
+    bucket = cache.get_bucket(
+        env, name, filename, source + json.dumps(context, sort_keys=True)
+    )
+    if bucket.code is None:
+        ast = _FoldStatic(context).visit(env.parse(source, name, filename))
+        bucket.code = env.compile(ast, name, filename)
+        cache.set_bucket(bucket)
+    return env.template_class.from_code(
+        env, bucket.code, env.make_globals(None)
+    )
+
+
+def load_templates() -> None:
+    """Compile every email template, replacing any compiled before."""
+    global _templates  # noqa: PLW0603
+    cache_dir = get_settings().mail_template_cache_dir or None
+    if cache_dir:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    loader = FileSystemLoader(TEMPLATE_FOLDER)
+    cache = FileSystemBytecodeCache(cache_dir)
+    # Not autoescaped, as FastMail rendered them.
+    env = Environment(  # noqa: S701
+        loader=loader, bytecode_cache=cache, auto_reload=False
+    )
+    context = static_context()
+    _templates = {
+        name: _compile(env, loader, cache, name, context)
+        for name in loader.list_templates()
+    }
+    category_logger.info(
+        "Compiled {} email template(s)",
+        LogCategory.EMAIL,
+        len(_templates),
+    )
+
+
+def render(template_name: str, body: dict[str, Any] | None) -> str:
+    """Render a template with a message's values.
+
+    Compiles the templates on first use if they were not loaded at
+    startup. Raises ``TemplateNotFound`` for an unknown template.
+    """
+    if not _templates:
+        load_templates()
+    try:
+        template = _templates[template_name]
+    except KeyError:
+        raise TemplateNotFound(template_name) from None
+    return template.render(body or {})
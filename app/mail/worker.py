@@ -0,0 +1,116 @@
+"""Send the emails queued in the outbox.
+
+Run with ``api-admin mail worker``, alongside the API. Each poll claims up
+to ``MAIL_OUTBOX_BATCH_SIZE`` due emails and sends at most
+``MAIL_OUTBOX_CONCURRENCY`` of them at once over the SMTP connection pool.
+The outcome of each email is committed as soon as it is known, so a worker
+that stops mid-batch does not send the rest again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from app.config.settings import get_settings
+from app.database.db import async_session
+from app.logs import LogCategory, category_logger
+from app.mail import outbox, templates
+from app.mail.delivery import close_pool
+from app.managers.email import EmailManager
+from app.metrics import (
+    increment_email_outbox_result,
+    observe_email_delivery,
+    set_email_outbox_backlog,
+)
+from app.models.email_outbox import OutboxStatus
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from app.models.email_outbox import EmailOutbox
+
+
+async def _send(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    manager: EmailManager,
+    email: EmailOutbox,
+    limit: asyncio.Semaphore,
+) -> None:
+    """Send one claimed email and record the outcome."""
+    async with limit:
+        start = time.perf_counter()
+        try:
+            await manager.send(outbox.to_message(email), email.template_name)
+        except Exception as exc:  # noqa: BLE001
+            error = f"{type(exc).__name__}: {exc}"
+            async with sessionmaker() as session, session.begin():
+                status = await outbox.mark_failed(session, email, error)
+            result = "dead" if status == OutboxStatus.dead else "retry"
+            increment_email_outbox_result(result)
+            category_logger.error(
+                "Failed to send email {} (attempt {}, {}): {}",
+                LogCategory.ERRORS,
+                email.id,
+                email.attempts,
+                result,
+                error,
+            )
+            return
+        sent = time.perf_counter()
+        async with sessionmaker() as session, session.begin():
+            await outbox.mark_sent(session, email.id)
+    increment_email_outbox_result("sent")
+    observe_email_delivery(
+        sent - start,
+        (datetime.now(timezone.utc) - email.created_at).total_seconds(),
+    )
+    category_logger.info(
+        "Email {} sent: '{}'",
+        LogCategory.EMAIL,
+        email.id,
+        email.subject,
+    )
+
+
+async def process_due(
+    sessionmaker: async_sessionmaker[AsyncSession] = async_session,
+    manager: EmailManager | None = None,
+) -> int:
+    """Send the emails that are due, returning how many were claimed."""
+    settings = get_settings()
+    async with sessionmaker() as session, session.begin():
+        emails = await outbox.claim(session, settings.mail_outbox_batch_size)
+    limit = asyncio.Semaphore(max(1, settings.mail_outbox_concurrency))
+    manager = manager or EmailManager()
+    await asyncio.gather(
+        *(_send(sessionmaker, manager, email, limit) for email in emails)
+    )
+    async with sessionmaker() as session:
+        set_email_outbox_backlog(await outbox.backlog(session))
+    return len(emails)
+
+
+async def run_worker(
+    stop: asyncio.Event,
+    sessionmaker: async_sessionmaker[AsyncSession] = async_session,
+) -> None:
+    """Send queued emails until ``stop`` is set."""
+    templates.load_templates()
+    manager = EmailManager()
+    category_logger.info("Mail worker started", LogCategory.EMAIL)
+    try:
+        while not stop.is_set():
+            claimed = await process_due(sessionmaker, manager)
+            if claimed < get_settings().mail_outbox_batch_size:
+                # Caught up; wait for more email.
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        stop.wait(), get_settings().mail_outbox_poll_interval
+                    )
+    finally:
+        await close_pool()
+        category_logger.info("Mail worker stopped", LogCategory.EMAIL)
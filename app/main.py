@@ -1,5 +1,6 @@
 """Main file for the FastAPI Template."""
 
+import asyncio
 import logging
 import sys
 from collections.abc import AsyncGenerator
@@ -17,19 +18,27 @@ from loguru import logger as loguru_logger
 from redis import RedisError
 from redis.asyncio import Redis
 from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+from slowapi.middleware import SlowAPIASGIMiddleware
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.admin import register_admin
+from app.cache.tiered import TieredBackend
 from app.config.helpers import get_api_version, get_project_root
-from app.config.log_config import get_log_config
+from app.config.log_config import close_log_writer, get_log_config
 from app.config.openapi import custom_openapi
 from app.config.settings import get_settings
 from app.database.db import async_session
+from app.database.hashing import shutdown_hash_pool
+from app.database.replica import READ_PRIMARY_HEADER, replicas
+from app.mail.delivery import close_pool
 from app.metrics.instrumentator import register_metrics
-from app.middleware.cache_logging import CacheLoggingMiddleware
-from app.middleware.logging_middleware import LoggingMiddleware
-from app.rate_limit import limiter
+from app.middleware.observability import ObservabilityMiddleware
+from app.middleware.rate_limit_headers import (
+    RATE_LIMIT_HEADERS,
+    RateLimitHeadersMiddleware,
+)
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.rate_limit import gcra, limiter
 from app.rate_limit.handlers import rate_limit_handler
 from app.resources import config_error
 from app.resources.routes import api_router
@@ -62,6 +71,30 @@ if not get_settings().i_read_the_damn_docs:
     sys.exit(BLIND_USER_ERROR)
 
 
+async def init_redis_cache(redis_client: "Redis[bytes]") -> None:
+    """Cache responses in Redis, behind a local tier if CACHE_LOCAL_TTL > 0."""
+    backend = RedisBackend(redis_client)
+    if get_settings().cache_local_ttl <= 0:
+        FastAPICache.init(backend, prefix="fastapi-cache")
+        return
+    tiered = TieredBackend(
+        backend,
+        local_ttl=get_settings().cache_local_ttl,
+        maxsize=get_settings().cache_local_maxsize,
+    )
+    FastAPICache.init(tiered, prefix="fastapi-cache")
+    await tiered.start()
+
+
+async def close_redis_cache(redis_client: "Redis[bytes]") -> None:
+    """Stop the local tier's invalidation listener and close Redis."""
+    tiered = TieredBackend.current()
+    if tiered is not None:
+        await tiered.stop()
+    await redis_client.close()
+    logger.info("Redis connection closed.")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[Any, None]:
     """Lifespan function Replaces the previous startup/shutdown functions.
@@ -117,10 +150,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, None]:
                     decode_responses=False,
                 )
                 await redis_client.ping()
-                FastAPICache.init(
-                    RedisBackend(redis_client),
-                    prefix="fastapi-cache",
-                )
+                await init_redis_cache(redis_client)
                 logger.info("Redis cache backend initialized successfully.")
             except (ConnectionError, TimeoutError, RedisError, OSError) as e:
                 logger.warning(
@@ -140,13 +170,27 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, None]:
 
     yield
 
-    # Ensure loguru queue is drained before shutdown to avoid warnings.
+    # Let in-flight password hashes finish, then stop the hashing pool. The
+    # wait runs on a thread so the loop can still serve other shutdown work.
+    await asyncio.to_thread(shutdown_hash_pool)
+
+    # Close the read replica connection pools, if any.
+    await replicas.dispose()
+
+    # Close the rate limiter's Redis connection, if any.
+    await gcra.close_redis()
+
+    # Close the pooled SMTP connections, if any.
+    await close_pool()
+
+    # Ensure loguru queue is drained before shutdown to avoid warnings,
+    # and write out the log messages still waiting for the log writer.
     loguru_logger.complete()
+    close_log_writer()
 
     # Cleanup: Close Redis connection if it was opened
     if redis_client:
-        await redis_client.close()
-        logger.info("Redis connection closed.")
+        await close_redis_cache(redis_client)
 
 
 app = FastAPI(
@@ -193,19 +237,25 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[READ_PRIMARY_HEADER, "Retry-After", *RATE_LIMIT_HEADERS],
 )
 
-# Add logging middleware
-app.add_middleware(LoggingMiddleware)
+# Keep clients reading from the primary for a moment after each change,
+# so a lagging read replica does not hide their own writes.
+if replicas:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Report the remaining rate limit budget on rate limited routes
+app.add_middleware(RateLimitHeadersMiddleware)
 
-# Add cache logging middleware
-app.add_middleware(CacheLoggingMiddleware)
+# Add request and cache logging middleware
+app.add_middleware(ObservabilityMiddleware)
 
 # Add SlowAPI middleware and state (required for rate limiting)
 # NOTE: app.state.limiter must be set regardless of rate_limit_enabled
 # The limiter itself has enabled=False when rate limiting is disabled
 app.state.limiter = limiter
-app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(SlowAPIASGIMiddleware)
 
 # Add pagination support
 add_pagination(app)
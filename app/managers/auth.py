@@ -4,19 +4,27 @@ import datetime
 import secrets
 
 import jwt
-from fastapi import BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import NameEmail
 from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.log_context import annotate_request
 from app.config.settings import get_settings
 from app.database.db import get_database
+from app.database.hashing import run_in_hash_pool
 from app.database.helpers import (
     get_user_by_email_,
     get_user_by_id_,
+    get_user_with_household_,
     hash_password,
 )
+from app.database.principal import (
+    Principal,
+    get_principal,
+    invalidate_principal,
+)
 from app.logs import LogCategory, category_logger
 from app.managers.email import EmailManager
 from app.managers.helpers import MAX_JWT_TOKEN_LENGTH, is_valid_jwt_format
@@ -70,15 +78,19 @@ class AuthManager:
         except (jwt.PyJWTError, AttributeError) as exc:
             user_id = getattr(user, "id", "unknown")
             category_logger.error(
-                f"Failed to generate JWT for user {user_id}: {exc}",
+                "Failed to generate JWT for user {}: {}",
                 LogCategory.ERRORS,
+                user_id,
+                exc,
             )
             raise HTTPException(
                 status.HTTP_401_UNAUTHORIZED, ResponseMessages.CANT_GENERATE_JWT
             ) from exc
         else:
             category_logger.info(
-                f"Access token created for user {user.id}", LogCategory.AUTH
+                "Access token created for user {}",
+                LogCategory.AUTH,
+                user.id,
             )
             return token
 
@@ -98,8 +110,10 @@ class AuthManager:
         except (jwt.PyJWTError, AttributeError) as exc:
             user_id = getattr(user, "id", "unknown")
             category_logger.error(
-                f"Failed to generate refresh token for user {user_id}: {exc}",
+                "Failed to generate refresh token for user {}: {}",
                 LogCategory.ERRORS,
+                user_id,
+                exc,
             )
             raise HTTPException(
                 status.HTTP_401_UNAUTHORIZED,
@@ -107,7 +121,9 @@ class AuthManager:
             ) from exc
         else:
             category_logger.info(
-                f"Refresh token created for user {user.id}", LogCategory.AUTH
+                "Refresh token created for user {}",
+                LogCategory.AUTH,
+                user.id,
             )
             return token
 
@@ -127,9 +143,10 @@ class AuthManager:
         except (jwt.PyJWTError, AttributeError) as exc:
             user_id = getattr(user, "id", "unknown")
             category_logger.error(
-                f"Failed to generate verification token for user "
-                f"{user_id}: {exc}",
+                "Failed to generate verification token for user {}: {}",
                 LogCategory.ERRORS,
+                user_id,
+                exc,
             )
             raise HTTPException(
                 status.HTTP_401_UNAUTHORIZED,
@@ -137,8 +154,9 @@ class AuthManager:
             ) from exc
         else:
             category_logger.info(
-                f"Verification token created for user {user.id}",
+                "Verification token created for user {}",
                 LogCategory.AUTH,
+                user.id,
             )
             return token
 
@@ -158,8 +176,10 @@ class AuthManager:
         except (jwt.PyJWTError, AttributeError) as exc:
             user_id = getattr(user, "id", "unknown")
             category_logger.error(
-                f"Failed to generate reset token for user {user_id}: {exc}",
+                "Failed to generate reset token for user {}: {}",
                 LogCategory.ERRORS,
+                user_id,
+                exc,
             )
             raise HTTPException(
                 status.HTTP_401_UNAUTHORIZED,
@@ -167,8 +187,9 @@ class AuthManager:
             ) from exc
         else:
             category_logger.info(
-                f"Password reset token created for user {user.id}",
+                "Password reset token created for user {}",
                 LogCategory.AUTH,
+                user.id,
             )
             return token
 
@@ -237,8 +258,9 @@ class AuthManager:
             if not user_data:
                 increment_auth_failure("user_not_found", "refresh_token")
                 category_logger.warning(
-                    f"Refresh attempted with non-existent user ID: {user_id}",
+                    "Refresh attempted with non-existent user ID: {}",
                     LogCategory.AUTH,
+                    user_id,
                 )
                 raise HTTPException(
                     status.HTTP_404_NOT_FOUND, ResponseMessages.USER_NOT_FOUND
@@ -248,15 +270,18 @@ class AuthManager:
             if bool(user_data.banned):
                 increment_auth_failure("banned_user", "refresh_token")
                 category_logger.warning(
-                    f"Banned user {user_data.id} attempted token refresh",
+                    "Banned user {} attempted token refresh",
                     LogCategory.AUTH,
+                    user_data.id,
                 )
                 raise HTTPException(
                     status.HTTP_401_UNAUTHORIZED, ResponseMessages.INVALID_TOKEN
                 )
             new_token = AuthManager.encode_token(user_data)
             category_logger.info(
-                f"Token refreshed for user {user_data.id}", LogCategory.AUTH
+                "Token refreshed for user {}",
+                LogCategory.AUTH,
+                user_data.id,
             )
 
         except jwt.ExpiredSignatureError as exc:
@@ -341,8 +366,9 @@ class AuthManager:
             if not user_data:
                 increment_auth_failure("user_not_found", "verify_email")
                 category_logger.warning(
-                    f"Email verification with non-existent user ID: {user_id}",
+                    "Email verification with non-existent user ID: {}",
                     LogCategory.AUTH,
+                    user_id,
                 )
                 raise HTTPException(
                     status.HTTP_404_NOT_FOUND, ResponseMessages.USER_NOT_FOUND
@@ -352,8 +378,9 @@ class AuthManager:
             if bool(user_data.banned):
                 increment_auth_failure("banned_user", "verify_email")
                 category_logger.warning(
-                    f"Banned user {user_data.id} attempted email verification",
+                    "Banned user {} attempted email verification",
                     LogCategory.AUTH,
+                    user_data.id,
                 )
                 raise HTTPException(
                     status.HTTP_401_UNAUTHORIZED, ResponseMessages.INVALID_TOKEN
@@ -362,8 +389,9 @@ class AuthManager:
             if bool(user_data.verified):
                 increment_auth_failure("already_verified", "verify_email")
                 category_logger.warning(
-                    f"User {user_data.id} verification when already verified",
+                    "User {} verification when already verified",
                     LogCategory.AUTH,
+                    user_data.id,
                 )
                 raise HTTPException(
                     status.HTTP_401_UNAUTHORIZED, ResponseMessages.INVALID_TOKEN
@@ -377,9 +405,12 @@ class AuthManager:
                 )
             )
             await session.commit()
+            await invalidate_principal(user_id)
 
             category_logger.info(
-                f"User {user_data.id} successfully verified", LogCategory.AUTH
+                "User {} successfully verified",
+                LogCategory.AUTH,
+                user_data.id,
             )
 
             raise HTTPException(
@@ -404,48 +435,46 @@ class AuthManager:
             ) from exc
 
     @staticmethod
-    async def forgot_password(
-        email: str, background_tasks: BackgroundTasks, session: AsyncSession
-    ) -> None:
-        """Send a password reset email to the user if they exist."""
+    async def forgot_password(email: str, session: AsyncSession) -> None:
+        """Queue a password reset email to the user if they exist."""
         # Get user by email - but don't reveal if user exists for security
         user = await get_user_by_email_(email, session)
 
         # Always return success message to prevent email enumeration
         if not user:
             category_logger.info(
-                f"Password reset requested for non-existent email: {email}",
+                "Password reset requested for non-existent email: {}",
                 LogCategory.AUTH,
+                email,
             )
             return
 
         # Don't send reset email to banned users
         if bool(user.banned):
             category_logger.warning(
-                f"Banned user {user.id} attempted password reset",
+                "Banned user {} attempted password reset",
                 LogCategory.AUTH,
+                user.id,
             )
             return
 
         # Generate reset token
         reset_token = AuthManager.encode_reset_token(user)
         category_logger.info(
-            f"Password reset requested for user {user.id}", LogCategory.AUTH
+            "Password reset requested for user {}",
+            LogCategory.AUTH,
+            user.id,
         )
 
-        # Send password reset email
+        # Queue the password reset email
         email_manager = EmailManager()
         email_manager.template_send(
-            background_tasks,
+            session,
             EmailTemplateSchema(
                 recipients=[NameEmail(name=user.first_name, email=user.email)],
                 subject=f"{get_settings().api_title} - Password Reset",
                 body={
                     "name": user.first_name,
-                    "application": get_settings().api_title,
-                    "base_url": get_settings().base_url,
-                    "frontend_url": get_settings().frontend_url
-                    or get_settings().base_url,
                     "reset_token": reset_token,
                 },
                 template_name="password_reset.html",
@@ -517,8 +546,9 @@ class AuthManager:
             if not user_data:
                 increment_auth_failure("user_not_found", "password_reset")
                 category_logger.warning(
-                    f"Password reset with non-existent user ID: {user_id}",
+                    "Password reset with non-existent user ID: {}",
                     LogCategory.AUTH,
+                    user_id,
                 )
                 raise HTTPException(
                     status.HTTP_404_NOT_FOUND, ResponseMessages.USER_NOT_FOUND
@@ -528,15 +558,18 @@ class AuthManager:
             if bool(user_data.banned):
                 increment_auth_failure("banned_user", "password_reset")
                 category_logger.warning(
-                    f"Banned user {user_data.id} attempted password reset",
+                    "Banned user {} attempted password reset",
                     LogCategory.AUTH,
+                    user_data.id,
                 )
                 raise HTTPException(
                     status.HTTP_401_UNAUTHORIZED, ResponseMessages.INVALID_TOKEN
                 )
 
             # Hash the new password
-            hashed_password = hash_password(new_password)
+            hashed_password = await run_in_hash_pool(
+                hash_password, new_password
+            )
 
             # Update the user's password
             await session.execute(
@@ -547,8 +580,9 @@ class AuthManager:
             await session.commit()
 
             category_logger.info(
-                f"Password successfully reset for user {user_data.id}",
+                "Password successfully reset for user {}",
                 LogCategory.AUTH,
+                user_data.id,
             )
 
         except jwt.ExpiredSignatureError as exc:
@@ -570,7 +604,7 @@ class AuthManager:
 
     @staticmethod
     async def resend_verify_code(
-        user: int, background_tasks: BackgroundTasks, session: AsyncSession
+        user: int, session: AsyncSession
     ) -> None:  # pragma: no cover (code not used at this time)
         """Resend the user a verification email."""
         user_data = await get_user_by_id_(user, session)
@@ -595,16 +629,12 @@ class AuthManager:
         email = EmailManager()
         user_full_name = f"{user_data.first_name} {user_data.last_name}"
         email.template_send(
-            background_tasks,
+            session,
             EmailTemplateSchema(
                 recipients=[NameEmail(user_full_name, user_data.email)],
                 subject=f"Welcome to {get_settings().api_title}!",
                 body={
-                    "application": f"{get_settings().api_title}",
                     "user": user_data.email,
-                    "base_url": get_settings().base_url,
-                    "frontend_url": get_settings().frontend_url
-                    or get_settings().base_url,
                     "verification": AuthManager.encode_verify_token(user_data),
                 },
                 template_name="welcome.html",
@@ -626,15 +656,12 @@ class AuthManager:
 bearer = HTTPBearer(auto_error=False)
 
 
-async def get_jwt_user(  # noqa: C901
-    request: Request,
-    db: AsyncSession = Depends(get_database),
-    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),
-) -> User | None:
-    """Get user from JWT token."""
-    if not credentials:
-        return None
+def _access_token_user_id(credentials: HTTPAuthorizationCredentials) -> int:
+    """Validate an access token and return the user id it was issued to.
 
+    Raises HTTPException 401 if the token is malformed, expired, invalid or
+    not an access token.
+    """
     # Validate token format before processing
     if (
         not credentials.credentials
@@ -659,67 +686,6 @@ async def get_jwt_user(  # noqa: C901
             algorithms=["HS256"],
             options={"verify_sub": False},
         )
-        # Use constant-time comparison to prevent timing attacks
-        token_type = payload.get("typ")
-        if not isinstance(token_type, str) or not secrets.compare_digest(
-            token_type, "access"
-        ):
-            increment_auth_failure("invalid_token", "jwt")
-            category_logger.warning(
-                "Authentication attempted with non-access token",
-                LogCategory.AUTH,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=ResponseMessages.INVALID_TOKEN,
-            )
-
-        user_id = payload.get("sub")
-        # Accept int-like strings but reject weird types early
-        if isinstance(user_id, str) and user_id.isascii() and user_id.isdigit():
-            user_id = int(user_id)
-        if isinstance(user_id, bool) or not isinstance(user_id, int):
-            increment_auth_failure("invalid_token", "jwt")
-            category_logger.warning(
-                "Authentication attempted with invalid 'sub' claim",
-                LogCategory.AUTH,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=ResponseMessages.INVALID_TOKEN,
-            )
-
-        user_data = await get_user_by_id_(user_id, db)
-
-        # Check user validity - user must exist, be verified, and not banned
-        if not user_data:
-            increment_auth_failure("user_not_found", "jwt")
-            category_logger.warning(
-                "Authentication attempted with invalid user token",
-                LogCategory.AUTH,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=ResponseMessages.INVALID_TOKEN,
-            )
-
-        if bool(user_data.banned) or not bool(user_data.verified):
-            user_status = "banned" if user_data.banned else "unverified"
-            reason = "banned_user" if user_data.banned else "unverified_user"
-            increment_auth_failure(reason, "jwt")
-            category_logger.warning(
-                f"Authentication attempted by {user_status} user "
-                f"{user_data.id}",
-                LogCategory.AUTH,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=ResponseMessages.INVALID_TOKEN,
-            )
-
-        # Store user in request state
-        request.state.user = user_data
-
     except jwt.ExpiredSignatureError as exc:
         increment_auth_failure("expired_token", "jwt")
         category_logger.warning(
@@ -738,8 +704,112 @@ async def get_jwt_user(  # noqa: C901
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ResponseMessages.INVALID_TOKEN,
         ) from exc
-    else:
-        return user_data
+
+    # Use constant-time comparison to prevent timing attacks
+    token_type = payload.get("typ")
+    if not isinstance(token_type, str) or not secrets.compare_digest(
+        token_type, "access"
+    ):
+        increment_auth_failure("invalid_token", "jwt")
+        category_logger.warning(
+            "Authentication attempted with non-access token",
+            LogCategory.AUTH,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ResponseMessages.INVALID_TOKEN,
+        )
+
+    user_id: object = payload.get("sub")
+    # Accept int-like strings but reject weird types early
+    if isinstance(user_id, str) and user_id.isascii() and user_id.isdigit():
+        user_id = int(user_id)
+    if isinstance(user_id, bool) or not isinstance(user_id, int):
+        increment_auth_failure("invalid_token", "jwt")
+        category_logger.warning(
+            "Authentication attempted with invalid 'sub' claim",
+            LogCategory.AUTH,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ResponseMessages.INVALID_TOKEN,
+        )
+    return user_id
+
+
+def _ensure_active(user: User | Principal | None) -> None:
+    """Reject a token whose user is missing, banned or unverified."""
+    if not user:
+        increment_auth_failure("user_not_found", "jwt")
+        category_logger.warning(
+            "Authentication attempted with invalid user token",
+            LogCategory.AUTH,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ResponseMessages.INVALID_TOKEN,
+        )
+
+    if bool(user.banned) or not bool(user.verified):
+        user_status = "banned" if user.banned else "unverified"
+        reason = "banned_user" if user.banned else "unverified_user"
+        increment_auth_failure(reason, "jwt")
+        category_logger.warning(
+            "Authentication attempted by {} user {}",
+            LogCategory.AUTH,
+            user_status,
+            user.id,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ResponseMessages.INVALID_TOKEN,
+        )
+
+
+async def get_jwt_user(
+    request: Request,
+    db: AsyncSession = Depends(get_database),
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),
+) -> User | None:
+    """Get user from JWT token."""
+    if not credentials:
+        return None
+
+    user_id = _access_token_user_id(credentials)
+    user_data, household_id = await get_user_with_household_(user_id, db)
+
+    # Check user validity - user must exist, be verified, and not banned
+    _ensure_active(user_data)
+
+    # Store user in request state. The household membership comes from
+    # the same query, so get_current_household needs no extra lookup.
+    request.state.user = user_data
+    request.state.household_id = household_id
+    annotate_request(user_id=user_id, household_id=household_id)
+    return user_data
+
+
+async def get_jwt_principal(
+    request: Request,
+    db: AsyncSession = Depends(get_database),
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),
+) -> Principal | None:
+    """Get the cached principal of the user from JWT token.
+
+    Like ``get_jwt_user``, but only checks the cached role and status of the
+    user instead of loading the user, for routes that need no more than the
+    user's id and role.
+    """
+    if not credentials:
+        return None
+
+    user_id = _access_token_user_id(credentials)
+    principal = await get_principal(db, user_id)
+    _ensure_active(principal)
+
+    request.state.user = principal
+    annotate_request(user_id=user_id)
+    return principal
 
 
 oauth2_schema = get_jwt_user
@@ -2,77 +2,93 @@
 
 from __future__ import annotations
 
-import socket
-from pathlib import Path
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
-from fastapi import BackgroundTasks  # noqa: TC002
 from fastapi.responses import JSONResponse
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+from fastapi_mail import ConnectionConfig, MessageSchema, MessageType
 from pydantic import SecretStr
+from pydantic_settings import SettingsConfigDict
 
 from app.config.settings import get_settings
 from app.logs import LogCategory, category_logger
+from app.mail import templates
+from app.mail.delivery import PooledMail
+from app.mail.outbox import enqueue
 
 if TYPE_CHECKING:  # pragma: no cover
+    from sqlalchemy.ext.asyncio import AsyncSession
+
     from app.schemas.email import EmailSchema, EmailTemplateSchema
 
 
+class _FrozenConnectionConfig(ConnectionConfig):
+    """A ``ConnectionConfig`` that cannot be changed once built."""
+
+    model_config = SettingsConfigDict(frozen=True)
+
+
+@lru_cache
+def get_mail_config(*, suppress_send: bool = False) -> ConnectionConfig:
+    """Return the mail connection configuration.
+
+    It is built, and validated, once and shared by every ``EmailManager``.
+    There is no ``TEMPLATE_FOLDER``: templates are rendered by
+    ``app.mail.templates``, not by ``FastMail``.
+    """
+    settings = get_settings()
+    return _FrozenConnectionConfig(
+        MAIL_USERNAME=settings.mail_username,
+        MAIL_PASSWORD=SecretStr(settings.mail_password),
+        MAIL_FROM=settings.mail_from,
+        MAIL_PORT=settings.mail_port,
+        MAIL_SERVER=settings.mail_server,
+        MAIL_FROM_NAME=settings.mail_from_name,
+        MAIL_STARTTLS=settings.mail_starttls,
+        MAIL_SSL_TLS=settings.mail_ssl_tls,
+        USE_CREDENTIALS=settings.mail_use_credentials,
+        VALIDATE_CERTS=settings.mail_validate_certs,
+        SUPPRESS_SEND=1 if suppress_send else 0,
+    )
+
+
+def _template_values(message: MessageSchema) -> dict[str, Any] | None:
+    """Return a message's template values in the form ``render`` takes.
+
+    As with ``FastMail``, a list is passed to the template as ``body``.
+    """
+    values = message.template_body
+    if isinstance(values, list):
+        return {"body": values}
+    if isinstance(values, str):
+        msg = "A template body must be a dict or a list, not a string"
+        raise TypeError(msg)
+    return values
+
+
 class EmailManager:
     """Class to manage all Email operations."""
 
     def __init__(self, *, suppress_send: bool | None = False) -> None:
         """Initialize the EmailManager.
 
-        Define the configuration instance.
+        Use the shared configuration instance.
         """
-        self.conf = ConnectionConfig(
-            MAIL_USERNAME=get_settings().mail_username,
-            MAIL_PASSWORD=SecretStr(get_settings().mail_password),
-            MAIL_FROM=get_settings().mail_from,
-            MAIL_PORT=get_settings().mail_port,
-            MAIL_SERVER=get_settings().mail_server,
-            MAIL_FROM_NAME=get_settings().mail_from_name,
-            MAIL_STARTTLS=get_settings().mail_starttls,
-            MAIL_SSL_TLS=get_settings().mail_ssl_tls,
-            USE_CREDENTIALS=get_settings().mail_use_credentials,
-            VALIDATE_CERTS=get_settings().mail_validate_certs,
-            TEMPLATE_FOLDER=(
-                Path(__file__).parent.parent / "templates" / "email"
-            ),
-            SUPPRESS_SEND=1 if suppress_send else 0,
-        )
+        self.conf = get_mail_config(suppress_send=bool(suppress_send))
 
-    def _log_smtp_connection_info(self) -> None:
-        """Log SMTP connection details for debugging."""
-        hostname = self.conf.MAIL_SERVER
-        port = self.conf.MAIL_PORT
-        try:
-            resolved_ip = socket.gethostbyname(hostname)
-        except socket.gaierror:
-            resolved_ip = "Unable to resolve"
-        category_logger.info(
-            f"SMTP connection: hostname={hostname}, "
-            f"resolved_ip={resolved_ip}, port={port}",
-            LogCategory.EMAIL,
-        )
-        print(f"SMTP connection: hostname={hostname},resolved_ip={resolved_ip}, port={port}")
-
-    async def _send_safe(
+    async def send(
         self, message: MessageSchema, template_name: str | None = None
     ) -> None:
-        """Send email and suppress failures to avoid 500s."""
-        self._log_smtp_connection_info()
-        try:
-            fm = FastMail(self.conf)
-            if template_name:
-                await fm.send_message(message, template_name=template_name)
-            else:
-                await fm.send_message(message)
-        except (OSError, ValueError) as exc:
-            category_logger.error(
-                f"Failed to send email: {exc}", LogCategory.ERRORS
+        """Send a message now, rendering it from a template if named.
+
+        Raises the error that made sending fail.
+        """
+        if template_name:
+            message.body = templates.render(
+                template_name, _template_values(message)
             )
+            message.template_body = None
+        await PooledMail(self.conf).send_message(message)
 
     async def simple_send(self, email_data: EmailSchema) -> JSONResponse:
         """Send a plain email with a subject and message."""
@@ -83,15 +99,16 @@ class EmailManager:
             subtype=MessageType.html,
         )
 
-        self._log_smtp_connection_info()
         try:
-            fm = FastMail(self.conf)
+            fm = PooledMail(self.conf)
             await fm.send_message(message)
 
             recipients_list = email_data.recipients
             category_logger.info(
-                f"Email sent: '{email_data.subject}' to {recipients_list}",
+                "Email sent: '{}' to {}",
                 LogCategory.EMAIL,
+                email_data.subject,
+                recipients_list,
             )
 
             return JSONResponse(
@@ -99,49 +116,40 @@ class EmailManager:
             )
         except Exception as exc:
             category_logger.error(
-                f"Failed to send email: {exc}", LogCategory.ERRORS
+                "Failed to send email: {}",
+                LogCategory.ERRORS,
+                exc,
             )
             raise
 
     def background_send(
-        self, backgroundtasks: BackgroundTasks, email_data: EmailSchema
+        self, session: AsyncSession, email_data: EmailSchema
     ) -> None:
-        """Send an email in the background."""
-        message = MessageSchema(
-            subject=email_data.subject,
-            recipients=email_data.recipients,
-            body=email_data.body,
-            subtype=MessageType.html,
-        )
-
-        backgroundtasks.add_task(self._send_safe, message)
+        """Queue an email in the outbox, sent once the session commits."""
+        enqueue(session, email_data)
 
         recipients_list = email_data.recipients
         category_logger.info(
-            f"Email queued for background send: '{email_data.subject}' "
-            f"to {recipients_list}",
+            "Email queued for background send: '{}' to {}",
             LogCategory.EMAIL,
+            email_data.subject,
+            recipients_list,
         )
 
     def template_send(
-        self, backgroundtasks: BackgroundTasks, email_data: EmailTemplateSchema
+        self, session: AsyncSession, email_data: EmailTemplateSchema
     ) -> None:
-        """Send an email using a Jinja Template."""
-        message = MessageSchema(
-            subject=email_data.subject,
-            recipients=email_data.recipients,
-            subtype=MessageType.html,
-            template_body=email_data.body,
-        )
-        backgroundtasks.add_task(
-            self._send_safe,
-            message,
-            email_data.template_name,
-        )
+        """Queue a Jinja Template email in the outbox.
+
+        It is sent once the session commits.
+        """
+        enqueue(session, email_data)
 
         recipients = ", ".join(r.email for r in email_data.recipients)
         category_logger.info(
-            f"Template email queued: '{email_data.subject}' "
-            f"({email_data.template_name}) to {recipients}",
+            "Template email queued: '{}' ({}) to {}",
             LogCategory.EMAIL,
+            email_data.subject,
+            email_data.template_name,
+            recipients,
         )
@@ -1,11 +1,17 @@
 """Security dependencies for the API."""
 
+import uuid
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 from fastapi.requests import Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.managers.auth import oauth2_schema
+from app.config.log_context import annotate_request
+from app.database import membership
+from app.database.db import get_database
+from app.database.principal import Principal
+from app.managers.auth import get_jwt_principal, oauth2_schema
 from app.models.user import User
 
 
@@ -24,6 +30,50 @@ async def get_current_user(
     )
 
 
+async def get_current_principal(
+    _request: Request,
+    principal: Principal | None = Depends(get_jwt_principal),
+) -> Principal:
+    """Get the cached principal of the current user from JWT token."""
+    if principal:
+        return principal
+
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated. Use a JWT token.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def get_current_household(
+    request: Request,
+    user: Annotated[Principal, Depends(get_current_principal)],
+    db: Annotated[AsyncSession, Depends(get_database)],
+) -> uuid.UUID:
+    """Get the household of the current user.
+
+    Authenticates with the cached principal rather than the full user.
+    Reuses the membership loaded together with the user when the full JWT
+    check already ran, and otherwise uses the cached membership lookup.
+    Raises HTTPException 403 if the user is not a member of any
+    household.
+    """
+    household_id: uuid.UUID | None
+    if hasattr(request.state, "household_id"):
+        household_id = request.state.household_id
+    else:
+        household_id = await membership.get_household_id(db, user.id)
+        request.state.household_id = household_id
+        annotate_request(household_id=household_id)
+
+    if household_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not a member of any household",
+        )
+    return household_id
+
+
 # Make the dependency optional for routes that allow unauthenticated access
 async def get_optional_user(
     current_user: Annotated[User | None, Depends(get_current_user)],
@@ -5,12 +5,13 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from email_validator import EmailNotValidError, validate_email
-from fastapi import BackgroundTasks, HTTPException, status
+from fastapi import HTTPException, status
 from pydantic import NameEmail
 from sqlalchemy import Select, delete, func, or_, select, update
 from sqlalchemy.exc import IntegrityError
 
 from app.config.settings import get_settings
+from app.database.hashing import run_in_hash_pool
 from app.database.helpers import (
     add_new_user_,
     get_all_users_,
@@ -19,6 +20,7 @@ from app.database.helpers import (
     hash_password,
     verify_password,
 )
+from app.database.principal import invalidate_principal_on_commit
 from app.logs import LogCategory, category_logger
 from app.managers.auth import AuthManager
 from app.managers.email import EmailManager
@@ -70,9 +72,16 @@ class UserManager:
     async def register(
         user_data: dict[str, Any],
         session: AsyncSession,
-        background_tasks: BackgroundTasks | None = None,
+        *,
+        send_welcome: bool = False,
     ) -> tuple[str, str]:
-        """Register a new user."""
+        """Register a new user.
+
+        With ``send_welcome`` (set by the register route), the user must
+        verify their email address, and a welcome email is queued in the
+        outbox in the same transaction as the user. Otherwise the user is
+        created already verified.
+        """
         # Check for missing password first
         if "password" not in user_data:
             raise HTTPException(
@@ -83,7 +92,9 @@ class UserManager:
         try:
             # Hash password before checking other fields, to catch
             # password-specific errors
-            hashed_password = hash_password(user_data["password"])
+            hashed_password = await run_in_hash_pool(
+                hash_password, user_data["password"]
+            )
         except ValueError as exc:
             raise HTTPException(
                 status.HTTP_400_BAD_REQUEST,
@@ -103,10 +114,7 @@ class UserManager:
 
         new_user["banned"] = False
 
-        if background_tasks:
-            new_user["verified"] = False
-        else:
-            new_user["verified"] = True
+        new_user["verified"] = not send_welcome
 
         try:
             email_validation = validate_email(
@@ -119,14 +127,16 @@ class UserManager:
             await session.flush()
 
             category_logger.info(
-                f"New user registered: {new_user['email']}",
+                "New user registered: {}",
                 LogCategory.DATABASE,
+                new_user["email"],
             )
 
         except IntegrityError as err:
             category_logger.error(
-                f"User registration failed - email exists: {new_user['email']}",
+                "User registration failed - email exists: {}",
                 LogCategory.ERRORS,
+                new_user["email"],
             )
             raise HTTPException(
                 status.HTTP_400_BAD_REQUEST,
@@ -144,20 +154,16 @@ class UserManager:
         # it without an exception, so it must exist)
         assert user_do  # noqa: S101
 
-        if background_tasks:
+        if send_welcome:
             email = EmailManager()
             user_full_name = f"{new_user['first_name']} {new_user['last_name']}"
             email.template_send(
-                background_tasks,
+                session,
                 EmailTemplateSchema(
                     recipients=[NameEmail(user_full_name, new_user["email"])],
                     subject=f"Welcome to {get_settings().api_title}!",
                     body={
-                        "application": f"{get_settings().api_title}",
                         "user": new_user["email"],
-                        "base_url": get_settings().base_url,
-                        "frontend_url": get_settings().frontend_url
-                        or get_settings().base_url,
                         "name": user_full_name,
                         "verification": AuthManager.encode_verify_token(
                             user_do
@@ -192,8 +198,8 @@ class UserManager:
         )
 
         try:
-            password_valid = verify_password(
-                user_data["password"], hash_to_verify
+            password_valid = await run_in_hash_pool(
+                verify_password, user_data["password"], hash_to_verify
             )
         except ValueError as err:
             raise HTTPException(
@@ -206,9 +212,9 @@ class UserManager:
         if not user_do:
             increment_login_attempt("not_found")
             category_logger.warning(
-                f"Failed login attempt for email: {user_data['email']} "
-                "(user not found)",
+                "Failed login attempt for email: {} (user not found)",
                 LogCategory.AUTH,
+                user_data["email"],
             )
             raise HTTPException(
                 status.HTTP_400_BAD_REQUEST, ErrorMessages.AUTH_INVALID
@@ -218,9 +224,9 @@ class UserManager:
         if not password_valid:
             increment_login_attempt("invalid_password")
             category_logger.warning(
-                f"Failed login attempt for email: {user_data['email']} "
-                "(invalid password)",
+                "Failed login attempt for email: {} (invalid password)",
                 LogCategory.AUTH,
+                user_data["email"],
             )
             raise HTTPException(
                 status.HTTP_400_BAD_REQUEST, ErrorMessages.AUTH_INVALID
@@ -230,9 +236,9 @@ class UserManager:
         if bool(user_do.banned):
             increment_login_attempt("banned")
             category_logger.warning(
-                f"Failed login attempt for email: {user_data['email']} "
-                "(user banned)",
+                "Failed login attempt for email: {} (user banned)",
                 LogCategory.AUTH,
+                user_data["email"],
             )
             raise HTTPException(
                 status.HTTP_400_BAD_REQUEST, ErrorMessages.AUTH_INVALID
@@ -247,8 +253,10 @@ class UserManager:
 
         increment_login_attempt("success")
         category_logger.info(
-            f"User logged in: {user_do.email} (ID: {user_do.id})",
+            "User logged in: {} (ID: {})",
             LogCategory.AUTH,
+            user_do.email,
+            user_do.id,
         )
 
         token = AuthManager.encode_token(user_do)
@@ -285,9 +293,12 @@ class UserManager:
                 )
 
         await session.execute(delete(User).where(User.id == user_id))
+        invalidate_principal_on_commit(session, user_id)
 
         category_logger.info(
-            f"User deleted: ID {user_id}", LogCategory.DATABASE
+            "User deleted: ID {}",
+            LogCategory.DATABASE,
+            user_id,
         )
 
     @staticmethod
@@ -307,7 +318,7 @@ class UserManager:
         try:
             # Hash password if provided
             hashed_password = (
-                hash_password(user_data.password)
+                await run_in_hash_pool(hash_password, user_data.password)
                 if user_data.password
                 else user.password
             )
@@ -329,7 +340,9 @@ class UserManager:
         )
 
         category_logger.info(
-            f"User updated: ID {user_id}", LogCategory.DATABASE
+            "User updated: ID {}",
+            LogCategory.DATABASE,
+            user_id,
         )
 
         # Return the updated user
@@ -348,7 +361,9 @@ class UserManager:
                 status.HTTP_404_NOT_FOUND, ErrorMessages.USER_INVALID
             )
         try:
-            hashed_password = hash_password(user_data.password)
+            hashed_password = await run_in_hash_pool(
+                hash_password, user_data.password
+            )
         except ValueError as exc:
             raise HTTPException(
                 status.HTTP_400_BAD_REQUEST,
@@ -362,7 +377,9 @@ class UserManager:
         )
 
         category_logger.info(
-            f"Password changed for user ID {user_id}", LogCategory.DATABASE
+            "Password changed for user ID {}",
+            LogCategory.DATABASE,
+            user_id,
         )
 
     @staticmethod
@@ -385,7 +402,9 @@ class UserManager:
                 update(User).where(User.id == user_id).values(**updates)
             )
             category_logger.info(
-                f"Profile updated for user ID {user_id}", LogCategory.DATABASE
+                "Profile updated for user ID {}",
+                LogCategory.DATABASE,
+                user_id,
             )
 
         return await UserManager.get_user_by_id(user_id, session)
@@ -416,10 +435,14 @@ class UserManager:
         await session.execute(
             update(User).where(User.id == user_id).values(banned=banned)
         )
+        invalidate_principal_on_commit(session, user_id)
 
         action = "banned" if banned else "unbanned"
         category_logger.info(
-            f"User {action}: ID {user_id}", LogCategory.DATABASE
+            "User {}: ID {}",
+            LogCategory.DATABASE,
+            action,
+            user_id,
         )
 
     @staticmethod
@@ -430,10 +453,13 @@ class UserManager:
         await session.execute(
             update(User).where(User.id == user_id).values(role=role)
         )
+        invalidate_principal_on_commit(session, user_id)
 
         category_logger.info(
-            f"User role changed to {role.value}: ID {user_id}",
+            "User role changed to {}: ID {}",
             LogCategory.DATABASE,
+            role.value,
+            user_id,
         )
 
     @staticmethod
@@ -2,8 +2,16 @@
 
 from app.metrics.custom import (
     increment_auth_failure,
+    increment_cache_lookup,
+    increment_email_outbox_result,
     increment_login_attempt,
+    increment_rate_limit_decision,
     increment_rate_limit_exceeded,
+    observe_db_pool_checkout_wait,
+    observe_email_delivery,
+    set_email_outbox_backlog,
+    set_password_hash_queue_depth,
+    track_db_pool_usage,
 )
 from app.metrics.instrumentator import get_instrumentator
 from app.metrics.namespace import METRIC_NAMESPACE
@@ -12,6 +20,14 @@ __all__ = [
     "METRIC_NAMESPACE",
     "get_instrumentator",
     "increment_auth_failure",
+    "increment_cache_lookup",
+    "increment_email_outbox_result",
     "increment_login_attempt",
+    "increment_rate_limit_decision",
     "increment_rate_limit_exceeded",
+    "observe_db_pool_checkout_wait",
+    "observe_email_delivery",
+    "set_email_outbox_backlog",
+    "set_password_hash_queue_depth",
+    "track_db_pool_usage",
 ]
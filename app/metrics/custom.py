@@ -1,10 +1,18 @@
 """Custom business metrics for Prometheus."""
 
-from prometheus_client import Counter
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.pool import QueuePool
 
 from app.config.settings import get_settings
 from app.metrics.namespace import METRIC_NAMESPACE
 
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlalchemy.pool import Pool
+
 # Authentication failure tracking
 auth_failures_total = Counter(
     "auth_failures_total",
@@ -29,6 +37,77 @@ rate_limit_exceeded_total = Counter(
     namespace=METRIC_NAMESPACE,
 )
 
+# Rate limit policy decisions by where they were made ("local" in-process
+# counters, "redis") and their result
+rate_limit_decisions_total = Counter(
+    "rate_limit_decisions_total",
+    "Rate limit policy decisions by source and result",
+    ["source", "result"],
+    namespace=METRIC_NAMESPACE,
+)
+
+# Password hashing jobs waiting for a free worker in the hashing pool
+password_hash_queue_depth = Gauge(
+    "password_hash_queue_depth",
+    "Password hashing jobs waiting for a free worker",
+    namespace=METRIC_NAMESPACE,
+)
+
+# Response cache lookups per tier ("local" in-process, "redis")
+cache_lookups_total = Counter(
+    "cache_lookups_total",
+    "Response cache lookups by tier and result",
+    ["tier", "result"],
+    namespace=METRIC_NAMESPACE,
+)
+
+# Outbox emails sent by the mail worker: the SMTP send time, and the time
+# from being queued to being sent
+email_send_seconds = Histogram(
+    "email_send_seconds",
+    "Time taken to send an outbox email to the mail server",
+    namespace=METRIC_NAMESPACE,
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+email_delivery_latency_seconds = Histogram(
+    "email_delivery_latency_seconds",
+    "Time from an email being queued in the outbox to being sent",
+    namespace=METRIC_NAMESPACE,
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+email_outbox_backlog = Gauge(
+    "email_outbox_backlog",
+    "Outbox emails waiting to be sent",
+    namespace=METRIC_NAMESPACE,
+)
+# Outbox send attempts by result ("sent", "retry", "dead")
+email_outbox_results_total = Counter(
+    "email_outbox_results_total",
+    "Outbox email send attempts by result",
+    ["result"],
+    namespace=METRIC_NAMESPACE,
+)
+
+# Database connection pool usage (per worker process)
+db_pool_checkout_wait_seconds = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    namespace=METRIC_NAMESPACE,
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+db_pool_connections_in_use = Gauge(
+    "db_pool_connections_in_use",
+    "Database connections currently checked out of the pool",
+    ["engine"],
+    namespace=METRIC_NAMESPACE,
+)
+db_pool_overflow_connections = Gauge(
+    "db_pool_overflow_connections",
+    "Database connections open beyond the pool size",
+    ["engine"],
+    namespace=METRIC_NAMESPACE,
+)
+
 
 # Helper functions (only increment if metrics enabled)
 def increment_auth_failure(reason: str, method: str) -> None:
@@ -37,7 +116,6 @@ def increment_auth_failure(reason: str, method: str) -> None:
         auth_failures_total.labels(reason=reason, method=method).inc()
 
 
-
 def increment_login_attempt(status: str) -> None:
     """Increment login attempt counter."""
     if get_settings().metrics_enabled:
@@ -51,3 +129,65 @@ def increment_rate_limit_exceeded(endpoint: str, limit: str) -> None:
             endpoint=endpoint,
             limit=limit,
         ).inc()
+
+
+def increment_rate_limit_decision(source: str, *, allowed: bool) -> None:
+    """Count a rate limit policy decision made in the given source."""
+    if get_settings().metrics_enabled:
+        rate_limit_decisions_total.labels(
+            source=source, result="allowed" if allowed else "limited"
+        ).inc()
+
+
+def increment_cache_lookup(tier: str, *, hit: bool) -> None:
+    """Count a response cache lookup in the given tier."""
+    if get_settings().metrics_enabled:
+        cache_lookups_total.labels(
+            tier=tier, result="hit" if hit else "miss"
+        ).inc()
+
+
+def set_password_hash_queue_depth(depth: int) -> None:
+    """Set the password hashing queue depth gauge."""
+    if get_settings().metrics_enabled:
+        password_hash_queue_depth.set(depth)
+
+
+def observe_email_delivery(send_seconds: float, latency_seconds: float) -> None:
+    """Record the send time and queue-to-sent latency of an outbox email."""
+    if get_settings().metrics_enabled:
+        email_send_seconds.observe(send_seconds)
+        email_delivery_latency_seconds.observe(latency_seconds)
+
+
+def set_email_outbox_backlog(backlog: int) -> None:
+    """Set the number of outbox emails waiting to be sent."""
+    if get_settings().metrics_enabled:
+        email_outbox_backlog.set(backlog)
+
+
+def increment_email_outbox_result(result: str) -> None:
+    """Count an outbox send attempt by its result."""
+    if get_settings().metrics_enabled:
+        email_outbox_results_total.labels(result=result).inc()
+
+
+def observe_db_pool_checkout_wait(seconds: float) -> None:
+    """Record how long a pool checkout waited for a connection."""
+    if get_settings().metrics_enabled:
+        db_pool_checkout_wait_seconds.observe(seconds)
+
+
+def track_db_pool_usage(pool: Pool, engine: str = "primary") -> None:
+    """Report the pool's in-use and overflow connections on each scrape.
+
+    Each engine is reported under its own ``engine`` label. Pools other than
+    a ``QueuePool`` do not count their connections and are not reported.
+    """
+    if get_settings().metrics_enabled and isinstance(pool, QueuePool):
+        db_pool_connections_in_use.labels(engine=engine).set_function(
+            pool.checkedout
+        )
+        db_pool_overflow_connections.labels(engine=engine).set_function(
+            lambda: max(pool.overflow(), 0)
+        )
@@ -0,0 +1,214 @@
+"""Pure ASGI middleware for request and cache logging.
+
+Request logging and cache hit/miss logging used to be two
+``BaseHTTPMiddleware`` layers. Each layer runs the rest of the app in a
+separate task and re-wraps the response body stream, which costs time on
+every request and breaks streaming responses into buffered chunks. This
+middleware does both jobs in one layer: it only wraps ``send`` to read the
+status code and cache header from the ``http.response.start`` message, and
+passes every message through untouched.
+
+With structured (JSON) logging, it also binds the request's log context
+(``app.config.log_context``) for the rest of the request, and returns its
+request id in an ``X-Request-ID`` header.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, urlencode
+
+from loguru import logger
+
+from app.config.log_config import LogCategory, log_config
+from app.config.log_context import (
+    bind_request,
+    current_request,
+    reset_request,
+)
+from app.logs import category_logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CACHE_HEADER = b"x-fastapi-cache"
+
+
+class ObservabilityMiddleware:
+    """Log HTTP requests and cache activity for the enabled categories.
+
+    The ``REQUESTS`` category logs each request in uvicorn's access log
+    format with sensitive query parameters redacted. The ``CACHE`` category
+    logs the request ``Cache-Control`` header and, for cached routes, whether
+    the response was a cache hit or miss. With neither enabled, and text
+    logging, requests are passed straight to the app.
+    """
+
+    REDACTED_VALUE = "REDACTED"
+    # Order matters: keep currently used keys early for short-circuit checks.
+    SENSITIVE_QUERY_KEYS = (
+        "code",
+        "token",
+        "reset_token",
+        "verification",
+        "verify",
+        "access_token",
+        "refresh_token",
+        "api_key",
+        "key",
+    )
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap the given ASGI app."""
+        self.app = app
+
+    @classmethod
+    def _should_redact(cls, key: str) -> bool:
+        """Check if a query parameter name should be redacted."""
+        key_lower = key.lower()
+        for sensitive_key in cls.SENSITIVE_QUERY_KEYS:
+            if key_lower == sensitive_key:
+                return True
+        return False
+
+    @classmethod
+    def _redact_query(cls, query: str) -> str:
+        """Redact sensitive query parameters from a raw query string."""
+        if not query:
+            return ""
+
+        params = parse_qsl(query, keep_blank_values=True)
+        if not params:
+            return query
+
+        redacted = False
+        redacted_params: list[tuple[str, str]] = []
+        for key, value in params:
+            if cls._should_redact(key):
+                redacted = True
+                redacted_params.append((key, cls.REDACTED_VALUE))
+                continue
+            redacted_params.append((key, value))
+
+        if not redacted:
+            return query
+
+        return urlencode(redacted_params)
+
+    @staticmethod
+    def _log_cache_control(scope: Scope) -> None:
+        """Log the request's Cache-Control header, if any."""
+        for name, value in scope["headers"]:
+            if name == b"cache-control":
+                category_logger.debug(
+                    "Request has Cache-Control: {}",
+                    LogCategory.CACHE,
+                    value.decode("latin-1"),
+                )
+                return
+
+    @staticmethod
+    def _log_cache_status(
+        scope: Scope, cache_status: str, duration: float
+    ) -> None:
+        """Log whether a cached route was served from the cache.
+
+        ``STALE`` responses came from the cache while it was refreshed.
+        """
+        duration_ms = duration * 1000
+        method, path = scope["method"], scope["path"]
+        status = cache_status.upper()
+        if status in {"HIT", "STALE"}:
+            category_logger.debug(
+                "CACHE {}: {} {} ({:.2f}ms)",
+                LogCategory.CACHE,
+                status,
+                method,
+                path,
+                duration_ms,
+            )
+        else:
+            category_logger.debug(
+                "CACHE MISS: {} {} ({:.2f}ms) [header={}]",
+                LogCategory.CACHE,
+                method,
+                path,
+                duration_ms,
+                cache_status,
+            )
+
+    @classmethod
+    def _log_request(
+        cls, scope: Scope, status_code: int, duration: float
+    ) -> None:
+        """Log the request in uvicorn's access log format."""
+        client = scope.get("client")
+        client_addr = client[0] if client else "unknown"
+        path = scope["path"]
+        query = scope.get("query_string", b"").decode("latin-1")
+        if query:
+            path = f"{path}?{cls._redact_query(query)}"
+        # uvicorn style: client - "METHOD /path" status_code
+        logger.info(
+            '{} - "{} {}" {} ({:.3f}s)',
+            client_addr,
+            scope["method"],
+            path,
+            status_code,
+            duration,
+        )
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Run the app, logging once the response has been sent."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if not log_config.structured:
+            await self._observe(scope, receive, send)
+            return
+        context_token = bind_request(scope)
+        try:
+            await self._observe(scope, receive, send)
+        finally:
+            reset_request(context_token)
+
+    async def _observe(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Run the app, logging for the enabled categories."""
+        log_requests = log_config.is_enabled(LogCategory.REQUESTS)
+        log_cache = log_config.is_enabled(LogCategory.CACHE)
+        context = current_request()
+        if not log_requests and not log_cache and context is None:
+            await self.app(scope, receive, send)
+            return
+
+        if log_cache:
+            self._log_cache_control(scope)
+
+        status_code = 500
+        cache_status: str | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, cache_status
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == CACHE_HEADER:
+                        cache_status = value.decode("latin-1")
+                        break
+                if context is not None:
+                    context.respond(message)
+            await send(message)
+
+        start_time = time.perf_counter()
+        await self.app(scope, receive, send_wrapper)
+        duration = time.perf_counter() - start_time
+
+        if log_cache and cache_status:
+            self._log_cache_status(scope, cache_status, duration)
+        if log_requests:
+            self._log_request(scope, status_code, duration)
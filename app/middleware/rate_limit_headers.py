@@ -0,0 +1,82 @@
+"""Pure ASGI middleware that reports rate limit budgets to clients.
+
+Routes with a rate limit policy (see ``app.rate_limit.dependencies``)
+record the result of their check in the request state. This middleware
+adds it to the response as ``RateLimit-Limit``, ``RateLimit-Remaining``
+and ``RateLimit-Reset`` headers, so clients can slow down before they
+are refused. Adding them here rather than in the dependency also covers
+routes that return their own ``Response`` and error responses.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+    from app.rate_limit.gcra import RateLimitResult
+
+# Request state key holding the route's RateLimitResult.
+RATE_LIMIT_STATE = "rate_limit"
+RATE_LIMIT_HEADERS = (
+    "RateLimit-Limit",
+    "RateLimit-Remaining",
+    "RateLimit-Reset",
+)
+
+
+def rate_limit_headers(
+    limit: int, remaining: int, reset: float
+) -> dict[str, str]:
+    """Return the headers describing a client's remaining budget.
+
+    Args:
+        limit: The requests allowed per period.
+        remaining: The requests the client can still make now.
+        reset: Seconds until the whole budget is available again.
+    """
+    return dict(
+        zip(
+            RATE_LIMIT_HEADERS,
+            (str(limit), str(remaining), str(math.ceil(reset))),
+            strict=True,
+        )
+    )
+
+
+class RateLimitHeadersMiddleware:
+    """Add the recorded rate limit budget to each response."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap the given ASGI app."""
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Run the app, adding headers if a rate limit was checked."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                result: RateLimitResult | None = scope.get("state", {}).get(
+                    RATE_LIMIT_STATE
+                )
+                if result is not None:
+                    headers = rate_limit_headers(
+                        result.limit, result.remaining, result.reset
+                    )
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        *(
+                            (name.lower().encode("latin-1"), value.encode())
+                            for name, value in headers.items()
+                        ),
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
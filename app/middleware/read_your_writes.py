@@ -0,0 +1,66 @@
+"""Pure ASGI middleware that pins clients to the primary after a change.
+
+Read replicas can lag a little behind the primary. After a successful
+``POST``, ``PUT``, ``PATCH`` or ``DELETE`` this middleware sets a
+``read_primary_until`` cookie and an ``X-Read-Primary-Until`` header on the
+response, holding a Unix timestamp ``DB_READ_YOUR_WRITES_SECONDS`` in the
+future. Browsers send the cookie back automatically; other clients can echo
+the header. Until the timestamp passes, ``get_read_database`` reads from the
+primary, so the client sees its own writes.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from app.config.settings import get_settings
+from app.database.replica import READ_PRIMARY_COOKIE, READ_PRIMARY_HEADER
+
+if TYPE_CHECKING:  # pragma: no cover
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class ReadYourWritesMiddleware:
+    """Mark successful mutating responses with a read-from-primary window."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap the given ASGI app."""
+        self.app = app
+
+    @staticmethod
+    def _window_headers() -> list[tuple[bytes, bytes]]:
+        """Return the cookie and header for a new read-your-writes window."""
+        seconds = get_settings().db_read_your_writes_seconds
+        until = f"{time.time() + seconds:.3f}"
+        cookie = (
+            f"{READ_PRIMARY_COOKIE}={until}; Max-Age={seconds}; Path=/; "
+            "HttpOnly; SameSite=Lax"
+        )
+        return [
+            (b"set-cookie", cookie.encode("latin-1")),
+            (READ_PRIMARY_HEADER.lower().encode("latin-1"), until.encode()),
+        ]
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Run the app, adding the window to successful mutations."""
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] < 400  # noqa: PLR2004
+            ):
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    *self._window_headers(),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
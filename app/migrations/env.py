@@ -9,7 +9,15 @@ from sqlalchemy import pool
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from app.database.db import Base, get_database_url
-from app.models import floor, household, invitation, room, task, user
+from app.models import (
+    email_outbox,
+    floor,
+    household,
+    invitation,
+    room,
+    task,
+    user,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
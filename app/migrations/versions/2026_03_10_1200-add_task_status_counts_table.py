@@ -0,0 +1,65 @@
+"""Add the task_status_counts counter table.
+
+Revision ID: add_task_status_counts
+Revises: add_household_id_to_resources
+Create Date: 2026-03-10 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "add_task_status_counts"
+down_revision: Union[str, None] = "add_household_id_to_resources"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create task_status_counts and backfill it from existing tasks."""
+    op.create_table(
+        "task_status_counts",
+        sa.Column("scope_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="taskstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            "household_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("households.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("scope_id", "status"),
+    )
+
+    # Household-wide counters
+    op.execute(
+        """
+        INSERT INTO task_status_counts (scope_id, status, household_id, count)
+        SELECT household_id, status, household_id, COUNT(*)
+        FROM tasks
+        GROUP BY household_id, status
+        """
+    )
+    # Per-room counters
+    op.execute(
+        """
+        INSERT INTO task_status_counts (scope_id, status, household_id, count)
+        SELECT task_rooms.room_id, tasks.status, tasks.household_id, COUNT(*)
+        FROM task_rooms
+        JOIN tasks ON tasks.id = task_rooms.task_id
+        GROUP BY task_rooms.room_id, tasks.status, tasks.household_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the task_status_counts table."""
+    op.drop_table("task_status_counts")
@@ -0,0 +1,96 @@
+"""Add composite and partial indexes for the task query paths.
+
+Revision ID: add_task_query_indexes
+Revises: add_task_status_counts
+Create Date: 2026-03-12 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_task_query_indexes"
+down_revision: Union[str, None] = "add_task_status_counts"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial index predicate)
+INDEXES: list[tuple[str, str, list[sa.TextClause | str], str | None]] = [
+    ("ix_tasks_household_id_status", "tasks", ["household_id", "status"], None),
+    (
+        "ix_tasks_household_id_priority",
+        "tasks",
+        ["household_id", "priority", "id"],
+        None,
+    ),
+    (
+        "ix_tasks_household_id_created_at",
+        "tasks",
+        ["household_id", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_tasks_household_id_assigned_user_id",
+        "tasks",
+        ["household_id", "assigned_user_id"],
+        "assigned_user_id IS NOT NULL",
+    ),
+    (
+        "ix_tasks_household_id_open_priority",
+        "tasks",
+        ["household_id", sa.text("priority DESC"), "created_at"],
+        "status <> 'done'",
+    ),
+    (
+        "ix_task_dependencies_depends_on_task_id",
+        "task_dependencies",
+        ["depends_on_task_id"],
+        None,
+    ),
+    ("ix_task_rooms_room_id", "task_rooms", ["room_id"], None),
+]
+
+
+def upgrade() -> None:
+    """Create the task indexes without blocking writes to the tables."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        # Superseded by ix_tasks_household_id_status, which has the same
+        # leading column.
+        op.drop_index(
+            "ix_tasks_household_id",
+            table_name="tasks",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Restore the single household_id index and drop the new indexes."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_household_id",
+            "tasks",
+            ["household_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,51 @@
+"""Add tasks.incomplete_dependency_count.
+
+Revision ID: add_incomplete_dependency_count
+Revises: add_task_query_indexes
+Create Date: 2026-03-14 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_incomplete_dependency_count"
+down_revision: Union[str, None] = "add_task_query_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the counter column and backfill it from task_dependencies."""
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "incomplete_dependency_count",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+        ),
+    )
+    op.execute(
+        """
+        UPDATE tasks
+        SET incomplete_dependency_count = counts.incomplete
+        FROM (
+            SELECT task_dependencies.task_id, COUNT(*) AS incomplete
+            FROM task_dependencies
+            JOIN tasks AS dependency
+                ON dependency.id = task_dependencies.depends_on_task_id
+            WHERE dependency.status <> 'done'
+            GROUP BY task_dependencies.task_id
+        ) AS counts
+        WHERE tasks.id = counts.task_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the counter column."""
+    op.drop_column("tasks", "incomplete_dependency_count")
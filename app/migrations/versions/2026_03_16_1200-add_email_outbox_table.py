@@ -0,0 +1,68 @@
+"""Add the email_outbox table.
+
+Revision ID: add_email_outbox
+Revises: add_incomplete_dependency_count
+Create Date: 2026-03-16 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "add_email_outbox"
+down_revision: Union[str, None] = "add_incomplete_dependency_count"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create email_outbox and the index the mail worker polls."""
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("subject", sa.Text(), nullable=False),
+        sa.Column(
+            "recipients", postgresql.JSONB(astext_type=sa.Text()), nullable=False
+        ),
+        sa.Column("body", sa.Text(), nullable=True),
+        sa.Column("template_name", sa.Text(), nullable=True),
+        sa.Column(
+            "template_body",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+        ),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "sent", "dead", name="outboxstatus"),
+            nullable=False,
+        ),
+        sa.Column(
+            "attempts", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "next_attempt_at", sa.DateTime(timezone=True), nullable=False
+        ),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_email_outbox_pending_next_attempt_at",
+        "email_outbox",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the email_outbox table."""
+    op.drop_index(
+        "ix_email_outbox_pending_next_attempt_at", table_name="email_outbox"
+    )
+    op.drop_table("email_outbox")
+    sa.Enum(name="outboxstatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,69 @@
+"""Define the EmailOutbox model."""
+
+from __future__ import annotations
+
+import enum
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import BigInteger, DateTime, Enum, Index, Integer, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.db import Base
+
+
+class OutboxStatus(str, enum.Enum):
+    """Allowed outbox email statuses."""
+
+    pending = "pending"
+    sent = "sent"
+    dead = "dead"
+
+
+class EmailOutbox(Base):
+    """An email waiting to be sent by the mail worker.
+
+    Rows are added in the same transaction as the change that sends them,
+    so an email is queued if and only if the change is committed.
+    """
+
+    __tablename__ = "email_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    subject: Mapped[str] = mapped_column(Text)
+    # A list of {"name", "email"} objects.
+    recipients: Mapped[list[dict[str, str]]] = mapped_column(JSONB)
+    body: Mapped[str | None] = mapped_column(Text, nullable=True)
+    template_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+    template_body: Mapped[dict[str, Any] | None] = mapped_column(
+        JSONB, nullable=True
+    )
+    status: Mapped[OutboxStatus] = mapped_column(
+        Enum(OutboxStatus), default=OutboxStatus.pending
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0"
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    def __repr__(self) -> str:
+        """Define the model representation."""
+        return f'EmailOutbox({self.id}, "{self.subject}", {self.status.value})'
+
+
+# The worker polls for pending emails that are due, oldest first.
+Index(
+    "ix_email_outbox_pending_next_attempt_at",
+    EmailOutbox.next_attempt_at,
+    postgresql_where=EmailOutbox.status == OutboxStatus.pending,
+)
@@ -6,7 +6,19 @@ import enum
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, String, Table, Text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    desc,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -37,6 +49,9 @@ task_rooms = Table(
         ForeignKey("rooms.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    # The primary key only covers lookups by task; room filters and room
+    # stats search by room.
+    Index("ix_task_rooms_room_id", "room_id"),
 )
 
 
@@ -55,6 +70,26 @@ task_dependencies = Table(
         ForeignKey("tasks.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    # Reverse edge lookups: dependents of a task (cycle checks, unblocking).
+    Index("ix_task_dependencies_depends_on_task_id", "depends_on_task_id"),
+)
+
+
+# Materialized per-status task counters. ``scope_id`` is either a household
+# id (counts for the whole household) or a room id (counts for tasks
+# assigned to that room). Maintained by ``app.database.task_stats``.
+task_status_counts = Table(
+    "task_status_counts",
+    Base.metadata,
+    Column("scope_id", UUID(as_uuid=True), primary_key=True),
+    Column("status", Enum(TaskStatus), primary_key=True),
+    Column(
+        "household_id",
+        UUID(as_uuid=True),
+        ForeignKey("households.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("count", Integer(), nullable=False, server_default="0"),
 )
 
 
@@ -62,12 +97,41 @@ class Task(Base):
     """Define the Task model."""
 
     __tablename__ = "tasks"
+    # Every task query is scoped to one household, so each index leads with
+    # household_id (which also serves plain household lookups). The sort
+    # indexes end with id to match the keyset pagination order of GET /tasks.
+    __table_args__ = (
+        Index("ix_tasks_household_id_status", "household_id", "status"),
+        Index(
+            "ix_tasks_household_id_priority", "household_id", "priority", "id"
+        ),
+        Index(
+            "ix_tasks_household_id_created_at",
+            "household_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_tasks_household_id_assigned_user_id",
+            "household_id",
+            "assigned_user_id",
+            postgresql_where=text("assigned_user_id IS NOT NULL"),
+        ),
+        # Open tasks in suggestion order (priority desc, oldest first).
+        Index(
+            "ix_tasks_household_id_open_priority",
+            "household_id",
+            desc("priority"),
+            "created_at",
+            postgresql_where=text("status != 'done'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     household_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("households.id", ondelete="CASCADE"), index=True
+        UUID(as_uuid=True), ForeignKey("households.id", ondelete="CASCADE")
     )
     title: Mapped[str] = mapped_column(String(200))
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -77,6 +141,11 @@ class Task(Base):
         Enum(TaskStatus), default=TaskStatus.not_started
     )
     assigned_user_id: Mapped[int | None] = mapped_column(nullable=True)
+    # Number of dependencies that are not done yet. Maintained by
+    # ``app.database.propagation``; a task is blocked while it is non-zero.
+    incomplete_dependency_count: Mapped[int] = mapped_column(
+        default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.now(timezone.utc)
     )
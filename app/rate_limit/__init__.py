@@ -4,10 +4,10 @@ from typing import TYPE_CHECKING
 
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 
 from app.config.settings import get_settings
 from app.logs import LogCategory, category_logger
+from app.rate_limit.client import client_ip
 
 if TYPE_CHECKING:
     from slowapi import Limiter as LimiterType
@@ -58,7 +58,8 @@ def get_limiter() -> Limiter:
 
     # Create limiter instance
     _limiter = Limiter(
-        key_func=get_remote_address,  # Rate limit by IP address
+        # Rate limit by client address, as reported by trusted proxies
+        key_func=client_ip,
         storage_uri=storage_uri,
         enabled=settings.rate_limit_enabled,
     )
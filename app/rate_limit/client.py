@@ -0,0 +1,79 @@
+"""Find the address of the client behind trusted reverse proxies.
+
+Behind a load balancer every request arrives from one of a few proxy
+addresses, so limiting by the peer address would make all users share a
+budget. Proxies append the address they received a request from to
+``X-Forwarded-For``, so the client is the last address in the header that
+was not added by one of our own proxies (``TRUSTED_PROXIES``). Addresses
+further left are set by the client itself and cannot be trusted.
+"""
+
+from __future__ import annotations
+
+import functools
+import ipaddress
+from typing import TYPE_CHECKING
+
+from app.config.settings import get_settings
+from app.logs import LogCategory, category_logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fastapi import Request
+
+Network = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+# Used when the peer address is unknown, e.g. in tests.
+UNKNOWN_CLIENT = "unknown"
+
+
+@functools.cache
+def parse_networks(value: str) -> tuple[Network, ...]:
+    """Parse comma-separated IPs and CIDR ranges, skipping invalid ones."""
+    networks = []
+    for item in value.split(","):
+        entry = item.strip()
+        if not entry:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            category_logger.warning(
+                "Ignoring invalid trusted proxy {!r}",
+                LogCategory.AUTH,
+                entry,
+            )
+    return tuple(networks)
+
+
+def _trusted(address: str, networks: tuple[Network, ...]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_ip(request: Request) -> str:
+    """Return the address of the client that made the request.
+
+    This is the peer address, unless the peer is a trusted proxy: then it
+    is the rightmost ``X-Forwarded-For`` address not of a trusted proxy.
+    """
+    peer = request.client.host if request.client else UNKNOWN_CLIENT
+    networks = parse_networks(get_settings().trusted_proxies)
+    if not networks or not _trusted(peer, networks):
+        return peer
+
+    client = peer
+    forwarded = ",".join(request.headers.getlist("X-Forwarded-For"))
+    for item in reversed(forwarded.split(",")):
+        address = item.strip()
+        try:
+            ipaddress.ip_address(address)
+        except ValueError:
+            # Garbage is never a client address; the proxy before it is.
+            break
+        client = address
+        if not _trusted(address, networks):
+            break
+    return client
@@ -1,7 +1,13 @@
 """Rate limit configurations for different endpoints."""
 
+import re
+from dataclasses import dataclass, field
+from enum import Enum
 from typing import ClassVar
 
+_LIMIT_PATTERN = re.compile(r"^(\d+)/(\d*)\s*(second|minute|hour|day)s?$")
+_UNIT_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
 
 class RateLimits:
     """Rate limit definitions for authentication endpoints.
@@ -31,3 +37,78 @@ class RateLimits:
 
     # Password reset POST (actual reset) - critical security
     RESET_PASSWORD_POST: ClassVar[str] = "5/hour"  # noqa: S105
+
+
+class RateLimitScope(str, Enum):
+    """Who a rate limit policy counts requests for."""
+
+    # The client's IP address (see ``app.rate_limit.client``)
+    IP = "ip"
+    # The authenticated user, or the client's IP without a token
+    USER = "user"
+    # The household of the authenticated user, shared by its members
+    HOUSEHOLD = "household"
+
+
+@dataclass(frozen=True)
+class RatePolicy:
+    """A rate limit for a group of routes and who it applies to.
+
+    Attributes:
+        name: Identifies the policy's counters; routes sharing a policy
+            share its budget.
+        limit: Rate limit string in the ``RateLimits`` format.
+        scope: Who requests are counted for.
+        count: Requests allowed per period, parsed from ``limit``.
+        period: The period in seconds, parsed from ``limit``.
+    """
+
+    name: str
+    limit: str
+    scope: RateLimitScope
+    count: int = field(init=False)
+    period: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Parse the limit once, when the policy is declared."""
+        count, period = parse_limit(self.limit)
+        object.__setattr__(self, "count", count)
+        object.__setattr__(self, "period", period)
+
+
+def parse_limit(limit: str) -> tuple[int, int]:
+    """Parse a rate limit string into a count and a period in seconds.
+
+    Raises:
+        ValueError: If the string is not in the ``RateLimits`` format.
+    """
+    match = _LIMIT_PATTERN.match(limit)
+    if not match:
+        msg = f"Invalid rate limit: {limit!r}"
+        raise ValueError(msg)
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * _UNIT_SECONDS[unit]
+
+
+class RatePolicies:
+    """Rate limit policies for the household APIs.
+
+    Apply them with the ``rate_limit`` dependency from
+    ``app.rate_limit.dependencies``. Counters are shared by all workers
+    through Redis when it is enabled.
+    """
+
+    # Reading tasks, rooms and floors, per household
+    HOUSEHOLD_READ: ClassVar[RatePolicy] = RatePolicy(
+        "household_read", "300/minute", RateLimitScope.HOUSEHOLD
+    )
+
+    # Changing tasks, rooms and floors, per household
+    HOUSEHOLD_WRITE: ClassVar[RatePolicy] = RatePolicy(
+        "household_write", "60/minute", RateLimitScope.HOUSEHOLD
+    )
+
+    # Managing households, members and invitations, per user
+    MEMBERSHIP: ClassVar[RatePolicy] = RatePolicy(
+        "membership", "30/minute", RateLimitScope.USER
+    )
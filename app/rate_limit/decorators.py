@@ -9,6 +9,7 @@ from slowapi.errors import RateLimitExceeded
 from app.logs import LogCategory, category_logger
 from app.metrics import increment_rate_limit_exceeded
 from app.rate_limit import get_limiter
+from app.rate_limit.client import UNKNOWN_CLIENT, client_ip
 
 
 def rate_limited(limit: str) -> Callable[..., Any]:
@@ -58,13 +59,13 @@ def rate_limited(limit: str) -> Callable[..., Any]:
                     None,
                 )
 
-                client_ip = "unknown"
-                if request and hasattr(request, "client") and request.client:
-                    client_ip = request.client.host
+                address = client_ip(request) if request else UNKNOWN_CLIENT
 
                 category_logger.warning(
-                    f"Rate limit exceeded for {client_ip}: {limit}",
+                    "Rate limit exceeded for {}: {}",
                     LogCategory.AUTH,
+                    address,
+                    limit,
                 )
 
                 # Increment metrics
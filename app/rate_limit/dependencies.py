@@ -0,0 +1,122 @@
+"""Route dependencies enforcing rate limit policies.
+
+The ``@rate_limited`` decorator limits the authentication routes by client
+address. The household APIs are limited per user or per household instead
+(see ``RatePolicies``), so one busy household cannot exhaust the budget of
+everyone behind the same load balancer.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import uuid  # noqa: TC003
+from typing import TYPE_CHECKING, Annotated
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.config.settings import get_settings
+from app.logs import LogCategory, category_logger
+from app.managers.auth import oauth2_schema
+from app.managers.security import get_current_household
+from app.metrics import increment_rate_limit_exceeded
+from app.middleware.rate_limit_headers import RATE_LIMIT_STATE
+from app.models.user import User  # noqa: TC001
+from app.rate_limit import gcra
+from app.rate_limit.client import client_ip
+from app.rate_limit.config import RateLimitScope, RatePolicy
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Awaitable, Callable
+
+RATE_LIMITED_DETAIL = "Rate limit exceeded. Please try again later."
+
+
+async def ip_subject(request: Request) -> str:
+    """Identify the client by its address."""
+    return f"ip:{client_ip(request)}"
+
+
+async def user_subject(
+    request: Request,
+    user: Annotated[User | None, Depends(oauth2_schema)],
+) -> str:
+    """Identify the client by its user, or its address without a token.
+
+    Shares the JWT check with the route's own ``get_current_user``, which
+    FastAPI runs once per request.
+    """
+    if user is None:
+        return await ip_subject(request)
+    return f"user:{user.id}"
+
+
+async def household_subject(
+    household_id: Annotated[uuid.UUID, Depends(get_current_household)],
+) -> str:
+    """Identify the client by the household of its user."""
+    return f"household:{household_id}"
+
+
+_SUBJECTS: dict[RateLimitScope, Callable[..., Awaitable[str]]] = {
+    RateLimitScope.IP: ip_subject,
+    RateLimitScope.USER: user_subject,
+    RateLimitScope.HOUSEHOLD: household_subject,
+}
+
+
+@functools.cache
+def rate_limit(policy: RatePolicy) -> Callable[..., Awaitable[None]]:
+    """Return a dependency that enforces a rate limit policy.
+
+    Raises HTTPException 429, with a ``Retry-After`` header, once the
+    policy's subject has used up its budget. Every response also reports
+    the remaining budget in ``RateLimit-*`` headers (see
+    ``app.middleware.rate_limit_headers``). Does nothing while rate
+    limiting is disabled (``RATE_LIMIT_ENABLED=false``).
+
+    Example:
+        ```python
+        @router.post(
+            "/",
+            dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
+        )
+        async def create_task(...): ...
+        ```
+    """
+
+    # A default rather than Annotated: string annotations are resolved in
+    # the module's globals, which do not include ``policy``.
+    async def enforce(
+        request: Request,
+        subject: str = Depends(_SUBJECTS[policy.scope]),
+    ) -> None:
+        if not get_settings().rate_limit_enabled:
+            return
+        result = await gcra.check(policy, subject)
+        # Report the tightest budget when several policies apply.
+        recorded = getattr(request.state, RATE_LIMIT_STATE, None)
+        if recorded is None or result.remaining <= recorded.remaining:
+            setattr(request.state, RATE_LIMIT_STATE, result)
+        if result.allowed:
+            return
+
+        endpoint = request.scope.get("endpoint")
+        category_logger.warning(
+            "Rate limit exceeded for {}: {} ({})",
+            LogCategory.AUTH,
+            subject,
+            policy.name,
+            policy.limit,
+        )
+        increment_rate_limit_exceeded(
+            endpoint=getattr(endpoint, "__name__", request.url.path),
+            limit=policy.limit,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=RATE_LIMITED_DETAIL,
+            headers={"Retry-After": str(math.ceil(result.retry_after))},
+        )
+
+    return enforce
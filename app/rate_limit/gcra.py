@@ -0,0 +1,167 @@
+"""Rate limit counters using the generic cell rate algorithm (GCRA).
+
+For a policy allowing ``count`` requests per ``period``, each request
+moves a theoretical arrival time (TAT) ``period / count`` into the
+future, starting from now if it is in the past. A request is allowed as
+long as the new TAT is at most ``period`` ahead of now, so a client can
+burst ``count`` requests and then continues at the policy's average rate.
+Unlike a fixed window there is no boundary at which a client can send
+twice its budget, and unlike a sliding log only the TAT is stored.
+
+With Redis (``RATE_LIMIT_ENABLED`` and ``REDIS_ENABLED``) the check is a
+Lua script, so it is atomic across workers and takes one round trip; it
+uses Redis' clock so workers' clocks need not agree. Without Redis, or
+while it is unreachable, each worker keeps its own TATs in memory.
+
+With Redis, each worker also counts requests in memory first, as a token
+bucket of the policy's size. A client that sent this worker alone more
+than its budget is over the shared limit as well, so it is refused
+without a Redis round trip; only requests the local bucket allows are
+counted in Redis.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.cache.snapshot import LRUCache
+from app.config.settings import get_settings
+from app.logs import LogCategory, category_logger
+from app.metrics import increment_rate_limit_decision
+
+if TYPE_CHECKING:  # pragma: no cover
+    from redis.commands.core import AsyncScript
+
+    from app.rate_limit.config import RatePolicy
+
+KEY_PREFIX = "rate-limit"
+# Most clients each worker tracks in memory.
+LOCAL_MAXSIZE = 10_000
+
+# KEYS[1]: the TAT key. ARGV[1]: milliseconds per request. ARGV[2]: the
+# period in milliseconds. Returns whether the request is allowed, the
+# requests remaining, and the milliseconds until a request is allowed and
+# until the budget is full again.
+_GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or now), now)
+local new_tat = tat + interval
+if new_tat - now > period then
+    return {0, 0, new_tat - period - now, tat - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, math.floor((period - (new_tat - now)) / interval), 0, new_tat - now}
+"""
+
+_redis: Redis[bytes] | None = None
+_script: AsyncScript | None = None
+_local: LRUCache[str, float] = LRUCache(maxsize=LOCAL_MAXSIZE)
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """The outcome of counting a request against a policy.
+
+    Attributes:
+        allowed: Whether the request is within the limit.
+        limit: The requests allowed per period.
+        remaining: The requests the client can still burst.
+        retry_after: Seconds until a request will be allowed, or 0.
+        reset: Seconds until the client's whole budget is available.
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset: float
+
+
+def _redis_script() -> AsyncScript | None:
+    """Return the GCRA script on a shared Redis client, if Redis is used."""
+    global _redis, _script  # noqa: PLW0603
+    settings = get_settings()
+    if not (settings.rate_limit_enabled and settings.redis_enabled):
+        return None
+    if _script is None:
+        _redis = Redis.from_url(settings.rate_limit_storage_url)
+        _script = _redis.register_script(_GCRA_SCRIPT)
+    return _script
+
+
+def _check_local(key: str, policy: RatePolicy) -> RateLimitResult:
+    """Count a request in this worker's memory."""
+    now = time.monotonic()
+    interval = policy.period / policy.count
+    tat = max(_local.get(key) or now, now)
+    new_tat = tat + interval
+    if new_tat - now > policy.period:
+        return RateLimitResult(
+            allowed=False,
+            limit=policy.count,
+            remaining=0,
+            retry_after=new_tat - policy.period - now,
+            reset=tat - now,
+        )
+    _local.set(key, new_tat, new_tat - now)
+    return RateLimitResult(
+        allowed=True,
+        limit=policy.count,
+        remaining=math.floor((policy.period - (new_tat - now)) / interval),
+        retry_after=0,
+        reset=new_tat - now,
+    )
+
+
+async def check(policy: RatePolicy, subject: str) -> RateLimitResult:
+    """Count a request by a subject, e.g. ``user:42``, against a policy."""
+    key = f"{KEY_PREFIX}:{policy.name}:{subject}"
+    local = _check_local(key, policy)
+    script = _redis_script()
+    if script is None or not local.allowed:
+        increment_rate_limit_decision("local", allowed=local.allowed)
+        return local
+
+    period_ms = policy.period * 1000
+    try:
+        allowed, remaining, retry_ms, reset_ms = await script(
+            keys=[key], args=[max(period_ms // policy.count, 1), period_ms]
+        )
+    except (RedisError, OSError) as e:
+        category_logger.error(
+            "Rate limit check failed, counting locally: {}",
+            LogCategory.AUTH,
+            e,
+        )
+        increment_rate_limit_decision("local", allowed=True)
+        return local
+    increment_rate_limit_decision("redis", allowed=bool(allowed))
+    return RateLimitResult(
+        allowed=bool(allowed),
+        limit=policy.count,
+        remaining=int(remaining),
+        retry_after=retry_ms / 1000,
+        reset=reset_ms / 1000,
+    )
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client, if one was opened."""
+    global _redis, _script  # noqa: PLW0603
+    if _redis is not None:
+        await _redis.close()
+    _redis = _script = None
+
+
+def clear_local() -> None:
+    """Forget the requests counted in this worker's memory."""
+    _local.clear()
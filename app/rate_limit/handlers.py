@@ -1,11 +1,14 @@
 """Exception handlers for rate limiting."""
 
+import functools
 import re
 
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from slowapi.errors import RateLimitExceeded
 
+from app.middleware.rate_limit_headers import rate_limit_headers
+
 # Default Retry-After value in seconds (1 hour)
 DEFAULT_RETRY_AFTER = "3600"
 
@@ -18,9 +21,13 @@ UNIT_TO_SECONDS = {
 }
 
 
+@functools.cache
 def parse_retry_after(limit_str: str) -> str:
     """Parse rate limit string and return Retry-After seconds.
 
+    Results are cached, so each limit is only parsed on its first
+    rejection.
+
     Args:
         limit_str: Rate limit string like "3 per 1 hour" or "5/15minutes"
 
@@ -61,16 +68,20 @@ async def rate_limit_handler(
 ) -> JSONResponse:
     """Handle rate limit exceeded exceptions.
 
-    Returns a 429 status with Retry-After header.
+    Returns a 429 status with Retry-After and RateLimit-* headers.
     """
     # Calculate Retry-After from limit string
-    retry_after = DEFAULT_RETRY_AFTER  # Default to 1 hour
+    headers = {"Retry-After": DEFAULT_RETRY_AFTER}  # Default to 1 hour
     if exc.limit is not None:
         limit_str = str(exc.limit.limit)
         retry_after = parse_retry_after(limit_str)
+        headers = {
+            "Retry-After": retry_after,
+            **rate_limit_headers(exc.limit.limit.amount, 0, int(retry_after)),
+        }
 
     return JSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={"detail": "Rate limit exceeded. Please try again later."},
-        headers={"Retry-After": retry_after},
+        headers=headers,
     )
@@ -6,7 +6,6 @@ from urllib.parse import quote
 import jwt
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Body,
     Depends,
     HTTPException,
@@ -57,7 +56,6 @@ MIN_PASSWORD_LENGTH = 8
 @rate_limited(RateLimits.REGISTER)
 async def register(
     request: Request,  # noqa: ARG001 - Required by slowapi decorator
-    background_tasks: BackgroundTasks,
     user_data: UserRegisterRequest,
     session: Annotated[AsyncSession, Depends(get_database)],
 ) -> dict[str, str]:
@@ -73,7 +71,7 @@ async def register(
     token, refresh = await UserManager.register(
         user_data.model_dump(),
         session=session,
-        background_tasks=background_tasks,
+        send_welcome=True,
     )
     return {"token": token, "refresh": refresh}
 
@@ -149,7 +147,6 @@ async def verify(
 @rate_limited(RateLimits.FORGOT_PASSWORD)
 async def forgot_password(
     request: Request,  # noqa: ARG001 - Required by slowapi decorator
-    background_tasks: BackgroundTasks,
     request_data: ForgotPasswordRequest,
     session: Annotated[AsyncSession, Depends(get_database)],
 ) -> dict[str, str]:
@@ -161,9 +158,7 @@ async def forgot_password(
 
     The reset link will expire after 30 minutes.
     """
-    await AuthManager.forgot_password(
-        request_data.email, background_tasks, session
-    )
+    await AuthManager.forgot_password(request_data.email, session)
     return {"message": ResponseMessages.RESET_EMAIL_SENT}
 
 
@@ -7,11 +7,18 @@ from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import (
+    cached,
+    household_key_builder,
+    invalidate_household_cache_on_commit,
+)
+from app.cache.constants import CacheNamespaces
 from app.database.db import get_database
-from app.database.quota import check_floor_quota, get_user_household_id
-from app.managers.security import get_current_user
+from app.database.quota import check_floor_quota
+from app.managers.security import get_current_household
 from app.models.floor import Floor
-from app.models.user import User
+from app.rate_limit.config import RatePolicies
+from app.rate_limit.dependencies import rate_limit
 from app.schemas.request.floor import CreateFloorRequest, UpdateFloorRequest
 from app.schemas.response.floor import FloorResponse
 
@@ -20,17 +27,22 @@ router = APIRouter(tags=["Floors"], prefix="/floors")
 
 @router.get(
     "",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_READ))],
     summary="Get floors",
     description=(
         "Fetch list of all floors in the household for dropdown selection."
     ),
 )
+@cached(
+    namespace=CacheNamespaces.HOUSEHOLD,
+    key_builder=household_key_builder,
+    revalidate=True,
+)
 async def get_floors(
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> list[FloorResponse]:
     """Get all floors for the user's household."""
-    household_id = await get_user_household_id(db, user.id)
     result = await db.execute(
         select(Floor)
         .where(Floor.household_id == household_id)
@@ -42,17 +54,17 @@ async def get_floors(
 
 @router.post(
     "",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     status_code=status.HTTP_201_CREATED,
     summary="Create floor",
     description="Create a new floor for the household.",
 )
 async def create_floor(
     request: CreateFloorRequest,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> FloorResponse:
     """Create a new floor."""
-    household_id = await get_user_household_id(db, user.id)
     await check_floor_quota(db, household_id)
 
     floor = Floor(
@@ -62,22 +74,23 @@ async def create_floor(
     )
     db.add(floor)
     await db.flush()
+    invalidate_household_cache_on_commit(db, household_id)
     return FloorResponse.model_validate(floor)
 
 
 @router.put(
     "/{floor_id}",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     summary="Update floor",
     description="Update floor details.",
 )
 async def update_floor(
     floor_id: UUID,
     request: UpdateFloorRequest,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> FloorResponse:
     """Update an existing floor."""
-    household_id = await get_user_household_id(db, user.id)
     result = await db.execute(
         select(Floor).where(Floor.id == floor_id, Floor.household_id == household_id)
     )
@@ -91,22 +104,23 @@ async def update_floor(
     if request.order is not None:
         floor.order = request.order
     await db.flush()
+    invalidate_household_cache_on_commit(db, household_id)
     return FloorResponse.model_validate(floor)
 
 
 @router.delete(
     "",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete floor",
     description="Delete a floor by id.",
 )
 async def delete_floor(
     floor_id: UUID,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> Response:
     """Delete a floor."""
-    household_id = await get_user_household_id(db, user.id)
     result = await db.execute(
         select(Floor).where(Floor.id == floor_id, Floor.household_id == household_id)
     )
@@ -116,4 +130,5 @@ async def delete_floor(
             status_code=status.HTTP_404_NOT_FOUND, detail="Floor not found"
         )
     await db.delete(floor)
+    invalidate_household_cache_on_commit(db, household_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
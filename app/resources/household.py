@@ -9,10 +9,14 @@ from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession  # noqa: TC002
 
+from app.database import membership
 from app.database.db import get_database
+from app.database.replica import get_read_database
 from app.managers.security import get_current_user
 from app.models.household import Household, HouseholdRole, household_members
 from app.models.user import User  # noqa: TC001
+from app.rate_limit.config import RatePolicies
+from app.rate_limit.dependencies import rate_limit
 from app.schemas.request.household import (  # noqa: TC001
     CreateHouseholdRequest,
     UpdateHouseholdRequest,
@@ -87,14 +91,17 @@ def _household_response(
 
 @router.get(
     "",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[
+        Depends(get_current_user),
+        Depends(rate_limit(RatePolicies.MEMBERSHIP)),
+    ],
     response_model=HouseholdResponse,
     summary="Get household information",
     description="Fetch household details for the current user.",
 )
 async def get_household(
     user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_database)],
+    db: Annotated[AsyncSession, Depends(get_read_database)],
 ) -> HouseholdResponse:
     """Get household information for the current user."""
     household = await _get_household_for_user(db, user.id)
@@ -104,7 +111,10 @@ async def get_household(
 
 @router.post(
     "",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[
+        Depends(get_current_user),
+        Depends(rate_limit(RatePolicies.MEMBERSHIP)),
+    ],
     response_model=HouseholdResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Create household",
@@ -141,6 +151,7 @@ async def create_household(
         )
     )
     await db.flush()
+    membership.invalidate_household_membership_on_commit(db, user.id)
 
     members = await _get_members(db, household.id)
     return _household_response(household, members)
@@ -148,7 +159,10 @@ async def create_household(
 
 @router.put(
     "",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[
+        Depends(get_current_user),
+        Depends(rate_limit(RatePolicies.MEMBERSHIP)),
+    ],
     response_model=HouseholdResponse,
     summary="Update household",
     description="Update the household name. Owner only.",
@@ -173,7 +187,10 @@ async def update_household(
 
 @router.delete(
     "",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[
+        Depends(get_current_user),
+        Depends(rate_limit(RatePolicies.MEMBERSHIP)),
+    ],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete household",
     description=(
@@ -192,18 +209,22 @@ async def delete_household(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Forbidden – user is not the household owner",
         )
-    await db.execute(
-        delete(household_members).where(
-            household_members.c.household_id == household.id
-        )
+    removed = await db.execute(
+        delete(household_members)
+        .where(household_members.c.household_id == household.id)
+        .returning(household_members.c.user_id)
     )
     await db.delete(household)
+    membership.invalidate_household_membership_on_commit(db, *removed.scalars())
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.post(
     "/leave",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[
+        Depends(get_current_user),
+        Depends(rate_limit(RatePolicies.MEMBERSHIP)),
+    ],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Leave household",
     description="Current user leaves the household.",
@@ -225,12 +246,16 @@ async def leave_household(
             household_members.c.user_id == user.id,
         )
     )
+    membership.invalidate_household_membership_on_commit(db, user.id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.delete(
     "/users/{user_id}",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[
+        Depends(get_current_user),
+        Depends(rate_limit(RatePolicies.MEMBERSHIP)),
+    ],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Remove household member",
     description=(
@@ -251,13 +276,13 @@ async def remove_household_member(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Forbidden – insufficient permissions",
         )
-    membership = await db.execute(
+    member = await db.execute(
         select(household_members.c.user_id).where(
             household_members.c.household_id == household.id,
             household_members.c.user_id == user_id,
         )
     )
-    if not membership.scalar_one_or_none():
+    if not member.scalar_one_or_none():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found in household",
@@ -268,4 +293,5 @@ async def remove_household_member(
             household_members.c.user_id == user_id,
         )
     )
+    membership.invalidate_household_membership_on_commit(db, user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -6,18 +6,21 @@ from datetime import datetime, timedelta, timezone
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import NameEmail
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.settings import get_settings
+from app.database import membership
 from app.database.db import get_database
 from app.managers.email import EmailManager
 from app.managers.security import get_current_user
 from app.models.household import household_members
 from app.models.invitation import Invitation, InvitationStatus
 from app.models.user import User
+from app.rate_limit.config import RatePolicies
+from app.rate_limit.dependencies import rate_limit
 from app.schemas.email import EmailSchema
 from app.schemas.request.invitation import CreateInvitationRequest
 from app.schemas.response.invitation import InvitationResponse
@@ -25,17 +28,6 @@ from app.schemas.response.invitation import InvitationResponse
 router = APIRouter(tags=["Invitations"], prefix="/invitations")
 
 
-async def _get_user_household_id(
-    db: AsyncSession, user_id: int
-) -> UUID | None:
-    result = await db.execute(
-        select(household_members.c.household_id).where(
-            household_members.c.user_id == user_id
-        )
-    )
-    return result.scalar_one_or_none()
-
-
 def _invitation_response(invitation: Invitation) -> InvitationResponse:
     return InvitationResponse(
         id=invitation.id,
@@ -50,7 +42,10 @@ def _invitation_response(invitation: Invitation) -> InvitationResponse:
 
 @router.get(
     "",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[
+        Depends(get_current_user),
+        Depends(rate_limit(RatePolicies.MEMBERSHIP)),
+    ],
     response_model=list[InvitationResponse],
     summary="Get pending invitations",
     description="Fetch list of pending invitations sent from the household.",
@@ -60,7 +55,7 @@ async def get_invitations(
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> list[InvitationResponse]:
     """Get pending invitations for the user's household."""
-    household_id = await _get_user_household_id(db, user.id)
+    household_id = await membership.get_household_id(db, user.id)
     if not household_id:
         return []
     invitations = (
@@ -76,7 +71,10 @@ async def get_invitations(
 
 @router.post(
     "",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[
+        Depends(get_current_user),
+        Depends(rate_limit(RatePolicies.MEMBERSHIP)),
+    ],
     response_model=InvitationResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Invite user to household",
@@ -85,11 +83,10 @@ async def get_invitations(
 async def invite_user(
     request: CreateInvitationRequest,
     user: Annotated[User, Depends(get_current_user)],
-    background_tasks: BackgroundTasks,
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> InvitationResponse:
     """Create an invitation for the user's household."""
-    household_id = await _get_user_household_id(db, user.id)
+    household_id = await membership.get_household_id(db, user.id)
     if not household_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -112,7 +109,7 @@ async def invite_user(
     )
     email_manager = EmailManager()
     email_manager.background_send(
-        background_tasks,
+        db,
         EmailSchema(
             recipients=[NameEmail(request.email, request.email)],
             subject=f"You're invited to join {settings.api_title}",
@@ -127,7 +124,10 @@ async def invite_user(
 
 @router.delete(
     "/{invitation_id}",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[
+        Depends(get_current_user),
+        Depends(rate_limit(RatePolicies.MEMBERSHIP)),
+    ],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Cancel invitation",
     description="Cancel a pending household invitation.",
@@ -156,7 +156,10 @@ async def cancel_invitation(
 
 @router.post(
     "/{invitation_id}/accept",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[
+        Depends(get_current_user),
+        Depends(rate_limit(RatePolicies.MEMBERSHIP)),
+    ],
     response_model=dict,
     summary="Accept invitation to join household",
     description="Accept an invitation and join the household.",
@@ -201,12 +204,16 @@ async def accept_invitation(
         )
     )
     await db.flush()
+    membership.invalidate_household_membership_on_commit(db, user.id)
     return {"householdId": invitation.household_id}
 
 
 @router.post(
     "/{invitation_id}/decline",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[
+        Depends(get_current_user),
+        Depends(rate_limit(RatePolicies.MEMBERSHIP)),
+    ],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Decline invitation to join household",
     description="Decline a household invitation.",
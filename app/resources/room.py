@@ -7,12 +7,21 @@ from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import (
+    cached,
+    household_key_builder,
+    invalidate_household_cache_on_commit,
+)
+from app.cache.constants import CacheNamespaces
+from app.database import task_stats
 from app.database.db import get_database
-from app.database.quota import check_room_quota, get_user_household_id
-from app.managers.security import get_current_user
+from app.database.quota import check_room_quota
+from app.database.replica import get_read_database
+from app.managers.security import get_current_household
 from app.models.room import Room
-from app.models.task import Task, TaskStatus, task_rooms
-from app.models.user import User
+from app.models.task import TaskStatus, task_rooms
+from app.rate_limit.config import RatePolicies
+from app.rate_limit.dependencies import rate_limit
 from app.schemas.request.room import CreateRoomRequest, UpdateRoomRequest
 from app.schemas.response.room import (
     RoomDetailsResponse,
@@ -25,6 +34,7 @@ router = APIRouter(tags=["Rooms"], prefix="/rooms")
 
 @router.get(
     "",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_READ))],
     response_model=list[RoomResponse],
     summary="Get household rooms",
     description=(
@@ -32,12 +42,16 @@ router = APIRouter(tags=["Rooms"], prefix="/rooms")
         "including color coding."
     ),
 )
+@cached(
+    namespace=CacheNamespaces.HOUSEHOLD,
+    key_builder=household_key_builder,
+    revalidate=True,
+)
 async def get_rooms(
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> list[RoomResponse]:
     """Get all rooms for the user's household."""
-    household_id = await get_user_household_id(db, user.id)
     result = await db.execute(
         select(Room).where(Room.household_id == household_id).order_by(Room.name)
     )
@@ -47,6 +61,7 @@ async def get_rooms(
 
 @router.post(
     "",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     response_model=RoomResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Create new room",
@@ -54,11 +69,10 @@ async def get_rooms(
 )
 async def create_room(
     room_data: CreateRoomRequest,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> RoomResponse:
     """Create a new room."""
-    household_id = await get_user_household_id(db, user.id)
     await check_room_quota(db, household_id)
 
     room = Room(
@@ -69,11 +83,13 @@ async def create_room(
     )
     db.add(room)
     await db.flush()
+    invalidate_household_cache_on_commit(db, household_id)
     return RoomResponse.model_validate(room)
 
 
 @router.get(
     "/{room_id}",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_READ))],
     response_model=RoomDetailsResponse,
     summary="Get single room details",
     description=(
@@ -83,11 +99,10 @@ async def create_room(
 )
 async def get_room(
     room_id: UUID,
-    user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_database)],
+    household_id: Annotated[UUID, Depends(get_current_household)],
+    db: Annotated[AsyncSession, Depends(get_read_database)],
 ) -> RoomDetailsResponse:
     """Get a single room."""
-    household_id = await get_user_household_id(db, user.id)
     result = await db.execute(
         select(Room).where(Room.id == room_id, Room.household_id == household_id)
     )
@@ -103,6 +118,7 @@ async def get_room(
 
 @router.put(
     "/{room_id}",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     response_model=RoomResponse,
     summary="Update room",
     description="Update room details including name, color, and floor.",
@@ -110,11 +126,10 @@ async def get_room(
 async def update_room(
     room_id: UUID,
     room_data: UpdateRoomRequest,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> RoomResponse:
     """Update a room."""
-    household_id = await get_user_household_id(db, user.id)
     result = await db.execute(
         select(Room).where(Room.id == room_id, Room.household_id == household_id)
     )
@@ -130,11 +145,13 @@ async def update_room(
     if room_data.floor is not None:
         room.floor = room_data.floor
     await db.flush()
+    invalidate_household_cache_on_commit(db, household_id)
     return RoomResponse.model_validate(room)
 
 
 @router.delete(
     "/{room_id}",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete room",
     description=(
@@ -144,11 +161,10 @@ async def update_room(
 )
 async def delete_room(
     room_id: UUID,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> Response:
     """Delete a room."""
-    household_id = await get_user_household_id(db, user.id)
     result = await db.execute(
         select(Room).where(Room.id == room_id, Room.household_id == household_id)
     )
@@ -170,22 +186,23 @@ async def delete_room(
             detail="Room has assigned tasks",
         )
     await db.delete(room)
+    invalidate_household_cache_on_commit(db, household_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get(
     "/{room_id}/stats",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_READ))],
     response_model=RoomStatsResponse,
     summary="Get room statistics",
     description="Fetch aggregated task statistics for a specific room.",
 )
 async def get_room_stats(
     room_id: UUID,
-    user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_database)],
+    household_id: Annotated[UUID, Depends(get_current_household)],
+    db: Annotated[AsyncSession, Depends(get_read_database)],
 ) -> RoomStatsResponse:
     """Get room statistics."""
-    household_id = await get_user_household_id(db, user.id)
     result = await db.execute(
         select(Room).where(Room.id == room_id, Room.household_id == household_id)
     )
@@ -194,38 +211,10 @@ async def get_room_stats(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
         )
-    base_query = (
-        select(Task)
-        .join(task_rooms, task_rooms.c.task_id == Task.id)
-        .where(task_rooms.c.room_id == room_id)
-    )
-    total = (
-        await db.execute(select(func.count()).select_from(base_query.subquery()))
-    ).scalar_one()
-    completed = (
-        await db.execute(
-            select(func.count()).select_from(
-                base_query.where(Task.status == TaskStatus.done).subquery()
-            )
-        )
-    ).scalar_one()
-    in_progress = (
-        await db.execute(
-            select(func.count()).select_from(
-                base_query.where(Task.status == TaskStatus.in_progress).subquery()
-            )
-        )
-    ).scalar_one()
-    blocked = (
-        await db.execute(
-            select(func.count()).select_from(
-                base_query.where(Task.status == TaskStatus.blocked).subquery()
-            )
-        )
-    ).scalar_one()
+    counts = await task_stats.room_status_counts(db, room_id)
     return RoomStatsResponse(
-        total_tasks=total,
-        completed=completed,
-        in_progress=in_progress,
-        blocked=blocked,
+        total_tasks=sum(counts.values()),
+        completed=counts[TaskStatus.done],
+        in_progress=counts[TaskStatus.in_progress],
+        blocked=counts[TaskStatus.blocked],
     )
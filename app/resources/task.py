@@ -3,28 +3,47 @@
 from __future__ import annotations
 
 import uuid as uuid_module
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Any, Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from sqlalchemy import delete, func, select
+from sqlalchemy import Select, SQLColumnExpression, delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.cache import (
+    cached,
+    household_key_builder,
+    invalidate_household_cache_on_commit,
+)
+from app.cache.constants import CacheNamespaces
+from app.database import (
+    pagination,
+    propagation,
+    reachability,
+    task_batch,
+    task_stats,
+)
 from app.database.db import get_database
-from app.database.quota import check_task_quota, get_user_household_id
-from app.managers.security import get_current_user
+from app.database.quota import check_task_quota
+from app.database.replica import get_read_database
+from app.managers.security import get_current_household
 from app.models.room import Room
 from app.models.task import Task, TaskStatus, task_dependencies
-from app.models.user import User
+from app.rate_limit.config import RatePolicies
+from app.rate_limit.dependencies import rate_limit
 from app.schemas.request.task import (
+    MAX_BATCH_OPERATIONS,
     AddDependencyRequest,
+    BatchTaskRequest,
     CreateTaskRequest,
     UpdateTaskRequest,
     UpdateTaskStatusRequest,
 )
 from app.schemas.response.task import (
     PaginatedTasksResponse,
+    TaskBatchResponse,
     TaskDashboardStats,
     TaskDependencyGraph,
     TaskDetailsResponse,
@@ -35,6 +54,9 @@ from app.schemas.response.task import (
 
 router = APIRouter(tags=["Tasks"], prefix="/tasks")
 
+# Largest page GET /tasks/{id}/available-dependencies returns.
+MAX_DEPENDENCY_PAGE_SIZE = 100
+
 
 def _task_response(task: Task) -> TaskResponse:
     return TaskResponse.model_validate(task)
@@ -72,89 +94,55 @@ async def _get_task_or_404(
     return task
 
 
-def _build_dependency_graph(edges: list[tuple[UUID, UUID]]) -> dict[UUID, set[UUID]]:
-    adjacency: dict[UUID, set[UUID]] = {}
-    for task_id, depends_on_id in edges:
-        adjacency.setdefault(task_id, set()).add(depends_on_id)
-    return adjacency
-
-
-def _has_path(
-    adjacency: dict[UUID, set[UUID]], start: UUID, target: UUID
-) -> bool:
-    seen: set[UUID] = set()
-    stack = [start]
-    while stack:
-        node = stack.pop()
-        if node == target:
-            return True
-        if node in seen:
-            continue
-        seen.add(node)
-        stack.extend(adjacency.get(node, set()))
-    return False
-
-
-async def _would_create_cycle(
-    db: AsyncSession, task_id: UUID, depends_on_task_id: UUID
-) -> bool:
-    if task_id == depends_on_task_id:
-        return True
-    result = await db.execute(
-        select(
-            task_dependencies.c.task_id,
-            task_dependencies.c.depends_on_task_id,
-        )
-    )
-    edges: list[tuple[UUID, UUID]] = list(result.tuples().all())
-    adjacency = _build_dependency_graph(edges)
-    adjacency.setdefault(task_id, set()).add(depends_on_task_id)
-    return _has_path(adjacency, depends_on_task_id, task_id)
-
-
-def _has_incomplete_dependencies(task: Task) -> bool:
-    """Check if any dependency is not done."""
-    return any(dep.status != TaskStatus.done for dep in task.depends_on)
-
+async def _count_tasks(
+    db: AsyncSession,
+    stmt: Select[tuple[Task]],
+    count: Literal["exact", "estimate", "none"],
+) -> int | None:
+    """Count the tasks ``stmt`` selects, as exactly as ``count`` asks."""
+    if count == "exact":
+        return (
+            await db.execute(select(func.count()).select_from(stmt.subquery()))
+        ).scalar_one()
+    if count == "estimate":
+        return await pagination.estimate_count(db, stmt)
+    return None
 
-async def _update_blocked_status(db: AsyncSession, task: Task) -> None:
-    """Update task blocked status based on dependencies."""
-    if _has_incomplete_dependencies(task):
-        if task.status != TaskStatus.blocked:
-            task.status = TaskStatus.blocked
-    elif task.status == TaskStatus.blocked:
-        task.status = TaskStatus.not_started
 
+_TASK_SORT_COLUMNS: dict[str, SQLColumnExpression[Any]] = {
+    "priority": Task.priority,
+    "difficulty": Task.difficulty,
+    "created_at": Task.created_at,
+}
 
-async def _unblock_dependent_tasks(db: AsyncSession, completed_task: Task) -> None:
-    """Unblock tasks that depend on the completed task if all their deps are done."""
-    dependent_tasks = (
-        await db.execute(
-            select(Task)
-            .join(
-                task_dependencies,
-                Task.id == task_dependencies.c.task_id,
-            )
-            .where(task_dependencies.c.depends_on_task_id == completed_task.id)
-            .options(selectinload(Task.depends_on))
-        )
-    ).scalars().all()
 
-    for task in dependent_tasks:
-        await _update_blocked_status(db, task)
+def _parse_sort_value(sort: str, value: object) -> object:
+    """Convert a cursor's JSON sort value back to the column's type."""
+    if sort == "created_at":
+        return datetime.fromisoformat(str(value))
+    return int(str(value))
 
 
 @router.get(
     "",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_READ))],
     response_model=PaginatedTasksResponse,
     summary="Get all tasks",
     description=(
         "Fetch a paginated list of tasks for the household with filtering "
-        "and sorting. Includes associated room data and dependency information."
+        "and sorting. Includes associated room data and dependency information. "
+        "Pass the returned next_cursor as cursor to fetch the following page "
+        "in constant time, and count=estimate or count=none to skip the "
+        "exact total."
     ),
 )
-async def get_tasks(
-    user: Annotated[User, Depends(get_current_user)],
+@cached(
+    namespace=CacheNamespaces.HOUSEHOLD,
+    key_builder=household_key_builder,
+    revalidate=True,
+)
+async def get_tasks(  # noqa: PLR0913
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
     room_ids: list[UUID] | None = Query(default=None),
     assigned_user_id: int | None = None,
@@ -166,16 +154,13 @@ async def get_tasks(
     order: str = "asc",
     page: int = 1,
     page_size: int = 20,
+    cursor: str | None = None,
+    count: Literal["exact", "estimate", "none"] = "exact",
 ) -> PaginatedTasksResponse:
     """List tasks with filtering and pagination."""
-    household_id = await get_user_household_id(db, user.id)
-    stmt = (
-        select(Task)
-        .where(Task.household_id == household_id)
-        .options(selectinload(Task.rooms))
-    )
+    stmt = select(Task).where(Task.household_id == household_id)
     if room_ids:
-        stmt = stmt.join(Task.rooms).where(Room.id.in_(room_ids)).distinct()
+        stmt = stmt.where(Task.rooms.any(Room.id.in_(room_ids)))
     if assigned_user_id:
         stmt = stmt.where(Task.assigned_user_id == assigned_user_id)
     if priorities:
@@ -189,33 +174,53 @@ async def get_tasks(
     elif blocked is False:
         stmt = stmt.where(Task.status != TaskStatus.blocked)
 
-    sort_map = {
-        "priority": Task.priority,
-        "difficulty": Task.difficulty,
-        "created_at": Task.created_at,
-    }
-    if sort in sort_map:
-        sort_col = sort_map[sort]
-        if order == "desc":
-            stmt = stmt.order_by(sort_col.desc())
-        else:
-            stmt = stmt.order_by(sort_col.asc())
+    total = await _count_tasks(db, stmt, count)
+
+    # Unsorted listings use creation order, which has a matching index.
+    # Task.id breaks ties so the order is total and cursors are stable.
+    sort_key = sort if sort in _TASK_SORT_COLUMNS else "created_at"
+    cursor_key = f"{sort_key}:{order}"
+    try:
+        stmt = pagination.keyset_select(
+            stmt,
+            [_TASK_SORT_COLUMNS[sort_key], Task.id],
+            key=cursor_key,
+            parse_value=lambda value: _parse_sort_value(sort_key, value),
+            cursor=cursor,
+            descending=order == "desc",
+            page=page,
+            page_size=page_size,
+        )
+    except pagination.InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from exc
 
-    total = (
-        await db.execute(select(func.count()).select_from(stmt.subquery()))
-    ).scalar_one()
-    stmt = stmt.limit(page_size).offset((page - 1) * page_size)
-    tasks = (await db.execute(stmt)).scalars().all()
+    tasks = (
+        (await db.execute(stmt.options(selectinload(Task.rooms))))
+        .scalars()
+        .all()
+    )
+    tasks, next_cursor = pagination.split_page(
+        tasks,
+        page_size,
+        key=cursor_key,
+        sort_value=lambda task: getattr(task, sort_key),
+        row_id=lambda task: task.id,
+    )
     return PaginatedTasksResponse(
         items=[_task_response(task) for task in tasks],
         page=page,
         page_size=page_size,
         total=total,
+        next_cursor=next_cursor,
     )
 
 
 @router.post(
     "",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     response_model=TaskResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Create new task",
@@ -223,11 +228,10 @@ async def get_tasks(
 )
 async def create_task(
     task_data: CreateTaskRequest,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> TaskResponse:
     """Create a new task."""
-    household_id = await get_user_household_id(db, user.id)
     await check_task_quota(db, household_id)
 
     task = Task(
@@ -266,7 +270,6 @@ async def create_task(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
             )
         task.depends_on = dependencies
-        await _update_blocked_status(db, task)
 
     db.add(task)
     await db.flush()
@@ -276,59 +279,77 @@ async def create_task(
             select(Task).where(Task.id == task.id).options(selectinload(Task.rooms))
         )
     ).scalar_one()
+    invalidate_household_cache_on_commit(db, household_id)
     return _task_response(task_with_rooms)
 
 
+@router.post(
+    "/batch",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
+    response_model=TaskBatchResponse,
+    summary="Apply task operations in bulk",
+    description=(
+        f"Create, update, re-status and delete up to {MAX_BATCH_OPERATIONS} "
+        "tasks in one transaction. Operations run in order and either all "
+        "succeed or none are applied. New tasks may depend on each other "
+        "through 'ref' and 'dependency_refs'."
+    ),
+)
+async def batch_tasks(
+    batch: BatchTaskRequest,
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
+    db: Annotated[AsyncSession, Depends(get_database)],
+) -> TaskBatchResponse:
+    """Apply a batch of task operations."""
+    results = await task_batch.apply_task_batch(
+        db, household_id, batch.operations
+    )
+    invalidate_household_cache_on_commit(db, household_id)
+    return TaskBatchResponse(results=results)
+
+
 @router.get(
     "/stats",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_READ))],
     response_model=TaskDashboardStats,
     summary="Get dashboard statistics",
     description="Fetch aggregated task counts for the household.",
 )
+@cached(
+    namespace=CacheNamespaces.HOUSEHOLD,
+    key_builder=household_key_builder,
+    revalidate=True,
+)
 async def get_dashboard_stats(
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> TaskDashboardStats:
     """Get task dashboard stats."""
-    household_id = await get_user_household_id(db, user.id)
-    total_open = (
-        await db.execute(
-            select(func.count()).where(
-                Task.household_id == household_id, Task.status != TaskStatus.done
-            )
-        )
-    ).scalar_one()
-    total_blocked = (
-        await db.execute(
-            select(func.count()).where(
-                Task.household_id == household_id, Task.status == TaskStatus.blocked
-            )
-        )
-    ).scalar_one()
-    total_completed = (
-        await db.execute(
-            select(func.count()).where(
-                Task.household_id == household_id, Task.status == TaskStatus.done
-            )
-        )
-    ).scalar_one()
+    counts = await task_stats.household_status_counts(db, household_id)
     return TaskDashboardStats(
-        open=total_open, blocked=total_blocked, completed=total_completed
+        open=sum(counts.values()) - counts[TaskStatus.done],
+        blocked=counts[TaskStatus.blocked],
+        completed=counts[TaskStatus.done],
     )
 
 
 @router.get(
     "/suggestions",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_READ))],
     response_model=list[TaskSuggestion],
     summary="Get smart task suggestions",
     description="Fetch top 1–3 recommended tasks with reasoning.",
 )
+@cached(
+    namespace=CacheNamespaces.HOUSEHOLD,
+    key_builder=household_key_builder,
+    revalidate=True,
+)
 async def get_task_suggestions(
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> list[TaskSuggestion]:
     """Get task suggestions."""
-    household_id = await get_user_household_id(db, user.id)
     stmt = (
         select(Task)
         .where(Task.household_id == household_id, Task.status != TaskStatus.done)
@@ -347,17 +368,17 @@ async def get_task_suggestions(
 
 @router.get(
     "/{task_id}",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_READ))],
     response_model=TaskDetailsResponse,
     summary="Get single task details",
     description="Fetch complete task information including rooms and dependencies.",
 )
 async def get_task(
     task_id: UUID,
-    user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_database)],
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
+    db: Annotated[AsyncSession, Depends(get_read_database)],
 ) -> TaskDetailsResponse:
     """Get a single task."""
-    household_id = await get_user_household_id(db, user.id)
     task = await _get_task_or_404(db, task_id, household_id, load_dependencies=True)
     response = TaskDetailsResponse.model_validate(task)
     response.dependencies = [_task_summary(dep) for dep in task.depends_on]
@@ -366,6 +387,7 @@ async def get_task(
 
 @router.put(
     "/{task_id}",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     response_model=TaskResponse,
     summary="Update existing task",
     description="Update any or all fields of an existing task.",
@@ -373,13 +395,11 @@ async def get_task(
 async def update_task(
     task_id: UUID,
     task_data: UpdateTaskRequest,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> TaskResponse:
     """Update a task."""
-    household_id = await get_user_household_id(db, user.id)
     task = await _get_task_or_404(db, task_id, household_id, load_dependencies=True)
-    status_changed_to_done = False
     if task_data.title is not None:
         task.title = task_data.title
     if task_data.description is not None:
@@ -389,8 +409,6 @@ async def update_task(
     if task_data.difficulty is not None:
         task.difficulty = task_data.difficulty
     if task_data.status is not None:
-        if task_data.status == TaskStatus.done and task.status != TaskStatus.done:
-            status_changed_to_done = True
         task.status = task_data.status
     if task_data.assigned_user_id is not None:
         task.assigned_user_id = task_data.assigned_user_id
@@ -429,86 +447,63 @@ async def update_task(
             task.depends_on = dependencies
         else:
             task.depends_on = []
-        await _update_blocked_status(db, task)
-
-    if status_changed_to_done:
-        await _unblock_dependent_tasks(db, task)
 
     await db.flush()
     await db.refresh(task)
+    invalidate_household_cache_on_commit(db, household_id)
     return _task_response(task)
 
 
 @router.delete(
     "/{task_id}",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete task",
     description="Permanently delete a task and all related records.",
 )
 async def delete_task(
     task_id: UUID,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> Response:
     """Delete a task."""
-    household_id = await get_user_household_id(db, user.id)
     task = await _get_task_or_404(db, task_id, household_id, load_dependencies=True)
     await db.delete(task)
+    invalidate_household_cache_on_commit(db, household_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get(
     "/{task_id}/available-dependencies",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_READ))],
     response_model=list[TaskSummary],
     summary="Get available tasks for dependencies",
     description=(
-        "Excludes current task and tasks that would create circular dependencies."
+        "Excludes current task and tasks that would create circular dependencies. "
+        "Pass page_size to page through large households."
     ),
 )
 async def get_available_dependencies(
     task_id: UUID,
-    user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_database)],
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
+    db: Annotated[AsyncSession, Depends(get_read_database)],
+    page: Annotated[int, Query(ge=1)] = 1,
+    page_size: Annotated[
+        int | None, Query(ge=1, le=MAX_DEPENDENCY_PAGE_SIZE)
+    ] = None,
 ) -> list[TaskSummary]:
     """Get available dependency tasks."""
-    household_id = await get_user_household_id(db, user.id)
     await _get_task_or_404(db, task_id, household_id)
-    result = await db.execute(
-        select(
-            task_dependencies.c.task_id,
-            task_dependencies.c.depends_on_task_id,
-        )
+    offset = (page - 1) * page_size if page_size else 0
+    tasks = await reachability.get_available_dependencies(
+        db, household_id, task_id, limit=page_size, offset=offset
     )
-    edges = result.all()
-    reverse_map: dict[UUID, set[UUID]] = {}
-    for task, depends_on in edges:
-        reverse_map.setdefault(depends_on, set()).add(task)
-
-    blocked_ids: set[UUID] = {task_id}
-    stack = [task_id]
-    while stack:
-        current = stack.pop()
-        for dependent in reverse_map.get(current, set()):
-            if dependent not in blocked_ids:
-                blocked_ids.add(dependent)
-                stack.append(dependent)
-
-    tasks = (
-        await db.execute(
-            select(Task)
-            .where(Task.household_id == household_id)
-            .options(selectinload(Task.rooms))
-        )
-    ).scalars().all()
-    return [
-        _task_summary(task)
-        for task in tasks
-        if task.id not in blocked_ids
-    ]
+    return [_task_summary(task) for task in tasks]
 
 
 @router.post(
     "/{task_id}/dependencies",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     status_code=status.HTTP_201_CREATED,
     summary="Add task dependency",
     description="Add a dependency where this task depends on another task.",
@@ -516,38 +511,39 @@ async def get_available_dependencies(
 async def add_task_dependency(
     task_id: UUID,
     request: AddDependencyRequest,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> Response:
     """Add a task dependency."""
-    household_id = await get_user_household_id(db, user.id)
     task = await _get_task_or_404(db, task_id, household_id, load_dependencies=True)
     dependency = await _get_task_or_404(db, request.depends_on_task_id, household_id)
-    if await _would_create_cycle(db, task_id, request.depends_on_task_id):
+    if await reachability.would_create_cycle(
+        db, household_id, task_id, request.depends_on_task_id
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Circular dependency detected",
         )
     if dependency not in task.depends_on:
         task.depends_on.append(dependency)
-        await _update_blocked_status(db, task)
     await db.flush()
+    invalidate_household_cache_on_commit(db, household_id)
     return Response(status_code=status.HTTP_201_CREATED)
 
 
 @router.delete(
     "/{task_id}/dependencies/{depends_on_task_id}",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Remove task dependency",
 )
 async def delete_task_dependency(
     task_id: UUID,
     depends_on_task_id: UUID,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> Response:
     """Remove a task dependency."""
-    household_id = await get_user_household_id(db, user.id)
     await _get_task_or_404(db, task_id, household_id)
     await db.execute(
         delete(task_dependencies).where(
@@ -555,25 +551,24 @@ async def delete_task_dependency(
             task_dependencies.c.depends_on_task_id == depends_on_task_id,
         )
     )
-    task = await _get_task_or_404(db, task_id, household_id, load_dependencies=True)
-    await _update_blocked_status(db, task)
-    await db.flush()
+    await propagation.refresh_tasks(db, [task_id])
+    invalidate_household_cache_on_commit(db, household_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get(
     "/{task_id}/dependency-graph",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_READ))],
     response_model=TaskDependencyGraph,
     summary="Get task dependency graph",
     description="Fetch dependency graph data for visualization.",
 )
 async def get_task_dependency_graph(
     task_id: UUID,
-    user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_database)],
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
+    db: Annotated[AsyncSession, Depends(get_read_database)],
 ) -> TaskDependencyGraph:
     """Get a task dependency graph."""
-    household_id = await get_user_household_id(db, user.id)
     task = await _get_task_or_404(db, task_id, household_id, load_dependencies=True)
     return TaskDependencyGraph(
         depends_on=[_task_summary(dep) for dep in task.depends_on],
@@ -583,6 +578,7 @@ async def get_task_dependency_graph(
 
 @router.patch(
     "/{task_id}/status",
+    dependencies=[Depends(rate_limit(RatePolicies.HOUSEHOLD_WRITE))],
     response_model=TaskResponse,
     summary="Quick update task status",
     description="Mark a task as done from dashboard suggestions.",
@@ -590,7 +586,7 @@ async def get_task_dependency_graph(
 async def update_task_status(
     task_id: UUID,
     task_data: UpdateTaskStatusRequest,
-    user: Annotated[User, Depends(get_current_user)],
+    household_id: Annotated[uuid_module.UUID, Depends(get_current_household)],
     db: Annotated[AsyncSession, Depends(get_database)],
 ) -> TaskResponse:
     """Update task status."""
@@ -599,11 +595,11 @@ async def update_task_status(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only 'done' status is supported",
         )
-    household_id = await get_user_household_id(db, user.id)
     task = await _get_task_or_404(db, task_id, household_id)
     task.status = TaskStatus.done
     await db.flush()
     await db.refresh(task)
+    invalidate_household_cache_on_commit(db, household_id)
     return _task_response(task)
 
 
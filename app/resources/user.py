@@ -14,6 +14,7 @@ from app.cache import (
 )
 from app.cache.constants import CacheNamespaces
 from app.database.db import get_database
+from app.database.replica import get_read_database
 from app.managers.auth import can_edit_user, is_admin
 from app.managers.security import get_current_user
 from app.managers.user import UserManager
@@ -40,6 +41,7 @@ router = APIRouter(tags=["Users"], prefix="/users")
     expire=300,
     namespace=CacheNamespaces.USER_ME,
     key_builder=user_scoped_key_builder,
+    response_model=MyUserResponse,
 )
 async def get_my_user(
     request: Request,
@@ -206,7 +208,7 @@ async def delete_user(
     description="Search for users with various criteria. Admin only endpoint.",
 )
 async def search_users(
-    db: Annotated[AsyncSession, Depends(get_database)],
+    db: Annotated[AsyncSession, Depends(get_read_database)],
     search_term: str,
     field: str = "all",
     *,
@@ -1,11 +1,15 @@
 """Define Request schemas specific to Tasks."""
 
+from typing import Annotated, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.task import TaskStatus
 
+# Maximum number of operations accepted by one POST /tasks/batch request.
+MAX_BATCH_OPERATIONS = 500
+
 
 class CreateTaskRequest(BaseModel):
     """Request schema for creating a task."""
@@ -51,3 +55,57 @@ class UpdateTaskStatusRequest(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     status: TaskStatus
+
+
+class BatchCreateTaskOperation(CreateTaskRequest):
+    """Create a task as part of a batch.
+
+    ``ref`` names the new task within the batch, so other create operations
+    can depend on it through ``dependency_refs`` before it has an id.
+    """
+
+    op: Literal["create"]
+    ref: str | None = None
+    dependency_refs: list[str] | None = None
+
+
+class BatchUpdateTaskOperation(UpdateTaskRequest):
+    """Update a task as part of a batch."""
+
+    op: Literal["update"]
+    id: UUID
+
+
+class BatchTaskStatusOperation(UpdateTaskStatusRequest):
+    """Change the status of a task as part of a batch."""
+
+    op: Literal["status"]
+    id: UUID
+
+
+class BatchDeleteTaskOperation(BaseModel):
+    """Delete a task as part of a batch."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    op: Literal["delete"]
+    id: UUID
+
+
+BatchTaskOperation = Annotated[
+    BatchCreateTaskOperation
+    | BatchUpdateTaskOperation
+    | BatchTaskStatusOperation
+    | BatchDeleteTaskOperation,
+    Field(discriminator="op"),
+]
+
+
+class BatchTaskRequest(BaseModel):
+    """Request schema for applying several task operations at once."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    operations: list[BatchTaskOperation] = Field(
+        min_length=1, max_length=MAX_BATCH_OPERATIONS
+    )
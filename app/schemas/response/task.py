@@ -1,6 +1,7 @@
 """Define Response schemas specific to Tasks."""
 
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -74,4 +75,20 @@ class PaginatedTasksResponse(BaseModel):
     items: list[TaskResponse]
     page: int
     page_size: int
-    total: int
+    total: int | None = None
+    next_cursor: str | None = None
+
+
+class TaskBatchResult(BaseModel):
+    """Outcome of one operation of a task batch."""
+
+    op: Literal["create", "update", "status", "delete"]
+    id: UUID
+    ref: str | None = None
+    task: TaskResponse | None = None
+
+
+class TaskBatchResponse(BaseModel):
+    """Response schema for a task batch, in operation order."""
+
+    results: list[TaskBatchResult]
@@ -0,0 +1,249 @@
+"""Test the 'api-admin bench' command."""
+
+import json
+
+from fastapi_cache.coder import PickleCoder
+from typer.testing import CliRunner
+
+from app.api_admin import app
+from app.commands.bench import (
+    TASK_INDEXES,
+    build_middleware_app,
+    coder_payloads,
+    email_batch,
+    latency_summary,
+    log_request_eagerly,
+    log_request_lazily,
+    log_request_structured,
+    plan_summary,
+    time_coder,
+    time_email_stages,
+    time_request_logging,
+)
+from app.config.log_config import LogCategory, get_log_config
+from app.mail import templates
+from app.middleware.observability import ObservabilityMiddleware
+
+
+class TestBenchCLI:
+    """Test the benchmark CLI commands."""
+
+    aiorun_patch_path = "app.commands.bench.aiorun"
+    bench_patch_path = "app.commands.bench._bench_indexes"
+    middleware_patch_path = "app.commands.bench._bench_middleware"
+    emails_patch_path = "app.commands.bench._bench_emails"
+    logging_patch_path = "app.commands.bench._bench_logging"
+
+    def test_indexes_runs_benchmark(self, mocker) -> None:
+        """Test 'bench indexes' runs the benchmark with the given sizes."""
+        bench = mocker.patch(self.bench_patch_path, autospec=True)
+
+        result = CliRunner().invoke(
+            app, ["bench", "indexes", "--tasks", "500", "--households", "5"]
+        )
+
+        assert result.exit_code == 0
+        bench.assert_called_once_with(500, 5)
+
+    def test_indexes_rejects_non_positive_sizes(self, mocker) -> None:
+        """Test 'bench indexes' refuses to seed an empty dataset."""
+        aiorun = mocker.patch(self.aiorun_patch_path)
+
+        result = CliRunner().invoke(app, ["bench", "indexes", "--tasks", "0"])
+
+        assert result.exit_code == 1
+        assert "must be positive" in result.output
+        aiorun.assert_not_called()
+
+    def test_task_indexes_cover_models(self) -> None:
+        """Test the benchmarked indexes are the ones declared on models."""
+        assert "ix_tasks_household_id_open_priority" in TASK_INDEXES
+        assert "ix_task_dependencies_depends_on_task_id" in TASK_INDEXES
+        assert "ix_task_rooms_room_id" in TASK_INDEXES
+
+    def test_plan_summary_lists_scans(self) -> None:
+        """Test plan_summary names each scan and the index it uses."""
+        plan = {
+            "Node Type": "Limit",
+            "Plans": [
+                {
+                    "Node Type": "Index Scan",
+                    "Relation Name": "tasks",
+                    "Index Name": "ix_tasks_household_id_priority",
+                },
+                {"Node Type": "Seq Scan", "Relation Name": "task_rooms"},
+            ],
+        }
+
+        assert plan_summary(plan) == (
+            "Index Scan using ix_tasks_household_id_priority, Seq Scan"
+        )
+        assert plan_summary({"Node Type": "Result"}) == "Result"
+
+    def test_middleware_runs_benchmark(self, mocker) -> None:
+        """Test 'bench middleware' runs the benchmark with the given load."""
+        bench = mocker.patch(self.middleware_patch_path, autospec=True)
+
+        result = CliRunner().invoke(
+            app, ["bench", "middleware", "--requests", "100", "-c", "4"]
+        )
+
+        assert result.exit_code == 0
+        bench.assert_called_once_with(100, 4)
+
+    def test_middleware_rejects_fewer_requests_than_clients(
+        self, mocker
+    ) -> None:
+        """Test 'bench middleware' needs a request for every client."""
+        aiorun = mocker.patch(self.aiorun_patch_path)
+
+        result = CliRunner().invoke(
+            app, ["bench", "middleware", "--requests", "2", "-c", "4"]
+        )
+
+        assert result.exit_code == 1
+        assert "must be at least --concurrency" in result.output
+        aiorun.assert_not_called()
+
+    def test_middleware_stacks(self) -> None:
+        """Test the compared stacks differ only in the middleware."""
+        legacy = build_middleware_app(pure_asgi=False)
+        current = build_middleware_app(pure_asgi=True)
+
+        # Starlette types each entry as a factory, not the class it wraps.
+        current_classes: set[object] = {m.cls for m in current.user_middleware}
+        legacy_classes: set[object] = {m.cls for m in legacy.user_middleware}
+        assert ObservabilityMiddleware in current_classes
+        assert ObservabilityMiddleware not in legacy_classes
+        assert len(legacy.routes) == len(current.routes)
+
+    def test_coders_compares_coders(self) -> None:
+        """Test 'bench coders' times both coders on every payload."""
+        result = CliRunner().invoke(
+            app, ["bench", "coders", "-n", "2", "--items", "3"]
+        )
+
+        assert result.exit_code == 0
+        assert result.output.count("PickleCoder") == len(coder_payloads(3))
+        assert result.output.count("ModelCoder") == len(coder_payloads(3))
+
+    def test_coders_rejects_non_positive_counts(self) -> None:
+        """Test 'bench coders' needs at least one iteration and item."""
+        result = CliRunner().invoke(app, ["bench", "coders", "--items", "0"])
+
+        assert result.exit_code == 1
+        assert "must be positive" in result.output
+
+    def test_time_coder_reports_encoded_size(self) -> None:
+        """Test time_coder returns timings and the stored entry size."""
+        user, _ = coder_payloads(1)["/users/me"]
+
+        encode_us, decode_us, size = time_coder(PickleCoder, user, 2)
+
+        assert encode_us > 0
+        assert decode_us > 0
+        assert size == len(PickleCoder.encode(user))
+
+    def test_latency_summary(self) -> None:
+        """Test latency_summary reports percentiles in ms and requests/s."""
+        latencies = [i / 1000 for i in range(1, 101)]
+
+        p50, p99, throughput = latency_summary(latencies, elapsed=2.0)
+
+        assert round(p50, 2) == 50.5  # noqa: PLR2004
+        assert round(p99, 2) == 99.01  # noqa: PLR2004
+        assert throughput == 50  # noqa: PLR2004
+
+    def test_emails_runs_benchmark(self, mocker) -> None:
+        """Test 'bench emails' runs the benchmark for the given count."""
+        bench = mocker.patch(self.emails_patch_path, autospec=True)
+
+        result = CliRunner().invoke(app, ["bench", "emails", "-n", "50"])
+
+        assert result.exit_code == 0
+        bench.assert_called_once_with(50)
+
+    def test_emails_rejects_non_positive_count(self, mocker) -> None:
+        """Test 'bench emails' needs at least one email."""
+        aiorun = mocker.patch(self.aiorun_patch_path)
+
+        result = CliRunner().invoke(app, ["bench", "emails", "-n", "0"])
+
+        assert result.exit_code == 1
+        assert "must be positive" in result.output
+        aiorun.assert_not_called()
+
+    def test_email_batch_static_values(self) -> None:
+        """Test only the legacy batch carries the static template values."""
+        legacy, current = email_batch(2, static=True), email_batch(2)
+
+        assert len(legacy) == len(current) == 2  # noqa: PLR2004
+        assert legacy[0].body.keys() > current[0].body.keys()
+        assert "application" not in current[0].body
+        static = templates.static_context()
+        assert legacy[0].body["application"] == static["application"]
+
+    def test_time_email_stages(self) -> None:
+        """Test time_email_stages times configuring and rendering."""
+        stages = time_email_stages(email_batch(2, static=True), email_batch(2))
+
+        assert set(stages) == {"Mail config", "Render"}
+        assert all(
+            before > 0 and after > 0 for before, after in stages.values()
+        )
+
+    def test_logging_runs_benchmark(self, mocker) -> None:
+        """Test 'bench logging' runs the benchmark for the given count."""
+        bench = mocker.patch(self.logging_patch_path, autospec=True)
+
+        result = CliRunner().invoke(app, ["bench", "logging", "-r", "50"])
+
+        assert result.exit_code == 0
+        bench.assert_called_once_with(50)
+
+    def test_logging_rejects_non_positive_requests(self, mocker) -> None:
+        """Test 'bench logging' needs at least one request."""
+        bench = mocker.patch(self.logging_patch_path, autospec=True)
+
+        result = CliRunner().invoke(app, ["bench", "logging", "-r", "0"])
+
+        assert result.exit_code == 1
+        assert "must be positive" in result.output
+        bench.assert_not_called()
+
+    def test_request_logging_sinks_write_the_same_lines(
+        self, tmp_path, monkeypatch
+    ) -> None:
+        """Test every sink writes the request log, eager or lazy alike."""
+        monkeypatch.setattr(
+            get_log_config(), "enabled_categories", LogCategory.ALL
+        )
+        logs = {}
+        for sink, log_request in (
+            ("inline", log_request_eagerly),
+            ("enqueue", log_request_eagerly),
+            ("batched", log_request_lazily),
+            ("json", log_request_structured),
+        ):
+            path = tmp_path / f"{sink}.log"
+            per_request, _, lines = time_request_logging(
+                sink, log_request, 3, path
+            )
+            assert per_request > 0
+            assert lines >= 3  # noqa: PLR2004
+            logs[sink] = path.read_text().splitlines()
+
+        text = {
+            sink: [line.split(" | ", 1)[1] for line in logs[sink]]
+            for sink in ("inline", "enqueue", "batched")
+        }
+        assert text["inline"] == text["enqueue"] == text["batched"]
+        records = [json.loads(line) for line in logs["json"]]
+        assert [
+            f"{record['level']: <8} | {record['message']}" for record in records
+        ] == text["batched"]
+        assert all(record["request"]["user_id"] == 1 for record in records)
+        assert (
+            '127.0.0.1 - "GET /api/users/me" 200 (0.004s)'
+            in (text["batched"][-1])
+        )
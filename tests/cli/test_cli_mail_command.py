@@ -0,0 +1,56 @@
+"""Test the 'api-admin mail' command."""
+
+from sqlalchemy.exc import SQLAlchemyError
+from typer.testing import CliRunner
+
+from app.api_admin import app
+from app.config.settings import get_settings
+
+
+class TestCLIMail:
+    """Test the mail CLI commands."""
+
+    patch_async_session = "app.commands.mail.async_session"
+
+    def test_requeue(self, runner: CliRunner, mocker) -> None:
+        """Test dead-lettered emails are requeued."""
+        mock_session = mocker.patch(self.patch_async_session)
+        session = mock_session.return_value.__aenter__.return_value
+        session.begin = mocker.MagicMock()
+        requeue = mocker.patch(
+            "app.commands.mail.outbox.requeue_dead", return_value=2
+        )
+
+        result = runner.invoke(app, ["mail", "requeue"])
+
+        assert result.exit_code == 0
+        requeue.assert_awaited_once()
+        assert "Requeued 2 dead-lettered email(s)" in result.output
+
+    def test_requeue_error(self, runner: CliRunner, mocker) -> None:
+        """Test a database error is reported."""
+        mocker.patch(
+            self.patch_async_session, side_effect=SQLAlchemyError("Ooooops!!")
+        )
+
+        result = runner.invoke(app, ["mail", "requeue"])
+
+        assert result.exit_code == 1
+        assert "ERROR requeuing emails" in result.output
+
+    def test_worker_serves_metrics(
+        self, runner: CliRunner, mocker, monkeypatch
+    ) -> None:
+        """Test the worker runs and exposes its metrics when enabled."""
+        monkeypatch.setattr(get_settings(), "metrics_enabled", True)
+        run_worker = mocker.patch("app.commands.mail.run_worker")
+        serve = mocker.patch("app.commands.mail.start_http_server")
+
+        result = runner.invoke(
+            app, ["mail", "worker", "--metrics-port", "9200"]
+        )
+
+        assert result.exit_code == 0
+        run_worker.assert_awaited_once()
+        serve.assert_called_once_with(9200)
+        assert "Mail worker stopped" in result.output
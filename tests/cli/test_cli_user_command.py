@@ -566,11 +566,13 @@ class TestCLI:
             return_value=None,
         )
         mocker.patch(self.patch_async_session)
+        after_commit = mocker.patch("app.commands.user.run_after_commit")
 
         result = runner.invoke(app, ["user", "delete", str(test_user.id)])
         assert result.exit_code == 0
 
         assert mock_manager.called
+        assert after_commit.called
         assert f"User {test_user.id} DELETED" in result.output
 
     def test_delete_sqlalchemy_error(
@@ -23,10 +23,20 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.pool import NullPool
 from typer.testing import CliRunner
 
+from app.cache.generation import clear_local_generations
+from app.cache.single_flight import clear_inflight
 from app.config.helpers import get_project_root
-from app.database.db import Base, get_database, get_database_url
+from app.database.db import (
+    Base,
+    get_database,
+    get_database_url,
+    run_after_commit,
+)
+from app.database.membership import clear_local_membership_cache
+from app.database.principal import clear_local_principal_cache
 from app.main import app
 from app.managers.email import EmailManager
+from app.rate_limit.gcra import clear_local as clear_local_rate_limits
 
 # Module-level sessionmaker for tests that import it directly
 # Uses NullPool to avoid event loop issues
@@ -57,6 +67,11 @@ async def init_and_clear_cache() -> None:
     if not isinstance(backend, InMemoryBackend):
         FastAPICache.init(InMemoryBackend(), prefix="fastapi-cache")
     await FastAPICache.clear()
+    clear_local_membership_cache()
+    clear_local_principal_cache()
+    clear_local_generations()
+    clear_inflight()
+    clear_local_rate_limits()
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -102,8 +117,10 @@ async def client(
 
     async def get_database_override() -> AsyncGenerator[AsyncSession, Any]:
         """Return the database connection for testing."""
-        async with async_test_sessionmaker() as session, session.begin():
-            yield session
+        async with async_test_sessionmaker() as session:
+            async with session.begin():
+                yield session
+            await run_after_commit(session)
 
     app.dependency_overrides[get_database] = get_database_override
 
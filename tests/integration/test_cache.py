@@ -22,11 +22,12 @@ class TestCacheMiddleware:
     ) -> None:
         """Test middleware processes requests with Cache-Control header.
 
-        This covers line 26 in cache_logging.py where the middleware
-        checks for and logs the Cache-Control header. We can't easily
-        verify loguru output, but we can verify the code path executes.
+        This covers ObservabilityMiddleware._log_cache_control, where the
+        middleware checks for and logs the Cache-Control header. We can't
+        easily verify loguru output, but we can verify the code path
+        executes.
         """
-        # Request with Cache-Control header (triggers line 26)
+        # Request with Cache-Control header (triggers _log_cache_control)
         response = await client.get(
             "/",
             headers={"Cache-Control": "no-cache"},
@@ -53,11 +54,11 @@ class TestCacheMiddleware:
 
         token = AuthManager.encode_token(User(id=admin_user_id))
 
-        response = await client.get(
+        miss = await client.get(
             "/users/me",
             headers={"Authorization": f"Bearer {token}"},
         )
-        assert response.status_code == status.HTTP_200_OK
+        assert miss.status_code == status.HTTP_200_OK
 
         response = await client.get(
             "/users/me",
@@ -65,3 +66,4 @@ class TestCacheMiddleware:
         )
         assert response.status_code == status.HTTP_200_OK
         assert response.headers.get("X-FastAPI-Cache") == "HIT"
+        assert response.json() == miss.json()
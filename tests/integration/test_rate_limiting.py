@@ -4,8 +4,20 @@ from collections.abc import Generator
 from typing import TYPE_CHECKING
 
 import pytest
+from faker import Faker
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import get_settings
+from app.database.helpers import hash_password
+from app.managers.auth import AuthManager
+from app.models.enums import RoleType
+from app.models.household import Household, HouseholdRole, household_members
+from app.models.user import User
+from app.rate_limit import gcra
+from app.rate_limit.config import RatePolicies, RatePolicy
 
 if TYPE_CHECKING:
     from slowapi import Limiter
@@ -221,6 +233,138 @@ class TestRateLimiting:
         )
 
         assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers["RateLimit-Limit"] == "3"
+        assert response.headers["RateLimit-Remaining"] == "0"
         data = response.json()
         assert "detail" in data
         assert "rate limit" in data["detail"].lower()
+
+
+@pytest.mark.integration
+class TestPolicyRateLimiting:
+    """Test user and household rate limits on the household APIs."""
+
+    @pytest.fixture(autouse=True)
+    def enable_rate_limiting(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Enable the policy rate limits."""
+        monkeypatch.setattr(get_settings(), "rate_limit_enabled", True)
+
+    async def _user(self, test_db: AsyncSession) -> User:
+        user = User(
+            email=Faker().email(),
+            first_name="Test",
+            last_name="User",
+            password=hash_password("test12345!"),
+            verified=True,
+            role=RoleType.user,
+        )
+        test_db.add(user)
+        await test_db.commit()
+        await test_db.refresh(user)
+        return user
+
+    async def _exhaust(self, policy: RatePolicy, subject: str) -> None:
+        for _ in range(policy.count):
+            await gcra.check(policy, subject)
+
+    @pytest.mark.asyncio
+    async def test_membership_routes_limited_per_user(
+        self, client: AsyncClient, test_db: AsyncSession
+    ) -> None:
+        """Ensure one user's budget does not limit another user."""
+        limited, other = await self._user(test_db), await self._user(test_db)
+        await self._exhaust(RatePolicies.MEMBERSHIP, f"user:{limited.id}")
+
+        refused = await client.get(
+            "/household",
+            headers={
+                "Authorization": f"Bearer {AuthManager.encode_token(limited)}"
+            },
+        )
+        allowed = await client.get(
+            "/household",
+            headers={
+                "Authorization": f"Bearer {AuthManager.encode_token(other)}"
+            },
+        )
+
+        assert refused.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(refused.headers["Retry-After"]) > 0
+        assert refused.headers["RateLimit-Remaining"] == "0"
+        assert allowed.status_code == status.HTTP_404_NOT_FOUND
+        assert allowed.headers["RateLimit-Limit"] == "30"
+        assert allowed.headers["RateLimit-Remaining"] == "29"
+
+    @pytest.mark.asyncio
+    async def test_task_routes_limited_per_household(
+        self, client: AsyncClient, test_db: AsyncSession
+    ) -> None:
+        """Ensure members of a household share its budget."""
+        owner, member = await self._user(test_db), await self._user(test_db)
+        household = Household(name="Limited", owner_id=owner.id)
+        test_db.add(household)
+        await test_db.commit()
+        await test_db.refresh(household)
+        await test_db.execute(
+            insert(household_members).values(
+                [
+                    {
+                        "household_id": household.id,
+                        "user_id": user.id,
+                        "role": role,
+                    }
+                    for user, role in (
+                        (owner, HouseholdRole.owner),
+                        (member, HouseholdRole.member),
+                    )
+                ]
+            )
+        )
+        await test_db.commit()
+        await self._exhaust(
+            RatePolicies.HOUSEHOLD_READ, f"household:{household.id}"
+        )
+
+        response = await client.get(
+            "/tasks",
+            headers={
+                "Authorization": f"Bearer {AuthManager.encode_token(member)}"
+            },
+        )
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    @pytest.mark.asyncio
+    async def test_auth_routes_limit_forwarded_clients(
+        self,
+        client: AsyncClient,
+        mocker,
+        monkeypatch,
+        reset_rate_limiter,
+    ) -> None:
+        """Ensure clients behind a trusted proxy get their own budgets."""
+        monkeypatch.setattr(reset_rate_limiter, "enabled", True)
+        monkeypatch.setattr(get_settings(), "trusted_proxies", "127.0.0.1")
+        mocker.patch("app.managers.user.EmailManager.template_send")
+
+        async def register(email: str, forwarded_for: str) -> int:
+            response = await client.post(
+                "/register/",
+                json={
+                    "email": email,
+                    "first_name": "Test",
+                    "last_name": "User",
+                    "password": "password123!",
+                },
+                headers={"X-Forwarded-For": forwarded_for},
+            )
+            return response.status_code
+
+        statuses = [
+            await register(f"user{i}@example.com", "198.51.100.1")
+            for i in range(4)
+        ]
+        other_client = await register("other@example.com", "198.51.100.2")
+
+        assert statuses[-1] == status.HTTP_429_TOO_MANY_REQUESTS
+        assert other_client == status.HTTP_201_CREATED
@@ -7,14 +7,16 @@ import pytest
 from faker import Faker
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import get_settings
 from app.database.helpers import hash_password
 from app.managers.auth import AuthManager
 from app.models.enums import RoleType
 from app.models.household import Household, household_members
 from app.models.room import Room
-from app.models.task import Task, TaskStatus
+from app.models.task import Task, TaskStatus, task_status_counts
 from app.models.user import User
 
 
@@ -240,3 +242,569 @@ class TestTaskRoutes:
         assert room_task["rooms"][0]["id"] == str(kitchen.id)
         assert room_task["rooms"][0]["name"] == "Kitchen"
 
+
+    async def test_add_dependency_rejects_transitive_cycle(
+        self, client: AsyncClient, test_db: AsyncSession
+    ) -> None:
+        """Ensure POST /tasks/{id}/dependencies rejects indirect cycles."""
+        user, household = await self._create_user_and_household(test_db)
+        token = AuthManager.encode_token(user)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        task_a, task_b, task_c = [
+            await self._create_task(
+                test_db,
+                household_id=household.id,
+                title=title,
+                priority=1,
+                difficulty=1,
+                status=TaskStatus.not_started,
+            )
+            for title in ("a", "b", "c")
+        ]
+
+        # a -> b -> c
+        response = await client.post(
+            f"/tasks/{task_a.id}/dependencies",
+            json={"depends_on_task_id": str(task_b.id)},
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        response = await client.post(
+            f"/tasks/{task_b.id}/dependencies",
+            json={"depends_on_task_id": str(task_c.id)},
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        # c -> a would close the loop
+        response = await client.post(
+            f"/tasks/{task_c.id}/dependencies",
+            json={"depends_on_task_id": str(task_a.id)},
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Circular dependency detected"
+
+        # Once b -> c is removed the edge becomes legal
+        response = await client.delete(
+            f"/tasks/{task_b.id}/dependencies/{task_c.id}",
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        response = await client.post(
+            f"/tasks/{task_c.id}/dependencies",
+            json={"depends_on_task_id": str(task_a.id)},
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    async def test_get_available_dependencies_excludes_transitive_dependents(
+        self, client: AsyncClient, test_db: AsyncSession
+    ) -> None:
+        """Ensure tasks that already depend on the task are not offered."""
+        user, household = await self._create_user_and_household(test_db)
+        token = AuthManager.encode_token(user)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        task_a, task_b, task_c, task_d = [
+            await self._create_task(
+                test_db,
+                household_id=household.id,
+                title=title,
+                priority=1,
+                difficulty=1,
+                status=TaskStatus.not_started,
+            )
+            for title in ("a", "b", "c", "d")
+        ]
+        # c -> b -> a, so neither b nor c may become a dependency of a
+        for task, depends_on in ((task_b, task_a), (task_c, task_b)):
+            response = await client.post(
+                f"/tasks/{task.id}/dependencies",
+                json={"depends_on_task_id": str(depends_on.id)},
+                headers=headers,
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+
+        response = await client.get(
+            f"/tasks/{task_a.id}/available-dependencies", headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert {t["id"] for t in response.json()} == {str(task_d.id)}
+
+        pages = []
+        for page in (1, 2):
+            response = await client.get(
+                f"/tasks/{task_d.id}/available-dependencies",
+                params={"page": page, "page_size": 2},
+                headers=headers,
+            )
+            assert response.status_code == status.HTTP_200_OK
+            pages.append({t["id"] for t in response.json()})
+        assert [len(ids) for ids in pages] == [2, 1]
+        assert pages[0] | pages[1] == {
+            str(task_a.id),
+            str(task_b.id),
+            str(task_c.id),
+        }
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"page": 0}, {"page_size": -1}, {"page_size": 0}, {"page_size": 101}],
+    )
+    async def test_get_available_dependencies_rejects_bad_pages(
+        self, client: AsyncClient, test_db: AsyncSession, params: dict[str, int]
+    ) -> None:
+        """Ensure page and page_size out of range are rejected with 422."""
+        user, household = await self._create_user_and_household(test_db)
+        token = AuthManager.encode_token(user)
+        task = await self._create_task(
+            test_db,
+            household_id=household.id,
+            title="a",
+            priority=1,
+            difficulty=1,
+            status=TaskStatus.not_started,
+        )
+
+        response = await client.get(
+            f"/tasks/{task.id}/available-dependencies",
+            params=params,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    @pytest.mark.parametrize("use_counters", [True, False])
+    async def test_stats_track_task_mutations(
+        self,
+        client: AsyncClient,
+        test_db: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+        use_counters: bool,  # noqa: FBT001
+    ) -> None:
+        """Ensure dashboard and room stats follow create/update/delete."""
+        monkeypatch.setattr(
+            get_settings(), "task_stats_use_counters", use_counters
+        )
+        user, household = await self._create_user_and_household(test_db)
+        token = AuthManager.encode_token(user)
+        headers = {"Authorization": f"Bearer {token}"}
+        kitchen = Room(name="Kitchen", household_id=household.id)
+        test_db.add(kitchen)
+        await test_db.commit()
+        await test_db.refresh(kitchen)
+
+        async def stats() -> tuple[dict[str, int], dict[str, int]]:
+            dashboard = await client.get("/tasks/stats", headers=headers)
+            room = await client.get(
+                f"/rooms/{kitchen.id}/stats", headers=headers
+            )
+            assert dashboard.status_code == status.HTTP_200_OK
+            assert room.status_code == status.HTTP_200_OK
+            return dashboard.json(), room.json()
+
+        created = []
+        for task_status in ("not_started", "in_progress", "done"):
+            response = await client.post(
+                "/tasks",
+                json={
+                    "title": task_status,
+                    "priority": 1,
+                    "difficulty": 1,
+                    "status": task_status,
+                    "room_ids": [str(kitchen.id)],
+                },
+                headers=headers,
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+            created.append(response.json()["id"])
+        # A task depending on an open task starts out blocked
+        response = await client.post(
+            "/tasks",
+            json={
+                "title": "blocked",
+                "priority": 1,
+                "difficulty": 1,
+                "dependency_ids": [created[0]],
+            },
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        blocked_id = response.json()["id"]
+
+        assert await stats() == (
+            {"open": 3, "blocked": 1, "completed": 1},
+            {"total_tasks": 3, "completed": 1, "in_progress": 1, "blocked": 0},
+        )
+
+        # Completing the dependency unblocks the dependent task
+        response = await client.put(
+            f"/tasks/{created[0]}", json={"status": "done"}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response = await client.put(
+            f"/tasks/{blocked_id}",
+            json={"room_ids": [str(kitchen.id)]},
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response = await client.put(
+            f"/tasks/{created[1]}", json={"room_ids": []}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response = await client.delete(f"/tasks/{created[2]}", headers=headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        assert await stats() == (
+            {"open": 2, "blocked": 0, "completed": 1},
+            {"total_tasks": 2, "completed": 1, "in_progress": 0, "blocked": 0},
+        )
+
+    async def test_stats_ignore_unrelated_task_updates(
+        self, test_db: AsyncSession
+    ) -> None:
+        """Ensure edits to other fields neither count nor load task rooms."""
+        _, household = await self._create_user_and_household(test_db)
+        kitchen = Room(name="Kitchen", household_id=household.id)
+        test_db.add(kitchen)
+        await test_db.commit()
+        task = await self._create_task(
+            test_db,
+            household_id=household.id,
+            title="Dishes",
+            priority=1,
+            difficulty=1,
+            status=TaskStatus.not_started,
+            room=kitchen,
+        )
+        assert "rooms" in inspect(task).unloaded
+        counters = task_status_counts.c
+        counts = select(counters.scope_id, counters.status, counters.count)
+        before = set((await test_db.execute(counts)).all())
+        assert before
+
+        statements: list[str] = []
+
+        def record(
+            _conn: object, _cursor: object, statement: str, *_: object
+        ) -> None:
+            statements.append(statement)
+
+        engine = test_db.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            task.title = "Dishes tonight"
+            await test_db.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert not [sql for sql in statements if "task_rooms" in sql]
+        assert set((await test_db.execute(counts)).all()) == before
+
+    @pytest.mark.parametrize("use_counters", [True, False])
+    async def test_status_changes_propagate_to_dependents(
+        self,
+        client: AsyncClient,
+        test_db: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+        use_counters: bool,  # noqa: FBT001
+    ) -> None:
+        """Ensure every status and edge change re-blocks dependent tasks."""
+        monkeypatch.setattr(
+            get_settings(), "task_stats_use_counters", use_counters
+        )
+        user, _ = await self._create_user_and_household(test_db)
+        token = AuthManager.encode_token(user)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def create(title: str, *dependency_ids: str) -> str:
+            response = await client.post(
+                "/tasks",
+                json={
+                    "title": title,
+                    "priority": 1,
+                    "difficulty": 1,
+                    "dependency_ids": list(dependency_ids),
+                },
+                headers=headers,
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+            task_id: str = response.json()["id"]
+            return task_id
+
+        async def state(task_id: str) -> tuple[str, int | None]:
+            response = await client.get(f"/tasks/{task_id}", headers=headers)
+            assert response.status_code == status.HTTP_200_OK
+            count = await test_db.scalar(
+                select(Task.incomplete_dependency_count).where(
+                    Task.id == UUID(task_id)
+                )
+            )
+            task_status: str = response.json()["status"]
+            return task_status, count
+
+        first = await create("first")
+        second = await create("second", first)
+        third = await create("third", first, second)
+        assert await state(second) == ("blocked", 1)
+        assert await state(third) == ("blocked", 2)
+
+        # The quick status route propagates like a full update
+        response = await client.patch(
+            f"/tasks/{first}/status", json={"status": "done"}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert await state(second) == ("not_started", 0)
+        assert await state(third) == ("blocked", 1)
+
+        response = await client.patch(
+            f"/tasks/{second}/status", json={"status": "done"}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert await state(third) == ("not_started", 0)
+
+        # Re-opening a dependency blocks open dependents, not done ones
+        response = await client.put(
+            f"/tasks/{first}", json={"status": "in_progress"}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert await state(second) == ("done", 1)
+        assert await state(third) == ("blocked", 1)
+
+        response = await client.delete(
+            f"/tasks/{third}/dependencies/{first}", headers=headers
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert await state(third) == ("not_started", 0)
+
+        # Deleting an unfinished dependency unblocks its dependents
+        fourth = await create("fourth", third)
+        assert await state(fourth) == ("blocked", 1)
+        response = await client.delete(f"/tasks/{third}", headers=headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert await state(fourth) == ("not_started", 0)
+
+        response = await client.get("/tasks/stats", headers=headers)
+        assert response.json() == {"open": 2, "blocked": 0, "completed": 1}
+
+    async def test_get_tasks_cursor_pagination(
+        self, client: AsyncClient, test_db: AsyncSession
+    ) -> None:
+        """Ensure next_cursor walks every task once in sort order."""
+        user, household = await self._create_user_and_household(test_db)
+        token = AuthManager.encode_token(user)
+        headers = {"Authorization": f"Bearer {token}"}
+        for priority in (3, 1, 2, 2, 5):
+            await self._create_task(
+                test_db,
+                household_id=household.id,
+                title=f"priority {priority}",
+                priority=priority,
+                difficulty=1,
+                status=TaskStatus.not_started,
+            )
+
+        params: dict[str, Any] = {
+            "sort": "priority",
+            "order": "desc",
+            "page_size": 2,
+            "count": "none",
+        }
+        priorities: list[int] = []
+        seen: set[str] = set()
+        while True:
+            response = await client.get(
+                "/tasks", params=params, headers=headers
+            )
+            assert response.status_code == status.HTTP_200_OK
+            body = response.json()
+            assert body["total"] is None
+            priorities.extend(t["priority"] for t in body["items"])
+            seen.update(t["id"] for t in body["items"])
+            if body["next_cursor"] is None:
+                break
+            params["cursor"] = body["next_cursor"]
+        assert priorities == [5, 3, 2, 2, 1]
+        assert len(seen) == len(priorities)
+
+        # All tasks share created_at here, so only the id tie-breaker orders
+        params = {"sort": "created_at", "page_size": 4}
+        response = await client.get("/tasks", params=params, headers=headers)
+        body = response.json()
+        assert body["total"] == len(seen)
+        params["cursor"] = body["next_cursor"]
+        response = await client.get("/tasks", params=params, headers=headers)
+        rest = response.json()
+        assert rest["next_cursor"] is None
+        assert {t["id"] for t in body["items"] + rest["items"]} == seen
+
+        response = await client.get(
+            "/tasks",
+            params={"sort": "difficulty", "cursor": params["cursor"]},
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = await client.get(
+            "/tasks", params={"count": "estimate"}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.json()["total"], int)
+
+    async def test_batch_tasks_applies_operations(
+        self, client: AsyncClient, test_db: AsyncSession
+    ) -> None:
+        """Ensure a batch applies every operation and re-blocks tasks."""
+        user, household = await self._create_user_and_household(test_db)
+        token = AuthManager.encode_token(user)
+        headers = {"Authorization": f"Bearer {token}"}
+        kitchen = Room(name="Kitchen", household_id=household.id)
+        test_db.add(kitchen)
+        await test_db.commit()
+        await test_db.refresh(kitchen)
+        plaster = await self._create_task(
+            test_db, household.id, "plaster", 1, 1, TaskStatus.not_started
+        )
+        sand = await self._create_task(
+            test_db, household.id, "sand", 1, 1, TaskStatus.in_progress
+        )
+        tidy = await self._create_task(
+            test_db, household.id, "tidy", 1, 1, TaskStatus.done
+        )
+        task = {"priority": 2, "difficulty": 2}
+
+        response = await client.post(
+            "/tasks/batch",
+            json={
+                "operations": [
+                    {
+                        "op": "create",
+                        "title": "prime",
+                        "ref": "prime",
+                        "dependency_ids": [str(plaster.id)],
+                        "room_ids": [str(kitchen.id)],
+                        **task,
+                    },
+                    {
+                        "op": "create",
+                        "title": "paint",
+                        "dependency_refs": ["prime"],
+                        **task,
+                    },
+                    {
+                        "op": "update",
+                        "id": str(sand.id),
+                        "title": "sand walls",
+                        "dependency_ids": [str(plaster.id)],
+                    },
+                    {"op": "status", "id": str(plaster.id), "status": "done"},
+                    {"op": "delete", "id": str(tidy.id)},
+                ]
+            },
+            headers=headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert [r["op"] for r in results] == [
+            "create",
+            "create",
+            "update",
+            "status",
+            "delete",
+        ]
+        assert results[0]["ref"] == "prime"
+        assert results[0]["task"]["rooms"][0]["id"] == str(kitchen.id)
+        assert results[4] == {
+            "op": "delete",
+            "id": str(tidy.id),
+            "ref": None,
+            "task": None,
+        }
+        # plaster is done, so prime and sand are free; paint waits on prime
+        statuses = {
+            r["task"]["title"]: r["task"]["status"] for r in results[:4]
+        }
+        assert statuses == {
+            "prime": "not_started",
+            "paint": "blocked",
+            "sand walls": "in_progress",
+            "plaster": "done",
+        }
+
+        response = await client.get(
+            f"/tasks/{results[1]['id']}", headers=headers
+        )
+        assert [d["id"] for d in response.json()["dependencies"]] == [
+            results[0]["id"]
+        ]
+        response = await client.get("/tasks/stats", headers=headers)
+        assert response.json() == {"open": 3, "blocked": 1, "completed": 1}
+
+    async def test_batch_tasks_is_all_or_nothing(
+        self,
+        client: AsyncClient,
+        test_db: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Ensure a failing batch leaves every task unchanged."""
+        user, household = await self._create_user_and_household(test_db)
+        token = AuthManager.encode_token(user)
+        headers = {"Authorization": f"Bearer {token}"}
+        first = await self._create_task(
+            test_db, household.id, "first", 1, 1, TaskStatus.not_started
+        )
+        second = await self._create_task(
+            test_db, household.id, "second", 1, 1, TaskStatus.not_started
+        )
+        create = {
+            "op": "create",
+            "title": "new",
+            "priority": 1,
+            "difficulty": 1,
+        }
+
+        async def batch(*operations: dict[str, Any]) -> int:
+            response = await client.post(
+                "/tasks/batch",
+                json={"operations": list(operations)},
+                headers=headers,
+            )
+            return response.status_code
+
+        missing = "00000000-0000-0000-0000-000000000000"
+        cycle = [
+            {
+                "op": "update",
+                "id": str(first.id),
+                "dependency_ids": [str(second.id)],
+            },
+            {
+                "op": "update",
+                "id": str(second.id),
+                "dependency_ids": [str(first.id)],
+            },
+        ]
+        assert await batch(create, *cycle) == status.HTTP_400_BAD_REQUEST
+        assert (
+            await batch(create, {"op": "delete", "id": missing})
+            == status.HTTP_404_NOT_FOUND
+        )
+        assert (
+            await batch(
+                {"op": "status", "id": str(first.id), "status": "done"},
+                {"op": "delete", "id": str(first.id)},
+            )
+            == status.HTTP_400_BAD_REQUEST
+        )
+        monkeypatch.setattr(get_settings(), "max_tasks_per_household", 3)
+        assert await batch(create, create) == status.HTTP_403_FORBIDDEN
+
+        response = await client.get("/tasks", headers=headers)
+        tasks = {t["title"]: t for t in response.json()["items"]}
+        assert set(tasks) == {"first", "second"}
+        assert tasks["first"]["status"] == "not_started"
+        response = await client.get(f"/tasks/{second.id}", headers=headers)
+        assert response.json()["dependencies"] == []
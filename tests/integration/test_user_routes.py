@@ -1,13 +1,17 @@
 """Define tests for the 'User' routes of the application."""
 
+import json
 from typing import Any
 
 import pytest
 from faker import Faker
 from fastapi import status
 from httpx import AsyncClient
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.log_config import LogCategory, format_json, get_log_config
+from app.config.log_writer import is_not_batch
 from app.database.helpers import hash_password
 from app.managers.auth import AuthManager
 from app.managers.user import ErrorMessages
@@ -72,6 +76,36 @@ class TestUserRoutes:
             "detail": "Not authenticated. Use a JWT token."
         }
 
+    async def test_get_my_profile_json_log(
+        self, client: AsyncClient, test_db: AsyncSession, monkeypatch
+    ) -> None:
+        """Test the JSON request log carries the request's context."""
+        config = get_log_config()
+        monkeypatch.setattr(config, "log_format", "json")
+        monkeypatch.setattr(config, "enabled_categories", LogCategory.REQUESTS)
+        test_user = User(**self.get_test_user())
+        test_db.add(test_user)
+        await test_db.commit()
+        token = AuthManager.encode_token(test_user)
+        lines: list[str] = []
+        handler_id = logger.add(
+            lines.append, format=format_json, filter=is_not_batch
+        )
+
+        try:
+            response = await client.get(
+                "/users/me", headers={"Authorization": f"Bearer {token}"}
+            )
+        finally:
+            logger.remove(handler_id)
+
+        assert response.status_code == status.HTTP_200_OK
+        request = json.loads(lines[-1])["request"]
+        assert request["id"] == response.headers["x-request-id"]
+        assert request["route"] == "/users/me"
+        assert request["user_id"] == test_user.id
+        assert request["status"] == status.HTTP_200_OK
+
     # ------------------------------------------------------------------------ #
     #                           test make_admin route                          #
     # ------------------------------------------------------------------------ #
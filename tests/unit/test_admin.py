@@ -147,7 +147,8 @@ class TestAdminAuth:
 
         assert auth_backend._decode_token(token) is None
 
-    def test_validate_user(self, auth_backend: AdminAuth) -> None:
+    @pytest.mark.asyncio
+    async def test_validate_user(self, auth_backend: AdminAuth) -> None:
         """Test user validation."""
         # Create test users
         admin_user = User(
@@ -181,18 +182,27 @@ class TestAdminAuth:
         )
 
         # Test valid admin user
-        assert auth_backend._validate_user("password123", admin_user) is True
+        assert (
+            await auth_backend._validate_user("password123", admin_user) is True
+        )
 
         # Test banned admin user
-        assert auth_backend._validate_user("password123", banned_admin) is False
+        assert (
+            await auth_backend._validate_user("password123", banned_admin)
+            is False
+        )
 
         # Test regular user
-        assert auth_backend._validate_user("password123", regular_user) is False
+        assert (
+            await auth_backend._validate_user("password123", regular_user)
+            is False
+        )
 
         # Test wrong password
         assert (
-            auth_backend._validate_user("wrong_password", admin_user) is False
+            await auth_backend._validate_user("wrong_password", admin_user)
+            is False
         )
 
         # Test None user
-        assert auth_backend._validate_user("any_password", None) is False
+        assert await auth_backend._validate_user("any_password", None) is False
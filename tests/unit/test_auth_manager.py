@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 
 import jwt
 import pytest
-from fastapi import BackgroundTasks, HTTPException, status
+from fastapi import HTTPException, status
 from pydantic import ValidationError
 
 from app.config.settings import get_settings
@@ -244,8 +244,7 @@ class TestAuthManager:
     @pytest.mark.asyncio
     async def test_verify(self, test_db) -> None:
         """Test the verify method."""
-        background_tasks = BackgroundTasks()
-        await UserManager.register(self.test_user, test_db, background_tasks)
+        await UserManager.register(self.test_user, test_db, send_welcome=True)
         verify_token = AuthManager.encode_verify_token(User(id=1))
         with pytest.raises(HTTPException) as exc_info:
             await AuthManager.verify(verify_token, test_db)
@@ -267,8 +266,7 @@ class TestAuthManager:
     @pytest.mark.asyncio
     async def test_verify_wrong_token(self, test_db) -> None:
         """Test the verify method with a bad token type."""
-        background_tasks = BackgroundTasks()
-        await UserManager.register(self.test_user, test_db, background_tasks)
+        await UserManager.register(self.test_user, test_db, send_welcome=True)
         wrong_token = get_token(
             sub=1,
             exp=datetime.now(tz=timezone.utc).timestamp() + 10000,
@@ -282,8 +280,7 @@ class TestAuthManager:
     @pytest.mark.asyncio
     async def test_verify_banned_user(self, test_db) -> None:
         """Test the verify method with a banned user."""
-        background_tasks = BackgroundTasks()
-        await UserManager.register(self.test_user, test_db, background_tasks)
+        await UserManager.register(self.test_user, test_db, send_welcome=True)
         await UserManager.set_ban_status(1, 666, test_db, banned=True)
         verify_token = get_token(
             sub=1,
@@ -312,8 +309,7 @@ class TestAuthManager:
     @pytest.mark.asyncio
     async def test_verify_user_invalid_token(self, test_db) -> None:
         """Test the verify method with an invalid token."""
-        background_tasks = BackgroundTasks()
-        await UserManager.register(self.test_user, test_db, background_tasks)
+        await UserManager.register(self.test_user, test_db, send_welcome=True)
 
         with pytest.raises(HTTPException) as exc_info:
             await AuthManager.verify("very_bad_token", test_db)
@@ -337,8 +333,7 @@ class TestAuthManager:
     async def test_verify_updates_database(self, test_db) -> None:
         """Test that verify() successfully updates the database."""
         # Register a new user (defaults to verified=False)
-        background_tasks = BackgroundTasks()
-        await UserManager.register(self.test_user, test_db, background_tasks)
+        await UserManager.register(self.test_user, test_db, send_welcome=True)
 
         # Get initial user state and verify it's not verified
         user_before = await UserManager.get_user_by_id(1, test_db)
@@ -370,10 +365,7 @@ class TestAuthManager:
         await UserManager.register(self.test_user, test_db)
 
         # Request password reset
-        background_tasks = BackgroundTasks()
-        await AuthManager.forgot_password(
-            self.test_user["email"], background_tasks, test_db
-        )
+        await AuthManager.forgot_password(self.test_user["email"], test_db)
 
         # Verify email was called
         assert mock_email.called
@@ -389,10 +381,7 @@ class TestAuthManager:
         )
 
         # Request password reset for non-existent user
-        background_tasks = BackgroundTasks()
-        await AuthManager.forgot_password(
-            "nonexistent@example.com", background_tasks, test_db
-        )
+        await AuthManager.forgot_password("nonexistent@example.com", test_db)
 
         # Verify email was NOT called
         assert not mock_email.called
@@ -410,10 +399,7 @@ class TestAuthManager:
         await UserManager.set_ban_status(1, 666, test_db, banned=True)
 
         # Request password reset
-        background_tasks = BackgroundTasks()
-        await AuthManager.forgot_password(
-            self.test_user["email"], background_tasks, test_db
-        )
+        await AuthManager.forgot_password(self.test_user["email"], test_db)
 
         # Verify email was NOT called
         assert not mock_email.called
@@ -781,11 +767,8 @@ class TestAuthManager:
     @pytest.mark.asyncio
     async def test_verify_string_sub_claim(self, test_db) -> None:
         """Test verify accepts string 'sub' claim and converts to int."""
-        # Create unverified user by passing BackgroundTasks
-        background_tasks = BackgroundTasks()
-        await UserManager.register(
-            self.test_user, test_db, background_tasks=background_tasks
-        )
+        # Create unverified user by asking for the welcome email
+        await UserManager.register(self.test_user, test_db, send_welcome=True)
         # Create a JWT with string 'sub' claim
         token_with_string_sub = jwt.encode(
             {
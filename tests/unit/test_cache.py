@@ -1,20 +1,36 @@
 """Unit tests for cache module (decorators, key builders, invalidation)."""
 
+import json
+import uuid
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from fastapi import Request, Response
-from fastapi_cache import FastAPICache
+from fastapi import FastAPI, Request, Response
+from httpx import ASGITransport, AsyncClient
 from pytest_mock import MockerFixture
 from redis.exceptions import RedisError
 
+from app.cache import generation
+from app.cache.coders import model_coder
 from app.cache.decorators import cached
-from app.cache.invalidation import invalidate_namespace, invalidate_user_cache
+from app.cache.invalidation import (
+    invalidate_household_cache,
+    invalidate_household_cache_on_commit,
+    invalidate_namespace,
+    invalidate_user_cache,
+)
 from app.cache.key_builders import (
+    household_key_builder,
     paginated_key_builder,
     user_paginated_key_builder,
     user_scoped_key_builder,
 )
+from app.config.settings import get_settings
+from app.database.db import run_after_commit
+from app.models.task import TaskStatus
+from app.models.user import User
+from app.schemas.response.user import MyUserResponse
 
 
 @pytest.mark.unit
@@ -62,12 +78,183 @@ class TestCachedDecorator:
         # Function should be unchanged (no-op decorator)
         assert decorated_func is test_func
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("revalidate", "cache_control"),
+        [(False, "max-age=60"), (True, "private, no-cache")],
+    )
+    async def test_cached_revalidate_header(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        *,
+        revalidate: bool,
+        cache_control: str,
+    ) -> None:
+        """Test revalidate=True tells clients not to reuse responses."""
+        mock_settings = MagicMock()
+        mock_settings.cache_enabled = True
+        mock_settings.cache_stale_ttl = 30
+        monkeypatch.setattr(
+            "app.cache.decorators.get_settings", lambda: mock_settings
+        )
+        calls = []
+        app = FastAPI()
+
+        @app.get("/data")
+        @cached(expire=60, namespace="test", revalidate=revalidate)
+        async def get_data() -> dict[str, int]:
+            calls.append(1)
+            return {"value": 1}
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            miss = await client.get("/data")
+            hit = await client.get("/data")
+
+        assert len(calls) == 1
+        assert miss.json() == hit.json() == {"value": 1}
+        assert miss.headers["cache-control"] == cache_control
+        assert hit.headers["x-fastapi-cache"] == "HIT"
+        assert hit.headers["cache-control"].startswith(
+            cache_control.split("=")[0]
+        )
+
+    @pytest.mark.asyncio
+    async def test_cached_default_keys_follow_invalidation(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test default keys are versioned so invalidation reaches them."""
+        mock_settings = MagicMock()
+        mock_settings.cache_enabled = True
+        mock_settings.cache_stale_ttl = 30
+        monkeypatch.setattr(
+            "app.cache.decorators.get_settings", lambda: mock_settings
+        )
+        app = FastAPI()
+
+        @app.get("/data")
+        @cached(expire=60, namespace="test")
+        async def get_data() -> dict[str, int]:
+            return {"value": 1}
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            statuses = [(await client.get("/data")).headers["x-fastapi-cache"]]
+            statuses.append(
+                (await client.get("/data")).headers["x-fastapi-cache"]
+            )
+            await invalidate_namespace("test")
+            statuses.append(
+                (await client.get("/data")).headers["x-fastapi-cache"]
+            )
+
+        assert statuses == ["MISS", "HIT", "MISS"]
+
+
+@pytest.mark.unit
+class TestModelCoder:
+    """Test storing cached responses as response model JSON."""
+
+    def test_round_trip_from_orm(self) -> None:
+        """Test an ORM result is stored as its response model's fields."""
+        coder = model_coder(MyUserResponse)
+        user = User(
+            id=1,
+            email="coder@example.com",
+            password="secret",  # noqa: S106
+            first_name="Cody",
+            last_name="Coder",
+        )
+
+        encoded = coder.encode(user)
+
+        assert encoded.startswith(b"j")
+        assert b"secret" not in encoded
+        assert coder.decode_as_type(encoded, type_=User) == {
+            "email": "coder@example.com",
+            "id": 1,
+            "first_name": "Cody",
+            "last_name": "Coder",
+        }
+
+    def test_large_entries_are_compressed(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test entries over the size threshold are zlib-compressed."""
+        monkeypatch.setattr(get_settings(), "cache_compress_min_size", 64)
+        coder = model_coder(list[str])
+        value = ["room"] * 100
+
+        encoded = coder.encode(value)
+
+        assert encoded.startswith(b"z")
+        assert len(encoded) < len(json.dumps(value))
+        assert coder.decode(encoded) == value
+
+    def test_coder_is_shared_per_model(self) -> None:
+        """Test each response model gets one coder class."""
+        assert model_coder(list[str]) is model_coder(list[str])
+        assert model_coder(list[str]) is not model_coder(list[int])
+
+    @pytest.mark.parametrize(
+        ("returns", "response_model", "coder_name"),
+        [
+            (MyUserResponse, None, "MyUserResponseCoder"),
+            (User, MyUserResponse, "MyUserResponseCoder"),
+            (User, None, "PickleCoder"),
+            (Any, None, "PickleCoder"),
+        ],
+    )
+    def test_cached_chooses_coder(
+        self,
+        mocker: MockerFixture,
+        returns: Any,  # noqa: ANN401
+        response_model: Any,  # noqa: ANN401
+        coder_name: str,
+    ) -> None:
+        """Test the model coder is used when a response model is known."""
+        mocker.patch(
+            "app.cache.decorators.get_settings",
+            return_value=MagicMock(cache_enabled=True),
+        )
+        cache = mocker.patch("app.cache.decorators.cache_route")
+
+        async def route() -> None:
+            pass  # pragma: no cover
+
+        route.__annotations__["return"] = returns
+        cached(namespace="test", response_model=response_model)(route)
+
+        assert cache.call_args.kwargs["coder"].__name__ == coder_name
+
+    @pytest.mark.asyncio
+    async def test_model_coded_keys_are_suffixed(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test model-coded entries do not share keys with pickled ones."""
+        mocker.patch(
+            "app.cache.decorators.get_settings",
+            return_value=MagicMock(cache_enabled=True),
+        )
+        cache = mocker.patch("app.cache.decorators.cache_route")
+
+        async def route() -> list[str]:
+            return []  # pragma: no cover
+
+        cached(namespace="test", key_builder=lambda *_, **__: "k")(route)
+
+        key_builder = cache.call_args.kwargs["key_builder"]
+        assert await key_builder(route, "test") == "k:json"
+
 
 @pytest.mark.unit
 class TestKeyBuilders:
     """Test cache key builder functions."""
 
-    def test_user_scoped_key_builder_with_user(self) -> None:
+    @pytest.mark.asyncio
+    async def test_user_scoped_key_builder_with_user(self) -> None:
         """Test key builder with authenticated user."""
         mock_request = MagicMock(spec=Request)
         mock_user = MagicMock()
@@ -76,7 +263,7 @@ class TestKeyBuilders:
 
         mock_func = MagicMock(__name__="test_func")
 
-        key = user_scoped_key_builder(
+        key = await user_scoped_key_builder(
             func=mock_func,
             namespace="user",
             request=mock_request,
@@ -85,9 +272,10 @@ class TestKeyBuilders:
             kwargs={},
         )
 
-        assert key == "user:123:test_func"
+        assert key == "user:123:g0.0:test_func"
 
-    def test_user_scoped_key_builder_without_user(self) -> None:
+    @pytest.mark.asyncio
+    async def test_user_scoped_key_builder_without_user(self) -> None:
         """Test key builder without authenticated user."""
         mock_request = MagicMock(spec=Request)
         # No user attribute
@@ -95,7 +283,7 @@ class TestKeyBuilders:
 
         mock_func = MagicMock(__name__="test_func")
 
-        key = user_scoped_key_builder(
+        key = await user_scoped_key_builder(
             func=mock_func,
             namespace="user",
             request=mock_request,
@@ -104,16 +292,17 @@ class TestKeyBuilders:
             kwargs={},
         )
 
-        assert key == "user:anonymous:test_func"
+        assert key == "user:anonymous:g0.0:test_func"
 
-    def test_paginated_key_builder_with_params(self) -> None:
+    @pytest.mark.asyncio
+    async def test_paginated_key_builder_with_params(self) -> None:
         """Test paginated key builder with query params."""
         mock_request = MagicMock(spec=Request)
         mock_request.query_params = {"page": "2", "size": "100"}
 
         mock_func = MagicMock(__name__="list_items")
 
-        key = paginated_key_builder(
+        key = await paginated_key_builder(
             func=mock_func,
             namespace="items",
             request=mock_request,
@@ -122,16 +311,17 @@ class TestKeyBuilders:
             kwargs={},
         )
 
-        assert key == "items:list_items:page:2:size:100"
+        assert key == "items:g0:list_items:page:2:size:100"
 
-    def test_paginated_key_builder_with_defaults(self) -> None:
+    @pytest.mark.asyncio
+    async def test_paginated_key_builder_with_defaults(self) -> None:
         """Test paginated key builder with default params."""
         mock_request = MagicMock(spec=Request)
         mock_request.query_params = {}
 
         mock_func = MagicMock(__name__="list_items")
 
-        key = paginated_key_builder(
+        key = await paginated_key_builder(
             func=mock_func,
             namespace="items",
             request=mock_request,
@@ -140,9 +330,10 @@ class TestKeyBuilders:
             kwargs={},
         )
 
-        assert key == "items:list_items:page:1:size:50"
+        assert key == "items:g0:list_items:page:1:size:50"
 
-    def test_user_paginated_key_builder(self) -> None:
+    @pytest.mark.asyncio
+    async def test_user_paginated_key_builder(self) -> None:
         """Test user_paginated_key_builder (currently unused)."""
         # This function exists but isn't used yet
         mock_request = MagicMock(spec=Request)
@@ -153,7 +344,7 @@ class TestKeyBuilders:
 
         mock_func = MagicMock(__name__="get_paginated_data")
 
-        key = user_paginated_key_builder(
+        key = await user_paginated_key_builder(
             func=mock_func,
             namespace="data",
             request=mock_request,
@@ -162,7 +353,147 @@ class TestKeyBuilders:
             kwargs={},
         )
 
-        assert key == "data:777:get_paginated_data:page:5:size:20"
+        assert key == "data:777:g0.0:get_paginated_data:page:5:size:20"
+
+
+@pytest.mark.unit
+class TestHouseholdKeyBuilder:
+    """Test the household-scoped, generation-versioned key builder."""
+
+    @staticmethod
+    async def _key(func_name: str = "get_tasks", **kwargs: object) -> str:
+        return await household_key_builder(
+            func=MagicMock(__name__=func_name),
+            namespace="fastapi-cache:household",
+            request=MagicMock(spec=Request),
+            response=MagicMock(spec=Response),
+            args=(),
+            kwargs=kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_key_includes_household_generation_and_params(self) -> None:
+        """Test the key format."""
+        household_id = uuid.uuid4()
+
+        key = await self._key(
+            household_id=household_id, page=2, order="asc", db=MagicMock()
+        )
+
+        assert key == (
+            f"fastapi-cache:household:{household_id}:g0.0:get_tasks:"
+            "order=asc&page=2"
+        )
+
+    @pytest.mark.asyncio
+    async def test_equivalent_params_share_a_key(self) -> None:
+        """Test list order and None arguments do not change the key."""
+        household_id = uuid.uuid4()
+        rooms = [uuid.uuid4(), uuid.uuid4()]
+
+        first = await self._key(
+            household_id=household_id,
+            room_ids=rooms,
+            statuses=[TaskStatus.done, TaskStatus.blocked],
+            sort=None,
+        )
+        second = await self._key(
+            household_id=household_id,
+            statuses=[TaskStatus.blocked, TaskStatus.done],
+            room_ids=rooms[::-1],
+        )
+
+        assert first == second
+        assert "statuses=blocked,done" in first
+
+    @pytest.mark.asyncio
+    async def test_households_and_routes_have_separate_keys(self) -> None:
+        """Test keys differ by household and by route."""
+        household_id = uuid.uuid4()
+
+        keys = {
+            await self._key(household_id=household_id),
+            await self._key(household_id=uuid.uuid4()),
+            await self._key("get_rooms", household_id=household_id),
+        }
+
+        assert len(keys) == 3  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_invalidation_moves_to_new_key(self) -> None:
+        """Test invalidating the household changes its keys."""
+        household_id = uuid.uuid4()
+        before = await self._key(household_id=household_id, page=1)
+
+        await invalidate_household_cache(household_id)
+
+        after = await self._key(household_id=household_id, page=1)
+        assert after != before
+        assert f":{household_id}:g0.1:get_tasks:" in after
+
+    @pytest.mark.asyncio
+    async def test_unreadable_generation_never_reuses_key(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test a Redis failure yields keys that cannot hit stale data."""
+        mocker.patch(
+            "app.cache.key_builders.generation_tag",
+            new_callable=AsyncMock,
+            side_effect=RedisError("Connection failed"),
+        )
+        household_id = uuid.uuid4()
+
+        first = await self._key(household_id=household_id)
+        second = await self._key(household_id=household_id)
+
+        assert first != second
+
+
+@pytest.mark.unit
+class TestGenerations:
+    """Test namespace generation counters."""
+
+    @pytest.mark.asyncio
+    async def test_local_generations(self) -> None:
+        """Test in-process counters start at 0 and increment."""
+        assert await generation.generation_tag("things:1") == "0.0"
+        assert await generation.bump_generation("things:1") == 1
+        assert await generation.bump_generation("things:1") == 2  # noqa: PLR2004
+        assert await generation.generation_tag("things:1") == "0.2"
+        assert await generation.generation_tag("things:2") == "0.0"
+
+    @pytest.mark.asyncio
+    async def test_parent_generation_invalidates_children(self) -> None:
+        """Test bumping a namespace changes the tags nested under it."""
+        await generation.bump_generation("things:1")
+
+        await generation.bump_generation("things")
+
+        assert await generation.generation_tag("things") == "1"
+        assert await generation.generation_tag("things:1") == "1.1"
+        assert await generation.generation_tag("things:2") == "1.0"
+
+    @pytest.mark.asyncio
+    async def test_redis_generations(self, mocker: MockerFixture) -> None:
+        """Test Redis counters use one MGET or INCR on shared keys."""
+        backend = MagicMock()
+        backend.redis.mget = AsyncMock(side_effect=[[None, None], [b"2", b"7"]])
+        backend.redis.incr = AsyncMock(return_value=8)
+        mocker.patch.object(generation, "redis_backend", return_value=backend)
+
+        assert await generation.generation_tag("things:1") == "0.0"
+        assert await generation.generation_tag("things:1") == "2.7"
+        assert await generation.bump_generation("things:1") == 8  # noqa: PLR2004
+
+        backend.redis.mget.assert_called_with(
+            [
+                "fastapi-cache:generation:things",
+                "fastapi-cache:generation:things:1",
+            ]
+        )
+        backend.redis.incr.assert_called_once_with(
+            "fastapi-cache:generation:things:1"
+        )
 
 
 @pytest.mark.unit
@@ -174,26 +505,25 @@ class TestInvalidationFunctions:
         self, mocker: MockerFixture
     ) -> None:
         """Test successful user cache invalidation."""
-        mock_clear = mocker.patch.object(
-            FastAPICache, "clear", new_callable=AsyncMock
+        mock_bump = mocker.patch(
+            "app.cache.invalidation.bump_generation", new_callable=AsyncMock
         )
 
         await invalidate_user_cache(123)
 
-        # Should clear both namespaces (user:123 and users:123)
+        # Should bump both namespaces (user:123 and users:123)
         expected_call_count = 2
-        assert mock_clear.call_count == expected_call_count
-        mock_clear.assert_any_call(namespace="user:123")
-        mock_clear.assert_any_call(namespace="users:123")
+        assert mock_bump.call_count == expected_call_count
+        mock_bump.assert_any_call("user:123")
+        mock_bump.assert_any_call("users:123")
 
     @pytest.mark.asyncio
     async def test_invalidate_user_cache_redis_error(
         self, mocker: MockerFixture
     ) -> None:
         """Test user cache invalidation handles Redis errors gracefully."""
-        mock_clear = mocker.patch.object(
-            FastAPICache,
-            "clear",
+        mock_bump = mocker.patch(
+            "app.cache.invalidation.bump_generation",
             new_callable=AsyncMock,
             side_effect=RedisError("Connection failed"),
         )
@@ -201,7 +531,7 @@ class TestInvalidationFunctions:
         # Should not raise exception
         await invalidate_user_cache(123)
 
-        assert mock_clear.call_count == 1
+        assert mock_bump.call_count == 1
 
     @pytest.mark.asyncio
     @pytest.mark.asyncio
@@ -210,13 +540,13 @@ class TestInvalidationFunctions:
         self, mocker: MockerFixture
     ) -> None:
         """Test successful namespace invalidation."""
-        mock_clear = mocker.patch.object(
-            FastAPICache, "clear", new_callable=AsyncMock
+        mock_bump = mocker.patch(
+            "app.cache.invalidation.bump_generation", new_callable=AsyncMock
         )
 
         await invalidate_namespace("products:789")
 
-        mock_clear.assert_called_once_with(namespace="products:789")
+        mock_bump.assert_called_once_with("products:789")
 
     @pytest.mark.asyncio
     async def test_invalidate_namespace_error_handling(
@@ -224,9 +554,8 @@ class TestInvalidationFunctions:
     ) -> None:
         """Test namespace invalidation handles all error types."""
         for error_type in [RedisError, OSError, RuntimeError]:
-            mock_clear = mocker.patch.object(
-                FastAPICache,
-                "clear",
+            mock_bump = mocker.patch(
+                "app.cache.invalidation.bump_generation",
                 new_callable=AsyncMock,
                 side_effect=error_type("Error"),
             )
@@ -234,4 +563,39 @@ class TestInvalidationFunctions:
             # Should not raise exception
             await invalidate_namespace("test:namespace")
 
-            assert mock_clear.call_count == 1
+            assert mock_bump.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_household_cache_error_handling(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test household invalidation handles Redis errors gracefully."""
+        mock_bump = mocker.patch(
+            "app.cache.invalidation.bump_generation",
+            new_callable=AsyncMock,
+            side_effect=RedisError("Connection failed"),
+        )
+
+        # Should not raise exception
+        await invalidate_household_cache(uuid.uuid4())
+
+        assert mock_bump.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_household_cache_on_commit(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test household invalidation waits for the commit."""
+        mock_bump = mocker.patch(
+            "app.cache.invalidation.bump_generation", new_callable=AsyncMock
+        )
+        session = MagicMock(info={})
+        household_id = uuid.uuid4()
+
+        invalidate_household_cache_on_commit(session, household_id)
+
+        mock_bump.assert_not_called()
+        await run_after_commit(session)
+        mock_bump.assert_called_once_with(f"household:{household_id}")
+        await run_after_commit(session)
+        assert mock_bump.call_count == 1
@@ -4,11 +4,17 @@ import contextlib
 import os
 
 import pytest
+from prometheus_client import REGISTRY
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
 
-from app.config.settings import Settings
+from app.config.settings import Settings, get_settings
 from app.database import db
+from app.metrics import METRIC_NAMESPACE, track_db_pool_usage
 
 
 @pytest.mark.unit
@@ -284,3 +290,66 @@ class TestDatabase:
         # Test async_engine
         assert db.async_engine is not None
         assert isinstance(db.async_engine, AsyncEngine)
+
+    def test_engine_options_from_settings(self, mocker) -> None:
+        """Test the pool is sized and the statement cache is on by default."""
+        mocker.patch("app.database.db.get_settings").return_value = Settings(
+            db_user="test_user",
+            db_password="test_password",  # noqa: S106
+            db_pool_size=8,
+            db_pool_max_overflow=2,
+            db_pool_pre_ping=True,
+        )
+
+        options = db.engine_options()
+
+        assert options["poolclass"] is db.MeteredQueuePool
+        assert options["pool_size"] == 8  # noqa: PLR2004
+        assert options["max_overflow"] == 2  # noqa: PLR2004
+        assert options["pool_pre_ping"] is True
+        assert options["connect_args"] == {"prepared_statement_cache_size": 100}
+
+    def test_engine_options_pgbouncer(self, mocker) -> None:
+        """Test PgBouncer mode disables caching and names statements."""
+        mocker.patch("app.database.db.get_settings").return_value = Settings(
+            db_user="test_user",
+            db_password="test_password",  # noqa: S106
+            db_pgbouncer=True,
+        )
+
+        connect_args = db.engine_options()["connect_args"]
+
+        assert connect_args["statement_cache_size"] == 0
+        assert connect_args["prepared_statement_cache_size"] == 0
+        name_func = connect_args["prepared_statement_name_func"]
+        assert name_func() != name_func()
+
+    @pytest.mark.asyncio
+    async def test_pool_metrics(self, mocker) -> None:
+        """Test checkouts record their wait and the gauges read the pool."""
+        mocker.patch.object(get_settings(), "metrics_enabled", new=True)
+        observe = mocker.patch.object(db, "observe_db_pool_checkout_wait")
+        engine = create_async_engine(
+            db.get_database_url(use_test_db=True),
+            poolclass=db.MeteredQueuePool,
+            pool_size=1,
+            max_overflow=1,
+        )
+        track_db_pool_usage(engine.sync_engine.pool, engine="test")
+
+        def gauge(name: str) -> float | None:
+            return REGISTRY.get_sample_value(
+                f"{METRIC_NAMESPACE}_{name}", {"engine": "test"}
+            )
+
+        try:
+            async with engine.connect() as first, engine.connect() as second:
+                await first.execute(text("SELECT 1"))
+                await second.execute(text("SELECT 1"))
+                assert gauge("db_pool_connections_in_use") == 2  # noqa: PLR2004
+                assert gauge("db_pool_overflow_connections") == 1
+            assert gauge("db_pool_connections_in_use") == 0
+            assert gauge("db_pool_overflow_connections") == 0
+            assert observe.call_count == 2  # noqa: PLR2004
+        finally:
+            await engine.dispose()
@@ -5,9 +5,13 @@ from typing import TypedDict
 
 import pytest
 from fastapi import status
-from pydantic import NameEmail
+from fastapi_mail import MessageSchema, MessageType
+from pydantic import NameEmail, ValidationError
 
 from app.config.settings import get_settings
+from app.mail.delivery import PooledMail
+from app.managers.email import EmailManager
+from app.models.email_outbox import EmailOutbox
 from app.schemas.email import EmailSchema, EmailTemplateSchema
 
 
@@ -35,8 +39,6 @@ class TestEmailManager:
         template_name="template.html", body={"name": "Test Name"}, **email_data
     )
 
-    background_tasks_mock_path = "app.managers.email.BackgroundTasks"
-
     def test_init(self, email_manager) -> None:
         """Test the EmailManager constructor."""
         assert get_settings().mail_username == email_manager.conf.MAIL_USERNAME
@@ -47,6 +49,45 @@ class TestEmailManager:
         assert get_settings().mail_from == email_manager.conf.MAIL_FROM
         assert email_manager.conf.SUPPRESS_SEND == 1
 
+    def test_config_is_shared(self, email_manager) -> None:
+        """Test every EmailManager shares one configuration it can't change."""
+        assert EmailManager(suppress_send=True).conf is email_manager.conf
+        assert EmailManager().conf is not email_manager.conf
+        with pytest.raises(ValidationError):
+            email_manager.conf.MAIL_PORT = 25
+
+    async def test_send_renders_template(self, email_manager) -> None:
+        """Test send renders a named template into the message body."""
+        message = MessageSchema(
+            subject="Welcome",
+            recipients=self.email_data["recipients"],
+            template_body={"name": "Test Name", "verification": "abc123"},
+            subtype=MessageType.html,
+        )
+
+        with PooledMail(email_manager.conf).record_messages() as outbox:
+            await email_manager.send(message, "welcome.html")
+
+        [sent] = outbox
+        html = sent.get_payload()[0].get_payload(decode=True).decode()
+        assert "Welcome, Test Name!" in html
+        assert f"Welcome to {get_settings().api_title}" in html
+        assert "/verify?code=abc123" in html
+
+    async def test_send_rejects_string_template_body(
+        self, email_manager
+    ) -> None:
+        """Test send refuses a template body that is not a dict or list."""
+        message = MessageSchema(
+            subject="Welcome",
+            recipients=self.email_data["recipients"],
+            template_body="Test Name",
+            subtype=MessageType.html,
+        )
+
+        with pytest.raises(TypeError):
+            await email_manager.send(message, "welcome.html")
+
     @pytest.mark.asyncio
     async def test_simple_send(self, email_manager) -> None:
         """Test the simple_send method."""
@@ -56,25 +97,32 @@ class TestEmailManager:
         assert json.loads(response.body)["message"] == "email has been sent"
 
     def test_background_send(self, email_manager, mocker) -> None:
-        """Test the background_send method."""
-        mock_backgroundtasks = mocker.patch(self.background_tasks_mock_path)
-        response = email_manager.background_send(
-            mock_backgroundtasks, self.email_schema
-        )
+        """Test background_send queues the email in the outbox."""
+        session = mocker.MagicMock()
+        response = email_manager.background_send(session, self.email_schema)
+
         assert response is None
-        mock_backgroundtasks.add_task.assert_called_once()
-        # TODO(seapgan): investigate how to ensure the task is called with the
-        # correct args
+        queued = session.add.call_args[0][0]
+        assert isinstance(queued, EmailOutbox)
+        assert queued.subject == "Test Subject"
+        assert queued.body == "Test Body"
+        assert queued.template_name is None
+        assert queued.recipients == [
+            {"name": "Test Email", "email": "test_recipient@testing.com"}
+        ]
 
     def test_template_send(self, email_manager, mocker) -> None:
-        """Test the template_send method."""
-        mock_backgroundtasks = mocker.patch(self.background_tasks_mock_path)
+        """Test template_send queues the template email in the outbox."""
+        session = mocker.MagicMock()
         response = email_manager.template_send(
-            mock_backgroundtasks, self.email_data_with_template
+            session, self.email_data_with_template
         )
+
         assert response is None
-        mock_backgroundtasks.add_task.assert_called_once()
-        # TODO(seapgan): again see if we can get more granular with the assert
+        queued = session.add.call_args[0][0]
+        assert queued.template_name == "template.html"
+        assert queued.template_body == {"name": "Test Name"}
+        assert queued.body is None
 
     @pytest.mark.asyncio
     async def test_simple_send_exception_handling(
@@ -83,8 +131,8 @@ class TestEmailManager:
         """Test simple_send logs and re-raises exceptions."""
         # COVERS: email.py lines 65-69
 
-        # Mock FastMail to raise an exception
-        mock_fastmail_class = mocker.patch("app.managers.email.FastMail")
+        # Mock PooledMail to raise an exception
+        mock_fastmail_class = mocker.patch("app.managers.email.PooledMail")
         mock_fastmail_instance = mock_fastmail_class.return_value
         mock_fastmail_instance.send_message = mocker.AsyncMock(
             side_effect=Exception("SMTP connection failed")
@@ -0,0 +1,160 @@
+"""Test the email outbox and the mail worker."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import NameEmail
+from sqlalchemy import select
+
+from app.config.settings import get_settings
+from app.mail import outbox
+from app.mail.worker import process_due
+from app.managers.user import UserManager
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.schemas.email import EmailSchema
+
+
+def _email(subject: str = "Hello") -> EmailSchema:
+    return EmailSchema(
+        recipients=[NameEmail("Test", "test@example.com")],
+        subject=subject,
+        body="<p>Hello</p>",
+    )
+
+
+async def _queue(sessionmaker, count: int = 1) -> None:
+    async with sessionmaker() as session, session.begin():
+        for number in range(count):
+            outbox.enqueue(session, _email(f"Email {number}"))
+
+
+async def _emails(sessionmaker) -> list[EmailOutbox]:
+    async with sessionmaker() as session:
+        return list(
+            await session.scalars(select(EmailOutbox).order_by(EmailOutbox.id))
+        )
+
+
+@pytest.mark.unit
+class TestEmailOutbox:
+    """Test queueing and sending outbox emails."""
+
+    async def test_registration_queues_welcome_email(self, test_db) -> None:
+        """Test registering queues the welcome email with the user."""
+        await UserManager.register(
+            {
+                "email": "outbox@example.com",
+                "password": "test12345!",
+                "first_name": "Out",
+                "last_name": "Box",
+            },
+            test_db,
+            send_welcome=True,
+        )
+        await test_db.commit()
+
+        email = await test_db.scalar(select(EmailOutbox))
+        assert email.template_name == "welcome.html"
+        assert email.recipients[0]["email"] == "outbox@example.com"
+        assert email.status == OutboxStatus.pending
+
+    async def test_rolled_back_email_is_not_queued(
+        self, async_test_sessionmaker
+    ) -> None:
+        """Test an email is only queued if its transaction commits."""
+        async with async_test_sessionmaker() as session:
+            outbox.enqueue(session, _email())
+            await session.flush()
+            await session.rollback()
+
+        assert await _emails(async_test_sessionmaker) == []
+
+    async def test_due_emails_are_sent(
+        self, async_test_sessionmaker, mocker
+    ) -> None:
+        """Test the worker sends due emails and marks them sent."""
+        await _queue(async_test_sessionmaker, 3)
+        manager = mocker.MagicMock(send=mocker.AsyncMock())
+
+        claimed = await process_due(async_test_sessionmaker, manager)
+
+        assert claimed == 3  # noqa: PLR2004
+        assert manager.send.await_count == 3  # noqa: PLR2004
+        emails = await _emails(async_test_sessionmaker)
+        assert {email.status for email in emails} == {OutboxStatus.sent}
+        assert all(email.sent_at is not None for email in emails)
+        assert await process_due(async_test_sessionmaker, manager) == 0
+
+    async def test_failed_email_backs_off(
+        self, async_test_sessionmaker, mocker
+    ) -> None:
+        """Test a failed email is retried later, not straight away."""
+        await _queue(async_test_sessionmaker)
+        manager = mocker.MagicMock(
+            send=mocker.AsyncMock(side_effect=OSError("connection refused"))
+        )
+
+        await process_due(async_test_sessionmaker, manager)
+
+        [email] = await _emails(async_test_sessionmaker)
+        assert email.status == OutboxStatus.pending
+        assert email.attempts == 1
+        assert email.last_error == "OSError: connection refused"
+        assert email.next_attempt_at > datetime.now(timezone.utc) + timedelta(
+            seconds=25
+        )
+        assert await process_due(async_test_sessionmaker, manager) == 0
+
+    async def test_email_is_dead_lettered(
+        self, async_test_sessionmaker, mocker, monkeypatch
+    ) -> None:
+        """Test an email is dead-lettered after its last attempt."""
+        monkeypatch.setattr(get_settings(), "mail_outbox_max_attempts", 2)
+        monkeypatch.setattr(get_settings(), "mail_outbox_retry_base", 0)
+        await _queue(async_test_sessionmaker)
+        manager = mocker.MagicMock(
+            send=mocker.AsyncMock(side_effect=OSError("connection refused"))
+        )
+
+        await process_due(async_test_sessionmaker, manager)
+        await process_due(async_test_sessionmaker, manager)
+
+        [email] = await _emails(async_test_sessionmaker)
+        assert email.status == OutboxStatus.dead
+        assert email.attempts == 2  # noqa: PLR2004
+        assert await process_due(async_test_sessionmaker, manager) == 0
+
+        async with async_test_sessionmaker() as session, session.begin():
+            assert await outbox.requeue_dead(session) == 1
+        manager.send.side_effect = None
+        assert await process_due(async_test_sessionmaker, manager) == 1
+
+    async def test_sends_are_limited(
+        self, async_test_sessionmaker, mocker, monkeypatch
+    ) -> None:
+        """Test no more than MAIL_OUTBOX_CONCURRENCY emails send at once."""
+        monkeypatch.setattr(get_settings(), "mail_outbox_concurrency", 2)
+        await _queue(async_test_sessionmaker, 6)
+        sending = peak = 0
+
+        async def send(*_args: object) -> None:
+            nonlocal sending, peak
+            sending += 1
+            peak = max(peak, sending)
+            await asyncio.sleep(0.01)
+            sending -= 1
+
+        manager = mocker.MagicMock(send=send)
+
+        assert await process_due(async_test_sessionmaker, manager) == 6  # noqa: PLR2004
+        assert peak == 2  # noqa: PLR2004
+
+    def test_retry_delay_doubles_up_to_the_maximum(self, monkeypatch) -> None:
+        """Test the retry delay grows exponentially and is capped."""
+        monkeypatch.setattr(get_settings(), "mail_outbox_retry_base", 30)
+        monkeypatch.setattr(get_settings(), "mail_outbox_retry_max", 100)
+
+        assert [
+            outbox.retry_delay(attempt).total_seconds() for attempt in (1, 2, 3)
+        ] == [30, 60, 100]
@@ -0,0 +1,73 @@
+"""Test the precompiled email templates."""
+
+from pathlib import Path
+
+import pytest
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+
+from app.config.settings import get_settings
+from app.mail import templates
+
+BODY = {"name": "Test Name", "verification": "abc", "reset_token": "xyz"}
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path, monkeypatch) -> Path:
+    """Cache compiled templates in a scratch directory."""
+    monkeypatch.setattr(templates, "_templates", {})
+    monkeypatch.setattr(
+        get_settings(), "mail_template_cache_dir", str(tmp_path / "cache")
+    )
+    return tmp_path / "cache"
+
+
+@pytest.mark.unit
+class TestEmailTemplates:
+    """Test compiling and rendering the email templates."""
+
+    @pytest.mark.parametrize(
+        "template_name", ["welcome.html", "password_reset.html"]
+    )
+    def test_render_matches_jinja(self, cache_dir, template_name) -> None:
+        """Test a template renders as Jinja renders it with every value."""
+        templates.load_templates()
+        env = Environment(  # noqa: S701
+            loader=FileSystemLoader(templates.TEMPLATE_FOLDER)
+        )
+
+        expected = env.get_template(template_name).render(
+            **BODY, **templates.static_context()
+        )
+
+        assert templates.render(template_name, BODY) == expected
+
+    def test_static_values_are_compiled_in(
+        self, cache_dir, monkeypatch
+    ) -> None:
+        """Test settings-derived values are fixed when templates compile."""
+        monkeypatch.setattr(get_settings(), "api_title", "Before")
+        templates.load_templates()
+        monkeypatch.setattr(get_settings(), "api_title", "After")
+
+        assert "Welcome to Before" in templates.render("welcome.html", BODY)
+
+        templates.load_templates()
+
+        assert "Welcome to After" in templates.render("welcome.html", BODY)
+
+    def test_compiled_templates_are_cached(self, cache_dir, mocker) -> None:
+        """Test a second load reuses the cached bytecode."""
+        templates.load_templates()
+        cached = sorted(cache_dir.iterdir())
+        compile_template = mocker.spy(Environment, "compile")
+
+        templates.load_templates()
+
+        assert cached
+        assert sorted(cache_dir.iterdir()) == cached
+        compile_template.assert_not_called()
+
+    def test_unknown_template(self, cache_dir) -> None:
+        """Test rendering a missing template raises TemplateNotFound."""
+        with pytest.raises(TemplateNotFound):
+            templates.render("missing.html", BODY)
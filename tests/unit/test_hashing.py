@@ -0,0 +1,83 @@
+"""Unit tests for the password hashing pool."""
+
+import asyncio
+import threading
+from collections.abc import Iterator
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.database import hashing
+from app.database.helpers import hash_password, verify_password
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Give every test its own two-worker thread pool."""
+    settings = hashing.get_settings()
+    monkeypatch.setattr(settings, "password_hash_executor", "thread")
+    monkeypatch.setattr(settings, "password_hash_workers", 2)
+    hashing.shutdown_hash_pool()
+    yield
+    hashing.shutdown_hash_pool()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestHashPool:
+    """Test running password functions on the hashing pool."""
+
+    async def test_runs_off_the_event_loop(self) -> None:
+        """Test jobs run on a pool thread, not the event loop thread."""
+        thread = await hashing.run_in_hash_pool(threading.current_thread)
+
+        assert thread is not threading.current_thread()
+        assert thread.name.startswith("password-hash")
+
+    async def test_hash_and_verify(self) -> None:
+        """Test the password helpers give the same results on the pool."""
+        hashed = await hashing.run_in_hash_pool(hash_password, "test12345!")
+
+        assert await hashing.run_in_hash_pool(
+            verify_password, "test12345!", hashed
+        )
+        assert not await hashing.run_in_hash_pool(
+            verify_password, "wrong", hashed
+        )
+
+    async def test_errors_propagate(self) -> None:
+        """Test exceptions from the job reach the caller."""
+        with pytest.raises(ValueError, match="Password cannot be empty"):
+            await hashing.run_in_hash_pool(hash_password, "")
+
+        assert hashing.queue_depth() == 0
+
+    async def test_queue_depth(self, mocker: MockerFixture) -> None:
+        """Test jobs beyond the worker limit are reported as queued."""
+        gauge = mocker.patch.object(hashing, "set_password_hash_queue_depth")
+        release = threading.Event()
+        jobs = [
+            asyncio.create_task(hashing.run_in_hash_pool(release.wait))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+
+        assert hashing.queue_depth() == 3  # noqa: PLR2004
+        gauge.assert_called_with(3)
+
+        release.set()
+        await asyncio.gather(*jobs)
+        assert hashing.queue_depth() == 0
+        gauge.assert_called_with(0)
+
+    async def test_process_pool(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the pool can run the helpers in worker processes."""
+        monkeypatch.setattr(
+            hashing.get_settings(), "password_hash_executor", "process"
+        )
+        hashed = hash_password("test12345!")
+
+        assert await hashing.run_in_hash_pool(
+            verify_password, "test12345!", hashed
+        )
+        assert isinstance(hashing._executor, hashing.ProcessPoolExecutor)
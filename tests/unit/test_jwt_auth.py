@@ -4,7 +4,7 @@ import datetime
 
 import jwt
 import pytest
-from fastapi import BackgroundTasks, HTTPException, status
+from fastapi import HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
 
 from app.config.settings import get_settings
@@ -219,9 +219,8 @@ class TestJWTAuth:
 
     async def test_jwt_auth_unverified_user(self, test_db, mocker) -> None:
         """Test with an unverified user."""
-        background_tasks = BackgroundTasks()
         token, _ = await UserManager.register(
-            self.test_user, test_db, background_tasks=background_tasks
+            self.test_user, test_db, send_welcome=True
         )
         await UserManager.set_ban_status(1, 666, test_db, banned=True)
 
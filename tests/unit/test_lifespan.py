@@ -5,10 +5,12 @@ import logging
 import pytest
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
+from fastapi_cache import FastAPICache
 from fastapi_cache.backends.inmemory import InMemoryBackend
 from fastapi_cache.backends.redis import RedisBackend
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.cache.tiered import TieredBackend
 from app.main import lifespan
 
 
@@ -254,6 +256,7 @@ class TestLifespan:
         mock_settings.return_value.redis_enabled = True
         mock_settings.return_value.redis_password = "secret"  # noqa: S105
         mock_settings.return_value.redis_url = "redis://localhost:6379/0"
+        mock_settings.return_value.cache_local_ttl = 0
 
         mock_redis = mocker.MagicMock()
         mock_redis.ping = mocker.AsyncMock()
@@ -275,6 +278,46 @@ class TestLifespan:
         assert isinstance(cache_backend, RedisBackend)
         mock_redis.close.assert_awaited_once()
 
+    async def test_lifespan_initializes_tiered_cache(
+        self, mocker, monkeypatch
+    ) -> None:
+        """Ensure CACHE_LOCAL_TTL puts a local tier in front of Redis."""
+        app = FastAPI()
+        # Restore the global cache backend when the test ends.
+        monkeypatch.setattr(FastAPICache, "_init", False)
+        monkeypatch.setattr(FastAPICache, "_backend", None)
+        monkeypatch.setattr(FastAPICache, "_prefix", None)
+        mock_session = mocker.patch(self.mock_session)
+        mock_connection = (
+            mock_session.return_value.__aenter__.return_value.connection
+        )
+        mock_connection.return_value = None
+
+        mock_settings = mocker.patch("app.main.get_settings")
+        mock_settings.return_value.cache_enabled = True
+        mock_settings.return_value.redis_enabled = True
+        mock_settings.return_value.redis_password = "secret"  # noqa: S105
+        mock_settings.return_value.redis_url = "redis://localhost:6379/0"
+        mock_settings.return_value.cache_local_ttl = 5
+        mock_settings.return_value.cache_local_maxsize = 100
+
+        mock_redis = mocker.MagicMock()
+        mock_redis.ping = mocker.AsyncMock()
+        mock_redis.close = mocker.AsyncMock()
+        mocker.patch("app.main.Redis.from_url", return_value=mock_redis)
+        mock_start = mocker.patch.object(TieredBackend, "start")
+        mock_stop = mocker.patch.object(TieredBackend, "stop")
+
+        async with lifespan(app):
+            cache_backend = FastAPICache.get_backend()
+            assert isinstance(cache_backend, TieredBackend)
+            assert isinstance(cache_backend.remote, RedisBackend)
+            assert cache_backend.local_ttl == 5  # noqa: PLR2004
+            mock_start.assert_awaited_once()
+
+        mock_stop.assert_awaited_once()
+        mock_redis.close.assert_awaited_once()
+
     async def test_lifespan_logs_when_caching_disabled(
         self, caplog, mocker
     ) -> None:
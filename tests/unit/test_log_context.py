@@ -0,0 +1,120 @@
+"""Test the request log context."""
+
+import uuid
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+
+from app.config.log_context import (
+    RequestContext,
+    annotate_request,
+    bind_request,
+    current_request,
+    reset_request,
+)
+
+
+def _context() -> RequestContext:
+    """Return the bound request context, which must exist."""
+    context = current_request()
+    assert context is not None
+    return context
+
+
+def _scope(*headers: tuple[bytes, bytes]) -> dict[str, Any]:
+    """Return a minimal ASGI HTTP scope with the given headers."""
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/users/me",
+        "headers": list(headers),
+    }
+
+
+@pytest.mark.unit
+class TestRequestContext:
+    """Test binding and annotating the request log context."""
+
+    def test_bind_and_reset(self) -> None:
+        """Test a bound context is current until it is reset."""
+        token = bind_request(_scope())
+        context = current_request()
+
+        assert context is not None
+        assert context.method == "GET"
+        assert context.path == "/api/users/me"
+
+        reset_request(token)
+
+        assert current_request() is None
+
+    @pytest.mark.parametrize(
+        ("header", "kept"),
+        [
+            (b"0f6e2a3c-client.id:1", True),
+            (b"has spaces", False),
+            (b"x" * 65, False),
+            (b"", False),
+        ],
+    )
+    def test_request_id_header(self, header: bytes, kept: bool) -> None:  # noqa: FBT001
+        """Test a valid X-Request-ID is kept and others are replaced."""
+        token = bind_request(_scope((b"x-request-id", header)))
+        try:
+            request_id = _context().request_id
+        finally:
+            reset_request(token)
+
+        assert (request_id == header.decode()) is kept
+        assert request_id
+
+    def test_request_id_generated(self) -> None:
+        """Test a request without X-Request-ID gets a fresh id."""
+        ids = set()
+        for _ in range(2):
+            token = bind_request(_scope())
+            ids.add(_context().request_id)
+            reset_request(token)
+
+        assert len(ids) == 2  # noqa: PLR2004
+
+    def test_annotate_without_request(self) -> None:
+        """Test annotating outside a request does nothing."""
+        annotate_request(user_id=1)
+
+        assert current_request() is None
+
+    def test_annotate_keeps_known_values(self) -> None:
+        """Test annotating fills in values without clearing others."""
+        household_id = uuid.uuid4()
+        token = bind_request(_scope())
+        try:
+            annotate_request(user_id=3, household_id=household_id)
+            annotate_request(user_id=None)
+            context = _context()
+        finally:
+            reset_request(token)
+
+        assert context.user_id == 3  # noqa: PLR2004
+        assert context.household_id == household_id
+
+    def test_route_and_status(self) -> None:
+        """Test the route template and status appear once known."""
+        scope = _scope()
+        token = bind_request(scope)
+        context = _context()
+        reset_request(token)
+
+        assert context.as_dict()["route"] is None
+        assert "status" not in context.as_dict()
+
+        scope["route"] = Mock(path="/users/me")
+        message = {"type": "http.response.start", "status": 200}
+        context.respond(message)
+
+        assert context.as_dict()["route"] == "/users/me"
+        assert context.as_dict()["status"] == 200  # noqa: PLR2004
+        assert message["headers"] == [
+            (b"x-request-id", context.request_id.encode())
+        ]
@@ -0,0 +1,182 @@
+"""Test the batched log writer."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+from loguru import logger
+
+from app.config.log_config import LogConfig
+from app.config.log_writer import BatchedLogWriter, add_batched_file_sink
+from app.logs import CategoryLogger, LogCategory
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+class _Stalled:
+    """A write function that waits until released, recording batches."""
+
+    def __init__(self) -> None:
+        self.batches: list[str] = []
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, text: str) -> None:
+        self.writing.set()
+        self.release.wait(5)
+        self.batches.append(text)
+
+
+@pytest.mark.unit
+class TestBatchedLogWriter:
+    """Test queueing messages for the writer thread."""
+
+    def test_messages_are_written_in_batches(self) -> None:
+        """Test queued messages are written together, in order."""
+        write = _Stalled()
+        writer = BatchedLogWriter(
+            write, max_size=100, batch_size=3, policy="block"
+        )
+        writer("first\n")
+        write.writing.wait(5)
+        for number in range(5):
+            writer(f"{number}\n")
+
+        write.release.set()
+        writer.close()
+
+        assert write.batches == ["first\n", "0\n1\n2\n", "3\n4\n"]
+
+    def test_block_policy_loses_nothing(self) -> None:
+        """Test a full queue makes a new message wait for room."""
+        batches: list[str] = []
+        writer = BatchedLogWriter(
+            batches.append, max_size=2, batch_size=2, policy="block"
+        )
+
+        for number in range(50):
+            writer(f"{number}\n")
+        writer.close()
+
+        assert "".join(batches) == "".join(f"{n}\n" for n in range(50))
+        assert writer.dropped == 0
+
+    def test_drop_policy_counts_dropped_messages(self) -> None:
+        """Test a full queue drops new messages and reports how many."""
+        write = _Stalled()
+        writer = BatchedLogWriter(
+            write, max_size=2, batch_size=10, policy="drop"
+        )
+        writer("first\n")
+        write.writing.wait(5)
+        writer("kept\n")
+        writer("kept\n")
+        writer("dropped\n")
+        writer("dropped\n")
+
+        write.release.set()
+        writer.close()
+
+        assert writer.dropped == 2  # noqa: PLR2004
+        assert "dropped\n" not in "".join(write.batches)
+        assert write.batches[-1].endswith(
+            "2 log message(s) dropped: the log queue was full\n"
+        )
+
+    def test_messages_after_close_are_written_directly(self) -> None:
+        """Test the writer still writes once its thread has stopped."""
+        batches: list[str] = []
+        writer = BatchedLogWriter(
+            batches.append, max_size=10, batch_size=10, policy="block"
+        )
+        writer.close()
+
+        writer("late\n")
+
+        assert batches == ["late\n"]
+
+    def test_file_sink(self, tmp_path: Path) -> None:
+        """Test logged messages reach the file, formatted, via the writer."""
+        log_file = tmp_path / "api.log"
+        writer = add_batched_file_sink(
+            str(log_file),
+            level="INFO",
+            log_format="{level} | {message}",
+            max_size=10,
+            batch_size=10,
+            policy="block",
+        )
+        try:
+            logger.info("Hello {}", "world")
+            logger.debug("Not logged at INFO")
+            writer.close()
+        finally:
+            for handler_id in writer.handler_ids:
+                logger.remove(handler_id)
+
+        assert log_file.read_text() == "INFO | Hello world\n"
+
+
+@pytest.mark.unit
+class TestLazyCategoryLogger:
+    """Test messages are only formatted if they are logged."""
+
+    def test_level_is_checked_before_formatting(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test a message below LOG_LEVEL is dropped before anything else."""
+        mock_log_config = mocker.patch("app.logs.log_config")
+        mock_log_config.accepts.return_value = False
+        mock_logger = mocker.Mock()
+
+        CategoryLogger(mock_logger).info(
+            "User {} logged in", LogCategory.AUTH, 1
+        )
+
+        mock_log_config.accepts.assert_called_once_with(20)
+        mock_log_config.is_enabled.assert_not_called()
+        mock_logger.info.assert_not_called()
+
+    def test_args_are_passed_unformatted(self, mocker: MockerFixture) -> None:
+        """Test the message and its args are left for loguru to format."""
+        mock_log_config = mocker.patch("app.logs.log_config")
+        mock_log_config.accepts.return_value = True
+        mock_log_config.is_enabled.return_value = True
+        mock_logger = mocker.Mock()
+
+        CategoryLogger(mock_logger).warning(
+            "User {} failed: {}", LogCategory.AUTH, 1, "banned"
+        )
+
+        mock_logger.warning.assert_called_once_with(
+            "User {} failed: {}", 1, "banned"
+        )
+
+    @pytest.mark.parametrize(
+        ("log_level", "level_no", "expected"),
+        [("INFO", 10, False), ("INFO", 20, True), ("warning", 20, False)],
+    )
+    def test_accepts(
+        self,
+        mocker: MockerFixture,
+        log_level: str,
+        level_no: int,
+        expected: bool,  # noqa: FBT001
+    ) -> None:
+        """Test LogConfig.accepts compares a severity with LOG_LEVEL."""
+        mocker.patch(
+            "app.config.settings.get_settings",
+            return_value=mocker.Mock(
+                log_path="./logs",
+                log_level=log_level,
+                log_filename="api.log",
+                log_categories="ALL",
+            ),
+        )
+
+        assert LogConfig().accepts(level_no) is expected
@@ -2,20 +2,33 @@
 
 from __future__ import annotations
 
+import json
 import sys
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock, Mock
 
 import pytest
-from starlette.requests import Request
-from starlette.responses import Response
-
-from app.config.log_config import LogCategory, LogConfig, setup_logging
+from loguru import logger
+
+from app.config.log_config import (
+    LogCategory,
+    LogConfig,
+    format_json,
+    setup_logging,
+)
+from app.config.log_context import (
+    annotate_request,
+    bind_request,
+    current_request,
+    reset_request,
+)
+from app.config.log_writer import BATCH_KEY, BatchedLogWriter, is_not_batch
 from app.logs import CategoryLogger
-from app.middleware.logging_middleware import LoggingMiddleware
+from app.middleware.observability import ObservabilityMiddleware
 
 if TYPE_CHECKING:
     from pytest_mock import MockerFixture
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 @pytest.mark.unit
@@ -246,12 +259,10 @@ class TestLogConfig:
         config = LogConfig()
         assert config.console_enabled is True
 
-    def test_setup_logging_skips_console_when_disabled(
-        self, mocker: MockerFixture
-    ) -> None:
-        """Test setup_logging() doesn't add console handler when disabled."""
-        # COVERS: log_config.py line 87-93 (the if block)
-        mock_settings = Mock(
+    @staticmethod
+    def _logging_settings(*, console_enabled: bool = False) -> Mock:
+        """Return mock settings for setup_logging()."""
+        return Mock(
             log_path="./logs",
             log_level="INFO",
             log_rotation="1 day",
@@ -259,10 +270,19 @@ class TestLogConfig:
             log_compression="zip",
             log_categories="ALL",
             log_filename="api.log",
-            log_console_enabled=False,
+            log_console_enabled=console_enabled,
+            log_queue_size=100,
+            log_batch_size=10,
+            log_queue_policy="block",
         )
+
+    def test_setup_logging_skips_console_when_disabled(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test setup_logging() doesn't add console handler when disabled."""
         mocker.patch(
-            "app.config.settings.get_settings", return_value=mock_settings
+            "app.config.settings.get_settings",
+            return_value=self._logging_settings(),
         )
 
         # Mock logger methods
@@ -271,29 +291,21 @@ class TestLogConfig:
 
         setup_logging()
 
-        # Verify logger.add was called only once (for file handler, not console)
-        assert mock_logger_add.call_count == 1
-        # Verify it was called with a file path (str), not sys.stderr
-        call_args = mock_logger_add.call_args[0][0]
-        assert isinstance(call_args, str)
+        # Only the file handlers: the batched writer and the file it writes
+        expected_handler_count = 2
+        assert mock_logger_add.call_count == expected_handler_count
+        sinks = [call.args[0] for call in mock_logger_add.call_args_list]
+        assert sys.stderr not in sinks
+        assert isinstance(sinks[0], BatchedLogWriter)
+        assert isinstance(sinks[1], str)
 
     def test_setup_logging_adds_console_when_enabled(
         self, mocker: MockerFixture
     ) -> None:
         """Test setup_logging() adds console handler when enabled."""
-        # COVERS: log_config.py line 88-93 (inside the if block)
-        mock_settings = Mock(
-            log_path="./logs",
-            log_level="INFO",
-            log_rotation="1 day",
-            log_retention="30 days",
-            log_compression="zip",
-            log_categories="ALL",
-            log_filename="api.log",
-            log_console_enabled=True,
-        )
         mocker.patch(
-            "app.config.settings.get_settings", return_value=mock_settings
+            "app.config.settings.get_settings",
+            return_value=self._logging_settings(console_enabled=True),
         )
 
         # Mock logger methods
@@ -302,57 +314,58 @@ class TestLogConfig:
 
         setup_logging()
 
-        # Verify logger.add was called twice (console + file)
-        expected_handler_count = 2  # console + file
+        # Verify logger.add was called for the console and the file handlers
+        expected_handler_count = 3
         assert mock_logger_add.call_count == expected_handler_count
-        # First call should be for console (sys.stderr)
-        first_call_args = mock_logger_add.call_args_list[0][0][0]
-        # Second call should be for file (str path)
-        second_call_args = mock_logger_add.call_args_list[1][0][0]
-
-        # Verify first is sys.stderr and second is string path
-        assert first_call_args == sys.stderr
-        assert isinstance(second_call_args, str)
+        sinks = [call.args[0] for call in mock_logger_add.call_args_list]
+        assert sinks[0] == sys.stderr
+        assert isinstance(sinks[1], BatchedLogWriter)
+        assert isinstance(sinks[2], str)
 
-    def test_setup_logging_logs_when_reload_enabled(
+    def test_setup_logging_batches_file_writes_under_reload(
         self, mocker: MockerFixture
     ) -> None:
-        """Test setup_logging() logs when uvicorn reload is enabled."""
-        # COVERS: log_config.py lines 105-108 (reload log)
-        mock_settings = Mock(
-            log_path="./logs",
-            log_level="INFO",
-            log_rotation="1 day",
-            log_retention="30 days",
-            log_compression="zip",
-            log_categories="ALL",
-            log_filename="api.log",
-            log_console_enabled=False,
-        )
+        """Test the log file is written by the batched writer, not enqueue.
+
+        Loguru's enqueue is disabled under uvicorn reload; the batched
+        writer is not.
+        """
         mocker.patch(
-            "app.config.settings.get_settings", return_value=mock_settings
+            "app.config.settings.get_settings",
+            return_value=self._logging_settings(),
         )
         mocker.patch(
             "app.config.log_config.sys.argv",
             ["uvicorn", "app.main:app", "--reload"],
         )
+        mock_logger_add = mocker.patch("app.config.log_config.logger.add")
+        mocker.patch("app.config.log_config.logger.remove")
+
+        setup_logging()
 
+        writer_call, file_call = mock_logger_add.call_args_list
+        assert isinstance(writer_call.args[0], BatchedLogWriter)
+        assert file_call.args[0].endswith("api.log")
+        assert "enqueue" not in file_call.kwargs
+        assert writer_call.kwargs["filter"] is is_not_batch
+        assert not file_call.kwargs["filter"]({"extra": {}})
+        assert not file_call.kwargs["filter"]({"extra": {BATCH_KEY: "other"}})
+        assert file_call.kwargs["rotation"] == "1 day"
+
+    def test_setup_logging_json_format(self, mocker: MockerFixture) -> None:
+        """Test LOG_FORMAT=json formats the file and console as JSON."""
+        settings = self._logging_settings(console_enabled=True)
+        settings.log_format = "json"
+        mocker.patch("app.config.settings.get_settings", return_value=settings)
         mock_logger_add = mocker.patch("app.config.log_config.logger.add")
         mocker.patch("app.config.log_config.logger.remove")
-        mock_uvicorn_logger = mocker.Mock()
-        mock_get_logger = mocker.patch(
-            "app.config.log_config.logging.getLogger",
-            return_value=mock_uvicorn_logger,
-        )
 
         setup_logging()
 
-        mock_get_logger.assert_called_once_with("uvicorn")
-        mock_uvicorn_logger.info.assert_called_once_with(
-            "Loguru enqueue disabled because uvicorn reload is enabled."
-        )
-        assert mock_logger_add.call_count == 1
-        assert mock_logger_add.call_args.kwargs["enqueue"] is False
+        console_call, writer_call, _ = mock_logger_add.call_args_list
+        assert console_call.kwargs["format"] is format_json
+        assert console_call.kwargs["colorize"] is False
+        assert writer_call.kwargs["format"] is format_json
 
 
 @pytest.mark.unit
@@ -410,138 +423,150 @@ class TestCategoryLogger:
         mock_logger.error.assert_not_called()
 
 
+def _logged(call: Any) -> str:  # noqa: ANN401
+    """Return a logged message, formatted with its deferred args."""
+    message: str = call.args[0]
+    return message.format(*call.args[1:])
+
+
+def _http_scope(path: str, query: str = "", method: str = "GET") -> Scope:
+    """Return a minimal ASGI HTTP scope."""
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [],
+        "client": ("127.0.0.1", 50000),
+    }
+
+
+async def _call(
+    middleware: ObservabilityMiddleware, scope: Scope
+) -> list[Message]:
+    """Run the middleware and return the messages it sent."""
+    sent: list[Message] = []
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    await middleware(scope, AsyncMock(), send)
+    return sent
+
+
+def _app(status_code: int = 200) -> ASGIApp:
+    """Return an ASGI app answering every request with ``status_code``."""
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": status_code})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return app
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 class TestLoggingMiddleware:
-    """Test LoggingMiddleware class."""
+    """Test request logging in ObservabilityMiddleware."""
 
     async def test_middleware_skips_logging_when_requests_disabled(
         self, mocker: MockerFixture
     ) -> None:
         """Test middleware bypasses logging when REQUESTS disabled."""
-        # COVERS: logging_middleware.py line 30
         mock_log_config = mocker.patch(
-            "app.middleware.logging_middleware.log_config"
+            "app.middleware.observability.log_config"
         )
         mock_log_config.is_enabled.return_value = False
+        mock_log_config.structured = False
 
-        mock_logger = mocker.patch("app.middleware.logging_middleware.logger")
-
-        middleware = LoggingMiddleware(app=Mock())
+        mock_logger = mocker.patch("app.middleware.observability.logger")
 
-        # Create mock request and response
-        mock_request = Mock(spec=Request)
-        mock_response = Mock(spec=Response)
-        mock_call_next = AsyncMock(return_value=mock_response)
+        app = AsyncMock()
+        middleware = ObservabilityMiddleware(app=app)
+        scope = _http_scope("/api/users")
 
-        result = await middleware.dispatch(mock_request, mock_call_next)
+        await _call(middleware, scope)
 
-        # Verify early return path
-        mock_log_config.is_enabled.assert_called_once_with(LogCategory.REQUESTS)
-        mock_call_next.assert_called_once_with(mock_request)
+        # Verify the app is called directly, with the original send
+        mock_log_config.is_enabled.assert_any_call(LogCategory.REQUESTS)
+        app.assert_awaited_once()
+        assert app.await_args is not None
+        assert app.await_args.args[0] is scope
         mock_logger.info.assert_not_called()
-        assert result == mock_response
 
     async def test_middleware_logs_when_requests_enabled(
         self, mocker: MockerFixture
     ) -> None:
         """Test middleware logs requests when enabled."""
         mock_log_config = mocker.patch(
-            "app.middleware.logging_middleware.log_config"
+            "app.middleware.observability.log_config"
         )
         mock_log_config.is_enabled.return_value = True
 
-        mock_logger = mocker.patch("app.middleware.logging_middleware.logger")
+        mock_logger = mocker.patch("app.middleware.observability.logger")
 
-        middleware = LoggingMiddleware(app=Mock())
+        middleware = ObservabilityMiddleware(app=_app())
 
-        # Create mock request with necessary attributes
-        mock_request = Mock(spec=Request)
-        mock_request.client = Mock(host="127.0.0.1")
-        mock_request.method = "GET"
-        mock_request.url.path = "/api/users"
-        mock_request.url.query = ""
+        sent = await _call(middleware, _http_scope("/api/users"))
 
-        mock_response = Mock(spec=Response)
-        mock_response.status_code = 200
-        mock_call_next = AsyncMock(return_value=mock_response)
-
-        result = await middleware.dispatch(mock_request, mock_call_next)
-
-        # Verify logging occurred
-        mock_log_config.is_enabled.assert_called_once_with(LogCategory.REQUESTS)
-        mock_call_next.assert_called_once_with(mock_request)
+        # Verify logging occurred and the response passed through
+        mock_log_config.is_enabled.assert_any_call(LogCategory.REQUESTS)
         mock_logger.info.assert_called_once()
+        assert [message["type"] for message in sent] == [
+            "http.response.start",
+            "http.response.body",
+        ]
 
         # Verify log message format
-        log_message = mock_logger.info.call_args[0][0]
+        log_message = _logged(mock_logger.info.call_args)
         assert "127.0.0.1" in log_message
         assert "GET /api/users" in log_message
         assert "200" in log_message
-        assert result == mock_response
 
     async def test_middleware_logs_query_parameters(
         self, mocker: MockerFixture
     ) -> None:
         """Test middleware includes query parameters in logs."""
         mock_log_config = mocker.patch(
-            "app.middleware.logging_middleware.log_config"
+            "app.middleware.observability.log_config"
         )
         mock_log_config.is_enabled.return_value = True
 
-        mock_logger = mocker.patch("app.middleware.logging_middleware.logger")
-
-        middleware = LoggingMiddleware(app=Mock())
+        mock_logger = mocker.patch("app.middleware.observability.logger")
 
-        # Create mock request with query parameters
-        mock_request = Mock(spec=Request)
-        mock_request.client = Mock(host="127.0.0.1")
-        mock_request.method = "GET"
-        mock_request.url.path = "/api/users"
-        mock_request.url.query = "page=2&limit=10"
+        middleware = ObservabilityMiddleware(app=_app())
 
-        mock_response = Mock(spec=Response)
-        mock_response.status_code = 200
-        mock_call_next = AsyncMock(return_value=mock_response)
-
-        result = await middleware.dispatch(mock_request, mock_call_next)
+        await _call(middleware, _http_scope("/api/users", "page=2&limit=10"))
 
         # Verify logging occurred with query parameters
         mock_logger.info.assert_called_once()
-        log_message = mock_logger.info.call_args[0][0]
+        log_message = _logged(mock_logger.info.call_args)
         assert "127.0.0.1" in log_message
         assert "GET /api/users?page=2&limit=10" in log_message
         assert "200" in log_message
-        assert result == mock_response
 
     async def test_middleware_redacts_sensitive_query_parameters(
         self, mocker: MockerFixture
     ) -> None:
         """Test middleware redacts sensitive query parameters in logs."""
         mock_log_config = mocker.patch(
-            "app.middleware.logging_middleware.log_config"
+            "app.middleware.observability.log_config"
         )
         mock_log_config.is_enabled.return_value = True
 
-        mock_logger = mocker.patch("app.middleware.logging_middleware.logger")
-
-        middleware = LoggingMiddleware(app=Mock())
-
-        # Create mock request with sensitive query parameters
-        mock_request = Mock(spec=Request)
-        mock_request.client = Mock(host="127.0.0.1")
-        mock_request.method = "GET"
-        mock_request.url.path = "/api/auth"
-        mock_request.url.query = "page=2&code=secret&token=abc&API_KEY=bad"
+        mock_logger = mocker.patch("app.middleware.observability.logger")
 
-        mock_response = Mock(spec=Response)
-        mock_response.status_code = 200
-        mock_call_next = AsyncMock(return_value=mock_response)
+        middleware = ObservabilityMiddleware(app=_app())
 
-        result = await middleware.dispatch(mock_request, mock_call_next)
+        await _call(
+            middleware,
+            _http_scope(
+                "/api/auth", "page=2&code=secret&token=abc&API_KEY=bad"
+            ),
+        )
 
         mock_logger.info.assert_called_once()
-        log_message = mock_logger.info.call_args[0][0]
+        log_message = _logged(mock_logger.info.call_args)
         assert "GET /api/auth?page=2" in log_message
         assert "code=REDACTED" in log_message
         assert "token=REDACTED" in log_message
@@ -549,39 +574,189 @@ class TestLoggingMiddleware:
         assert "secret" not in log_message
         assert "abc" not in log_message
         assert "bad" not in log_message
-        assert result == mock_response
 
     async def test_middleware_logs_without_query_parameters(
         self, mocker: MockerFixture
     ) -> None:
         """Test middleware logs cleanly when no query parameters present."""
         mock_log_config = mocker.patch(
-            "app.middleware.logging_middleware.log_config"
+            "app.middleware.observability.log_config"
         )
         mock_log_config.is_enabled.return_value = True
 
-        mock_logger = mocker.patch("app.middleware.logging_middleware.logger")
-
-        middleware = LoggingMiddleware(app=Mock())
-
-        # Create mock request without query parameters
-        mock_request = Mock(spec=Request)
-        mock_request.client = Mock(host="127.0.0.1")
-        mock_request.method = "POST"
-        mock_request.url.path = "/api/users"
-        mock_request.url.query = ""  # Empty query string
+        mock_logger = mocker.patch("app.middleware.observability.logger")
 
-        mock_response = Mock(spec=Response)
-        mock_response.status_code = 201
-        mock_call_next = AsyncMock(return_value=mock_response)
+        middleware = ObservabilityMiddleware(app=_app(201))
 
-        result = await middleware.dispatch(mock_request, mock_call_next)
+        await _call(middleware, _http_scope("/api/users", method="POST"))
 
         # Verify logging occurred without trailing ?
         mock_logger.info.assert_called_once()
-        log_message = mock_logger.info.call_args[0][0]
+        log_message = _logged(mock_logger.info.call_args)
         assert "127.0.0.1" in log_message
         assert "POST /api/users" in log_message
         assert "POST /api/users?" not in log_message  # No trailing ?
         assert "201" in log_message
-        assert result == mock_response
+
+    async def test_middleware_logs_cache_status(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test the cache header is read from the response start message."""
+        mock_log_config = mocker.patch(
+            "app.middleware.observability.log_config"
+        )
+        mock_log_config.is_enabled.side_effect = (
+            lambda category: category == LogCategory.CACHE
+        )
+        mock_category_logger = mocker.patch(
+            "app.middleware.observability.category_logger"
+        )
+        mock_logger = mocker.patch("app.middleware.observability.logger")
+
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"x-fastapi-cache", b"HIT")],
+                }
+            )
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        scope = _http_scope("/api/users/me")
+        scope["headers"] = [(b"cache-control", b"no-cache")]
+
+        await _call(ObservabilityMiddleware(app=app), scope)
+
+        messages = [
+            call.args[0].format(*call.args[2:])
+            for call in mock_category_logger.debug.call_args_list
+        ]
+        assert messages[0] == "Request has Cache-Control: no-cache"
+        assert messages[1].startswith("CACHE HIT: GET /api/users/me")
+        mock_logger.info.assert_not_called()
+
+    async def test_middleware_passes_streamed_body_through(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test streamed body chunks are forwarded as they are sent."""
+        mock_log_config = mocker.patch(
+            "app.middleware.observability.log_config"
+        )
+        mock_log_config.is_enabled.return_value = True
+        mocker.patch("app.middleware.observability.logger")
+
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            await send({"type": "http.response.start", "status": 200})
+            for chunk in (b"a", b"b"):
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": True,
+                    }
+                )
+            await send({"type": "http.response.body", "body": b""})
+
+        sent = await _call(
+            ObservabilityMiddleware(app=app), _http_scope("/stream")
+        )
+
+        assert [message.get("body") for message in sent] == [
+            None,
+            b"a",
+            b"b",
+            b"",
+        ]
+
+    async def test_middleware_binds_request_context(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test structured logging gives each request a log context."""
+        mock_log_config = mocker.patch(
+            "app.middleware.observability.log_config"
+        )
+        mock_log_config.is_enabled.return_value = False
+        mock_log_config.structured = True
+        seen = []
+
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            seen.append(current_request())
+            annotate_request(user_id=7)
+            await _app(201)(scope, receive, send)
+
+        scope = _http_scope("/api/users")
+        scope["headers"] = [(b"x-request-id", b"req-42")]
+        sent = await _call(ObservabilityMiddleware(app=app), scope)
+
+        (context,) = seen
+        assert context is not None
+        assert context.request_id == "req-42"
+        assert context.user_id == 7  # noqa: PLR2004
+        assert context.status_code == 201  # noqa: PLR2004
+        assert (b"x-request-id", b"req-42") in sent[0]["headers"]
+        assert current_request() is None
+
+
+@pytest.mark.unit
+class TestJsonFormat:
+    """Test the JSON log format."""
+
+    @staticmethod
+    def _log(log: Any) -> dict[str, Any]:  # noqa: ANN401
+        """Log through a JSON formatted sink and return the parsed line."""
+        lines: list[str] = []
+        handler_id = logger.add(
+            lines.append, format=format_json, filter=is_not_batch
+        )
+        try:
+            log()
+        finally:
+            logger.remove(handler_id)
+        (line,) = lines
+        assert line.endswith("\n")
+        record: dict[str, Any] = json.loads(line)
+        return record
+
+    def test_record_without_request(self) -> None:
+        """Test a record outside a request has no request context."""
+        record = self._log(lambda: logger.info("User {} logged in", 5))
+
+        assert record["level"] == "INFO"
+        assert record["message"] == "User 5 logged in"
+        assert record["function"] == "<lambda>"
+        assert "request" not in record
+
+    def test_record_carries_request_context(self) -> None:
+        """Test a record logged during a request carries its context."""
+        scope = _http_scope("/api/users/7")
+        scope["route"] = Mock(path="/users/{user_id}")
+        token = bind_request(scope)
+        try:
+            annotate_request(user_id=7)
+            record = self._log(lambda: logger.warning('"quoted" {braces}'))
+        finally:
+            reset_request(token)
+
+        assert record["message"] == '"quoted" {braces}'
+        request = record["request"]
+        assert request["route"] == "/users/{user_id}"
+        assert request["path"] == "/api/users/7"
+        assert request["user_id"] == 7  # noqa: PLR2004
+        assert request["household_id"] is None
+        assert request["elapsed_ms"] >= 0
+        assert "status" not in request
+
+    def test_record_includes_exception(self) -> None:
+        """Test an exception's traceback is part of the JSON record."""
+
+        def log() -> None:
+            try:
+                1 / 0  # noqa: B018
+            except ZeroDivisionError:
+                logger.exception("Failed")
+
+        record = self._log(log)
+
+        assert record["level"] == "ERROR"
+        assert "ZeroDivisionError" in record["exception"]
@@ -0,0 +1,169 @@
+"""Test delivering email over the pooled SMTP connections."""
+
+import asyncio
+import socket
+from collections.abc import AsyncIterator, Iterator
+from email.message import EmailMessage
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from aiosmtpd.controller import Controller
+from fastapi_mail import ConnectionConfig, MessageSchema, MessageType
+from pydantic import NameEmail, SecretStr
+
+from app.config.settings import get_settings
+from app.mail import delivery
+from app.mail.delivery import PooledMail, close_pool, deliver
+
+
+class RecordingHandler:
+    """An aiosmtpd handler keeping the messages it receives."""
+
+    def __init__(self) -> None:
+        """Start with no messages."""
+        self.messages: list[bytes] = []
+        self.sessions: set[int] = set()
+
+    async def handle_DATA(self, server, session, envelope) -> str:  # noqa: N802
+        """Record the message and the connection it arrived on."""
+        self.messages.append(envelope.content)
+        self.sessions.add(id(session))
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def _conf(port: int, *, suppress_send: bool = False) -> ConnectionConfig:
+    return ConnectionConfig(
+        MAIL_USERNAME="",
+        MAIL_PASSWORD=SecretStr(""),
+        MAIL_FROM="api@example.com",
+        MAIL_PORT=port,
+        MAIL_SERVER="127.0.0.1",
+        MAIL_STARTTLS=False,
+        MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=False,
+        SUPPRESS_SEND=1 if suppress_send else 0,
+    )
+
+
+def _message(number: int) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "api@example.com"
+    message["To"] = f"user{number}@example.com"
+    message["Subject"] = f"Message {number}"
+    message.set_content("Hello")
+    return message
+
+
+@pytest.fixture
+def server() -> Iterator[tuple[RecordingHandler, int]]:
+    """Run a stand-in SMTP server that closes idle sessions quickly."""
+    handler = RecordingHandler()
+    port = _free_port()
+    controller = Controller(
+        handler, hostname="127.0.0.1", port=port, timeout=0.3
+    )
+    controller.start()
+    yield handler, port
+    controller.stop()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def stop_pool() -> AsyncIterator[None]:
+    """Stop the delivery workers after each test."""
+    yield
+    await close_pool()
+
+
+@pytest.mark.unit
+class TestMailDelivery:
+    """Test the SMTP connection pool."""
+
+    async def test_burst_shares_connections(
+        self, server, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a burst of mail uses at most the pool's connections."""
+        handler, port = server
+        monkeypatch.setattr(get_settings(), "mail_pool_size", 2)
+        loop = asyncio.get_running_loop()
+        getaddrinfo = AsyncMock(wraps=loop.getaddrinfo)
+        monkeypatch.setattr(loop, "getaddrinfo", getaddrinfo)
+
+        await asyncio.gather(
+            *(deliver(_conf(port), _message(n)) for n in range(10))
+        )
+
+        assert len(handler.messages) == 10  # noqa: PLR2004
+        assert len(handler.sessions) <= 2  # noqa: PLR2004
+        getaddrinfo.assert_awaited_once()
+
+    async def test_idle_connections_are_closed(
+        self, server, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a connection is reopened after the idle timeout."""
+        handler, port = server
+        monkeypatch.setattr(get_settings(), "mail_pool_size", 1)
+        monkeypatch.setattr(get_settings(), "mail_idle_timeout", 0.05)
+
+        await deliver(_conf(port), _message(1))
+        await asyncio.sleep(0.1)
+        await deliver(_conf(port), _message(2))
+
+        assert len(handler.messages) == 2  # noqa: PLR2004
+        assert len(handler.sessions) == 2  # noqa: PLR2004
+
+    async def test_dropped_connection_is_replaced(
+        self, server, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test mail is sent after the server closed an idle connection."""
+        handler, port = server
+        monkeypatch.setattr(get_settings(), "mail_pool_size", 1)
+
+        await deliver(_conf(port), _message(1))
+        await asyncio.sleep(0.5)
+        await deliver(_conf(port), _message(2))
+
+        assert len(handler.messages) == 2  # noqa: PLR2004
+
+    async def test_failures_reach_the_sender(self) -> None:
+        """Test a sender sees the error when the server is unreachable."""
+        with pytest.raises(OSError):  # noqa: PT011
+            await deliver(_conf(_free_port()), _message(1))
+
+    async def test_pooled_mail_sends_through_pool(self, server) -> None:
+        """Test PooledMail builds the message and sends it over the pool."""
+        handler, port = server
+        message = MessageSchema(
+            subject="Welcome",
+            recipients=[NameEmail(name="User", email="user@example.com")],
+            body="Hello",
+            subtype=MessageType.plain,
+        )
+
+        await PooledMail(_conf(port)).send_message(message)
+
+        assert len(handler.messages) == 1
+        assert b"Subject: Welcome" in handler.messages[0]
+
+    async def test_suppressed_mail_is_recorded_not_sent(self) -> None:
+        """Test SUPPRESS_SEND skips the pool but still records messages."""
+        mail = PooledMail(_conf(_free_port(), suppress_send=True))
+        message = MessageSchema(
+            subject="Welcome",
+            recipients=[NameEmail(name="User", email="user@example.com")],
+            body="Hello",
+            subtype=MessageType.plain,
+        )
+
+        with mail.record_messages() as outbox:
+            await mail.send_message(message)
+
+        assert len(outbox) == 1
+        assert delivery._queue is None
@@ -0,0 +1,215 @@
+"""Unit tests for the cached household membership lookup."""
+
+# ruff: noqa: PLR2004
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from pytest_mock import MockerFixture
+from redis.exceptions import RedisError
+
+from app.cache import snapshot
+from app.database import membership
+from app.database.db import run_after_commit
+from app.managers.security import get_current_household
+
+
+def _mock_db(household_id: uuid.UUID | None) -> AsyncMock:
+    """Return a session whose membership query yields ``household_id``."""
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = household_id
+    db = AsyncMock()
+    db.execute.return_value = result
+    return db
+
+
+@pytest.mark.unit
+class TestMembershipCache:
+    """Test the membership cache with the in-process LRU."""
+
+    @pytest.fixture(autouse=True)
+    def _no_redis(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(snapshot, "redis_backend", return_value=None)
+
+    @pytest.mark.asyncio
+    async def test_lookup_is_cached(self) -> None:
+        """Test a second lookup is served without a query."""
+        household_id = uuid.uuid4()
+        db = _mock_db(household_id)
+
+        assert await membership.get_household_id(db, 1) == household_id
+        assert await membership.get_household_id(db, 1) == household_id
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_membership_is_cached(self) -> None:
+        """Test users without a household are cached as well."""
+        db = _mock_db(None)
+
+        assert await membership.get_household_id(db, 2) is None
+        assert await membership.get_household_id(db, 2) is None
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_lookup(self) -> None:
+        """Test invalidation makes the next lookup hit the database."""
+        db = _mock_db(None)
+        await membership.get_household_id(db, 3)
+
+        household_id = uuid.uuid4()
+        db.execute.return_value.scalar_one_or_none.return_value = household_id
+        await membership.invalidate_household_membership(3)
+
+        assert await membership.get_household_id(db, 3) == household_id
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_on_commit_waits_for_commit(self) -> None:
+        """Test the deferred invalidation only runs after the commit."""
+        db = _mock_db(None)
+        db.info = {}
+        await membership.get_household_id(db, 4)
+
+        membership.invalidate_household_membership_on_commit(db, 4)
+        await membership.get_household_id(db, 4)
+        assert db.execute.await_count == 1
+
+        await run_after_commit(db)
+        await membership.get_household_id(db, 4)
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_cache(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test HOUSEHOLD_CACHE_TTL=0 always queries the database."""
+        monkeypatch.setattr(membership.get_settings(), "household_cache_ttl", 0)
+        db = _mock_db(uuid.uuid4())
+
+        await membership.get_household_id(db, 4)
+        await membership.get_household_id(db, 4)
+        assert db.execute.await_count == 2
+
+    def test_lru_evicts_oldest_and_expires(self, mocker: MockerFixture) -> None:
+        """Test the LRU drops the least recently used and expired keys."""
+        cache: snapshot.LRUCache[int, str] = snapshot.LRUCache(maxsize=2)
+        cache.set(1, "a", ttl=30)
+        cache.set(2, "b", ttl=30)
+        assert cache.get(1) == "a"
+        cache.set(3, "c", ttl=30)
+
+        assert cache.get(2) is None
+        assert cache.get(1) == "a"
+
+        mocker.patch.object(
+            snapshot.time, "monotonic", return_value=float("inf")
+        )
+        assert cache.get(3) is None
+
+
+@pytest.mark.unit
+class TestMembershipRedisCache:
+    """Test the membership cache with a Redis backend."""
+
+    @pytest.fixture
+    def backend(self, mocker: MockerFixture) -> MagicMock:
+        """Install a mocked Redis backend as the cache backend."""
+        backend = MagicMock(spec=RedisBackend)
+        backend.get = AsyncMock(return_value=None)
+        backend.set = AsyncMock()
+        backend.redis = MagicMock()
+        backend.redis.delete = AsyncMock()
+        mocker.patch.object(FastAPICache, "_backend", backend)
+        mocker.patch.object(FastAPICache, "_prefix", "fastapi-cache")
+        return backend
+
+    @pytest.mark.asyncio
+    async def test_lookup_uses_redis(self, backend: MagicMock) -> None:
+        """Test cached values are read from and written to Redis."""
+        household_id = uuid.uuid4()
+        db = _mock_db(household_id)
+
+        assert await membership.get_household_id(db, 5) == household_id
+        backend.set.assert_awaited_once_with(
+            "fastapi-cache:household-member:5",
+            str(household_id).encode(),
+            expire=membership.get_settings().household_cache_ttl,
+        )
+
+        backend.get.return_value = str(household_id).encode()
+        assert await membership.get_household_id(db, 5) == household_id
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_deletes_keys(self, backend: MagicMock) -> None:
+        """Test invalidation deletes every user's key in one call."""
+        await membership.invalidate_household_membership(6, 7)
+
+        backend.redis.delete.assert_awaited_once_with(
+            "fastapi-cache:household-member:6",
+            "fastapi-cache:household-member:7",
+        )
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_database(
+        self, backend: MagicMock
+    ) -> None:
+        """Test Redis failures are logged and the database is used."""
+        backend.get.side_effect = RedisError("down")
+        backend.set.side_effect = RedisError("down")
+        backend.redis.delete.side_effect = RedisError("down")
+        household_id = uuid.uuid4()
+
+        db = _mock_db(household_id)
+        assert await membership.get_household_id(db, 8) == household_id
+        await membership.invalidate_household_membership(8)
+
+
+@pytest.mark.unit
+class TestGetCurrentHousehold:
+    """Test the get_current_household dependency."""
+
+    @pytest.mark.asyncio
+    async def test_uses_membership_from_jwt_lookup(self) -> None:
+        """Test the membership loaded with the user is reused."""
+        household_id = uuid.uuid4()
+        request = MagicMock()
+        request.state.household_id = household_id
+        db = _mock_db(None)
+
+        result = await get_current_household(request, MagicMock(id=1), db)
+
+        assert result == household_id
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_lookup(self, mocker: MockerFixture) -> None:
+        """Test the cached lookup runs when the JWT check did not."""
+        household_id = uuid.uuid4()
+        lookup = mocker.patch.object(
+            membership, "get_household_id", return_value=household_id
+        )
+        request = MagicMock()
+        request.state = MagicMock(spec=[])
+        db = _mock_db(None)
+
+        result = await get_current_household(request, MagicMock(id=1), db)
+
+        assert result == household_id
+        lookup.assert_awaited_once_with(db, 1)
+
+    @pytest.mark.asyncio
+    async def test_rejects_user_without_household(self) -> None:
+        """Test users outside any household get a 403."""
+        request = MagicMock()
+        request.state.household_id = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_household(
+                request, MagicMock(id=1), _mock_db(None)
+            )
+
+        assert exc_info.value.status_code == 403
@@ -0,0 +1,81 @@
+"""Test the keyset pagination helpers."""
+
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.database import pagination
+from app.models.task import Task
+
+KEY = "priority:asc"
+
+
+def _select(cursor: str | None, page: int = 1) -> str:
+    """Return the SQL of a page of tasks by priority."""
+    stmt = pagination.keyset_select(
+        select(Task),
+        [Task.priority, Task.id],
+        key=KEY,
+        parse_value=int,
+        cursor=cursor,
+        descending=False,
+        page=page,
+        page_size=10,
+    )
+    return str(stmt.compile(compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.unit
+class TestKeysetPagination:
+    """Test selecting and splitting keyset pages."""
+
+    def test_first_pages_use_offset(self) -> None:
+        """Test pages without a cursor are selected by offset."""
+        sql = _select(None, page=3)
+
+        assert "ORDER BY tasks.priority ASC, tasks.id ASC" in sql
+        assert "LIMIT 11 OFFSET 20" in sql
+
+    def test_cursor_resumes_after_its_row(self) -> None:
+        """Test a cursor page starts after the row it was issued for."""
+        row_id = uuid.uuid4()
+        sql = _select(pagination.encode_cursor(KEY, 2, row_id))
+
+        assert "(tasks.priority, tasks.id) > (2," in sql
+        assert "OFFSET" not in sql
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not a cursor",
+            pagination.encode_cursor("difficulty:asc", 2, uuid.uuid4()),
+            pagination.encode_cursor(KEY, 2, "not-a-uuid"),
+            pagination.encode_cursor(KEY, "high", uuid.uuid4()),
+        ],
+    )
+    def test_invalid_cursor(self, cursor: str) -> None:
+        """Test malformed or mismatched cursors are rejected."""
+        with pytest.raises(pagination.InvalidCursorError):
+            _select(cursor)
+
+    def test_split_page(self) -> None:
+        """Test the extra row is dropped and becomes the next cursor."""
+        rows = [(priority, uuid.uuid4()) for priority in range(3)]
+
+        page, cursor = pagination.split_page(
+            rows, 2, key=KEY, sort_value=lambda r: r[0], row_id=lambda r: r[1]
+        )
+        last, next_cursor = pagination.split_page(
+            rows[2:],
+            2,
+            key=KEY,
+            sort_value=lambda r: r[0],
+            row_id=lambda r: r[1],
+        )
+
+        assert page == rows[:2]
+        assert cursor is not None
+        assert pagination.decode_cursor(cursor, KEY) == (1, str(rows[1][1]))
+        assert last == rows[2:]
+        assert next_cursor is None
@@ -0,0 +1,234 @@
+"""Unit tests for the cached principal used by the JWT check."""
+
+# ruff: noqa: PLR2004
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from pytest_mock import MockerFixture
+
+from app.cache import snapshot
+from app.database import principal
+from app.database.db import run_after_commit
+from app.database.principal import Principal
+from app.managers.auth import AuthManager, get_jwt_principal
+from app.managers.user import UserManager
+from app.models.enums import RoleType
+
+
+def _mock_db(role: RoleType = RoleType.user) -> AsyncMock:
+    """Return a session whose user query yields an active user."""
+    result = MagicMock()
+    result.one_or_none.return_value = MagicMock(
+        role=role, banned=False, verified=True
+    )
+    db = AsyncMock()
+    db.execute.return_value = result
+    return db
+
+
+@pytest.mark.unit
+class TestPrincipalCache:
+    """Test the principal cache with the in-process LRU."""
+
+    @pytest.fixture(autouse=True)
+    def _no_redis(self, mocker: MockerFixture) -> None:
+        mocker.patch.object(snapshot, "redis_backend", return_value=None)
+
+    def test_encode_round_trip(self) -> None:
+        """Test a principal survives its compact cache representation."""
+        admin = Principal(
+            id=3, role=RoleType.admin, banned=True, verified=False
+        )
+
+        assert admin.encode() == "admin:1:0"
+        assert Principal.decode(3, admin.encode()) == admin
+
+    @pytest.mark.asyncio
+    async def test_lookup_is_cached(self) -> None:
+        """Test a second lookup is served without a query."""
+        db = _mock_db()
+
+        first = await principal.get_principal(db, 1)
+        second = await principal.get_principal(db, 1)
+
+        assert first == second
+        assert first == Principal(
+            id=1, role=RoleType.user, banned=False, verified=True
+        )
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_user_is_not_cached(self) -> None:
+        """Test unknown users are looked up again on every request."""
+        db = _mock_db()
+        db.execute.return_value.one_or_none.return_value = None
+
+        assert await principal.get_principal(db, 2) is None
+        assert await principal.get_principal(db, 2) is None
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_lookup(self) -> None:
+        """Test invalidation makes the next lookup hit the database."""
+        db = _mock_db()
+        await principal.get_principal(db, 4)
+
+        db.execute.return_value = _mock_db(RoleType.admin).execute.return_value
+        await principal.invalidate_principal(4)
+
+        result = await principal.get_principal(db, 4)
+        assert result is not None
+        assert result.role == RoleType.admin
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_cache(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test PRINCIPAL_CACHE_TTL=0 always queries the database."""
+        monkeypatch.setattr(principal.get_settings(), "principal_cache_ttl", 0)
+        db = _mock_db()
+
+        await principal.get_principal(db, 5)
+        await principal.get_principal(db, 5)
+        assert db.execute.await_count == 2
+
+
+@pytest.mark.unit
+class TestPrincipalRedisCache:
+    """Test the principal cache with a Redis backend."""
+
+    @pytest.fixture
+    def backend(self, mocker: MockerFixture) -> MagicMock:
+        """Install a mocked Redis backend as the cache backend."""
+        backend = MagicMock(spec=RedisBackend)
+        backend.get = AsyncMock(return_value=None)
+        backend.set = AsyncMock()
+        backend.redis = MagicMock()
+        backend.redis.delete = AsyncMock()
+        mocker.patch.object(FastAPICache, "_backend", backend)
+        mocker.patch.object(FastAPICache, "_prefix", "fastapi-cache")
+        return backend
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_is_kept_locally(self, backend: MagicMock) -> None:
+        """Test a principal read from Redis is then served by the LRU."""
+        backend.get.return_value = b"admin:0:1"
+        db = _mock_db()
+
+        for _ in range(2):
+            result = await principal.get_principal(db, 6)
+            assert result is not None
+            assert result.role == RoleType.admin
+
+        backend.get.assert_awaited_once_with("fastapi-cache:principal:6")
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_miss_writes_redis(self, backend: MagicMock) -> None:
+        """Test a loaded principal is written to Redis with the full TTL."""
+        await principal.get_principal(_mock_db(), 7)
+
+        backend.set.assert_awaited_once_with(
+            "fastapi-cache:principal:7",
+            b"user:0:1",
+            expire=principal.get_settings().principal_cache_ttl,
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalidate_clears_both_tiers(
+        self, backend: MagicMock
+    ) -> None:
+        """Test invalidation drops the local entry and the Redis key."""
+        backend.get.return_value = b"user:0:1"
+        db = _mock_db()
+        await principal.get_principal(db, 8)
+
+        await principal.invalidate_principal(8)
+        backend.get.return_value = None
+        await principal.get_principal(db, 8)
+
+        backend.redis.delete.assert_awaited_once_with(
+            "fastapi-cache:principal:8"
+        )
+        assert db.execute.await_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestJWTPrincipal:
+    """Test get_jwt_principal against the database."""
+
+    test_user = {
+        "email": "principal@usertest.com",
+        "password": "test12345!",
+        "first_name": "Test",
+        "last_name": "User",
+    }
+
+    async def _authenticate(self, token: str, db) -> Principal:
+        credentials = HTTPAuthorizationCredentials(
+            scheme="Bearer", credentials=token
+        )
+        result = await get_jwt_principal(MagicMock(), db, credentials)
+        assert result is not None
+        return result
+
+    async def test_role_change_is_seen(self, test_db) -> None:
+        """Test change_role invalidates the cached principal."""
+        token, _ = await UserManager.register(self.test_user, test_db)
+        assert (await self._authenticate(token, test_db)).role == RoleType.user
+
+        await UserManager.change_role(RoleType.admin, 1, test_db)
+        # The cached principal is kept until the transaction commits.
+        assert (await self._authenticate(token, test_db)).role == RoleType.user
+        await run_after_commit(test_db)
+
+        result = await self._authenticate(token, test_db)
+        assert result.role == RoleType.admin
+
+    async def test_ban_is_seen(self, test_db) -> None:
+        """Test set_ban_status invalidates the cached principal."""
+        token, _ = await UserManager.register(self.test_user, test_db)
+        await self._authenticate(token, test_db)
+
+        await UserManager.set_ban_status(1, 666, test_db, banned=True)
+        await run_after_commit(test_db)
+
+        with pytest.raises(HTTPException) as exc:
+            await self._authenticate(token, test_db)
+        assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_deleted_user_is_rejected(self, test_db) -> None:
+        """Test delete_user invalidates the cached principal."""
+        token, _ = await UserManager.register(self.test_user, test_db)
+        await self._authenticate(token, test_db)
+
+        await UserManager.delete_user(1, test_db)
+        await test_db.flush()
+        await run_after_commit(test_db)
+
+        with pytest.raises(HTTPException) as exc:
+            await self._authenticate(token, test_db)
+        assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_verify_is_seen(self, test_db) -> None:
+        """Test AuthManager.verify invalidates the cached principal."""
+        token, _ = await UserManager.register(self.test_user, test_db)
+        user = await UserManager.get_user_by_id(1, test_db)
+        user.verified = False
+        await test_db.flush()
+        with pytest.raises(HTTPException):
+            await self._authenticate(token, test_db)
+
+        with pytest.raises(HTTPException) as exc:
+            await AuthManager.verify(
+                AuthManager.encode_verify_token(user), test_db
+            )
+        assert exc.value.status_code == status.HTTP_200_OK
+
+        assert (await self._authenticate(token, test_db)).verified
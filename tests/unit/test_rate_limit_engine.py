@@ -0,0 +1,285 @@
+"""Unit tests for rate limit policies, client addresses and GCRA counters."""
+
+from typing import Annotated
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import Depends, FastAPI, Request, Response
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers
+
+from app.config.settings import get_settings
+from app.metrics.namespace import METRIC_NAMESPACE
+from app.middleware.rate_limit_headers import RateLimitHeadersMiddleware
+from app.rate_limit import gcra
+from app.rate_limit.client import client_ip, parse_networks
+from app.rate_limit.config import (
+    RateLimitScope,
+    RatePolicies,
+    RatePolicy,
+    parse_limit,
+)
+from app.rate_limit.dependencies import rate_limit
+
+POLICY = RatePolicy("test", "3/minute", RateLimitScope.IP)
+
+
+def _request(peer: str, forwarded: str | None = None) -> MagicMock:
+    request = MagicMock(spec=Request)
+    request.client.host = peer
+    request.headers = Headers(
+        {"X-Forwarded-For": forwarded} if forwarded is not None else {}
+    )
+    return request
+
+
+@pytest.mark.unit
+class TestRatePolicy:
+    """Test parsing of rate limit policies."""
+
+    @pytest.mark.parametrize(
+        ("limit", "expected"),
+        [
+            ("5/minute", (5, 60)),
+            ("5/15minutes", (5, 900)),
+            ("3/hour", (3, 3600)),
+            ("100/2 days", (100, 172800)),
+        ],
+    )
+    def test_parse_limit(self, limit: str, expected: tuple[int, int]) -> None:
+        """Test limits are parsed to a count and period in seconds."""
+        assert parse_limit(limit) == expected
+
+    @pytest.mark.parametrize("limit", ["5", "5/fortnight", "five/minute"])
+    def test_invalid_limit_is_rejected(self, limit: str) -> None:
+        """Test a malformed policy fails when it is declared."""
+        with pytest.raises(ValueError, match="Invalid rate limit"):
+            RatePolicy("bad", limit, RateLimitScope.IP)
+
+    def test_declared_policies_are_parsed(self) -> None:
+        """Test the declared policies carry their parsed limits."""
+        assert RatePolicies.HOUSEHOLD_WRITE.count == 60  # noqa: PLR2004
+        assert RatePolicies.HOUSEHOLD_WRITE.period == 60  # noqa: PLR2004
+
+
+@pytest.mark.unit
+class TestClientIp:
+    """Test finding the client address behind trusted proxies."""
+
+    @pytest.fixture(autouse=True)
+    def proxies(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Trust a load balancer range and one proxy address."""
+        monkeypatch.setattr(
+            get_settings(), "trusted_proxies", "10.0.0.0/8, 192.0.2.1"
+        )
+
+    def test_direct_client_uses_peer(self) -> None:
+        """Test the header is ignored from untrusted peers."""
+        request = _request("203.0.113.9", "198.51.100.7")
+
+        assert client_ip(request) == "203.0.113.9"
+
+    def test_trusted_proxy_uses_forwarded_client(self) -> None:
+        """Test the rightmost untrusted address is the client."""
+        request = _request("10.0.0.5", "1.2.3.4, 198.51.100.7, 192.0.2.1")
+
+        assert client_ip(request) == "198.51.100.7"
+
+    def test_all_trusted_uses_leftmost(self) -> None:
+        """Test a chain of trusted proxies yields its first address."""
+        request = _request("10.0.0.5", "10.1.1.1, 192.0.2.1")
+
+        assert client_ip(request) == "10.1.1.1"
+
+    def test_garbage_stops_the_walk(self) -> None:
+        """Test an invalid entry is not taken as the client address."""
+        request = _request("10.0.0.5", "198.51.100.7, not-an-ip")
+
+        assert client_ip(request) == "10.0.0.5"
+
+    def test_no_trusted_proxies_uses_peer(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the header is ignored unless proxies are configured."""
+        monkeypatch.setattr(get_settings(), "trusted_proxies", "")
+        request = _request("10.0.0.5", "198.51.100.7")
+
+        assert client_ip(request) == "10.0.0.5"
+
+    def test_invalid_networks_are_skipped(self) -> None:
+        """Test a typo in the setting does not drop the other entries."""
+        assert [str(n) for n in parse_networks("10.0.0.0/8,bogus,")] == [
+            "10.0.0.0/8"
+        ]
+
+
+@pytest.mark.unit
+class TestGcra:
+    """Test counting requests against a policy."""
+
+    @pytest.mark.asyncio
+    async def test_local_burst_then_deny(self) -> None:
+        """Test a client may burst the whole budget, then must wait."""
+        results = [await gcra.check(POLICY, "ip:1") for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert 19 < results[3].retry_after <= 20  # noqa: PLR2004
+        assert results[3].limit == 3  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_subjects_are_counted_separately(self) -> None:
+        """Test one client's budget does not limit another's."""
+        for _ in range(3):
+            await gcra.check(POLICY, "ip:1")
+
+        assert (await gcra.check(POLICY, "ip:2")).allowed
+
+    @pytest.mark.asyncio
+    async def test_redis_script_result(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the Redis script is called once with the policy's rate."""
+        script = AsyncMock(return_value=[0, 0, 1500, 60000])
+        monkeypatch.setattr(gcra, "_redis_script", lambda: script)
+
+        result = await gcra.check(POLICY, "user:1")
+
+        script.assert_awaited_once_with(
+            keys=["rate-limit:test:user:1"], args=[20000, 60000]
+        )
+        assert not result.allowed
+        assert result.retry_after == 1.5  # noqa: PLR2004
+        assert result.reset == 60  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_local_bucket_refuses_before_redis(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a client over budget on this worker skips the Redis call."""
+        script = AsyncMock(return_value=[1, 0, 0, 60000])
+        monkeypatch.setattr(gcra, "_redis_script", lambda: script)
+        monkeypatch.setattr(get_settings(), "metrics_enabled", True)
+
+        def decisions(source: str, result: str) -> float:
+            return (
+                REGISTRY.get_sample_value(
+                    f"{METRIC_NAMESPACE}_rate_limit_decisions_total",
+                    {"source": source, "result": result},
+                )
+                or 0
+            )
+
+        before = decisions("local", "limited"), decisions("redis", "allowed")
+        results = [await gcra.check(POLICY, "user:1") for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert script.await_count == 3  # noqa: PLR2004
+        assert decisions("local", "limited") - before[0] == 1
+        assert decisions("redis", "allowed") - before[1] == 3  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_count_locally(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test an unreachable Redis falls back to local counters."""
+        script = AsyncMock(side_effect=RedisError("connection refused"))
+        monkeypatch.setattr(gcra, "_redis_script", lambda: script)
+
+        results = [await gcra.check(POLICY, "user:1") for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+
+
+@pytest.mark.unit
+class TestRateLimitDependency:
+    """Test the dependency enforcing a policy on a route."""
+
+    @pytest.mark.asyncio
+    async def test_exceeding_policy_returns_429(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test requests over the limit are refused with Retry-After."""
+        monkeypatch.setattr(get_settings(), "rate_limit_enabled", True)
+        app = FastAPI()
+        app.add_middleware(RateLimitHeadersMiddleware)
+
+        @app.get("/limited", dependencies=[Depends(rate_limit(POLICY))])
+        async def limited() -> dict[str, bool]:
+            return {"ok": True}
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            allowed = [await client.get("/limited") for _ in range(3)]
+            refused = await client.get("/limited")
+
+        assert [r.status_code for r in allowed] == [200, 200, 200]
+        assert refused.status_code == 429  # noqa: PLR2004
+        assert refused.headers["retry-after"] == "20"
+        assert refused.headers["ratelimit-remaining"] == "0"
+
+    @pytest.mark.asyncio
+    async def test_responses_report_budget(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test every response carries the RateLimit headers."""
+        monkeypatch.setattr(get_settings(), "rate_limit_enabled", True)
+        app = FastAPI()
+        app.add_middleware(RateLimitHeadersMiddleware)
+
+        @app.delete(
+            "/limited",
+            status_code=204,
+            dependencies=[Depends(rate_limit(POLICY))],
+        )
+        async def limited() -> Response:
+            return Response(status_code=204)
+
+        @app.get("/unlimited")
+        async def unlimited() -> dict[str, bool]:
+            return {"ok": True}
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            first = await client.delete("/limited")
+            second = await client.delete("/limited")
+            other = await client.get("/unlimited")
+
+        assert first.headers["ratelimit-limit"] == "3"
+        assert first.headers["ratelimit-remaining"] == "2"
+        assert first.headers["ratelimit-reset"] == "20"
+        assert second.headers["ratelimit-remaining"] == "1"
+        assert second.headers["ratelimit-reset"] == "40"
+        assert "ratelimit-limit" not in other.headers
+
+    @pytest.mark.asyncio
+    async def test_disabled_rate_limiting_allows_all(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test nothing is counted while rate limiting is disabled."""
+        monkeypatch.setattr(get_settings(), "rate_limit_enabled", False)
+        check = AsyncMock()
+        monkeypatch.setattr(gcra, "check", check)
+        app = FastAPI()
+
+        @app.get("/limited")
+        async def limited(
+            _: Annotated[None, Depends(rate_limit(POLICY))],
+        ) -> dict[str, bool]:
+            return {"ok": True}
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            for _ in range(5):
+                assert (await client.get("/limited")).status_code == 200  # noqa: PLR2004
+
+        check.assert_not_awaited()
+
+    def test_dependency_is_shared_per_policy(self) -> None:
+        """Test routes with the same policy share one dependency."""
+        assert rate_limit(POLICY) is rate_limit(POLICY)
@@ -0,0 +1,287 @@
+"""Test read replica routing and the read-your-writes middleware."""
+
+import time
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import APIRouter, Request
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import replica as replica_module
+from app.database.db import get_database_url
+from app.database.replica import (
+    READ_PRIMARY_COOKIE,
+    READ_PRIMARY_HEADER,
+    Replica,
+    ReplicaSet,
+    get_read_database,
+    reads_from_primary,
+)
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.resources import floor, room, task
+
+
+def _replica(name: str, sessionmaker=None) -> Replica:
+    engine = sessionmaker.kw["bind"] if sessionmaker else AsyncMock()
+    return Replica(
+        name=name, engine=engine, sessionmaker=sessionmaker or AsyncMock()
+    )
+
+
+def _request(headers: dict[str, str] | None = None) -> Request:
+    raw = [
+        (name.lower().encode(), value.encode())
+        for name, value in (headers or {}).items()
+    ]
+    return Request({"type": "http", "headers": raw})
+
+
+def _dependency_calls(dependant: Dependant) -> set[Any]:
+    calls = set()
+    for dependency in dependant.dependencies:
+        calls.add(dependency.call)
+        calls |= _dependency_calls(dependency)
+    return calls
+
+
+async def _read_session(request: Request, primary) -> tuple[Any, Any]:
+    generator = get_read_database(request, primary)
+    session = await generator.__anext__()
+    return session, generator
+
+
+@pytest.mark.unit
+class TestReplicaSet:
+    """Test choosing a replica."""
+
+    def test_empty_set_is_falsy(self) -> None:
+        """Test a set without replicas is falsy and chooses nothing."""
+        replicas = ReplicaSet([])
+
+        assert not replicas
+        assert replicas.choose() is None
+
+    def test_round_robin(self) -> None:
+        """Test replicas are chosen in turn."""
+        first, second = _replica("first"), _replica("second")
+        replicas = ReplicaSet([first, second])
+
+        chosen = [replicas.choose() for _ in range(4)]
+
+        assert chosen == [first, second, first, second]
+
+    def test_skips_replica_marked_down(self) -> None:
+        """Test a failed replica is skipped until its retry time."""
+        first, second = _replica("first"), _replica("second")
+        replicas = ReplicaSet([first, second])
+
+        replicas.mark_down(first, OSError("refused"))
+
+        assert [replicas.choose() for _ in range(3)] == [second] * 3
+
+        first.down_until = time.monotonic() - 1
+        assert first in [replicas.choose() for _ in range(2)]
+
+    def test_all_down_chooses_nothing(self) -> None:
+        """Test None is returned when every replica is down."""
+        only = _replica("only")
+        replicas = ReplicaSet([only])
+
+        replicas.mark_down(only, OSError("refused"))
+
+        assert replicas.choose() is None
+
+    def test_from_settings_uses_primary_credentials(self, monkeypatch) -> None:
+        """Test replica URLs differ from the primary only in host and port."""
+        settings = replica_module.get_settings()
+        monkeypatch.setattr(
+            settings, "db_replica_hosts", "replica-a, replica-b:6543,"
+        )
+
+        replicas = ReplicaSet.from_settings()
+
+        primary = make_url(get_database_url())
+        urls = [replica.engine.url for replica in replicas.replicas]
+        assert [replica.name for replica in replicas.replicas] == [
+            "replica-a",
+            "replica-b:6543",
+        ]
+        assert [(url.host, url.port) for url in urls] == [
+            ("replica-a", primary.port),
+            ("replica-b", 6543),
+        ]
+        assert all(url.database == primary.database for url in urls)
+        assert all(url.username == primary.username for url in urls)
+
+
+@pytest.mark.unit
+class TestReadsFromPrimary:
+    """Test the read-your-writes window."""
+
+    def test_no_window(self) -> None:
+        """Test requests without a window may use a replica."""
+        assert not reads_from_primary(_request())
+
+    def test_cookie_window(self) -> None:
+        """Test an unexpired cookie keeps reads on the primary."""
+        until = time.time() + 5
+        request = _request({"Cookie": f"{READ_PRIMARY_COOKIE}={until}"})
+
+        assert reads_from_primary(request)
+
+    def test_header_window(self) -> None:
+        """Test an unexpired header keeps reads on the primary."""
+        request = _request({READ_PRIMARY_HEADER: str(time.time() + 5)})
+
+        assert reads_from_primary(request)
+
+    @pytest.mark.parametrize("value", [str(time.time() - 5), "soon"])
+    def test_expired_or_invalid_window(self, value: str) -> None:
+        """Test expired or malformed windows are ignored."""
+        assert not reads_from_primary(_request({READ_PRIMARY_HEADER: value}))
+
+
+@pytest.mark.unit
+class TestGetReadDatabase:
+    """Test the get_read_database dependency."""
+
+    @pytest.mark.asyncio
+    async def test_primary_without_replicas(self, monkeypatch) -> None:
+        """Test the primary session is used when no replica is configured."""
+        monkeypatch.setattr(replica_module, "replicas", ReplicaSet([]))
+        primary = AsyncMock()
+
+        session, _ = await _read_session(_request(), primary)
+
+        assert session is primary
+
+    @pytest.mark.asyncio
+    async def test_replica_session(
+        self, monkeypatch, async_test_sessionmaker
+    ) -> None:
+        """Test a healthy replica gets its own connected session."""
+        monkeypatch.setattr(
+            replica_module,
+            "replicas",
+            ReplicaSet([_replica("test", async_test_sessionmaker)]),
+        )
+        primary = AsyncMock()
+
+        session, generator = await _read_session(_request(), primary)
+
+        assert session is not primary
+        assert session.in_transaction()
+        await generator.aclose()
+
+    @pytest.mark.asyncio
+    async def test_primary_inside_window(
+        self, monkeypatch, async_test_sessionmaker
+    ) -> None:
+        """Test the primary is used right after the client wrote."""
+        monkeypatch.setattr(
+            replica_module,
+            "replicas",
+            ReplicaSet([_replica("test", async_test_sessionmaker)]),
+        )
+        primary = AsyncMock()
+        request = _request({READ_PRIMARY_HEADER: str(time.time() + 5)})
+
+        session, _ = await _read_session(request, primary)
+
+        assert session is primary
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_falls_back(self, monkeypatch) -> None:
+        """Test a replica that cannot connect is marked down."""
+        url = make_url(get_database_url()).set(host="127.0.0.1", port=1)
+        engine = create_async_engine(url)
+        unreachable = _replica("unreachable", async_sessionmaker(engine))
+        monkeypatch.setattr(
+            replica_module, "replicas", ReplicaSet([unreachable])
+        )
+        primary = AsyncMock()
+
+        session, _ = await _read_session(_request(), primary)
+
+        assert session is primary
+        assert unreachable.down_until > time.monotonic()
+        await engine.dispose()
+
+    @pytest.mark.parametrize(
+        ("router", "path"),
+        [
+            (task.router, "/tasks"),
+            (task.router, "/tasks/stats"),
+            (task.router, "/tasks/suggestions"),
+            (room.router, "/rooms"),
+            (floor.router, "/floors"),
+        ],
+    )
+    def test_cached_routes_read_from_primary(
+        self, router: APIRouter, path: str
+    ) -> None:
+        """Test cached routes never fill the cache from a replica."""
+        route = next(
+            route
+            for route in router.routes
+            if isinstance(route, APIRoute)
+            and route.path == path
+            and "GET" in route.methods
+        )
+
+        assert get_read_database not in _dependency_calls(route.dependant)
+
+
+@pytest.mark.unit
+class TestReadYourWritesMiddleware:
+    """Test the read-your-writes middleware."""
+
+    @staticmethod
+    async def _call(method: str, status_code: int) -> dict[bytes, bytes]:
+        async def app(scope, receive, send) -> None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": status_code,
+                    "headers": [(b"content-type", b"application/json")],
+                }
+            )
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        messages = []
+
+        async def send(message) -> None:
+            messages.append(message)
+
+        scope = {"type": "http", "method": method, "headers": []}
+        await ReadYourWritesMiddleware(app)(scope, AsyncMock(), send)
+        return dict(messages[0]["headers"])
+
+    @pytest.mark.asyncio
+    async def test_successful_mutation_opens_window(self) -> None:
+        """Test a successful change sets the cookie and header."""
+        headers = await self._call("POST", 201)
+
+        until = float(headers[READ_PRIMARY_HEADER.lower().encode()])
+        assert time.time() < until <= time.time() + 5.001
+        cookie = headers[b"set-cookie"].decode()
+        assert cookie.startswith(f"{READ_PRIMARY_COOKIE}={until:.3f};")
+        assert "HttpOnly" in cookie
+        assert headers[b"content-type"] == b"application/json"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("method", "status_code"), [("GET", 200), ("PUT", 404)]
+    )
+    async def test_reads_and_failures_leave_no_window(
+        self, method: str, status_code: int
+    ) -> None:
+        """Test reads and failed changes do not pin the client."""
+        headers = await self._call(method, status_code)
+
+        assert b"set-cookie" not in headers
+        assert READ_PRIMARY_HEADER.lower().encode() not in headers
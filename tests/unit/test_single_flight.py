@@ -0,0 +1,290 @@
+"""Unit tests for cache stampede protection (single-flight and SWR)."""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from redis.exceptions import RedisError
+
+from app.cache import route, single_flight
+from app.cache.decorators import cached
+from app.cache.route import CacheEntry
+
+
+@pytest.fixture
+def cached_app(monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+    """Enable caching, with a one-minute soft and hard TTL."""
+    mock_settings = MagicMock()
+    mock_settings.cache_enabled = True
+    mock_settings.cache_stale_ttl = 60
+    monkeypatch.setattr(
+        "app.cache.decorators.get_settings", lambda: mock_settings
+    )
+    return FastAPI()
+
+
+@pytest.fixture
+async def client(cached_app: FastAPI) -> AsyncIterator[AsyncClient]:
+    """Return a client for the app with caching enabled."""
+    async with AsyncClient(
+        transport=ASGITransport(app=cached_app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Callable[[float], None]:
+    """Return a function moving the cache's clock forward."""
+    offset = 0.0
+    real_time = time.time
+
+    def advance(seconds: float) -> None:
+        nonlocal offset
+        offset += seconds
+
+    monkeypatch.setattr(route.time, "time", lambda: real_time() + offset)
+    return advance
+
+
+def _redis(*, acquired: bool | None = True) -> MagicMock:
+    backend = MagicMock()
+    backend.redis.set = AsyncMock(return_value=acquired)
+    backend.redis.eval = AsyncMock(return_value=1)
+    backend.redis.exists = AsyncMock(return_value=0)
+    return backend
+
+
+@pytest.mark.unit
+class TestCacheEntry:
+    """Test the stored form of cache entries."""
+
+    def test_round_trip(self) -> None:
+        """Test an entry keeps its payload and soft expiry."""
+        entry = CacheEntry(b"payload", 1234.5)
+
+        assert CacheEntry.unpack(entry.pack(), 60) == entry
+
+    def test_entries_without_header_are_fresh(self) -> None:
+        """Test entries stored before the header are fresh until expiry."""
+        entry = CacheEntry.unpack(b"jpayload", 60)
+
+        assert entry.payload == b"jpayload"
+        assert entry.fresh
+        assert 59 <= entry.max_age <= 60  # noqa: PLR2004
+
+    def test_etag_depends_on_payload_only(self) -> None:
+        """Test workers agree on the ETag of an entry."""
+        assert CacheEntry(b"a", 1).etag == CacheEntry(b"a", 2).etag
+        assert CacheEntry(b"a", 1).etag != CacheEntry(b"b", 1).etag
+
+
+@pytest.mark.unit
+class TestStampedeProtection:
+    """Test concurrent requests for a missing or stale entry."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(
+        self, cached_app: FastAPI, client: AsyncClient
+    ) -> None:
+        """Test requests missing together wait for a single computation."""
+        calls = []
+
+        @cached_app.get("/data")
+        @cached(expire=60, namespace="test")
+        async def get_data() -> dict[str, int]:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"value": 1}
+
+        responses = await asyncio.gather(
+            *(client.get("/data") for _ in range(5))
+        )
+
+        assert len(calls) == 1
+        assert all(r.json() == {"value": 1} for r in responses)
+        assert sorted(r.headers["x-fastapi-cache"] for r in responses) == [
+            "HIT",
+            "HIT",
+            "HIT",
+            "HIT",
+            "MISS",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_during_refresh(
+        self,
+        cached_app: FastAPI,
+        client: AsyncClient,
+        clock: Callable[[float], None],
+    ) -> None:
+        """Test one request refreshes a stale entry while others use it."""
+        calls = []
+        refreshing = asyncio.Event()
+        release = asyncio.Event()
+
+        @cached_app.get("/data")
+        @cached(expire=60, namespace="test")
+        async def get_data() -> dict[str, int]:
+            calls.append(1)
+            if len(calls) > 1:
+                refreshing.set()
+                await release.wait()
+            return {"value": len(calls)}
+
+        await client.get("/data")
+        clock(61)
+
+        refresh = asyncio.create_task(client.get("/data"))
+        await asyncio.wait_for(refreshing.wait(), timeout=1)
+        stale = await client.get("/data")
+        release.set()
+        refreshed = await refresh
+        hit = await client.get("/data")
+
+        assert len(calls) == 2  # noqa: PLR2004
+        assert stale.headers["x-fastapi-cache"] == "STALE"
+        assert stale.headers["cache-control"] == "max-age=0"
+        assert stale.json() == {"value": 1}
+        assert refreshed.headers["x-fastapi-cache"] == "MISS"
+        assert refreshed.json() == hit.json() == {"value": 2}
+        assert hit.headers["x-fastapi-cache"] == "HIT"
+
+    @pytest.mark.asyncio
+    async def test_failed_leader_lets_waiters_compute(
+        self, cached_app: FastAPI, client: AsyncClient
+    ) -> None:
+        """Test a leader's error does not leave its waiters without data."""
+        calls = []
+
+        @cached_app.get("/data")
+        @cached(expire=60, namespace="test")
+        async def get_data() -> dict[str, int]:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            if len(calls) == 1:
+                msg = "database unavailable"
+                raise RuntimeError(msg)
+            return {"value": 1}
+
+        with pytest.raises(RuntimeError):
+            await asyncio.gather(client.get("/data"), client.get("/data"))
+
+        assert not single_flight._inflight
+        assert (await client.get("/data")).json() == {"value": 1}
+
+    @pytest.mark.asyncio
+    async def test_no_cache_request_refreshes_entry(
+        self, cached_app: FastAPI, client: AsyncClient
+    ) -> None:
+        """Test Cache-Control: no-cache skips the stored entry."""
+        calls = []
+
+        @cached_app.get("/data")
+        @cached(expire=60, namespace="test")
+        async def get_data() -> dict[str, int]:
+            calls.append(1)
+            return {"value": len(calls)}
+
+        await client.get("/data")
+        fresh = await client.get("/data", headers={"Cache-Control": "no-cache"})
+        hit = await client.get("/data")
+
+        assert fresh.headers["x-fastapi-cache"] == "MISS"
+        assert fresh.json() == hit.json() == {"value": 2}
+
+    @pytest.mark.asyncio
+    async def test_matching_etag_is_not_modified(
+        self, cached_app: FastAPI, client: AsyncClient
+    ) -> None:
+        """Test clients holding the cached response get a 304."""
+
+        @cached_app.get("/data")
+        @cached(expire=60, namespace="test")
+        async def get_data() -> dict[str, int]:
+            return {"value": 1}
+
+        etag = (await client.get("/data")).headers["etag"]
+        response = await client.get("/data", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304  # noqa: PLR2004
+        assert response.content == b""
+
+    @pytest.mark.asyncio
+    async def test_waiters_stop_after_one_lease(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a leader that never finishes holds waiters one lease only."""
+        monkeypatch.setattr(single_flight, "redis_backend", lambda: None)
+        monkeypatch.setattr(single_flight.get_settings(), "cache_lease_ttl", 0)
+
+        token = await single_flight.try_lead("k")
+        await single_flight.wait_for_leader("k")
+        assert token is not None
+        await single_flight.finish("k", token)
+
+
+@pytest.mark.unit
+class TestRedisLeases:
+    """Test leases shared by workers through Redis."""
+
+    @pytest.mark.asyncio
+    async def test_leader_takes_and_releases_lease(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the leader holds a lease until it finishes."""
+        backend = _redis()
+        monkeypatch.setattr(single_flight, "redis_backend", lambda: backend)
+
+        token = await single_flight.try_lead("k")
+
+        assert token is not None
+        assert token != single_flight.LOCAL_TOKEN
+        backend.redis.set.assert_awaited_once()
+        assert backend.redis.set.call_args.args == ("k:lease", token)
+        assert backend.redis.set.call_args.kwargs["nx"] is True
+        assert await single_flight.try_lead("k") is None
+
+        await single_flight.finish("k", token)
+
+        backend.redis.eval.assert_awaited_once_with(
+            single_flight._RELEASE_SCRIPT,
+            1,
+            "k:lease",
+            token,
+        )
+        assert not single_flight._inflight
+
+    @pytest.mark.asyncio
+    async def test_lease_held_elsewhere_waits(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test another worker's lease is waited on until released."""
+        monkeypatch.setattr(single_flight, "POLL_INTERVAL", 0)
+        backend = _redis(acquired=None)
+        backend.redis.exists.side_effect = [1, 1, 0]
+        monkeypatch.setattr(single_flight, "redis_backend", lambda: backend)
+
+        assert await single_flight.try_lead("k") is None
+        await single_flight.wait_for_leader("k")
+
+        assert backend.redis.exists.await_count == 3  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fail_open(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a Redis outage makes requests compute, not wait."""
+        backend = _redis()
+        backend.redis.set.side_effect = RedisError("connection refused")
+        monkeypatch.setattr(single_flight, "redis_backend", lambda: backend)
+
+        token = await single_flight.try_lead("k")
+        assert token is not None
+        await single_flight.finish("k", token)
+
+        assert token == single_flight.LOCAL_TOKEN
+        backend.redis.eval.assert_not_awaited()
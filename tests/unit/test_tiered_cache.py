@@ -0,0 +1,272 @@
+"""Unit tests for the two-tier (in-process + Redis) cache backend."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, cast
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi_cache import FastAPICache
+from prometheus_client import REGISTRY
+from pytest_mock import MockerFixture
+from redis.exceptions import RedisError
+
+from app.cache import generation, tiered
+from app.cache.tiered import TieredBackend
+from app.config.settings import get_settings
+from app.metrics.namespace import METRIC_NAMESPACE
+
+
+def _backend(
+    ttl: int = 60, value: bytes | None = b"cached", *, subscribed: bool = True
+) -> TieredBackend:
+    remote = MagicMock()
+    remote.get_with_ttl = AsyncMock(return_value=(ttl, value))
+    remote.set = AsyncMock()
+    remote.clear = AsyncMock(return_value=1)
+    remote.redis.publish = AsyncMock()
+    backend = TieredBackend(remote, local_ttl=5, maxsize=100)
+    backend.subscribed = subscribed
+    return backend
+
+
+def _redis(backend: TieredBackend) -> MagicMock:
+    """Return the mocked Redis client behind a test backend."""
+    return cast("MagicMock", backend.remote.redis)
+
+
+class FakePubSub:
+    """A pub/sub connection that delivers the messages put in its queue."""
+
+    def __init__(self, *, fail: bool = False) -> None:
+        """Create a connection, which fails to subscribe if ``fail``."""
+        self.fail = fail
+        self.messages: asyncio.Queue[bytes] = asyncio.Queue()
+        self.listening = asyncio.Event()
+        self.reset = AsyncMock()
+
+    async def subscribe(self, channel: str) -> None:
+        """Subscribe, or raise if this connection should fail."""
+        if self.fail:
+            msg = "connection refused"
+            raise RedisError(msg)
+        self.channel = channel
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield queued messages, marking each done once handled."""
+        self.listening.set()
+        while True:
+            data = await self.messages.get()
+            yield {"type": "message", "data": data}
+            self.messages.task_done()
+
+
+@pytest.mark.unit
+class TestTieredBackend:
+    """Test reads, writes and evictions of the tiered backend."""
+
+    @pytest.mark.asyncio
+    async def test_local_hit_skips_redis(self) -> None:
+        """Test a second read is served from the local tier."""
+        backend = _backend()
+
+        assert await backend.get_with_ttl("k") == (60, b"cached")
+        ttl, value = await backend.get_with_ttl("k")
+
+        assert value == b"cached"
+        assert 59 <= ttl <= 60  # noqa: PLR2004
+        backend.remote.get_with_ttl.assert_awaited_once_with("k")
+
+    @pytest.mark.asyncio
+    async def test_misses_are_not_stored(self) -> None:
+        """Test a Redis miss is asked again on the next read."""
+        backend = _backend(ttl=-2, value=None)
+
+        assert await backend.get("k") is None
+        assert await backend.get("k") is None
+
+        assert backend.remote.get_with_ttl.await_count == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_unsubscribed_backend_bypasses_local_tier(self) -> None:
+        """Test the local tier is unused while invalidations can be missed."""
+        backend = _backend(subscribed=False)
+
+        await backend.set("k", b"value", 60)
+        await backend.get("k")
+        await backend.get("k")
+
+        assert backend.remote.get_with_ttl.await_count == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_set_writes_both_tiers(self) -> None:
+        """Test a write goes to Redis and is then read locally."""
+        backend = _backend()
+
+        await backend.set("k", b"value", 60)
+
+        backend.remote.set.assert_awaited_once_with("k", b"value", 60)
+        assert await backend.get("k") == b"value"
+        backend.remote.get_with_ttl.assert_not_awaited()
+
+    def test_evict_drops_key_and_nested_keys(self) -> None:
+        """Test eviction matches whole key segments only."""
+        backend = _backend()
+        for key in ("p:user", "p:user:1", "p:user:1:me", "p:user:10"):
+            backend.set_local(key, b"v", epoch=backend.epoch)
+
+        backend.evict("p:user:1")
+
+        assert backend.get_local("p:user") == b"v"
+        assert backend.get_local("p:user:1") is None
+        assert backend.get_local("p:user:1:me") is None
+        assert backend.get_local("p:user:10") == b"v"
+
+    @pytest.mark.asyncio
+    async def test_read_racing_an_eviction_is_not_stored(self) -> None:
+        """Test a value read before an invalidation is not kept after it."""
+        backend = _backend()
+
+        async def read_then_invalidate(key: str) -> tuple[int, bytes]:
+            backend.evict(key)
+            return 60, b"stale"
+
+        backend.remote.get_with_ttl.side_effect = read_then_invalidate
+
+        assert await backend.get("k") == b"stale"
+        assert backend.get_local("k") is None
+
+    @pytest.mark.asyncio
+    async def test_clear_publishes_eviction(self) -> None:
+        """Test clearing a namespace evicts it on every worker."""
+        backend = _backend()
+        backend.set_local("fastapi-cache:user:1:me", b"v", epoch=backend.epoch)
+
+        await backend.clear(namespace="fastapi-cache:user:1")
+
+        backend.remote.clear.assert_awaited_once_with(
+            "fastapi-cache:user:1", None
+        )
+        _redis(backend).publish.assert_awaited_once_with(
+            "fastapi-cache:invalidate", "fastapi-cache:user:1"
+        )
+        assert backend.get_local("fastapi-cache:user:1:me") is None
+
+    @pytest.mark.asyncio
+    async def test_lookup_metrics(self, mocker: MockerFixture) -> None:
+        """Test hits and misses are counted per tier."""
+        mocker.patch.object(get_settings(), "metrics_enabled", new=True)
+        backend = _backend()
+
+        def count(tier: str, result: str) -> float:
+            return (
+                REGISTRY.get_sample_value(
+                    f"{METRIC_NAMESPACE}_cache_lookups_total",
+                    {"tier": tier, "result": result},
+                )
+                or 0
+            )
+
+        before = {
+            (tier, result): count(tier, result)
+            for tier in ("local", "redis")
+            for result in ("hit", "miss")
+        }
+
+        await backend.get("k")
+        await backend.get("k")
+
+        assert count("local", "miss") - before["local", "miss"] == 1
+        assert count("redis", "hit") - before["redis", "hit"] == 1
+        assert count("local", "hit") - before["local", "hit"] == 1
+        assert count("redis", "miss") == before["redis", "miss"]
+
+
+@pytest.mark.unit
+class TestInvalidationListener:
+    """Test the pub/sub listener that keeps workers' local tiers fresh."""
+
+    @pytest.mark.asyncio
+    async def test_messages_evict_local_entries(self) -> None:
+        """Test published prefixes are evicted from the local tier."""
+        backend = _backend(subscribed=False)
+        pubsub = FakePubSub()
+        _redis(backend).pubsub.return_value = pubsub
+        await backend.start()
+        await asyncio.wait_for(pubsub.listening.wait(), timeout=1)
+
+        assert backend.subscribed
+        assert pubsub.channel == "fastapi-cache:invalidate"
+        for key in ("fastapi-cache:user:1:me", "fastapi-cache:user:2:me"):
+            backend.set_local(key, b"v", epoch=backend.epoch)
+
+        await pubsub.messages.put(b"fastapi-cache:user:1")
+        await asyncio.wait_for(pubsub.messages.join(), timeout=1)
+
+        assert backend.get_local("fastapi-cache:user:1:me") is None
+        assert backend.get_local("fastapi-cache:user:2:me") == b"v"
+
+        await backend.stop()
+
+        assert not backend.subscribed
+        assert backend.get_local("fastapi-cache:user:2:me") is None
+        pubsub.reset.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_lost_connection_resubscribes(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the listener retries after Redis fails."""
+        monkeypatch.setattr(tiered, "RESUBSCRIBE_DELAY", 0)
+        backend = _backend(subscribed=False)
+        failing, working = FakePubSub(fail=True), FakePubSub()
+        _redis(backend).pubsub.side_effect = [failing, working]
+
+        await backend.start()
+        await asyncio.wait_for(working.listening.wait(), timeout=1)
+
+        assert backend.subscribed
+        failing.reset.assert_awaited_once()
+        await backend.stop()
+
+
+@pytest.mark.unit
+class TestTieredGenerations:
+    """Test generation tags are cached in the local tier."""
+
+    @pytest.fixture
+    def backend(self, monkeypatch: pytest.MonkeyPatch) -> TieredBackend:
+        """Install a tiered backend over a mocked Redis."""
+        backend = _backend()
+        _redis(backend).mget = AsyncMock(return_value=[b"2", None])
+        monkeypatch.setattr(FastAPICache, "_backend", backend)
+        monkeypatch.setattr(generation, "redis_backend", lambda: backend.remote)
+        return backend
+
+    @pytest.mark.asyncio
+    async def test_tags_are_read_once(self, backend: TieredBackend) -> None:
+        """Test a tag is read from Redis once, then locally."""
+        assert await generation.generation_tag("things:1") == "2.0"
+        assert await generation.generation_tag("things:1") == "2.0"
+
+        _redis(backend).mget.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bump_publishes_and_evicts(
+        self, backend: TieredBackend
+    ) -> None:
+        """Test a bump reaches every worker's local tier."""
+        pipe = MagicMock()
+        pipe.incr.return_value = pipe
+        pipe.publish.return_value = pipe
+        pipe.execute = AsyncMock(return_value=[3, 1])
+        _redis(backend).pipeline.return_value.__aenter__.return_value = pipe
+        await generation.generation_tag("things:1")
+
+        assert await generation.bump_generation("things:1") == 3  # noqa: PLR2004
+
+        key = "fastapi-cache:generation:things:1"
+        pipe.incr.assert_called_once_with(key)
+        pipe.publish.assert_called_once_with("fastapi-cache:invalidate", key)
+        assert backend.get_local(key) is None
+        assert backend.get_local("fastapi-cache:generation:things") == b"2"
@@ -1,7 +1,7 @@
 """Test the UserManager class."""
 
 import pytest
-from fastapi import BackgroundTasks, HTTPException, status
+from fastapi import HTTPException, status
 
 from app.database.helpers import verify_password
 from app.managers.user import ErrorMessages, UserManager
@@ -116,24 +116,21 @@ class TestUserManager:  # pylint: disable=too-many-public-methods
         assert isinstance(token, str)
         assert isinstance(refresh, str)
 
-    async def test_register_user_verified_when_no_background_tasks_specified(
+    async def test_register_user_verified_without_welcome_email(
         self, test_db
     ) -> None:
-        """Test user is automatically verified when no 'background_tasks'."""
+        """Test user is automatically verified without 'send_welcome'."""
         await UserManager.register(self.test_user, test_db)
         user = await test_db.get(User, 1)
 
         assert user.verified is True
 
-    async def test_register_user_not_verified_when_background_tasks_specified(
+    async def test_register_user_not_verified_with_welcome_email(
         self,
         test_db,
     ) -> None:
-        """Test user is not verified when 'background_tasks' IS provided."""
-        background_tasks = BackgroundTasks()
-        await UserManager.register(
-            self.test_user, test_db, background_tasks=background_tasks
-        )
+        """Test user is not verified when 'send_welcome' IS set."""
+        await UserManager.register(self.test_user, test_db, send_welcome=True)
         user = await test_db.get(User, 1)
 
         assert user.verified is False
@@ -167,13 +164,9 @@ class TestUserManager:  # pylint: disable=too-many-public-methods
     async def test_login_user_not_verified(self, test_db) -> None:
         """Test logging in a user that isn't verified.
 
-        We can do this easily by creating a user and specify a
-        'background_tasks' parameter.
+        We can do this easily by creating a user with 'send_welcome' set.
         """
-        background_tasks = BackgroundTasks()
-        await UserManager.register(
-            self.test_user, test_db, background_tasks=background_tasks
-        )
+        await UserManager.register(self.test_user, test_db, send_welcome=True)
         with pytest.raises(HTTPException, match=ErrorMessages.NOT_VERIFIED):
             await UserManager.login(self.test_user, test_db)
 